@@ -46,4 +46,8 @@ class RateLimitExceededError(GitHubAPIError):
 
 class RepositoryAnalysisError(AIServiceException):
     """Exception for repository analysis errors"""
-    pass
\ No newline at end of file
+    pass
+
+class GraphImportError(AIServiceException):
+    """Exception when a skill graph import source cannot be read"""
+    pass
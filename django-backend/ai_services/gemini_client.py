@@ -3,12 +3,16 @@ Google Gemini API client for AI-powered project analysis
 """
 import google.generativeai as genai
 from django.conf import settings
+from django.core.cache import cache
+import asyncio
 import logging
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence, Union
 from dataclasses import dataclass
 import time
 
+from monitoring.performance_monitor import monitor_ai_service
+
 from .exceptions import GeminiAPIException, ServiceUnavailableException
 
 logger = logging.getLogger(__name__)
@@ -70,6 +74,7 @@ class GeminiClient:
             }
         ]
     
+    @monitor_ai_service('gemini_api', 'generate_content')
     def generate_content(self, prompt: str, max_retries: int = 3) -> str:
         """
         Generate content using Gemini API with retry logic
@@ -154,4 +159,233 @@ class GeminiClient:
             return "successful" in response.lower()
         except Exception as e:
             logger.error(f"Gemini API connection test failed: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    def generate_many(self, prompts: Sequence[str], max_retries: int = 3,
+                      return_exceptions: bool = False) -> List[Union[str, Exception]]:
+        """
+        Generate content for many prompts concurrently (synchronous entry point)
+        
+        Args:
+            prompts: Prompts to send, results are returned in the same order
+            max_retries: Maximum number of retry attempts per prompt
+            return_exceptions: Return failures in place instead of raising the first one
+            
+        Returns:
+            List of generated texts (or exceptions) aligned with ``prompts``
+        """
+        async_client = AsyncGeminiClient(client=self)
+        return asyncio.run(
+            async_client.generate_many(prompts, max_retries=max_retries,
+                                       return_exceptions=return_exceptions)
+        )
+
+
+class LLMRateBudget:
+    """
+    Requests-per-minute and tokens-per-minute budget shared across processes.
+    
+    Uses fixed one-minute windows stored in the Django cache (Redis in all
+    deployed environments), so every worker and web process draws from the
+    same quota. Token usage is estimated up front and corrected once the
+    actual usage is known.
+    """
+    
+    WINDOW_SECONDS = 60
+    
+    def __init__(self, name: str = 'gemini', requests_per_minute: int = None,
+                 tokens_per_minute: int = None):
+        self.name = name
+        self.requests_per_minute = requests_per_minute or getattr(settings, 'GEMINI_REQUESTS_PER_MINUTE', 60)
+        self.tokens_per_minute = tokens_per_minute or getattr(settings, 'GEMINI_TOKENS_PER_MINUTE', 1000000)
+    
+    def _window(self) -> int:
+        return int(time.time() // self.WINDOW_SECONDS)
+    
+    def _keys(self, window: int):
+        return (f"llm_budget:{self.name}:{window}:requests",
+                f"llm_budget:{self.name}:{window}:tokens")
+    
+    @staticmethod
+    def _incr(key: str, delta: int) -> int:
+        # add() is a no-op when the key exists, incr() is atomic on Redis
+        cache.add(key, 0, LLMRateBudget.WINDOW_SECONDS * 2)
+        try:
+            return cache.incr(key, delta)
+        except ValueError:
+            cache.set(key, delta, LLMRateBudget.WINDOW_SECONDS * 2)
+            return delta
+    
+    def try_acquire(self, tokens: int):
+        """
+        Reserve one request and ``tokens`` tokens in the current window.
+        
+        Returns:
+            Tuple of (window, 0.0) on success, or (None, seconds_to_wait) when
+            the window is exhausted.
+        """
+        window = self._window()
+        request_key, token_key = self._keys(window)
+        
+        used_requests = self._incr(request_key, 1)
+        used_tokens = self._incr(token_key, tokens)
+        
+        if used_requests <= self.requests_per_minute and used_tokens <= self.tokens_per_minute:
+            return window, 0.0
+        
+        # Give the reservation back and wait for the next window
+        self._incr(request_key, -1)
+        self._incr(token_key, -tokens)
+        wait = (window + 1) * self.WINDOW_SECONDS - time.time()
+        return None, max(wait, 0.05)
+    
+    def adjust(self, window: int, delta_tokens: int) -> None:
+        """Correct the token estimate for a window once actual usage is known"""
+        if window is None or not delta_tokens:
+            return
+        _, token_key = self._keys(window)
+        self._incr(token_key, delta_tokens)
+    
+    def release(self, window: int, tokens: int) -> None:
+        """Give back a reservation whose attempt failed without reporting usage"""
+        if window is None:
+            return
+        request_key, token_key = self._keys(window)
+        self._incr(request_key, -1)
+        self._incr(token_key, -tokens)
+    
+    def usage(self) -> Dict[str, int]:
+        """Current window usage, for monitoring"""
+        request_key, token_key = self._keys(self._window())
+        return {
+            'requests': cache.get(request_key, 0),
+            'tokens': cache.get(token_key, 0),
+            'requests_per_minute': self.requests_per_minute,
+            'tokens_per_minute': self.tokens_per_minute,
+        }
+
+
+class AsyncGeminiClient:
+    """
+    Asynchronous Gemini client with bounded parallelism and a shared quota.
+    
+    Wraps a ``GeminiClient`` so model, generation and safety configuration stay
+    in one place. Concurrency is limited per event loop with a semaphore,
+    while request and token quotas are enforced across processes through
+    ``LLMRateBudget``.
+    """
+    
+    # Rough characters-per-token ratio used to estimate prompt size
+    CHARS_PER_TOKEN = 4
+    
+    def __init__(self, client: GeminiClient = None, max_concurrency: int = None,
+                 budget: LLMRateBudget = None):
+        self.client = client or GeminiClient()
+        self.max_concurrency = max_concurrency or getattr(settings, 'GEMINI_MAX_CONCURRENCY', 8)
+        self.budget = budget or LLMRateBudget()
+        self._semaphore = None
+    
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+    
+    def estimate_tokens(self, prompt: str) -> int:
+        """Estimate prompt plus worst-case completion tokens for budgeting"""
+        prompt_tokens = len(prompt) // self.CHARS_PER_TOKEN + 1
+        return prompt_tokens + self.client.generation_config.get('max_output_tokens', 0)
+    
+    async def _acquire_budget(self, tokens: int) -> int:
+        while True:
+            window, wait = await asyncio.to_thread(self.budget.try_acquire, tokens)
+            if window is not None:
+                return window
+            logger.info(f"Gemini budget exhausted, waiting {wait:.1f}s for next window")
+            await asyncio.sleep(wait)
+    
+    async def generate_content(self, prompt: str, max_retries: int = 3) -> str:
+        """
+        Generate content asynchronously with retry logic and quota enforcement
+        
+        Args:
+            prompt: The input prompt for generation
+            max_retries: Maximum number of retry attempts
+            
+        Returns:
+            Generated content as string
+            
+        Raises:
+            GeminiAPIException: If all retry attempts fail
+            ServiceUnavailableException: If service is temporarily unavailable
+        """
+        # An estimate above the per-minute limit could never be granted; reserve
+        # a whole window instead and let adjust() settle the actual usage
+        estimated_tokens = min(self.estimate_tokens(prompt), self.budget.tokens_per_minute)
+        
+        async with self.semaphore:
+            for attempt in range(max_retries):
+                window = await self._acquire_budget(estimated_tokens)
+                usage_reported = False
+                try:
+                    response = await self.client.model.generate_content_async(
+                        prompt,
+                        generation_config=self.client.generation_config,
+                        safety_settings=self.client.safety_settings
+                    )
+                    
+                    usage = getattr(response, 'usage_metadata', None)
+                    actual_tokens = getattr(usage, 'total_token_count', None)
+                    if actual_tokens:
+                        usage_reported = True
+                        await asyncio.to_thread(self.budget.adjust, window,
+                                                actual_tokens - estimated_tokens)
+                    
+                    if response.text:
+                        return response.text.strip()
+                    else:
+                        logger.warning(f"Empty response from Gemini API on attempt {attempt + 1}")
+                        if attempt == max_retries - 1:
+                            raise GeminiAPIException("Received empty response from Gemini API")
+                
+                except GeminiAPIException:
+                    raise
+                except Exception as e:
+                    logger.error(f"Gemini API error on attempt {attempt + 1}: {str(e)}")
+                    # Nothing was billed against the estimate, so don't hold it
+                    # until the window rolls over
+                    if not usage_reported:
+                        await asyncio.to_thread(self.budget.release, window, estimated_tokens)
+                    if attempt == max_retries - 1:
+                        if "quota" in str(e).lower() or "rate limit" in str(e).lower():
+                            raise ServiceUnavailableException(f"Gemini API quota/rate limit exceeded: {str(e)}")
+                        else:
+                            raise GeminiAPIException(f"Failed to generate content after {max_retries} attempts: {str(e)}")
+                
+                # Exponential backoff without blocking other prompts
+                await asyncio.sleep(2 ** attempt)
+        
+        raise GeminiAPIException("Unexpected error in content generation")
+    
+    async def generate_many(self, prompts: Sequence[str], max_retries: int = 3,
+                            return_exceptions: bool = False) -> List[Union[str, Exception]]:
+        """
+        Fan out prompts concurrently and return results in input order
+        
+        Args:
+            prompts: Prompts to send
+            max_retries: Maximum number of retry attempts per prompt
+            return_exceptions: Return failures in place instead of raising the first one
+            
+        Returns:
+            List of generated texts (or exceptions) aligned with ``prompts``
+        """
+        started = time.time()
+        results = await asyncio.gather(
+            *(self.generate_content(prompt, max_retries=max_retries) for prompt in prompts),
+            return_exceptions=return_exceptions
+        )
+        logger.info(f"Generated {len(prompts)} Gemini responses in {time.time() - started:.2f}s "
+                    f"(concurrency={self.max_concurrency})")
+        return list(results)
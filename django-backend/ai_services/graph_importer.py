@@ -0,0 +1,459 @@
+"""
+Bulk importer for the Neo4j skill graph.
+
+Skill, technology, developer and project nodes and the relationships between
+them are written in large ``UNWIND $rows ... MERGE`` batches, one transaction
+per batch, instead of one statement per record. Because every statement
+merges on the node keys covered by the graph constraints, importing the same
+data twice leaves the graph unchanged.
+
+Records are streamed from CSV, JSON Lines or JSON files. Kinds are imported
+in dependency order, nodes before relationships. With a checkpoint file,
+the importer records how many records of each source it has committed, so an
+interrupted import resumes after the last committed batch. A source that
+changed since it was checkpointed is imported from the start.
+"""
+import csv
+import json
+import logging
+import os
+import re
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .exceptions import GraphImportError
+
+logger = logging.getLogger(__name__)
+
+# Uniqueness constraints the MERGE statements rely on
+GRAPH_CONSTRAINTS = [
+    "CREATE CONSTRAINT skill_name_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
+    "CREATE CONSTRAINT technology_name_unique IF NOT EXISTS FOR (t:Technology) REQUIRE t.name IS UNIQUE",
+    "CREATE CONSTRAINT developer_id_unique IF NOT EXISTS FOR (d:Developer) REQUIRE d.id IS UNIQUE",
+    "CREATE CONSTRAINT project_id_unique IF NOT EXISTS FOR (p:Project) REQUIRE p.id IS UNIQUE",
+]
+
+RELATIONSHIP_TYPE_PATTERN = re.compile(r'^[A-Z][A-Z0-9_]*$')
+
+
+def _text(value):
+    value = str(value).strip() if value is not None else ''
+    return value or None
+
+
+def _number(cast, default=None):
+    def convert(value):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return default
+        return cast(value)
+    return convert
+
+
+# Per kind: typed fields (required ones have no default), and the batch statement.
+# Fields not listed here become node properties (nodes) or are ignored (relationships).
+RECORD_TYPES = {
+    'skills': {
+        'fields': {'name': _text, 'category': _text},
+        'required': ('name',),
+        'node': True,
+        'query': """
+            UNWIND $rows AS row
+            MERGE (s:Skill {name: row.name})
+            SET s.category = coalesce(row.category, s.category),
+                s.updated_at = datetime(),
+                s += row.properties
+        """,
+    },
+    'technologies': {
+        'fields': {'name': _text, 'type': _text},
+        'required': ('name',),
+        'node': True,
+        'query': """
+            UNWIND $rows AS row
+            MERGE (t:Technology {name: row.name})
+            SET t.type = coalesce(row.type, t.type),
+                t.updated_at = datetime(),
+                t += row.properties
+        """,
+    },
+    'developers': {
+        'fields': {'id': _text},
+        'required': ('id',),
+        'node': True,
+        'query': """
+            UNWIND $rows AS row
+            MERGE (d:Developer {id: row.id})
+            SET d.updated_at = datetime(),
+                d += row.properties
+        """,
+    },
+    'projects': {
+        'fields': {'id': _text},
+        'required': ('id',),
+        'node': True,
+        'query': """
+            UNWIND $rows AS row
+            MERGE (p:Project {id: row.id})
+            SET p.updated_at = datetime(),
+                p += row.properties
+        """,
+    },
+    'skill_relationships': {
+        'fields': {
+            'skill1': _text, 'skill2': _text,
+            'strength': _number(float, 1.0), 'type': _text,
+        },
+        'required': ('skill1', 'skill2'),
+        'query': """
+            UNWIND $rows AS row
+            MATCH (s1:Skill {name: row.skill1})
+            MATCH (s2:Skill {name: row.skill2})
+            MERGE (s1)-[r:RELATED_TO]->(s2)
+            SET r.strength = row.strength,
+                r.relationship_type = coalesce(row.type, 'COMPLEMENTARY'),
+                r.updated_at = datetime()
+        """,
+    },
+    'skill_technologies': {
+        'fields': {
+            'skill': _text, 'technology': _text,
+            'relationship_type': _text, 'strength': _number(float, 1.0),
+        },
+        'required': ('skill', 'technology'),
+        # Relationship types cannot be parameters; batches are split per type
+        'group_by': ('relationship_type', 'USES'),
+        'query': """
+            UNWIND $rows AS row
+            MATCH (s:Skill {{name: row.skill}})
+            MATCH (t:Technology {{name: row.technology}})
+            MERGE (s)-[r:{relationship_type}]->(t)
+            SET r.strength = row.strength,
+                r.updated_at = datetime()
+        """,
+    },
+    'developer_skills': {
+        'fields': {
+            'developer_id': _text, 'skill': _text,
+            'proficiency': _number(float), 'experience_years': _number(int, 0),
+        },
+        'required': ('developer_id', 'skill', 'proficiency'),
+        'query': """
+            UNWIND $rows AS row
+            MATCH (d:Developer {id: row.developer_id})
+            MATCH (s:Skill {name: row.skill})
+            MERGE (d)-[r:HAS_SKILL]->(s)
+            SET r.proficiency = row.proficiency,
+                r.experience_years = row.experience_years,
+                r.updated_at = datetime()
+        """,
+    },
+    'project_skills': {
+        'fields': {
+            'project_id': _text, 'skill': _text,
+            'importance': _number(float), 'required_level': _number(float),
+        },
+        'required': ('project_id', 'skill', 'importance', 'required_level'),
+        'query': """
+            UNWIND $rows AS row
+            MATCH (p:Project {id: row.project_id})
+            MATCH (s:Skill {name: row.skill})
+            MERGE (p)-[r:REQUIRES_SKILL]->(s)
+            SET r.importance = row.importance,
+                r.required_level = row.required_level,
+                r.updated_at = datetime()
+        """,
+    },
+    'collaborations': {
+        'fields': {
+            'developer1_id': _text, 'developer2_id': _text,
+            'collaboration_score': _number(float), 'project_id': _text,
+        },
+        'required': ('developer1_id', 'developer2_id', 'collaboration_score'),
+        'query': """
+            UNWIND $rows AS row
+            MATCH (d1:Developer {id: row.developer1_id})
+            MATCH (d2:Developer {id: row.developer2_id})
+            MERGE (d1)-[r:COLLABORATED_WITH]->(d2)
+            WITH r, row, coalesce(r.projects, []) AS projects
+            SET r.projects = CASE
+                    WHEN row.project_id IS NULL OR row.project_id IN projects THEN projects
+                    ELSE projects + row.project_id
+                END,
+                r.collaboration_score = row.collaboration_score,
+                r.updated_at = datetime()
+        """,
+    },
+}
+
+# Nodes first so relationship MATCHes find their endpoints
+IMPORT_ORDER = list(RECORD_TYPES)
+
+SOURCE_EXTENSIONS = ('.csv', '.jsonl', '.json')
+
+
+class SkillGraphImporter:
+    """Streams graph records into Neo4j in UNWIND batches with resumable checkpoints"""
+
+    def __init__(self, neo4j=None, batch_size: int = 5000, checkpoint_path: str = None,
+                 progress: Callable[[Dict[str, Any]], None] = None, max_attempts: int = 3):
+        """
+        Args:
+            neo4j: Neo4jService to write through (defaults to the shared instance)
+            batch_size: Records per UNWIND transaction
+            checkpoint_path: JSON file recording committed progress; no resuming without it
+            progress: Called with a progress dict after every committed batch
+            max_attempts: Attempts per batch before the import fails
+        """
+        if neo4j is None:
+            from .neo4j_service import neo4j_service as neo4j
+        self.neo4j = neo4j
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path
+        self.progress = progress
+        self.max_attempts = max_attempts
+        self._checkpoint = self._load_checkpoint()
+
+    # Sources
+
+    def discover_sources(self, path: str) -> List[Tuple[str, str]]:
+        """
+        (kind, file) pairs in import order.
+
+        ``path`` is a directory holding ``<kind>.csv``, ``<kind>.jsonl`` or
+        ``<kind>.json`` files, or one JSON document keyed by kind (the
+        setup_rag_pipeline data file format).
+        """
+        if os.path.isdir(path):
+            sources = []
+            for kind in IMPORT_ORDER:
+                for extension in SOURCE_EXTENSIONS:
+                    candidate = os.path.join(path, kind + extension)
+                    if os.path.exists(candidate):
+                        sources.append((kind, candidate))
+            return sources
+
+        if not os.path.exists(path):
+            raise GraphImportError(f"Import source not found: {path}")
+        if path.endswith('.json'):
+            return [(kind, path) for kind in IMPORT_ORDER if kind in self._json_document(path)]
+        kind = os.path.splitext(os.path.basename(path))[0]
+        if kind not in RECORD_TYPES:
+            raise GraphImportError(f"Cannot tell the record kind of {path}; name it <kind>.csv or <kind>.jsonl")
+        return [(kind, path)]
+
+    def read_records(self, kind: str, path: str) -> Iterator[Dict[str, Any]]:
+        """Stream raw records of one kind from a file"""
+        if path.endswith('.csv'):
+            with open(path, newline='', encoding='utf-8') as handle:
+                yield from csv.DictReader(handle)
+        elif path.endswith('.jsonl'):
+            with open(path, encoding='utf-8') as handle:
+                for line in handle:
+                    if line.strip():
+                        yield json.loads(line)
+        else:
+            document = self._json_document(path)
+            yield from (document.get(kind, []) if isinstance(document, dict) else document)
+
+    def _json_document(self, path: str):
+        # Whole-document JSON cannot be streamed; CSV or JSON Lines suit large imports
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+
+    # Import
+
+    def import_path(self, path: str, kinds: Iterable[str] = None) -> Dict[str, Any]:
+        """Import every source found at ``path``, optionally limited to some kinds"""
+        kinds = set(kinds) if kinds else None
+        summary = {'success': True, 'kinds': {}, 'records': 0, 'elapsed': 0.0}
+        started = time.monotonic()
+        self.ensure_constraints()
+        for kind, source in self.discover_sources(path):
+            if kinds is not None and kind not in kinds:
+                continue
+            result = self.import_records(
+                kind, self.read_records(kind, source),
+                source_key=f"{kind}:{os.path.abspath(source)}",
+                fingerprint=self._fingerprint(source)
+            )
+            summary['kinds'].setdefault(kind, []).append(result)
+            summary['records'] += result['records']
+        summary['elapsed'] = time.monotonic() - started
+        return summary
+
+    def import_records(self, kind: str, records: Iterable[Dict[str, Any]],
+                       source_key: str = None, fingerprint: str = None) -> Dict[str, Any]:
+        """
+        Import records of one kind.
+
+        With a ``source_key`` and a checkpoint file, records committed by an
+        earlier run with the same fingerprint are skipped.
+        """
+        if kind not in RECORD_TYPES:
+            raise GraphImportError(f"Unknown record kind: {kind}")
+
+        state = self._checkpoint_state(source_key, fingerprint)
+        result = {
+            'kind': kind,
+            'records': 0,
+            'skipped_invalid': 0,
+            'resumed_from': state['records_done'],
+            'nodes_created': 0,
+            'relationships_created': 0,
+            'properties_set': 0,
+            'elapsed': 0.0,
+        }
+        if state['completed']:
+            logger.info(f"Skipping {source_key}: already imported")
+            result['already_imported'] = True
+            return result
+
+        started = time.monotonic()
+        records = iter(records)
+        # Resume after the last committed batch
+        for _ in islice(records, state['records_done']):
+            pass
+        done = state['records_done']
+
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                break
+            rows = []
+            for record in batch:
+                row = self._normalise(kind, record)
+                if row is None:
+                    result['skipped_invalid'] += 1
+                else:
+                    rows.append(row)
+
+            counters = self._write_batch(kind, rows)
+            for name in ('nodes_created', 'relationships_created', 'properties_set'):
+                result[name] += counters[name]
+
+            done += len(batch)
+            result['records'] += len(batch)
+            self._save_checkpoint(source_key, fingerprint, done, completed=False)
+
+            elapsed = time.monotonic() - started
+            result['elapsed'] = elapsed
+            if self.progress:
+                self.progress({
+                    'kind': kind,
+                    'records_done': done,
+                    'records_per_second': result['records'] / elapsed if elapsed else 0.0,
+                    **{name: result[name] for name in ('nodes_created', 'relationships_created')}
+                })
+
+        result['elapsed'] = time.monotonic() - started
+        self._save_checkpoint(source_key, fingerprint, done, completed=True)
+        logger.info(
+            f"Imported {result['records']} {kind} records in {result['elapsed']:.1f}s "
+            f"({result['nodes_created']} nodes, {result['relationships_created']} relationships created, "
+            f"{result['skipped_invalid']} invalid)"
+        )
+        return result
+
+    def ensure_constraints(self):
+        with self.neo4j.get_session() as session:
+            for constraint in GRAPH_CONSTRAINTS:
+                session.run(constraint).consume()
+
+    def _normalise(self, kind: str, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Typed row for the batch statement, or None when a required field is missing or malformed"""
+        spec = RECORD_TYPES[kind]
+        try:
+            row = {name: convert(record.get(name)) for name, convert in spec['fields'].items()}
+        except (TypeError, ValueError):
+            return None
+        if any(row[name] is None for name in spec['required']):
+            return None
+
+        if spec.get('node'):
+            properties = dict(record.get('metadata') or {}) if isinstance(record.get('metadata'), dict) else {}
+            for name, value in record.items():
+                if name in spec['fields'] or name == 'metadata':
+                    continue
+                # Neo4j properties hold scalars and lists, not maps
+                if isinstance(value, (str, int, float, bool, list)) and value != '':
+                    properties[name] = value
+            row['properties'] = properties
+        return row
+
+    def _write_batch(self, kind: str, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        counters = {'nodes_created': 0, 'relationships_created': 0, 'properties_set': 0}
+        if not rows:
+            return counters
+
+        spec = RECORD_TYPES[kind]
+        statements = []
+        if 'group_by' in spec:
+            field, default = spec['group_by']
+            groups = {}
+            for row in rows:
+                groups.setdefault(row[field] or default, []).append(row)
+            for relationship_type, group in groups.items():
+                if not RELATIONSHIP_TYPE_PATTERN.match(relationship_type):
+                    logger.warning(f"Skipping {len(group)} {kind} rows with invalid relationship type {relationship_type!r}")
+                    continue
+                statements.append((spec['query'].format(relationship_type=relationship_type), group))
+        else:
+            statements.append((spec['query'], rows))
+
+        def write(tx):
+            totals = dict.fromkeys(counters, 0)
+            for query, batch_rows in statements:
+                summary = tx.run(query, rows=batch_rows).consume()
+                for name in totals:
+                    totals[name] += getattr(summary.counters, name)
+            return totals
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                with self.neo4j.get_session() as session:
+                    return session.execute_write(write)
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    raise
+                logger.warning(f"Batch of {len(rows)} {kind} failed (attempt {attempt}), retrying: {e}")
+                time.sleep(2 ** attempt)
+
+    # Checkpoints
+
+    @staticmethod
+    def _fingerprint(path: str) -> str:
+        stat = os.stat(path)
+        return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as handle:
+                return json.load(handle)
+        return {'sources': {}}
+
+    def _checkpoint_state(self, source_key: Optional[str], fingerprint: Optional[str]) -> Dict[str, Any]:
+        state = self._checkpoint['sources'].get(source_key) if source_key else None
+        if not state or state.get('fingerprint') != fingerprint:
+            return {'records_done': 0, 'completed': False}
+        return state
+
+    def _save_checkpoint(self, source_key: Optional[str], fingerprint: Optional[str],
+                         records_done: int, completed: bool):
+        if not self.checkpoint_path or not source_key:
+            return
+        self._checkpoint['sources'][source_key] = {
+            'fingerprint': fingerprint,
+            'records_done': records_done,
+            'completed': completed,
+        }
+        # Write then rename so a crash never leaves a truncated checkpoint
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as handle:
+            json.dump(self._checkpoint, handle, indent=2)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def reset_checkpoint(self):
+        self._checkpoint = {'sources': {}}
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
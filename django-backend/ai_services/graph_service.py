@@ -7,6 +7,7 @@ from typing import List, Dict, Any, Optional, Tuple, Set
 import logging
 from django.conf import settings
 from .neo4j_service import neo4j_service
+from .team_solver import TeamCompositionSolver
 import numpy as np
 from collections import defaultdict, deque
 import heapq
@@ -192,7 +193,8 @@ class GraphAnalysisService:
     
     def find_optimal_team_composition(self, required_skills: List[str], 
                                     team_size_limit: int = 5,
-                                    exclude_developers: List[str] = None) -> Dict[str, Any]:
+                                    exclude_developers: List[str] = None,
+                                    time_budget: float = None) -> Dict[str, Any]:
         """
         Find optimal team composition using graph algorithms.
         
@@ -200,11 +202,14 @@ class GraphAnalysisService:
             required_skills: List of skills required for the project
             team_size_limit: Maximum number of team members
             exclude_developers: List of developer IDs to exclude
+            time_budget: Seconds the solver may search (defaults to TEAM_COMPOSITION_TIME_BUDGET)
             
         Returns:
             Dictionary containing optimal team composition and analysis
         """
         exclude_developers = exclude_developers or []
+        if time_budget is None:
+            time_budget = settings.TEAM_COMPOSITION_TIME_BUDGET
         
         try:
             # Get all developers with relevant skills
@@ -213,11 +218,22 @@ class GraphAnalysisService:
             if not candidates:
                 return {'team': [], 'coverage': 0.0, 'error': 'No suitable candidates found'}
             
-            # Use greedy algorithm with optimization
-            optimal_team = self._greedy_team_selection(candidates, required_skills, team_size_limit)
+            # Collaboration history for the whole pool, fetched once for the solver
+            collaboration_scores = self._get_collaboration_scores(
+                [candidate['developer_id'] for candidate in candidates]
+            )
+            
+            # Branch and bound; returns the best team so far if the budget runs out
+            solution = TeamCompositionSolver(
+                candidates, required_skills, collaboration_scores,
+                team_size_limit=team_size_limit, time_budget=time_budget
+            ).solve()
+            optimal_team = solution['team']
             
             # Calculate team metrics
-            team_analysis = self._analyze_team_composition(optimal_team, required_skills)
+            team_analysis = self._analyze_team_composition(
+                optimal_team, required_skills, collaboration_scores
+            )
             
             return {
                 'team': optimal_team,
@@ -225,7 +241,13 @@ class GraphAnalysisService:
                 'team_synergy_score': team_analysis['synergy_score'],
                 'collaboration_potential': team_analysis['collaboration_potential'],
                 'cost_estimate': team_analysis['cost_estimate'],
-                'coverage_details': team_analysis['coverage_details']
+                'coverage_details': team_analysis['coverage_details'],
+                'solver': {
+                    'objective': solution['objective'],
+                    'optimal': solution['optimal'],
+                    'nodes_explored': solution['nodes_explored'],
+                    'elapsed': solution['elapsed']
+                }
             }
             
         except Exception as e:
@@ -274,10 +296,42 @@ class GraphAnalysisService:
             logger.error(f"Error getting skill candidates: {e}")
             return []
     
+    def _get_collaboration_scores(self, developer_ids: List[str]) -> Dict[Tuple[str, str], float]:
+        """Get collaboration scores between every pair of the given developers that worked together."""
+        if len(developer_ids) < 2:
+            return {}
+        
+        try:
+            with self.neo4j.get_session() as session:
+                query = """
+                MATCH (d1:Developer)-[r:COLLABORATED_WITH]-(d2:Developer)
+                WHERE d1.id IN $developer_ids AND d2.id IN $developer_ids AND d1.id < d2.id
+                
+                RETURN d1.id as developer1_id,
+                       d2.id as developer2_id,
+                       max(r.collaboration_score) as collaboration_score
+                """
+                
+                result = session.run(query, {'developer_ids': developer_ids})
+                
+                return {
+                    (record['developer1_id'], record['developer2_id']): record['collaboration_score'] or 0.0
+                    for record in result
+                }
+                
+        except Exception as e:
+            logger.error(f"Error getting collaboration scores: {e}")
+            return {}
+    
     def _greedy_team_selection(self, candidates: List[Dict[str, Any]], 
                              required_skills: List[str], 
                              team_size_limit: int) -> List[Dict[str, Any]]:
-        """Select optimal team using greedy algorithm with skill coverage optimization."""
+        """
+        Select a team greedily by skill coverage.
+        
+        Superseded by TeamCompositionSolver; kept as the baseline for the
+        benchmark_team_composition command.
+        """
         team = []
         covered_skills = set()
         remaining_skills = set(required_skills)
@@ -329,7 +383,8 @@ class GraphAnalysisService:
         return team
     
     def _analyze_team_composition(self, team: List[Dict[str, Any]], 
-                                required_skills: List[str]) -> Dict[str, Any]:
+                                required_skills: List[str],
+                                collaboration_scores: Dict[Tuple[str, str], float] = None) -> Dict[str, Any]:
         """Analyze the composition and effectiveness of a selected team."""
         if not team:
             return {
@@ -353,7 +408,11 @@ class GraphAnalysisService:
         skill_coverage = len(covered_skills) / len(required_skills) if required_skills else 0.0
         
         # Calculate team synergy (collaboration history)
-        synergy_score = self._calculate_team_synergy([m['developer_id'] for m in team])
+        developer_ids = [m['developer_id'] for m in team]
+        if collaboration_scores is not None:
+            synergy_score = self._team_synergy_from_scores(developer_ids, collaboration_scores)
+        else:
+            synergy_score = self._calculate_team_synergy(developer_ids)
         
         # Calculate collaboration potential
         collaboration_potential = self._calculate_collaboration_potential(team)
@@ -401,6 +460,22 @@ class GraphAnalysisService:
             logger.error(f"Error calculating team synergy: {e}")
             return 0.0
     
+    @staticmethod
+    def _team_synergy_from_scores(developer_ids: List[str],
+                                  collaboration_scores: Dict[Tuple[str, str], float]) -> float:
+        """Average collaboration score over all pairs, from already fetched scores."""
+        if len(developer_ids) < 2:
+            return 0.0
+        
+        total, pairs = 0.0, 0
+        for i, dev1_id in enumerate(developer_ids):
+            for dev2_id in developer_ids[i + 1:]:
+                pairs += 1
+                total += collaboration_scores.get(
+                    (dev1_id, dev2_id), collaboration_scores.get((dev2_id, dev1_id), 0.0)
+                )
+        return total / pairs
+    
     def _calculate_collaboration_potential(self, team: List[Dict[str, Any]]) -> float:
         """Calculate collaboration potential based on complementary skills."""
         if len(team) < 2:
@@ -429,21 +504,36 @@ class GraphAnalysisService:
         return sum(complementarity_scores) / len(complementarity_scores) if complementarity_scores else 0.0
     
     def analyze_skill_market_dynamics(self, time_window_days: int = 90) -> Dict[str, Any]:
-        """Analyze skill market dynamics using graph algorithms."""
+        """
+        Analyze skill market dynamics using graph algorithms.
+        
+        Clusters and importance scores come from the latest skill graph
+        analytics snapshot; the graph is only traversed live before the
+        first snapshot exists.
+        """
+        from .skill_graph_analytics import skill_graph_analytics
+        
         try:
             # Get market trends from Neo4j
             market_trends = self.neo4j.analyze_skill_market_trends(time_window_days)
             
-            # Analyze skill clusters and relationships
-            skill_clusters = self._identify_skill_clusters()
-            
-            # Calculate skill importance scores
-            skill_importance = self._calculate_skill_importance_scores()
+            snapshot = skill_graph_analytics.current()
+            if snapshot is not None:
+                skill_clusters = snapshot['clusters'][:10]
+                skill_importance = snapshot['skill_importance']
+            else:
+                # Analyze skill clusters and relationships
+                skill_clusters = self._identify_skill_clusters()
+                
+                # Calculate skill importance scores
+                skill_importance = self._calculate_skill_importance_scores()
             
             return {
                 'market_trends': market_trends,
                 'skill_clusters': skill_clusters,
                 'skill_importance': skill_importance,
+                'analytics_version': snapshot['version'] if snapshot else None,
+                'analytics_computed_at': snapshot['computed_at'] if snapshot else None,
                 'recommendations': self._generate_market_recommendations(market_trends, skill_clusters)
             }
             
@@ -15,9 +15,12 @@ from concurrent.futures import ThreadPoolExecutor
 import json
 import hashlib
 
+from freelance_platform.cache_config import CacheService
+
 from .embedding_service import embedding_service
 from .graph_service import graph_service
 from .neo4j_service import neo4j_service
+from .skill_validator import SkillValidator
 from .vector_models import (
     VectorEmbedding, DeveloperProfileEmbedding, ProjectRequirementEmbedding,
     SkillEmbedding, SimilaritySearchResult
@@ -44,7 +47,8 @@ class HybridRAGService:
     
     def find_matching_developers(self, project_data: Dict[str, Any], 
                                limit: int = 20,
-                               include_analysis: bool = True) -> List[Dict[str, Any]]:
+                               include_analysis: bool = True,
+                               use_cache: bool = True) -> List[Dict[str, Any]]:
         """
         Find developers matching project requirements using hybrid RAG approach.
         
@@ -52,6 +56,7 @@ class HybridRAGService:
             project_data: Project information including requirements and description
             limit: Maximum number of developers to return
             include_analysis: Whether to include detailed matching analysis
+            use_cache: Whether a cached result may be returned instead of recomputing
             
         Returns:
             List of matching developers with scores and analysis
@@ -61,35 +66,14 @@ class HybridRAGService:
             
             # Generate cache key
             cache_key = self._generate_cache_key('developer_match', project_data, limit)
-            cached_result = cache.get(cache_key)
-            if cached_result:
-                logger.info(f"Returning cached developer matches for project {project_id}")
-                return cached_result
-            
-            # Step 1: Vector-based similarity search
-            vector_matches = self._vector_similarity_search(project_data, limit * 2)
-            
-            # Step 2: Graph-based relationship analysis
-            graph_matches = self._graph_relationship_analysis(project_data, vector_matches)
-            
-            # Step 3: Combine and rank results
-            hybrid_matches = self._combine_matching_scores(vector_matches, graph_matches)
-            
-            # Step 4: Add availability and reputation filtering
-            filtered_matches = self._apply_availability_filter(hybrid_matches)
-            
-            # Step 5: Generate detailed analysis if requested
-            if include_analysis:
-                final_matches = self._add_detailed_analysis(filtered_matches, project_data)
+            compute = lambda: self._rank_developers(project_data, limit, include_analysis)
+            if use_cache:
+                # One worker recomputes an expiring hot project while the rest get the previous list
+                result = CacheService.get_or_compute(
+                    cache_key, compute, self.cache_timeout, prefix='developer_match'
+                )
             else:
-                final_matches = filtered_matches
-            
-            # Sort by final score and limit results
-            final_matches.sort(key=lambda x: x.get('final_score', 0), reverse=True)
-            result = final_matches[:limit]
-            
-            # Cache the result
-            cache.set(cache_key, result, self.cache_timeout)
+                result = CacheService.refresh_cached(cache_key, compute, self.cache_timeout)
             
             logger.info(f"Found {len(result)} matching developers for project {project_id}")
             return result
@@ -98,6 +82,31 @@ class HybridRAGService:
             logger.error(f"Error finding matching developers: {e}")
             return []
     
+    def _rank_developers(self, project_data: Dict[str, Any], limit: int,
+                         include_analysis: bool) -> List[Dict[str, Any]]:
+        """Run the hybrid matching pipeline for a project"""
+        # Step 1: Vector-based similarity search
+        vector_matches = self._vector_similarity_search(project_data, limit * 2)
+        
+        # Step 2: Graph-based relationship analysis
+        graph_matches = self._graph_relationship_analysis(project_data, vector_matches)
+        
+        # Step 3: Combine and rank results
+        hybrid_matches = self._combine_matching_scores(vector_matches, graph_matches)
+        
+        # Step 4: Add availability and reputation filtering
+        filtered_matches = self._apply_availability_filter(hybrid_matches)
+        
+        # Step 5: Generate detailed analysis if requested
+        if include_analysis:
+            final_matches = self._add_detailed_analysis(filtered_matches, project_data)
+        else:
+            final_matches = filtered_matches
+        
+        # Sort by final score and limit results
+        final_matches.sort(key=lambda x: x.get('final_score', 0), reverse=True)
+        return final_matches[:limit]
+    
     def find_matching_projects(self, developer_data: Dict[str, Any], 
                              limit: int = 20,
                              include_analysis: bool = True) -> List[Dict[str, Any]]:
@@ -165,8 +174,11 @@ class HybridRAGService:
             # Get combined project embedding
             combined_embedding = self._combine_project_embeddings(project_embeddings)
             
-            # Search for similar developer profiles
+            # Search for similar developer profiles, pruned by the skill index
             developer_embeddings = DeveloperProfileEmbedding.objects.all()
+            candidate_ids = self._skill_candidates(project_data)
+            if candidate_ids is not None:
+                developer_embeddings = developer_embeddings.filter(developer_id__in=candidate_ids)
             
             matches = []
             for dev_embedding in developer_embeddings:
@@ -201,6 +213,32 @@ class HybridRAGService:
             logger.error(f"Error in vector similarity search: {e}")
             return []
     
+    def _skill_candidates(self, project_data: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        IDs of developers worth scoring for a project, or None to score everyone.
+        
+        Candidates have every mandatory skill, none of the excluded skills and at
+        least one required skill. When nobody in the index has a required skill
+        (the project may name them differently), that condition is dropped and the
+        embeddings decide.
+        """
+        if not getattr(settings, 'MATCHING_SKILL_PRUNING', True):
+            return None
+        from users.skill_index import skill_index
+        
+        required_skills = project_data.get('required_skills') or []
+        if required_skills and not skill_index.developers_with_any(required_skills).exists():
+            required_skills = []
+        candidates = skill_index.candidates(
+            any_of=required_skills,
+            all_of=project_data.get('mandatory_skills'),
+            none_of=project_data.get('excluded_skills')
+        )
+        if candidates is None:
+            return None
+        # Embeddings store developer IDs as strings
+        return [str(developer_id) for developer_id in candidates]
+    
     def _graph_relationship_analysis(self, project_data: Dict[str, Any], 
                                    vector_matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Perform graph-based relationship analysis for developers."""
@@ -272,14 +310,20 @@ class HybridRAGService:
     def _apply_availability_filter(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Apply availability and reputation filtering to matches."""
         try:
-            from users.models import User
+            from users.candidates import candidate_hydrator
+            
+            hydrator = candidate_hydrator()
+            developers = hydrator.load(match['developer_id'] for match in matches)
             
             filtered_matches = []
             for match in matches:
                 try:
-                    developer = User.objects.get(id=match['developer_id'])
-                    developer_profile = getattr(developer, 'developerprofile', None)
+                    developer = developers.get(match['developer_id'])
+                    if developer is None:
+                        logger.warning(f"Developer {match['developer_id']} not found")
+                        continue
                     
+                    developer_profile = hydrator.profile(developer)
                     if not developer_profile:
                         continue
                     
@@ -310,9 +354,6 @@ class HybridRAGService:
                     
                     filtered_matches.append(match)
                     
-                except User.DoesNotExist:
-                    logger.warning(f"Developer {match['developer_id']} not found")
-                    continue
                 except Exception as e:
                     logger.error(f"Error processing developer {match['developer_id']}: {e}")
                     continue
@@ -560,10 +601,8 @@ class HybridRAGService:
         return combined
     
     def _extract_skills_from_description(self, description: str) -> List[str]:
-        """Extract skills from project description using AI."""
-        # This would use the Gemini API to extract skills
-        # For now, return empty list as placeholder
-        return []
+        """Extract the known skills mentioned in a project description."""
+        return SkillValidator().extract_skills(description)
     
     def _generate_learning_recommendations(self, developer_id: str, 
                                          missing_skills: List[str]) -> List[str]:
@@ -0,0 +1,130 @@
+"""
+Management command to benchmark the compiled skill lexicon against the linear lookups it replaced
+"""
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_services.skill_validator import SkillValidator
+
+
+class Command(BaseCommand):
+    help = 'Compare skill lookup, validation and free-text extraction against the previous linear scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skills',
+            type=int,
+            default=5000,
+            help='Number of skill names to look up and validate (default: 5000)',
+        )
+        parser.add_argument(
+            '--documents',
+            type=int,
+            default=200,
+            help='Number of generated descriptions to extract skills from (default: 200)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=7,
+            help='Random seed for the generated inputs (default: 7)',
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        validator = SkillValidator()
+        lexicon = validator.lexicon
+        skills = self._generate_skills(rng, lexicon.known_skills, options['skills'])
+        documents = self._generate_documents(rng, lexicon.known_skills, options['documents'])
+        github_analysis = {
+            'skill_assessment': {
+                skill: {'proficiency': rng.randint(20, 95)}
+                for skill in rng.sample(lexicon.known_skills, min(40, len(lexicon.known_skills)))
+            }
+        }
+
+        self.stdout.write(
+            f'{len(lexicon.known_skills)} known skills, {len(skills)} skill names, '
+            f'{len(documents)} descriptions'
+        )
+        self.stdout.write(f'{"operation":<22} | {"linear ms":>10} | {"compiled ms":>11} | {"speedup":>8}')
+
+        legacy_ms, _ = self._time(lambda: [self._legacy_lookup(validator, skill) for skill in skills])
+        compiled_ms, _ = self._time(
+            lambda: [(lexicon.is_known(skill), lexicon.category(skill)) for skill in skills]
+        )
+        self._report('lookup', legacy_ms, compiled_ms)
+
+        lexicon._profiles.clear()
+        single_ms, single = self._time(lambda: {
+            skill: validator._validate_single_skill(skill, github_analysis) for skill in skills
+        })
+        lexicon._profiles.clear()
+        batch_ms, batch = self._time(lambda: validator.validate_skills(skills, github_analysis))
+        expected = {
+            skill: {**result, 'original_name': skill}
+            for skill, result in single.items() if result['is_valid']
+        }
+        if batch['validated_skills'] != expected:
+            raise CommandError('Batched validation does not match per-skill validation')
+        self._report('validate', single_ms, batch_ms)
+
+        patterns = [
+            re.compile(r'(?<!\w)' + re.escape(skill) + r'(?!\w)', re.IGNORECASE)
+            for skill in lexicon.known_skills
+        ]
+        scan_ms, _ = self._time(lambda: [
+            [skill for skill, pattern in zip(lexicon.known_skills, patterns) if pattern.search(document)]
+            for document in documents
+        ])
+        extract_ms, extracted = self._time(lambda: [lexicon.extract(document) for document in documents])
+        self._report('extract', scan_ms, extract_ms)
+
+        mentions = sum(len(skills_found) for skills_found in extracted)
+        self.stdout.write(f'{mentions} skills extracted, {mentions / max(1, len(documents)):.1f} per description')
+        self.stdout.write(self.style.SUCCESS('Benchmark completed'))
+
+    @staticmethod
+    def _legacy_lookup(validator, skill):
+        # The lookups as they were before the lexicon: list rebuilds and category scans per call
+        is_known = skill.lower() in [known.lower() for known in validator.known_skills]
+        category = 'Other'
+        for name, category_skills in validator.skill_categories.items():
+            if skill.lower() in [category_skill.lower() for category_skill in category_skills]:
+                category = name
+                break
+        return is_known, category
+
+    @staticmethod
+    def _generate_skills(rng, known_skills, count):
+        variants = [str.lower, str.upper, str.title, lambda skill: skill, lambda skill: f' {skill} ']
+        unknown = [f'inhouse-tool-{index}' for index in range(50)]
+        return [
+            rng.choice(variants)(rng.choice(known_skills)) if rng.random() < 0.9 else rng.choice(unknown)
+            for _ in range(count)
+        ]
+
+    @staticmethod
+    def _generate_documents(rng, known_skills, count):
+        filler = ('we need an experienced developer to build and maintain our platform with '
+                  'a focus on reliability testing and clean architecture').split()
+        documents = []
+        for _ in range(count):
+            words = [rng.choice(filler) for _ in range(rng.randint(60, 200))]
+            for _ in range(rng.randint(3, 12)):
+                words.insert(rng.randrange(len(words) + 1), rng.choice(known_skills) + rng.choice(['', ',', '.']))
+            documents.append(' '.join(words))
+        return documents
+
+    @staticmethod
+    def _time(operation):
+        started = time.perf_counter()
+        result = operation()
+        return (time.perf_counter() - started) * 1000, result
+
+    def _report(self, operation, baseline_ms, compiled_ms):
+        speedup = baseline_ms / compiled_ms if compiled_ms else 0.0
+        self.stdout.write(f'{operation:<22} | {baseline_ms:>10.1f} | {compiled_ms:>11.1f} | {speedup:>7.1f}x')
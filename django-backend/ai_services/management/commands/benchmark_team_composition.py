@@ -0,0 +1,118 @@
+"""
+Management command to benchmark the team composition solver against the greedy selection
+"""
+import copy
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from ai_services.graph_service import GraphAnalysisService
+from ai_services.team_solver import TeamCompositionSolver
+
+
+class Command(BaseCommand):
+    help = 'Compare team quality and latency of the branch-and-bound solver and the greedy selection on a generated pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pool-size',
+            type=int,
+            default=2000,
+            help='Number of candidate developers (default: 2000)',
+        )
+        parser.add_argument(
+            '--skills',
+            type=int,
+            default=60,
+            help='Number of distinct skills in the pool (default: 60)',
+        )
+        parser.add_argument(
+            '--required-skills',
+            type=int,
+            default=12,
+            help='Number of skills the team must cover (default: 12)',
+        )
+        parser.add_argument(
+            '--time-budget',
+            type=float,
+            default=2.0,
+            help='Solver time budget per team in seconds (default: 2.0)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=7,
+            help='Random seed for the generated pool (default: 7)',
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        skills = [f'skill-{index}' for index in range(options['skills'])]
+        required_skills = rng.sample(skills, options['required_skills'])
+        candidates, collaboration_scores = self._generate_pool(rng, options['pool_size'], skills)
+        graph_service = GraphAnalysisService()
+
+        self.stdout.write(
+            f'{options["pool_size"]} candidates, {len(collaboration_scores)} collaboration pairs, '
+            f'{len(required_skills)} required skills, {options["time_budget"]}s budget'
+        )
+        self.stdout.write(
+            f'{"size":>4} | {"greedy obj":>10} {"cover":>6} {"ms":>8} | '
+            f'{"solver obj":>10} {"cover":>6} {"ms":>8} {"nodes":>8} {"optimal":>8} | {"gain":>6}'
+        )
+
+        for team_size in range(3, 11):
+            solver = TeamCompositionSolver(
+                candidates, required_skills, collaboration_scores,
+                team_size_limit=team_size, time_budget=options['time_budget']
+            )
+
+            started = time.perf_counter()
+            greedy_team = graph_service._greedy_team_selection(
+                copy.deepcopy(candidates), required_skills, team_size
+            )
+            greedy_ms = (time.perf_counter() - started) * 1000
+            greedy_objective = solver.objective(solver.positions(greedy_team))
+
+            solution = solver.solve()
+
+            gain = (
+                (solution['objective'] - greedy_objective) / abs(greedy_objective) * 100
+                if greedy_objective else 0.0
+            )
+            self.stdout.write(
+                f'{team_size:>4} | {greedy_objective:>10.4f} {self._coverage(greedy_team, required_skills):>6.2f} '
+                f'{greedy_ms:>8.1f} | {solution["objective"]:>10.4f} '
+                f'{self._coverage(solution["team"], required_skills):>6.2f} '
+                f'{solution["elapsed"] * 1000:>8.1f} {solution["nodes_explored"]:>8} '
+                f'{str(solution["optimal"]):>8} | {gain:>5.1f}%'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Benchmark completed'))
+
+    @staticmethod
+    def _generate_pool(rng, pool_size, skills):
+        candidates = [
+            {
+                'developer_id': f'benchmark-developer-{index}',
+                'hourly_rate': round(rng.uniform(25, 180), 2),
+                'availability': 'available' if rng.random() < 0.85 else 'busy',
+                'reputation': round(rng.uniform(2.0, 5.0), 2),
+                'skills': {
+                    skill: round(rng.uniform(0.3, 1.0), 2)
+                    for skill in rng.sample(skills, rng.randint(1, 6))
+                },
+            }
+            for index in range(pool_size)
+        ]
+        collaboration_scores = {}
+        for _ in range(pool_size * 3):
+            first, second = rng.sample(candidates, 2)
+            collaboration_scores[(first['developer_id'], second['developer_id'])] = round(rng.uniform(0.1, 1.0), 2)
+        return candidates, collaboration_scores
+
+    @staticmethod
+    def _coverage(team, required_skills):
+        covered = {skill for member in team for skill in member['skills'] if skill in required_skills}
+        return len(covered) / len(required_skills) if required_skills else 0.0
@@ -17,6 +17,7 @@ from ai_services.vector_models import (
     SkillEmbedding, create_vector_extension, create_vector_indexes
 )
 from ai_services.neo4j_service import neo4j_service
+from ai_services.graph_importer import GRAPH_CONSTRAINTS, SkillGraphImporter
 from ai_services.embedding_service import embedding_service
 
 logger = logging.getLogger(__name__)
@@ -156,12 +157,7 @@ class Command(BaseCommand):
     
     def create_graph_constraints(self, force: bool = False):
         """Create Neo4j constraints for data integrity."""
-        constraints = [
-            "CREATE CONSTRAINT skill_name_unique IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
-            "CREATE CONSTRAINT technology_name_unique IF NOT EXISTS FOR (t:Technology) REQUIRE t.name IS UNIQUE",
-            "CREATE CONSTRAINT developer_id_unique IF NOT EXISTS FOR (d:Developer) REQUIRE d.id IS UNIQUE",
-            "CREATE CONSTRAINT project_id_unique IF NOT EXISTS FOR (p:Project) REQUIRE p.id IS UNIQUE",
-        ]
+        constraints = GRAPH_CONSTRAINTS
         
         self.stdout.write('Creating Neo4j constraints...')
         
@@ -248,18 +244,8 @@ class Command(BaseCommand):
         """Load skills data into Neo4j."""
         self.stdout.write(f'Loading {len(skills_data)} skills into Neo4j...')
         
-        success_count = 0
-        for skill_data in skills_data:
-            try:
-                success = neo4j_service.create_skill_node(
-                    skill_data['name'],
-                    skill_data['category'],
-                    skill_data.get('metadata', {})
-                )
-                if success:
-                    success_count += 1
-            except Exception as e:
-                logger.warning(f"Error loading skill {skill_data.get('name', 'unknown')}: {e}")
+        result = SkillGraphImporter(neo4j_service).import_records('skills', skills_data)
+        success_count = result['records'] - result['skipped_invalid']
         
         self.stdout.write(f'✓ Loaded {success_count}/{len(skills_data)} skills')
     
@@ -267,18 +253,8 @@ class Command(BaseCommand):
         """Load technologies data into Neo4j."""
         self.stdout.write(f'Loading {len(technologies_data)} technologies into Neo4j...')
         
-        success_count = 0
-        for tech_data in technologies_data:
-            try:
-                success = neo4j_service.create_technology_node(
-                    tech_data['name'],
-                    tech_data['type'],
-                    tech_data.get('metadata', {})
-                )
-                if success:
-                    success_count += 1
-            except Exception as e:
-                logger.warning(f"Error loading technology {tech_data.get('name', 'unknown')}: {e}")
+        result = SkillGraphImporter(neo4j_service).import_records('technologies', technologies_data)
+        success_count = result['records'] - result['skipped_invalid']
         
         self.stdout.write(f'✓ Loaded {success_count}/{len(technologies_data)} technologies')
     
@@ -286,8 +262,8 @@ class Command(BaseCommand):
         """Create skill relationships in Neo4j."""
         self.stdout.write(f'Creating {len(relationships_data)} skill relationships...')
         
-        success_count = neo4j_service.bulk_create_skill_relationships(relationships_data)
-        self.stdout.write(f'✓ Created {success_count} skill relationships')
+        result = SkillGraphImporter(neo4j_service).import_records('skill_relationships', relationships_data)
+        self.stdout.write(f'✓ Created {result["relationships_created"]} skill relationships')
     
     def generate_skill_embeddings(self, skills_data: List[Dict[str, Any]], force: bool = False):
         """Generate embeddings for skills."""
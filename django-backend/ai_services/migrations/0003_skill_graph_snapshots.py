@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:31
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_services', '0002_resumedocument_profileanalysiscombined_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillGraphSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('version', models.PositiveIntegerField(unique=True)),
+                ('skill_count', models.PositiveIntegerField(default=0)),
+                ('edge_count', models.PositiveIntegerField(default=0)),
+                ('modularity', models.FloatField(default=0.0)),
+                ('clusters', models.JSONField(default=list, help_text='Skill communities, largest first')),
+                ('skill_importance', models.JSONField(default=dict, help_text='Normalised PageRank per skill')),
+                ('skill_metrics', models.JSONField(default=dict, help_text='Cluster, PageRank, degree, developer and project counts per skill')),
+                ('parameters', models.JSONField(default=dict)),
+                ('duration_seconds', models.FloatField(default=0.0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'ai_skill_graph_snapshots',
+                'ordering': ['-version'],
+            },
+        ),
+    ]
@@ -453,3 +453,33 @@ class ProfileAnalysisCombined(models.Model):
     
     def __str__(self):
         return f"Combined Profile: {self.user.username} ({self.experience_level})"
+
+
+class SkillGraphSnapshot(models.Model):
+    """Versioned result of an offline skill graph analytics run"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    version = models.PositiveIntegerField(unique=True)
+    
+    # Graph size and clustering quality
+    skill_count = models.PositiveIntegerField(default=0)
+    edge_count = models.PositiveIntegerField(default=0)
+    modularity = models.FloatField(default=0.0)
+    
+    # Results
+    clusters = models.JSONField(default=list, help_text="Skill communities, largest first")
+    skill_importance = models.JSONField(default=dict, help_text="Normalised PageRank per skill")
+    skill_metrics = models.JSONField(
+        default=dict, help_text="Cluster, PageRank, degree, developer and project counts per skill"
+    )
+    
+    # Run metadata
+    parameters = models.JSONField(default=dict)
+    duration_seconds = models.FloatField(default=0.0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'ai_skill_graph_snapshots'
+        ordering = ['-version']
+    
+    def __str__(self):
+        return f"Skill graph snapshot v{self.version} ({self.skill_count} skills)"
@@ -491,14 +491,13 @@ class Neo4jService:
     
     def initialize_skill_graph(self, skills_data: List[Dict[str, Any]]) -> bool:
         """Initialize the skill graph with predefined skill relationships."""
+        from .graph_importer import SkillGraphImporter
+        
         try:
+            importer = SkillGraphImporter(self)
+            
             # Create skill nodes
-            for skill_data in skills_data:
-                self.create_skill_node(
-                    skill_data['name'],
-                    skill_data['category'],
-                    skill_data.get('metadata', {})
-                )
+            importer.import_records('skills', skills_data)
             
             # Create relationships
             relationships = []
@@ -513,7 +512,7 @@ class Neo4jService:
                     })
             
             if relationships:
-                self.bulk_create_skill_relationships(relationships)
+                importer.import_records('skill_relationships', relationships)
             
             logger.info(f"Initialized skill graph with {len(skills_data)} skills")
             return True
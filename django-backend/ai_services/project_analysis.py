@@ -93,6 +93,37 @@ class ProjectAnalysisEngine:
                 logger.error(f"Fallback analysis also failed: {str(fallback_error)}")
                 raise ProjectAnalysisException(f"Complete analysis failure: {str(e)}")
     
+    def analyze_projects(self, projects: List[Dict[str, str]]) -> List[ProjectAnalysisResult]:
+        """
+        Analyze many projects concurrently under the shared Gemini budget
+        
+        Args:
+            projects: List of dicts with 'description' and optional 'title'
+            
+        Returns:
+            List of ProjectAnalysisResult in the same order as ``projects``.
+            Projects whose AI analysis fails get the fallback analysis.
+        """
+        prompts = [
+            self._create_analysis_prompt(project['description'], project.get('title', ''))
+            for project in projects
+        ]
+        responses = self.gemini_client.generate_many(prompts, return_exceptions=True)
+        
+        results = []
+        for project, response in zip(projects, responses):
+            title = project.get('title', '')
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                analysis_data = self.gemini_client.parse_json_response(response)
+                results.append(self._process_analysis_result(analysis_data))
+            except Exception as e:
+                logger.warning(f"Batch analysis failed for {title}, using fallback: {str(e)}")
+                results.append(self._create_fallback_analysis(project['description']))
+        
+        return results
+    
     def _create_analysis_prompt(self, description: str, title: str = "") -> str:
         """Create a comprehensive prompt for project analysis"""
         
@@ -0,0 +1,356 @@
+"""
+Offline analytics over the skill co-occurrence graph.
+
+Skills are nodes. Two skills are joined by an edge weighted by how often
+they appear together on a developer profile or in a project's required
+skills. A periodic job builds that graph in process and runs two analyses:
+
+* Louvain community detection (greedy modularity optimisation with graph
+  aggregation) groups skills into clusters.
+* Weighted PageRank ranks skills by importance.
+
+Each run is stored as a versioned ``SkillGraphSnapshot``. The current
+snapshot is also kept in the cache, so the market dynamics endpoint reads
+its clusters and importance scores without touching the graph.
+"""
+import logging
+import random
+import time
+from collections import Counter, defaultdict
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import SkillGraphSnapshot, SkillNode
+
+logger = logging.getLogger(__name__)
+
+Adjacency = Dict[int, Dict[int, float]]
+
+
+def louvain_communities(adjacency: Adjacency, node_count: int,
+                        resolution: float = 1.0, seed: int = 0) -> List[int]:
+    """
+    Community index for every node of a weighted undirected graph.
+
+    ``adjacency[u][v]`` is the weight of edge u-v, present in both directions.
+    Isolated nodes end up in their own community.
+    """
+    rng = random.Random(seed)
+    membership = list(range(node_count))
+    graph = {node: dict(adjacency.get(node, {})) for node in range(node_count)}
+
+    while True:
+        communities, moved = _louvain_one_level(graph, resolution, rng)
+        if not moved:
+            break
+        membership = [communities[community] for community in membership]
+        graph = _aggregate(graph, communities)
+
+    # Renumber as 0..k-1
+    renumber = {}
+    return [renumber.setdefault(community, len(renumber)) for community in membership]
+
+
+def _louvain_one_level(graph: Adjacency, resolution: float,
+                       rng: random.Random) -> Tuple[Dict[int, int], bool]:
+    """Move nodes between neighbouring communities while modularity improves"""
+    degrees = {
+        node: sum(weight for other, weight in edges.items() if other != node) + 2 * edges.get(node, 0.0)
+        for node, edges in graph.items()
+    }
+    total_weight = sum(degrees.values()) / 2
+    node_community = {node: node for node in graph}
+    if total_weight <= 0:
+        return node_community, False
+
+    community_degree = dict(degrees)
+    nodes = list(graph)
+    moved_any = False
+    improved = True
+    while improved:
+        improved = False
+        rng.shuffle(nodes)
+        for node in nodes:
+            degree = degrees[node]
+            current = node_community[node]
+
+            weights_to_community = defaultdict(float)
+            for other, weight in graph[node].items():
+                if other != node:
+                    weights_to_community[node_community[other]] += weight
+
+            community_degree[current] -= degree
+            best_community = current
+            best_gain = 0.0
+            remove_cost = (
+                -weights_to_community[current] / total_weight
+                + resolution * community_degree[current] * degree / (2 * total_weight ** 2)
+            )
+            for community, weight in weights_to_community.items():
+                gain = (
+                    remove_cost + weight / total_weight
+                    - resolution * community_degree[community] * degree / (2 * total_weight ** 2)
+                )
+                if gain > best_gain + 1e-12:
+                    best_gain = gain
+                    best_community = community
+            community_degree[best_community] += degree
+
+            if best_community != current:
+                node_community[node] = best_community
+                improved = True
+                moved_any = True
+
+    return node_community, moved_any
+
+
+def _aggregate(graph: Adjacency, node_community: Dict[int, int]) -> Adjacency:
+    """One node per community; internal edges become self loops"""
+    aggregated = defaultdict(lambda: defaultdict(float))
+    for node, edges in graph.items():
+        community = node_community[node]
+        aggregated[community]
+        for other, weight in edges.items():
+            other_community = node_community[other]
+            if other == node:
+                aggregated[community][community] += weight
+            elif community == other_community:
+                # Each internal edge is visited from both ends
+                aggregated[community][community] += weight / 2
+            else:
+                aggregated[community][other_community] += weight
+    return {community: dict(edges) for community, edges in aggregated.items()}
+
+
+def modularity(adjacency: Adjacency, membership: List[int], resolution: float = 1.0) -> float:
+    """Modularity of a partition of a weighted undirected graph"""
+    internal = defaultdict(float)
+    community_degree = defaultdict(float)
+    total_weight = 0.0
+    for node, edges in adjacency.items():
+        for other, weight in edges.items():
+            community_degree[membership[node]] += weight
+            total_weight += weight / 2
+            if membership[node] == membership[other]:
+                internal[membership[node]] += weight / 2
+    if total_weight <= 0:
+        return 0.0
+    return sum(
+        internal[community] / total_weight
+        - resolution * (community_degree[community] / (2 * total_weight)) ** 2
+        for community in community_degree
+    )
+
+
+def pagerank(adjacency: Adjacency, node_count: int, damping: float = 0.85,
+             tolerance: float = 1e-10, max_iterations: int = 100) -> np.ndarray:
+    """Weighted PageRank by power iteration; dangling nodes spread rank uniformly"""
+    if node_count == 0:
+        return np.empty(0)
+    sources, targets, weights = [], [], []
+    for node, edges in adjacency.items():
+        for other, weight in edges.items():
+            sources.append(node)
+            targets.append(other)
+            weights.append(weight)
+    sources = np.array(sources, dtype=int)
+    targets = np.array(targets, dtype=int)
+    weights = np.array(weights, dtype=float)
+
+    out_weight = np.bincount(sources, weights=weights, minlength=node_count)
+    dangling = out_weight == 0
+    transition = weights / out_weight[sources] if sources.size else weights
+
+    rank = np.full(node_count, 1.0 / node_count)
+    for _ in range(max_iterations):
+        spread = np.bincount(targets, weights=transition * rank[sources], minlength=node_count)
+        new_rank = (1 - damping) / node_count + damping * (spread + rank[dangling].sum() / node_count)
+        converged = np.abs(new_rank - rank).sum() < tolerance
+        rank = new_rank
+        if converged:
+            break
+    return rank
+
+
+class SkillGraphAnalytics:
+    """Builds the skill co-occurrence graph, analyses it and serves the current snapshot"""
+
+    CACHE_KEY = 'skill_graph_analytics:current'
+
+    def build_graph(self, skill_lists: Iterable[Tuple[str, Iterable[str]]],
+                    min_cooccurrence: int = 1) -> Dict[str, Any]:
+        """
+        Co-occurrence graph from (source, skills) pairs, source being 'developer' or 'project'.
+
+        Skills are matched case-insensitively and named by their most common spelling.
+        """
+        spellings = defaultdict(Counter)
+        counts = {'developer': Counter(), 'project': Counter()}
+        pair_counts = Counter()
+        for source, skills in skill_lists:
+            keys = set()
+            for skill in skills or []:
+                if not isinstance(skill, str) or not skill.strip():
+                    continue
+                key = skill.strip().lower()
+                spellings[key][skill.strip()] += 1
+                keys.add(key)
+            counts[source].update(keys)
+            pair_counts.update(combinations(sorted(keys), 2))
+
+        keys = sorted(spellings)
+        index = {key: position for position, key in enumerate(keys)}
+        adjacency = defaultdict(dict)
+        for (first, second), weight in pair_counts.items():
+            if weight >= min_cooccurrence:
+                adjacency[index[first]][index[second]] = float(weight)
+                adjacency[index[second]][index[first]] = float(weight)
+
+        return {
+            'names': [spellings[key].most_common(1)[0][0] for key in keys],
+            'developer_counts': [counts['developer'][key] for key in keys],
+            'project_counts': [counts['project'][key] for key in keys],
+            'adjacency': dict(adjacency),
+        }
+
+    def analyze(self, graph: Dict[str, Any], resolution: float = 1.0, seed: int = 0) -> Dict[str, Any]:
+        """Clusters, importance scores and per-skill metrics for a graph from build_graph"""
+        names = graph['names']
+        adjacency = graph['adjacency']
+        node_count = len(names)
+
+        membership = louvain_communities(adjacency, node_count, resolution=resolution, seed=seed)
+        ranks = pagerank(adjacency, node_count)
+        top_rank = ranks.max() if node_count else 1.0
+        importance = {names[node]: float(ranks[node] / top_rank) for node in np.argsort(-ranks, kind='stable')}
+
+        categories = {
+            name.lower(): category
+            for name, category in SkillNode.objects.filter(name__in=names).values_list('name', 'category')
+        }
+
+        members = defaultdict(list)
+        for node, community in enumerate(membership):
+            members[community].append(node)
+
+        clusters = []
+        for community, nodes in members.items():
+            if len(nodes) < 2:
+                continue
+            nodes.sort(key=lambda node: -ranks[node])
+            primary = nodes[0]
+            strongest = max((adjacency.get(primary, {}).get(node, 0.0) for node in nodes[1:]), default=0.0)
+            clusters.append({
+                'cluster_id': community,
+                'primary_skill': names[primary],
+                'category': categories.get(names[primary].lower()),
+                'related_skills': [
+                    {
+                        'skill': names[node],
+                        'strength': round(adjacency.get(primary, {}).get(node, 0.0) / strongest, 4)
+                        if strongest else 0.0
+                    }
+                    for node in nodes[1:]
+                ],
+                'cluster_size': len(nodes),
+                'importance': float(ranks[nodes].sum()),
+            })
+        clusters.sort(key=lambda cluster: (-cluster['cluster_size'], -cluster['importance']))
+
+        skill_metrics = {
+            names[node]: {
+                'cluster_id': membership[node],
+                'pagerank': float(ranks[node]),
+                'degree': len(adjacency.get(node, {})),
+                'developer_count': graph['developer_counts'][node],
+                'project_count': graph['project_counts'][node],
+            }
+            for node in range(node_count)
+        }
+
+        return {
+            'clusters': clusters,
+            'skill_importance': importance,
+            'skill_metrics': skill_metrics,
+            'modularity': modularity(adjacency, membership, resolution),
+            'skill_count': node_count,
+            'edge_count': sum(len(edges) for edges in adjacency.values()) // 2,
+        }
+
+    def run(self) -> SkillGraphSnapshot:
+        """Analyse the current platform data and store the result as a new snapshot version"""
+        from projects.models import Project
+        from users.models import DeveloperProfile
+
+        started = time.monotonic()
+        parameters = {
+            'min_cooccurrence': settings.SKILL_GRAPH_MIN_COOCCURRENCE,
+            'resolution': 1.0,
+            'seed': 0,
+        }
+
+        def skill_lists():
+            for skills in DeveloperProfile.objects.values_list('skills', flat=True).iterator(chunk_size=2000):
+                yield 'developer', skills
+            for skills in Project.objects.values_list('required_skills', flat=True).iterator(chunk_size=2000):
+                yield 'project', skills
+
+        graph = self.build_graph(skill_lists(), min_cooccurrence=parameters['min_cooccurrence'])
+        result = self.analyze(graph, resolution=parameters['resolution'], seed=parameters['seed'])
+
+        with transaction.atomic():
+            latest = SkillGraphSnapshot.objects.select_for_update().order_by('-version').first()
+            snapshot = SkillGraphSnapshot.objects.create(
+                version=latest.version + 1 if latest else 1,
+                parameters=parameters,
+                duration_seconds=time.monotonic() - started,
+                **result
+            )
+            stale_versions = SkillGraphSnapshot.objects.order_by('-version').values_list(
+                'version', flat=True
+            )[settings.SKILL_GRAPH_SNAPSHOT_RETENTION:]
+            SkillGraphSnapshot.objects.filter(version__in=list(stale_versions)).delete()
+
+        transaction.on_commit(lambda: cache.set(self.CACHE_KEY, self._payload(snapshot), None))
+        logger.info(
+            f"Skill graph snapshot v{snapshot.version}: {snapshot.skill_count} skills, "
+            f"{len(snapshot.clusters)} clusters, modularity {snapshot.modularity:.3f}"
+        )
+        return snapshot
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        """The latest snapshot, from the cache when possible; None before the first run"""
+        payload = cache.get(self.CACHE_KEY)
+        if payload is None:
+            snapshot = SkillGraphSnapshot.objects.order_by('-version').first()
+            if snapshot is None:
+                return None
+            payload = self._payload(snapshot)
+            cache.set(self.CACHE_KEY, payload, None)
+        return payload
+
+    def get_version(self, version: int) -> Optional[Dict[str, Any]]:
+        snapshot = SkillGraphSnapshot.objects.filter(version=version).first()
+        return self._payload(snapshot) if snapshot else None
+
+    @staticmethod
+    def _payload(snapshot: SkillGraphSnapshot) -> Dict[str, Any]:
+        return {
+            'version': snapshot.version,
+            'computed_at': snapshot.created_at.isoformat(),
+            'skill_count': snapshot.skill_count,
+            'edge_count': snapshot.edge_count,
+            'modularity': snapshot.modularity,
+            'clusters': snapshot.clusters,
+            'skill_importance': snapshot.skill_importance,
+            'skill_metrics': snapshot.skill_metrics,
+        }
+
+
+# Singleton instance
+skill_graph_analytics = SkillGraphAnalytics()
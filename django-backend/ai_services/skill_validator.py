@@ -1,12 +1,29 @@
 """
 Skill validation and confidence scoring service.
 Validates extracted skills and calculates confidence scores based on multiple factors.
+
+The skill vocabulary (known skills, categories, market trends and synonyms)
+is compiled once per process into a ``SkillLexicon``: hash maps from the
+lowercased name to the canonical name, category and market data, and an
+Aho-Corasick automaton over every skill name and synonym for extracting
+skills from free text in one pass over the text.
+
+Validating a list normalises each skill through the lexicon, scores each
+distinct skill name once and reads the GitHub analysis once, so the cost
+grows with the number of skills rather than skills times vocabulary.
+
+``reload_skill_lexicon`` rebuilds the lexicon after the known skills change.
+It bumps a version in the shared cache, and every process rebuilds its copy
+on its next check of that version (at most every
+``SKILL_LEXICON_CHECK_INTERVAL`` seconds).
 """
 
 import logging
+import threading
+import time
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
-from collections import Counter
+from collections import Counter, deque
 import re
 
 from django.conf import settings
@@ -15,6 +32,490 @@ from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+KNOWN_SKILLS_CACHE_KEY = 'known_skills_list'
+LEXICON_VERSION_CACHE_KEY = 'skill_lexicon_version'
+
+# Common spellings of skill names, keyed by the title-cased input
+SKILL_NAME_MAPPINGS = {
+    'Javascript': 'JavaScript',
+    'Typescript': 'TypeScript',
+    'Nodejs': 'Node.js',
+    'Reactjs': 'React',
+    'Vuejs': 'Vue.js',
+    'Angularjs': 'AngularJS',
+    'Postgresql': 'PostgreSQL',
+    'Mysql': 'MySQL',
+    'Mongodb': 'MongoDB',
+    'Redis': 'Redis',
+    'Elasticsearch': 'Elasticsearch',
+    'Aws': 'AWS',
+    'Gcp': 'Google Cloud Platform',
+    'Azure': 'Microsoft Azure',
+    'Docker': 'Docker',
+    'Kubernetes': 'Kubernetes',
+    'Git': 'Git',
+    'Github': 'GitHub',
+    'Gitlab': 'GitLab',
+    'Jira': 'Jira',
+    'Slack': 'Slack',
+}
+
+# Other names for the same skill, resolved to the canonical name. Related but
+# different technologies (JavaScript and Node.js, Java and the JVM) are not synonyms.
+SKILL_SYNONYMS = {
+    'JS': 'JavaScript',
+    'ECMAScript': 'JavaScript',
+    'TS': 'TypeScript',
+    'Python3': 'Python',
+    'Python2': 'Python',
+    'Golang': 'Go',
+    'CPP': 'C++',
+    'C Plus Plus': 'C++',
+    'CSharp': 'C#',
+    'C Sharp': 'C#',
+    'Postgres': 'PostgreSQL',
+    'PSQL': 'PostgreSQL',
+    'My SQL': 'MySQL',
+    'Mongo': 'MongoDB',
+    'ReactJS': 'React',
+    'React.js': 'React',
+    'Vue': 'Vue.js',
+    'VueJS': 'Vue.js',
+    'NodeJS': 'Node.js',
+    'ExpressJS': 'Express.js',
+    'Amazon Web Services': 'AWS',
+    'GCP': 'Google Cloud Platform',
+    'Google Cloud': 'Google Cloud Platform',
+    'K8s': 'Kubernetes',
+    'Sklearn': 'Scikit-learn',
+}
+
+# Aliases reported with a validated skill
+SKILL_ALIASES = {
+    'JavaScript': ['JS', 'ECMAScript', 'Node.js'],
+    'TypeScript': ['TS'],
+    'Python': ['Python3', 'Python2'],
+    'Java': ['JVM'],
+    'C++': ['CPP', 'C Plus Plus'],
+    'C#': ['CSharp', 'C Sharp'],
+    'PostgreSQL': ['Postgres', 'PSQL'],
+    'MySQL': ['My SQL'],
+    'MongoDB': ['Mongo'],
+    'React': ['ReactJS', 'React.js'],
+    'Vue.js': ['Vue', 'VueJS'],
+    'Angular': ['AngularJS', 'Angular2+'],
+    'AWS': ['Amazon Web Services'],
+    'GCP': ['Google Cloud Platform', 'Google Cloud'],
+    'Azure': ['Microsoft Azure'],
+}
+
+# Skill names that are also ordinary words; in free text they only count when
+# written as the skill is (so "Go" and "Rust" match, "go" and "rust" do not).
+# Names of three characters or fewer are treated the same way.
+AMBIGUOUS_SKILL_NAMES = frozenset({
+    'go', 'rust', 'swift', 'dart', 'julia', 'spring', 'echo', 'gin', 'fiber',
+    'express', 'flask', 'sketch', 'slack', 'oracle', 'ionic', 'jest', 'mocha', 'vue', 'mongo',
+})
+
+PROGRAMMING_PATTERNS = [
+    re.compile(r'.*\+\+$'),  # C++, etc.
+    re.compile(r'^[A-Z][a-z]+$'),  # Single word, capitalized
+    re.compile(r'^[A-Z][a-z]+\.[a-z]+$'),  # Framework.extension
+    re.compile(r'^[A-Z]{2,}$'),  # Acronyms like SQL, API
+]
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def load_known_skills() -> List[str]:
+    """Load known skills from cache or database."""
+    cached_skills = cache.get(KNOWN_SKILLS_CACHE_KEY)
+    
+    if cached_skills:
+        return cached_skills
+    
+    # Default known skills list
+    known_skills = [
+        # Programming Languages
+        'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust',
+        'Swift', 'Kotlin', 'Ruby', 'PHP', 'Scala', 'R', 'MATLAB', 'Perl',
+        'Haskell', 'Clojure', 'Elixir', 'Dart', 'Julia', 'Lua',
+        
+        # Web Frameworks
+        'React', 'Vue.js', 'Angular', 'Django', 'Flask', 'FastAPI', 'Express.js',
+        'Next.js', 'Nuxt.js', 'Svelte', 'Laravel', 'Symfony', 'Ruby on Rails',
+        'Spring', 'ASP.NET', 'Gin', 'Echo', 'Fiber',
+        
+        # Databases
+        'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch', 'SQLite',
+        'Oracle', 'SQL Server', 'Cassandra', 'DynamoDB', 'Neo4j',
+        
+        # Cloud & DevOps
+        'AWS', 'Google Cloud Platform', 'Microsoft Azure', 'Docker', 'Kubernetes',
+        'Terraform', 'Ansible', 'Jenkins', 'GitLab CI', 'GitHub Actions',
+        
+        # Tools & Technologies
+        'Git', 'GitHub', 'GitLab', 'Jira', 'Slack', 'Figma', 'Adobe Creative Suite',
+        'Photoshop', 'Illustrator', 'Sketch', 'InVision',
+        
+        # Mobile Development
+        'React Native', 'Flutter', 'Ionic', 'Xamarin', 'Swift', 'Kotlin',
+        'Android', 'iOS',
+        
+        # Data Science & ML
+        'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Jupyter',
+        'Apache Spark', 'Hadoop', 'Tableau', 'Power BI',
+        
+        # Testing
+        'Jest', 'Mocha', 'PyTest', 'JUnit', 'RSpec', 'Selenium', 'Cypress',
+    ]
+    
+    # Cache for 1 hour
+    cache.set(KNOWN_SKILLS_CACHE_KEY, known_skills, timeout=3600)
+    return known_skills
+
+
+def load_skill_categories() -> Dict[str, List[str]]:
+    """Load skill categories mapping."""
+    return {
+        'Programming Languages': [
+            'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go',
+            'Rust', 'Swift', 'Kotlin', 'Ruby', 'PHP', 'Scala', 'R'
+        ],
+        'Web Frameworks': [
+            'React', 'Vue.js', 'Angular', 'Django', 'Flask', 'Express.js',
+            'Next.js', 'Laravel', 'Ruby on Rails', 'Spring'
+        ],
+        'Databases': [
+            'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
+            'SQLite', 'Oracle', 'SQL Server'
+        ],
+        'DevOps & Cloud': [
+            'AWS', 'Google Cloud Platform', 'Microsoft Azure', 'Docker',
+            'Kubernetes', 'Terraform', 'Ansible', 'Jenkins'
+        ],
+        'Mobile Development': [
+            'React Native', 'Flutter', 'Ionic', 'Swift', 'Kotlin', 'Android', 'iOS'
+        ],
+        'Data Science & ML': [
+            'TensorFlow', 'PyTorch', 'Pandas', 'NumPy', 'Scikit-learn',
+            'Apache Spark', 'Tableau'
+        ],
+        'Tools': [
+            'Git', 'GitHub', 'GitLab', 'Jira', 'Figma', 'Photoshop', 'Sketch'
+        ]
+    }
+
+
+def load_market_trends() -> Dict[str, Dict[str, float]]:
+    """Load market trends data for skills."""
+    # This would typically come from an external API or database
+    # For now, using static data based on common market trends
+    return {
+        'python': {'demand_score': 95, 'trend_score': 20},
+        'javascript': {'demand_score': 90, 'trend_score': 15},
+        'typescript': {'demand_score': 85, 'trend_score': 25},
+        'react': {'demand_score': 88, 'trend_score': 20},
+        'node.js': {'demand_score': 82, 'trend_score': 15},
+        'aws': {'demand_score': 92, 'trend_score': 30},
+        'docker': {'demand_score': 85, 'trend_score': 25},
+        'kubernetes': {'demand_score': 80, 'trend_score': 35},
+        'java': {'demand_score': 85, 'trend_score': 5},
+        'go': {'demand_score': 75, 'trend_score': 30},
+        'rust': {'demand_score': 65, 'trend_score': 40},
+        'vue.js': {'demand_score': 70, 'trend_score': 10},
+        'angular': {'demand_score': 75, 'trend_score': -5},
+        'django': {'demand_score': 78, 'trend_score': 10},
+        'flask': {'demand_score': 65, 'trend_score': 5},
+        'postgresql': {'demand_score': 80, 'trend_score': 15},
+        'mongodb': {'demand_score': 75, 'trend_score': 10},
+        'redis': {'demand_score': 70, 'trend_score': 15},
+    }
+
+
+class SkillLexicon:
+    """
+    Compiled skill vocabulary.
+    
+    Every lookup is a hash lookup on the lowercased name. Per-name results are
+    memoised, since the same skills recur across profiles and resumes.
+    """
+    
+    PROFILE_CACHE_SIZE = 20000
+    
+    def __init__(self, known_skills: List[str], skill_categories: Dict[str, List[str]],
+                 market_trends: Dict[str, Dict[str, float]], version: int = 0):
+        self.version = version
+        self.known_skills = list(known_skills)
+        self.skill_categories = skill_categories
+        self.market_trends = market_trends
+        
+        # Lowercased name -> canonical spelling (the first listed wins)
+        self.known = {}
+        for skill in self.known_skills:
+            self.known.setdefault(skill.lower(), skill)
+        self.synonyms = {name.lower(): canonical for name, canonical in SKILL_NAME_MAPPINGS.items()}
+        self.synonyms.update((name.lower(), canonical) for name, canonical in SKILL_SYNONYMS.items())
+        for canonical in list(self.synonyms.values()):
+            self.synonyms.setdefault(canonical.lower(), canonical)
+        self.categories = {}
+        for category, skills in skill_categories.items():
+            for skill in skills:
+                self.categories.setdefault(skill.lower(), category)
+        
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._build_automaton()
+    
+    # Normalisation and lookups
+    
+    def normalize(self, skill: str) -> str:
+        """Canonical name of a skill; unknown names are whitespace-collapsed and title-cased"""
+        collapsed = WHITESPACE.sub(' ', skill.strip())
+        key = collapsed.lower()
+        canonical = self.synonyms.get(key) or self.known.get(key)
+        return canonical if canonical is not None else collapsed.title()
+    
+    def is_known(self, skill: str) -> bool:
+        return skill.lower() in self.known
+    
+    def market_data(self, skill: str) -> Dict[str, float]:
+        return self.market_trends.get(skill.lower(), {})
+    
+    def category(self, skill: str) -> str:
+        """Category of a skill from the category lists, else from its name"""
+        lowered = skill.lower()
+        category = self.categories.get(lowered)
+        if category is not None:
+            return category
+        
+        # Pattern-based categorization
+        if re.match(r'^[A-Z][a-z]*$', skill) and lowered in ['python', 'java', 'javascript', 'typescript', 'go', 'rust', 'swift', 'kotlin']:
+            return 'Programming Languages'
+        elif lowered.endswith(('.js', '.py', '.rb', '.php')):
+            return 'Programming Languages'
+        elif 'framework' in lowered or skill.endswith(('JS', 'js')):
+            return 'Frameworks'
+        elif lowered in ['mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch']:
+            return 'Databases'
+        elif lowered in ['aws', 'azure', 'gcp', 'docker', 'kubernetes']:
+            return 'DevOps & Cloud'
+        elif lowered in ['git', 'github', 'gitlab', 'jira', 'slack']:
+            return 'Tools'
+        
+        return 'Other'
+    
+    def base_confidence(self, skill: str, is_known_skill: bool) -> float:
+        """Base confidence score for a skill from whether it is known and how it looks."""
+        if is_known_skill:
+            return 70.0  # High confidence for known skills
+        
+        # Check if skill matches common patterns
+        for pattern in PROGRAMMING_PATTERNS:
+            if pattern.match(skill):
+                return 50.0  # Medium confidence for pattern matches
+        
+        # Check skill length and format
+        if 2 <= len(skill) <= 30 and skill.replace('.', '').replace('-', '').replace(' ', '').isalnum():
+            return 30.0  # Low confidence for reasonable-looking skills
+        
+        return 10.0  # Very low confidence for unusual skills
+    
+    def market_confidence(self, skill: str) -> float:
+        """Confidence (0-20 points) from market demand and trend."""
+        market_data = self.market_data(skill)
+        
+        if not market_data:
+            return 0.0
+        
+        # Base market confidence
+        demand_score = market_data.get('demand_score', 0)  # 0-100
+        trend_score = market_data.get('trend_score', 0)    # -50 to +50
+        
+        market_confidence = (demand_score / 5) + max(0, trend_score / 2.5)
+        
+        return min(20, market_confidence)
+    
+    def market_demand(self, skill: str) -> str:
+        demand_score = self.market_data(skill).get('demand_score', 0)
+        
+        if demand_score >= 80:
+            return 'Very High'
+        elif demand_score >= 60:
+            return 'High'
+        elif demand_score >= 40:
+            return 'Medium'
+        elif demand_score >= 20:
+            return 'Low'
+        else:
+            return 'Very Low'
+    
+    def profile(self, skill: str) -> Dict[str, Any]:
+        """Everything about a normalised skill name that does not depend on GitHub data"""
+        profile = self._profiles.get(skill)
+        if profile is None:
+            is_known_skill = self.is_known(skill)
+            profile = {
+                'is_known_skill': is_known_skill,
+                'base_confidence': self.base_confidence(skill, is_known_skill),
+                'market_confidence': self.market_confidence(skill),
+                'category': self.category(skill),
+                'aliases': SKILL_ALIASES.get(skill, []),
+                'market_demand': self.market_demand(skill),
+                'high_market_demand': self.market_data(skill).get('demand_score', 0) > 50,
+            }
+            # Bounded so arbitrary input cannot grow it without limit
+            if len(self._profiles) >= self.PROFILE_CACHE_SIZE:
+                self._profiles.clear()
+            self._profiles[skill] = profile
+        return profile
+    
+    # Free text extraction
+    
+    def _build_automaton(self):
+        """Aho-Corasick automaton over the lowercased skill names and synonyms"""
+        terms = {}
+        for name in list(self.known_skills) + list(SKILL_NAME_MAPPINGS.values()) + list(SKILL_SYNONYMS):
+            lowered = name.lower()
+            # Single letters (R) match too much prose to extract from text
+            if len(lowered) > 1 and lowered not in terms:
+                case_sensitive = len(lowered) <= 3 or lowered in AMBIGUOUS_SKILL_NAMES
+                terms[lowered] = (len(lowered), self.normalize(name), name if case_sensitive else None)
+        
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[int, str, Optional[str]]]] = [[]]
+        for term, output in terms.items():
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(output)
+        
+        # Breadth-first failure links; states one character deep fail to the root
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+        
+        self._goto, self._fail, self._outputs = goto, fail, outputs
+    
+    def extract(self, text: str) -> List[str]:
+        """
+        Canonical names of the skills mentioned in a text, in order of first mention.
+        
+        Matches must stand alone (no letter or digit on either side) and overlapping
+        matches keep the longest, so "React Native" is not also read as "React".
+        """
+        if not text:
+            return []
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to more than one; keep offsets aligned with the text
+            lowered = ''.join(char.lower() if len(char.lower()) == 1 else char for char in text)
+        
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matches = []
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, canonical, exact in outputs[state]:
+                start = end - length
+                if start > 0 and (text[start - 1].isalnum() or text[start - 1] in '.#+'):
+                    continue
+                if end < len(text) and (text[end].isalnum() or text[end] in '#+'):
+                    continue
+                if exact is not None and text[start:end] != exact:
+                    continue
+                matches.append((start, end, canonical))
+        
+        # Leftmost, then longest, non-overlapping matches
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+        skills = {}
+        covered = 0
+        for start, end, canonical in matches:
+            if start >= covered:
+                skills.setdefault(canonical, None)
+                covered = end
+        return list(skills)
+
+
+_lexicon: Optional[SkillLexicon] = None
+_lexicon_checked_at = 0.0
+_lexicon_lock = threading.Lock()
+
+
+def _build_lexicon(version: int) -> SkillLexicon:
+    started = time.perf_counter()
+    lexicon = SkillLexicon(load_known_skills(), load_skill_categories(), load_market_trends(), version)
+    logger.info(
+        f"Compiled skill lexicon v{version}: {len(lexicon.known)} known skills, "
+        f"{len(lexicon.synonyms)} synonyms in {(time.perf_counter() - started) * 1000:.1f}ms"
+    )
+    return lexicon
+
+
+def get_skill_lexicon() -> SkillLexicon:
+    """The process-wide lexicon, rebuilt when another process has reloaded it"""
+    global _lexicon, _lexicon_checked_at
+    
+    check_interval = getattr(settings, 'SKILL_LEXICON_CHECK_INTERVAL', 30)
+    if _lexicon is not None and time.monotonic() - _lexicon_checked_at < check_interval:
+        return _lexicon
+    
+    try:
+        version = cache.get(LEXICON_VERSION_CACHE_KEY, 0)
+    except Exception as e:
+        logger.warning(f"Could not read skill lexicon version: {str(e)}")
+        version = _lexicon.version if _lexicon is not None else 0
+    
+    with _lexicon_lock:
+        if _lexicon is None or _lexicon.version != version:
+            _lexicon = _build_lexicon(version)
+        _lexicon_checked_at = time.monotonic()
+        return _lexicon
+
+
+def reload_skill_lexicon(known_skills: List[str] = None) -> SkillLexicon:
+    """
+    Rebuild the lexicon in every process.
+    
+    Args:
+        known_skills: New known skills list to store first; None keeps the current one
+    
+    Returns:
+        This process's rebuilt lexicon
+    """
+    global _lexicon, _lexicon_checked_at
+    
+    if known_skills is not None:
+        cache.set(KNOWN_SKILLS_CACHE_KEY, list(known_skills), timeout=None)
+    
+    cache.add(LEXICON_VERSION_CACHE_KEY, 0, timeout=None)
+    try:
+        version = cache.incr(LEXICON_VERSION_CACHE_KEY)
+    except ValueError:
+        # The key was evicted between add and incr
+        version = int(time.time())
+        cache.set(LEXICON_VERSION_CACHE_KEY, version, timeout=None)
+    
+    with _lexicon_lock:
+        _lexicon = _build_lexicon(version)
+        _lexicon_checked_at = time.monotonic()
+        return _lexicon
+
 
 class SkillValidator:
     """
@@ -22,30 +523,53 @@ class SkillValidator:
     Combines GitHub analysis, market trends, and historical data.
     """
     
-    def __init__(self):
-        """Initialize skill validator with known skills and patterns."""
-        self.known_skills = self._load_known_skills()
-        self.skill_categories = self._load_skill_categories()
-        self.market_trends = self._load_market_trends()
-        
-    def validate_skills(self, extracted_skills: List[str], 
+    MIN_CONFIDENCE = 30  # Minimum confidence threshold
+    
+    @property
+    def lexicon(self) -> SkillLexicon:
+        return get_skill_lexicon()
+    
+    @property
+    def known_skills(self) -> List[str]:
+        return self.lexicon.known_skills
+    
+    @property
+    def skill_categories(self) -> Dict[str, List[str]]:
+        return self.lexicon.skill_categories
+    
+    @property
+    def market_trends(self) -> Dict[str, Dict[str, float]]:
+        return self.lexicon.market_trends
+    
+    def validate_skills(self, extracted_skills: List[str],
                        github_analysis: Dict = None) -> Dict[str, Any]:
         """
         Validate a list of extracted skills and calculate confidence scores.
         
+        The GitHub analysis is read once for the whole list and each distinct
+        normalised skill is scored once.
+        
         Args:
             extracted_skills: List of skill names to validate
             github_analysis: Optional GitHub analysis data for context
-            
+        
         Returns:
             Dict with validated skills and confidence scores
         """
+        lexicon = self.lexicon
+        evidence = self._github_evidence(github_analysis, lexicon)
         validated_skills = {}
+        scored = {}
         
         for skill in extracted_skills:
-            validation_result = self._validate_single_skill(skill, github_analysis)
+            normalized_skill = lexicon.normalize(skill)
+            validation_result = scored.get(normalized_skill)
+            if validation_result is None:
+                validation_result = scored[normalized_skill] = self._validate(
+                    normalized_skill, lexicon, evidence
+                )
             if validation_result['is_valid']:
-                validated_skills[skill] = validation_result
+                validated_skills[skill] = self._for_original_name(validation_result, skill)
         
         return {
             'validated_skills': validated_skills,
@@ -55,6 +579,10 @@ class SkillValidator:
             'validated_at': timezone.now().isoformat()
         }
     
+    def extract_skills(self, text: str) -> List[str]:
+        """Canonical names of the known skills mentioned in free text, in order of first mention."""
+        return self.lexicon.extract(text)
+    
     def _validate_single_skill(self, skill: str, github_analysis: Dict = None) -> Dict[str, Any]:
         """
         Validate a single skill and calculate its confidence score.
@@ -62,165 +590,137 @@ class SkillValidator:
         Args:
             skill: Skill name to validate
             github_analysis: Optional GitHub analysis data
-            
+        
         Returns:
             Dict with validation results and confidence score
         """
-        # Normalize skill name
-        normalized_skill = self._normalize_skill_name(skill)
-        
-        # Check if skill is known
-        is_known_skill = self._is_known_skill(normalized_skill)
-        
-        # Calculate base confidence
-        base_confidence = self._calculate_base_confidence(normalized_skill, is_known_skill)
+        lexicon = self.lexicon
+        validation_result = self._validate(
+            lexicon.normalize(skill), lexicon, self._github_evidence(github_analysis, lexicon)
+        )
+        return self._for_original_name(validation_result, skill)
+    
+    @staticmethod
+    def _for_original_name(validation_result: Dict[str, Any], skill: str) -> Dict[str, Any]:
+        """A copy of a shared validation result for one raw skill name, nested containers included"""
+        return {
+            **validation_result,
+            'original_name': skill,
+            'confidence_breakdown': dict(validation_result['confidence_breakdown']),
+            'aliases': list(validation_result['aliases']),
+            'validation_factors': list(validation_result['validation_factors']),
+        }
+    
+    def _validate(self, normalized_skill: str, lexicon: SkillLexicon,
+                  evidence: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validation result for a normalised skill, without its original name"""
+        profile = lexicon.profile(normalized_skill)
         
         # Adjust confidence based on GitHub analysis
-        github_confidence = self._calculate_github_confidence(
-            normalized_skill, github_analysis
-        ) if github_analysis else 0
-        
-        # Adjust confidence based on market trends
-        market_confidence = self._calculate_market_confidence(normalized_skill)
+        github_confidence = self._github_confidence(normalized_skill, evidence) if evidence else 0
         
         # Calculate final confidence score
         final_confidence = self._combine_confidence_scores(
-            base_confidence, github_confidence, market_confidence
+            profile['base_confidence'], github_confidence, profile['market_confidence']
         )
         
-        # Determine skill category
-        category = self._determine_skill_category(normalized_skill)
-        
-        # Check for skill variations and aliases
-        aliases = self._find_skill_aliases(normalized_skill)
-        
         return {
-            'is_valid': final_confidence >= 30,  # Minimum confidence threshold
+            'is_valid': final_confidence >= self.MIN_CONFIDENCE,
             'normalized_name': normalized_skill,
-            'original_name': skill,
+            'original_name': normalized_skill,
             'confidence_score': final_confidence,
             'confidence_breakdown': {
-                'base_confidence': base_confidence,
+                'base_confidence': profile['base_confidence'],
                 'github_confidence': github_confidence,
-                'market_confidence': market_confidence
+                'market_confidence': profile['market_confidence']
             },
-            'category': category,
-            'is_known_skill': is_known_skill,
-            'aliases': aliases,
-            'market_demand': self._get_market_demand(normalized_skill),
-            'validation_factors': self._get_validation_factors(
-                normalized_skill, github_analysis
-            )
+            'category': profile['category'],
+            'is_known_skill': profile['is_known_skill'],
+            'aliases': list(profile['aliases']),
+            'market_demand': profile['market_demand'],
+            'validation_factors': self._validation_factors(normalized_skill, profile, evidence)
         }
     
     def _normalize_skill_name(self, skill: str) -> str:
         """Normalize skill name for consistent processing."""
-        # Remove extra whitespace and convert to title case
-        normalized = re.sub(r'\s+', ' ', skill.strip()).title()
-        
-        # Handle common variations
-        skill_mappings = {
-            'Javascript': 'JavaScript',
-            'Typescript': 'TypeScript',
-            'Nodejs': 'Node.js',
-            'Reactjs': 'React',
-            'Vuejs': 'Vue.js',
-            'Angularjs': 'AngularJS',
-            'Postgresql': 'PostgreSQL',
-            'Mysql': 'MySQL',
-            'Mongodb': 'MongoDB',
-            'Redis': 'Redis',
-            'Elasticsearch': 'Elasticsearch',
-            'Aws': 'AWS',
-            'Gcp': 'Google Cloud Platform',
-            'Azure': 'Microsoft Azure',
-            'Docker': 'Docker',
-            'Kubernetes': 'Kubernetes',
-            'Git': 'Git',
-            'Github': 'GitHub',
-            'Gitlab': 'GitLab',
-            'Jira': 'Jira',
-            'Slack': 'Slack',
-        }
-        
-        return skill_mappings.get(normalized, normalized)
+        return self.lexicon.normalize(skill)
     
     def _is_known_skill(self, skill: str) -> bool:
         """Check if skill is in the known skills database."""
-        return skill.lower() in [s.lower() for s in self.known_skills]
+        return self.lexicon.is_known(skill)
     
     def _calculate_base_confidence(self, skill: str, is_known_skill: bool) -> float:
         """Calculate base confidence score for a skill."""
-        if is_known_skill:
-            return 70.0  # High confidence for known skills
-        
-        # Check if skill matches common patterns
-        programming_patterns = [
-            r'.*\+\+$',  # C++, etc.
-            r'^[A-Z][a-z]+$',  # Single word, capitalized
-            r'^[A-Z][a-z]+\.[a-z]+$',  # Framework.extension
-            r'^[A-Z]{2,}$',  # Acronyms like SQL, API
-        ]
-        
-        for pattern in programming_patterns:
-            if re.match(pattern, skill):
-                return 50.0  # Medium confidence for pattern matches
-        
-        # Check skill length and format
-        if 2 <= len(skill) <= 30 and skill.replace('.', '').replace('-', '').replace(' ', '').isalnum():
-            return 30.0  # Low confidence for reasonable-looking skills
+        return self.lexicon.base_confidence(skill, is_known_skill)
+    
+    def _github_evidence(self, github_analysis: Dict = None,
+                         lexicon: SkillLexicon = None) -> Optional[Dict[str, Any]]:
+        """
+        The parts of a GitHub analysis that skills are checked against, read once.
         
-        return 10.0  # Very low confidence for unusual skills
+        GitHub reports its own spellings ("Vue", "Nodejs"), so the names are
+        normalised like the skills themselves before anything is looked up.
+        """
+        if not github_analysis:
+            return None
+        lexicon = lexicon or self.lexicon
+        
+        languages = {}
+        for name, usage in github_analysis.get('languages', {}).items():
+            canonical = lexicon.normalize(name)
+            languages[canonical] = languages.get(canonical, 0) + usage
+        frameworks = {
+            lexicon.normalize(name) for name in github_analysis.get('frameworks', [])
+            if isinstance(name, str)
+        }
+        skill_assessment = {}
+        for name, assessment in github_analysis.get('skill_assessment', {}).items():
+            canonical = lexicon.normalize(name)
+            current = skill_assessment.get(canonical)
+            if current is None or assessment.get('proficiency', 0) > current.get('proficiency', 0):
+                skill_assessment[canonical] = assessment
+        return {
+            'languages': languages,
+            'total_usage': sum(languages.values()),
+            'frameworks': frameworks,
+            'skill_assessment': skill_assessment,
+            'activity_score': github_analysis.get('activity_score', 0),
+        }
     
     def _calculate_github_confidence(self, skill: str, github_analysis: Dict) -> float:
         """Calculate confidence based on GitHub analysis data."""
         if not github_analysis:
             return 0.0
-        
+        return self._github_confidence(skill, self._github_evidence(github_analysis))
+    
+    def _github_confidence(self, skill: str, evidence: Dict[str, Any]) -> float:
         confidence_bonus = 0.0
         
         # Check if skill appears in languages
-        languages = github_analysis.get('languages', {})
+        languages = evidence['languages']
         if skill in languages:
-            usage_count = languages[skill]
-            total_usage = sum(languages.values())
-            usage_ratio = usage_count / max(1, total_usage)
+            usage_ratio = languages[skill] / max(1, evidence['total_usage'])
             confidence_bonus += usage_ratio * 30  # Up to 30 points
         
         # Check if skill appears in frameworks
-        frameworks = github_analysis.get('frameworks', [])
-        if skill in frameworks:
+        if skill in evidence['frameworks']:
             confidence_bonus += 20  # 20 points for framework detection
         
         # Check skill assessment data
-        skill_assessment = github_analysis.get('skill_assessment', {})
+        skill_assessment = evidence['skill_assessment']
         if skill in skill_assessment:
-            assessment = skill_assessment[skill]
-            proficiency = assessment.get('proficiency', 0)
+            proficiency = skill_assessment[skill].get('proficiency', 0)
             confidence_bonus += min(25, proficiency / 4)  # Up to 25 points
         
         # Check repository activity
-        activity_score = github_analysis.get('activity_score', 0)
-        if activity_score > 50:
+        if evidence['activity_score'] > 50:
             confidence_bonus += 10  # Activity bonus
         
         return min(40, confidence_bonus)  # Cap at 40 points
     
     def _calculate_market_confidence(self, skill: str) -> float:
         """Calculate confidence based on market trends and demand."""
-        market_data = self.market_trends.get(skill.lower(), {})
-        
-        if not market_data:
-            return 0.0
-        
-        # Base market confidence
-        demand_score = market_data.get('demand_score', 0)  # 0-100
-        trend_score = market_data.get('trend_score', 0)    # -50 to +50
-        
-        # Calculate market confidence (0-20 points)
-        market_confidence = (demand_score / 5) + max(0, trend_score / 2.5)
-        
-        return min(20, market_confidence)
+        return self.lexicon.market_confidence(skill)
     
     def _combine_confidence_scores(self, base: float, github: float, market: float) -> float:
         """Combine different confidence scores into final score."""
@@ -241,190 +741,41 @@ class SkillValidator:
     
     def _determine_skill_category(self, skill: str) -> str:
         """Determine the category of a skill."""
-        for category, skills in self.skill_categories.items():
-            if skill.lower() in [s.lower() for s in skills]:
-                return category
-        
-        # Pattern-based categorization
-        if re.match(r'^[A-Z][a-z]*$', skill) and skill.lower() in ['python', 'java', 'javascript', 'typescript', 'go', 'rust', 'swift', 'kotlin']:
-            return 'Programming Languages'
-        elif skill.lower().endswith(('.js', '.py', '.rb', '.php')):
-            return 'Programming Languages'
-        elif 'framework' in skill.lower() or skill.endswith(('JS', 'js')):
-            return 'Frameworks'
-        elif skill.lower() in ['mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch']:
-            return 'Databases'
-        elif skill.lower() in ['aws', 'azure', 'gcp', 'docker', 'kubernetes']:
-            return 'DevOps & Cloud'
-        elif skill.lower() in ['git', 'github', 'gitlab', 'jira', 'slack']:
-            return 'Tools'
-        
-        return 'Other'
+        return self.lexicon.category(skill)
     
     def _find_skill_aliases(self, skill: str) -> List[str]:
         """Find common aliases for a skill."""
-        aliases_map = {
-            'JavaScript': ['JS', 'ECMAScript', 'Node.js'],
-            'TypeScript': ['TS'],
-            'Python': ['Python3', 'Python2'],
-            'Java': ['JVM'],
-            'C++': ['CPP', 'C Plus Plus'],
-            'C#': ['CSharp', 'C Sharp'],
-            'PostgreSQL': ['Postgres', 'PSQL'],
-            'MySQL': ['My SQL'],
-            'MongoDB': ['Mongo'],
-            'React': ['ReactJS', 'React.js'],
-            'Vue.js': ['Vue', 'VueJS'],
-            'Angular': ['AngularJS', 'Angular2+'],
-            'AWS': ['Amazon Web Services'],
-            'GCP': ['Google Cloud Platform', 'Google Cloud'],
-            'Azure': ['Microsoft Azure'],
-        }
-        
-        return aliases_map.get(skill, [])
+        return SKILL_ALIASES.get(skill, [])
     
     def _get_market_demand(self, skill: str) -> str:
         """Get market demand level for a skill."""
-        market_data = self.market_trends.get(skill.lower(), {})
-        demand_score = market_data.get('demand_score', 0)
-        
-        if demand_score >= 80:
-            return 'Very High'
-        elif demand_score >= 60:
-            return 'High'
-        elif demand_score >= 40:
-            return 'Medium'
-        elif demand_score >= 20:
-            return 'Low'
-        else:
-            return 'Very Low'
+        return self.lexicon.market_demand(skill)
     
     def _get_validation_factors(self, skill: str, github_analysis: Dict = None) -> List[str]:
         """Get list of factors that contributed to skill validation."""
+        return self._validation_factors(
+            skill, self.lexicon.profile(skill), self._github_evidence(github_analysis)
+        )
+    
+    @staticmethod
+    def _validation_factors(skill: str, profile: Dict[str, Any],
+                            evidence: Optional[Dict[str, Any]]) -> List[str]:
         factors = []
         
-        if self._is_known_skill(skill):
+        if profile['is_known_skill']:
             factors.append('Known skill in database')
         
-        if github_analysis:
-            languages = github_analysis.get('languages', {})
-            if skill in languages:
+        if evidence:
+            if skill in evidence['languages']:
                 factors.append('Detected in GitHub repositories')
             
-            frameworks = github_analysis.get('frameworks', [])
-            if skill in frameworks:
+            if skill in evidence['frameworks']:
                 factors.append('Identified as framework')
             
-            skill_assessment = github_analysis.get('skill_assessment', {})
-            if skill in skill_assessment:
+            if skill in evidence['skill_assessment']:
                 factors.append('GitHub skill assessment available')
         
-        market_data = self.market_trends.get(skill.lower(), {})
-        if market_data.get('demand_score', 0) > 50:
+        if profile['high_market_demand']:
             factors.append('High market demand')
         
         return factors
-    
-    def _load_known_skills(self) -> List[str]:
-        """Load known skills from cache or database."""
-        cache_key = 'known_skills_list'
-        cached_skills = cache.get(cache_key)
-        
-        if cached_skills:
-            return cached_skills
-        
-        # Default known skills list
-        known_skills = [
-            # Programming Languages
-            'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust',
-            'Swift', 'Kotlin', 'Ruby', 'PHP', 'Scala', 'R', 'MATLAB', 'Perl',
-            'Haskell', 'Clojure', 'Elixir', 'Dart', 'Julia', 'Lua',
-            
-            # Web Frameworks
-            'React', 'Vue.js', 'Angular', 'Django', 'Flask', 'FastAPI', 'Express.js',
-            'Next.js', 'Nuxt.js', 'Svelte', 'Laravel', 'Symfony', 'Ruby on Rails',
-            'Spring', 'ASP.NET', 'Gin', 'Echo', 'Fiber',
-            
-            # Databases
-            'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch', 'SQLite',
-            'Oracle', 'SQL Server', 'Cassandra', 'DynamoDB', 'Neo4j',
-            
-            # Cloud & DevOps
-            'AWS', 'Google Cloud Platform', 'Microsoft Azure', 'Docker', 'Kubernetes',
-            'Terraform', 'Ansible', 'Jenkins', 'GitLab CI', 'GitHub Actions',
-            
-            # Tools & Technologies
-            'Git', 'GitHub', 'GitLab', 'Jira', 'Slack', 'Figma', 'Adobe Creative Suite',
-            'Photoshop', 'Illustrator', 'Sketch', 'InVision',
-            
-            # Mobile Development
-            'React Native', 'Flutter', 'Ionic', 'Xamarin', 'Swift', 'Kotlin',
-            'Android', 'iOS',
-            
-            # Data Science & ML
-            'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Jupyter',
-            'Apache Spark', 'Hadoop', 'Tableau', 'Power BI',
-            
-            # Testing
-            'Jest', 'Mocha', 'PyTest', 'JUnit', 'RSpec', 'Selenium', 'Cypress',
-        ]
-        
-        # Cache for 1 hour
-        cache.set(cache_key, known_skills, timeout=3600)
-        return known_skills
-    
-    def _load_skill_categories(self) -> Dict[str, List[str]]:
-        """Load skill categories mapping."""
-        return {
-            'Programming Languages': [
-                'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go',
-                'Rust', 'Swift', 'Kotlin', 'Ruby', 'PHP', 'Scala', 'R'
-            ],
-            'Web Frameworks': [
-                'React', 'Vue.js', 'Angular', 'Django', 'Flask', 'Express.js',
-                'Next.js', 'Laravel', 'Ruby on Rails', 'Spring'
-            ],
-            'Databases': [
-                'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
-                'SQLite', 'Oracle', 'SQL Server'
-            ],
-            'DevOps & Cloud': [
-                'AWS', 'Google Cloud Platform', 'Microsoft Azure', 'Docker',
-                'Kubernetes', 'Terraform', 'Ansible', 'Jenkins'
-            ],
-            'Mobile Development': [
-                'React Native', 'Flutter', 'Ionic', 'Swift', 'Kotlin', 'Android', 'iOS'
-            ],
-            'Data Science & ML': [
-                'TensorFlow', 'PyTorch', 'Pandas', 'NumPy', 'Scikit-learn',
-                'Apache Spark', 'Tableau'
-            ],
-            'Tools': [
-                'Git', 'GitHub', 'GitLab', 'Jira', 'Figma', 'Photoshop', 'Sketch'
-            ]
-        }
-    
-    def _load_market_trends(self) -> Dict[str, Dict[str, float]]:
-        """Load market trends data for skills."""
-        # This would typically come from an external API or database
-        # For now, using static data based on common market trends
-        return {
-            'python': {'demand_score': 95, 'trend_score': 20},
-            'javascript': {'demand_score': 90, 'trend_score': 15},
-            'typescript': {'demand_score': 85, 'trend_score': 25},
-            'react': {'demand_score': 88, 'trend_score': 20},
-            'node.js': {'demand_score': 82, 'trend_score': 15},
-            'aws': {'demand_score': 92, 'trend_score': 30},
-            'docker': {'demand_score': 85, 'trend_score': 25},
-            'kubernetes': {'demand_score': 80, 'trend_score': 35},
-            'java': {'demand_score': 85, 'trend_score': 5},
-            'go': {'demand_score': 75, 'trend_score': 30},
-            'rust': {'demand_score': 65, 'trend_score': 40},
-            'vue.js': {'demand_score': 70, 'trend_score': 10},
-            'angular': {'demand_score': 75, 'trend_score': -5},
-            'django': {'demand_score': 78, 'trend_score': 10},
-            'flask': {'demand_score': 65, 'trend_score': 5},
-            'postgresql': {'demand_score': 80, 'trend_score': 15},
-            'mongodb': {'demand_score': 75, 'trend_score': 10},
-            'redis': {'demand_score': 70, 'trend_score': 15},
-        }
\ No newline at end of file
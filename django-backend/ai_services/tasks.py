@@ -332,6 +332,137 @@ def cleanup_expired_cache():
         return {'success': False, 'error': str(e)}
 
 
+@shared_task(bind=True, max_retries=2)
+def compute_skill_graph_analytics(self):
+    """
+    Run community detection and PageRank over the skill co-occurrence graph
+    and store the result as a new snapshot version.
+    
+    Returns:
+        Dict with snapshot summary
+    """
+    from .skill_graph_analytics import skill_graph_analytics
+    
+    try:
+        snapshot = skill_graph_analytics.run()
+        
+        return {
+            'success': True,
+            'version': snapshot.version,
+            'skill_count': snapshot.skill_count,
+            'edge_count': snapshot.edge_count,
+            'cluster_count': len(snapshot.clusters),
+            'modularity': snapshot.modularity,
+            'duration_seconds': snapshot.duration_seconds
+        }
+        
+    except Exception as e:
+        logger.error(f"Error computing skill graph analytics: {str(e)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=600)
+        return {'success': False, 'error': str(e)}
+
+
+@shared_task(bind=True, max_retries=2)
+def rebuild_skill_index(self, batch_size: int = 500):
+    """
+    Reindex every developer profile in the skill index, picking up changes
+    made without a profile save (queryset updates, imports).
+    
+    Args:
+        batch_size: Number of profiles to reindex per batch
+        
+    Returns:
+        Dict with rebuild results
+    """
+    from users.skill_index import skill_index
+    
+    try:
+        started = timezone.now()
+        totals = skill_index.rebuild(batch_size=batch_size)
+        
+        logger.info(
+            f"Rebuilt skill index for {totals['developers']} developers: {totals['created']} created, "
+            f"{totals['updated']} updated, {totals['deleted']} deleted"
+        )
+        
+        return {
+            'success': True,
+            **totals,
+            'duration_seconds': (timezone.now() - started).total_seconds(),
+            'completed_at': timezone.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error rebuilding skill index: {str(e)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=600)
+        return {'success': False, 'error': str(e)}
+
+
+@shared_task(bind=True, max_retries=2)
+def analyze_pending_projects(self, batch_size: int = 20, min_age_minutes: int = 10):
+    """
+    Analyze projects still waiting for an AI analysis in one concurrent batch.
+    
+    Picks up projects created without an inline analysis, or whose inline
+    analysis failed, and sends their prompts through ``generate_many`` so the
+    batch shares the Gemini request and token budget.
+    
+    Args:
+        batch_size: Maximum number of projects to analyze per run
+        min_age_minutes: Skip projects younger than this, which may still be
+            analyzed by the request that created them
+        
+    Returns:
+        Dict with analysis results
+    """
+    from projects.models import Project
+    from .project_analysis import ProjectAnalysisEngine
+    
+    try:
+        projects = list(
+            Project.objects.filter(
+                status='analyzing',
+                ai_analysis={},
+                created_at__lte=timezone.now() - timedelta(minutes=min_age_minutes)
+            ).order_by('created_at')[:batch_size]
+        )
+        if not projects:
+            return {'success': True, 'analyzed': 0, 'failed': 0}
+        
+        analysis_engine = ProjectAnalysisEngine()
+        results = analysis_engine.analyze_projects([
+            {'description': project.description, 'title': project.title} for project in projects
+        ])
+        
+        analyzed = 0
+        failed = 0
+        for project, analysis_result in zip(projects, results):
+            try:
+                with transaction.atomic():
+                    analysis_engine.update_project_with_analysis(project, analysis_result)
+                analyzed += 1
+            except Exception as e:
+                logger.error(f"Error storing analysis for project {project.id}: {str(e)}")
+                failed += 1
+        
+        logger.info(f"Analyzed {analyzed} pending projects ({failed} failed)")
+        
+        return {
+            'success': True,
+            'analyzed': analyzed,
+            'failed': failed,
+            'completed_at': timezone.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error analyzing pending projects: {str(e)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=600)
+        return {'success': False, 'error': str(e)}
+
+
 @shared_task(bind=True, max_retries=3, default_retry_delay=600)
 def update_developer_skill_proficiency(self, user_id: str, force_update: bool = False):
     """
@@ -466,6 +597,10 @@ def update_developer_skill_proficiency(self, user_id: str, force_update: bool =
             except Exception as e:
                 logger.warning(f"Failed to generate embedding for user {user_id}: {str(e)}")
         
+        # Proficiency records feed the skill index, which profile saves alone would miss
+        from users.skill_index import skill_index
+        skill_index.index_developers([user.id])
+        
         logger.info(f"Successfully updated skill proficiency for user {user_id}")
         
         return {
@@ -0,0 +1,242 @@
+"""
+Team composition solver.
+
+Chooses up to ``team_size_limit`` available developers to maximise
+
+    COVERAGE_WEIGHT   * mean over required skills of the team's best proficiency
+  + SYNERGY_WEIGHT    * sum of pairwise collaboration scores / pairs in a full team
+  + REPUTATION_WEIGHT * sum of member reputations / team size limit
+  - COST_WEIGHT       * sum of member hourly rates / (team size limit * highest rate)
+
+Proficiency, reputation and collaboration scores are normalised to 0-1 by
+the largest value in the pool, when that exceeds 1.
+
+The search is a depth-first branch and bound, seeded with a greedy team built
+on the same objective. Each node keeps the team's best proficiency per skill
+and every candidate's collaboration score with the current members. Both are
+updated incrementally as members are added and removed, so a candidate's
+marginal value is never recomputed from scratch.
+
+A node is pruned when an optimistic bound on what its remaining slots can add
+cannot beat the best team found so far. The bound is the sum of the best
+per-candidate gains, with the coverage part also capped by what the whole
+remaining pool could cover. The search stops at the time budget and returns
+the best team found so far; ``optimal`` says whether it ran to completion.
+"""
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+EPSILON = 1e-12
+
+
+class TeamCompositionSolver:
+    """Branch-and-bound team selection over a candidate pool"""
+
+    COVERAGE_WEIGHT = 0.6
+    SYNERGY_WEIGHT = 0.2
+    REPUTATION_WEIGHT = 0.1
+    COST_WEIGHT = 0.1
+
+    def __init__(self, candidates: List[Dict[str, Any]], required_skills: List[str],
+                 collaboration_scores: Dict[Tuple[str, str], float] = None,
+                 team_size_limit: int = 5, time_budget: float = 2.0):
+        """
+        Args:
+            candidates: Candidate dicts as returned by GraphAnalysisService._get_skill_candidates
+            required_skills: Skills the team should cover
+            collaboration_scores: Collaboration score per developer ID pair (either order)
+            team_size_limit: Maximum number of team members
+            time_budget: Seconds to search before returning the best team so far
+        """
+        self.required_skills = list(dict.fromkeys(required_skills))
+        self.candidates = [c for c in candidates if c.get('availability') == 'available']
+        self.team_size_limit = max(team_size_limit, 0)
+        self.time_budget = time_budget
+
+        n = len(self.candidates)
+        skill_count = len(self.required_skills)
+        limit = max(self.team_size_limit, 1)
+
+        proficiency = np.array([
+            [candidate['skills'].get(skill) or 0.0 for skill in self.required_skills]
+            for candidate in self.candidates
+        ], dtype=float).reshape(n, skill_count)
+        self.proficiency = proficiency / max(proficiency.max(initial=0.0), 1.0)
+        self.coverage_weight = self.COVERAGE_WEIGHT / skill_count if skill_count else 0.0
+
+        reputation = np.array([c.get('reputation') or 0.0 for c in self.candidates], dtype=float)
+        rates = np.array([c.get('hourly_rate') or 0.0 for c in self.candidates], dtype=float)
+        reputation = reputation / max(reputation.max(initial=0.0), 1.0)
+        rates = rates / max(rates.max(initial=0.0), EPSILON)
+        # Reputation and cost are additive per member
+        self.member_value = (self.REPUTATION_WEIGHT * reputation - self.COST_WEIGHT * rates) / limit
+
+        self._build_collaboration(collaboration_scores or {})
+
+    def _build_collaboration(self, collaboration_scores: Dict[Tuple[str, str], float]):
+        """Sparse neighbour lists with weights in objective units"""
+        n = len(self.candidates)
+        index = {str(c['developer_id']): i for i, c in enumerate(self.candidates)}
+        pairs = {}
+        for (first, second), score in collaboration_scores.items():
+            i, j = index.get(str(first)), index.get(str(second))
+            if i is None or j is None or i == j or not score:
+                continue
+            key = (min(i, j), max(i, j))
+            pairs[key] = max(pairs.get(key, 0.0), float(score))
+
+        full_team_pairs = self.team_size_limit * (self.team_size_limit - 1) / 2
+        scale = max(max(pairs.values(), default=0.0), 1.0)
+        pair_weight = self.SYNERGY_WEIGHT / (full_team_pairs * scale) if full_team_pairs else 0.0
+
+        neighbours = [[] for _ in range(n)]
+        for (i, j), score in pairs.items():
+            neighbours[i].append((j, score * pair_weight))
+            neighbours[j].append((i, score * pair_weight))
+        self.neighbour_index = [np.array([j for j, _ in row], dtype=int) for row in neighbours]
+        self.neighbour_weight = [np.array([w for _, w in row], dtype=float) for row in neighbours]
+        self.max_edge = np.array([w.max(initial=0.0) for w in self.neighbour_weight], dtype=float)
+
+    def objective(self, members: Iterable[int]) -> float:
+        """Objective value of a team given as candidate positions"""
+        members = list(members)
+        if not members:
+            return 0.0
+        value = self.coverage_weight * self.proficiency[members].max(axis=0).sum()
+        value += self.member_value[members].sum()
+        member_set = set(members)
+        for i in members:
+            for j, weight in zip(self.neighbour_index[i], self.neighbour_weight[i]):
+                if j in member_set and j > i:
+                    value += weight
+        return float(value)
+
+    def positions(self, team: List[Dict[str, Any]]) -> List[int]:
+        """Candidate positions of a team given as candidate dicts (unknown members are dropped)"""
+        index = {str(c['developer_id']): i for i, c in enumerate(self.candidates)}
+        return [index[str(m['developer_id'])] for m in team if str(m['developer_id']) in index]
+
+    def solve(self) -> Dict[str, Any]:
+        """Best team found within the time budget"""
+        started = time.monotonic()
+        self._deadline = started + self.time_budget
+        self._timed_out = False
+        self._nodes = 0
+
+        n = len(self.candidates)
+        self._best_prof = np.zeros(len(self.required_skills))
+        self._synergy = np.zeros(n)
+        self._in_play = np.ones(n, dtype=bool)
+        self._team = []
+
+        self._best_team, self._best_value = self._greedy_seed()
+        if n and self.team_size_limit:
+            self._search(0.0, self.team_size_limit)
+
+        return {
+            'team': [self.candidates[i] for i in self._best_team],
+            'objective': self._best_value,
+            'optimal': not self._timed_out,
+            'nodes_explored': self._nodes,
+            'elapsed': time.monotonic() - started,
+        }
+
+    def _greedy_seed(self) -> Tuple[List[int], float]:
+        """Add the member with the largest positive marginal gain until none is left"""
+        team, value = [], 0.0
+        while len(team) < self.team_size_limit:
+            candidates = np.flatnonzero(self._in_play)
+            if not candidates.size:
+                break
+            gains = self._marginal_gains(candidates)
+            best = int(np.argmax(gains))
+            if gains[best] <= EPSILON:
+                break
+            value += self._add(int(candidates[best]))
+            team.append(int(candidates[best]))
+        for member in reversed(team):
+            self._remove(member)
+        return team, value
+
+    def _marginal_gains(self, candidates: np.ndarray) -> np.ndarray:
+        coverage = np.maximum(self.proficiency[candidates] - self._best_prof, 0.0).sum(axis=1)
+        return self.coverage_weight * coverage + self._synergy[candidates] + self.member_value[candidates]
+
+    def _add(self, member: int) -> float:
+        """Add a member, returning its exact marginal gain"""
+        gain = self._marginal_gains(np.array([member]))[0]
+        self._team.append((member, self._best_prof))
+        self._best_prof = np.maximum(self._best_prof, self.proficiency[member])
+        self._synergy[self.neighbour_index[member]] += self.neighbour_weight[member]
+        self._in_play[member] = False
+        return float(gain)
+
+    def _remove(self, member: int):
+        removed, best_prof = self._team.pop()
+        assert removed == member
+        self._best_prof = best_prof
+        self._synergy[self.neighbour_index[member]] -= self.neighbour_weight[member]
+        self._in_play[member] = True
+
+    @staticmethod
+    def _top_positive_sum(values: np.ndarray, count: int) -> float:
+        positive = values[values > 0]
+        if positive.size > count:
+            positive = np.partition(positive, positive.size - count)[-count:]
+        return float(positive.sum())
+
+    def _search(self, value: float, slots: int):
+        self._nodes += 1
+        if value > self._best_value + EPSILON:
+            self._best_value = value
+            self._best_team = [member for member, _ in self._team]
+        if slots == 0:
+            return
+        if time.monotonic() > self._deadline:
+            self._timed_out = True
+            return
+
+        candidates = np.flatnonzero(self._in_play)
+        if not candidates.size:
+            return
+
+        proficiency = self.proficiency[candidates]
+        coverage = self.coverage_weight * np.maximum(proficiency - self._best_prof, 0.0).sum(axis=1)
+        # Pairs among new members are bounded by half of each one's strongest edge per partner
+        other = self._synergy[candidates] + (slots - 1) / 2 * self.max_edge[candidates] + self.member_value[candidates]
+        gains = coverage + other
+
+        coverage_cap = self.coverage_weight * np.maximum(proficiency.max(axis=0) - self._best_prof, 0.0).sum()
+        bound = value + min(
+            self._top_positive_sum(gains, slots),
+            coverage_cap + self._top_positive_sum(other, slots),
+        )
+        if bound <= self._best_value + EPSILON:
+            return
+
+        order = np.argsort(-gains, kind='stable')
+        sorted_gains = gains[order]
+        excluded = []
+        for position, candidate_position in enumerate(order):
+            gain = sorted_gains[position]
+            if gain <= EPSILON:
+                break
+            # Any team through this child uses it plus later siblings only
+            later = sorted_gains[position + 1:position + slots]
+            if value + gain + later[later > 0].sum() <= self._best_value + EPSILON:
+                break
+
+            member = int(candidates[candidate_position])
+            child_value = value + self._add(member)
+            self._search(child_value, slots - 1)
+            self._remove(member)
+
+            # Teams containing this member are done; siblings must not revisit them
+            self._in_play[member] = False
+            excluded.append(member)
+            if self._timed_out:
+                break
+
+        self._in_play[excluded] = True
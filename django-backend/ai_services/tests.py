@@ -1,3 +1,184 @@
-from django.test import TestCase
+"""
+Tests for skill validation and batched Gemini analysis
+"""
+import asyncio
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from ai_services import skill_validator
+from ai_services.exceptions import GeminiAPIException
+from ai_services.gemini_client import AsyncGeminiClient, LLMRateBudget
+from ai_services.skill_validator import SkillValidator, get_skill_lexicon, reload_skill_lexicon
+
+
+class SkillValidatorTest(SimpleTestCase):
+    """Test cases for batched skill validation and free-text extraction"""
+
+    def setUp(self):
+        """Set up a validator on a fresh lexicon and a GitHub analysis"""
+        cache.clear()
+        patcher = mock.patch.object(skill_validator, '_lexicon', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(cache.clear)
+        self.validator = SkillValidator()
+        self.github_analysis = {
+            'languages': {'Python': 500, 'JavaScript': 300, 'Go': 100},
+            'frameworks': ['Vue', 'React', 'Nodejs'],
+            'skill_assessment': {'Python': {'proficiency': 80}, 'Javascript': {'proficiency': 70}},
+            'activity_score': 60,
+        }
+
+    def test_batch_matches_single_skill_validation(self):
+        """Test that validating a list gives the same results as validating each skill"""
+        skills = ['Python', 'python', 'Vue', 'vuejs', 'golang', 'React', 'nodejs', 'k8s', 'Random Thing']
+
+        batch = self.validator.validate_skills(skills, self.github_analysis)
+
+        expected = {}
+        for skill in skills:
+            result = self.validator._validate_single_skill(skill, self.github_analysis)
+            if result['is_valid']:
+                expected[skill] = result
+        self.assertEqual(batch['validated_skills'], expected)
+        self.assertEqual(batch['total_extracted'], len(skills))
+
+    def test_results_for_synonyms_are_independent(self):
+        """Test that raw names sharing a canonical skill don't share nested containers"""
+        validated = self.validator.validate_skills(['Python', 'python'], self.github_analysis)['validated_skills']
+
+        validated['Python']['confidence_breakdown']['github_confidence'] = 0
+        validated['Python']['validation_factors'].append('Edited')
+
+        self.assertNotEqual(validated['python']['confidence_breakdown']['github_confidence'], 0)
+        self.assertNotIn('Edited', validated['python']['validation_factors'])
+        self.assertEqual(validated['python']['original_name'], 'python')
+
+    def test_github_evidence_uses_canonical_names(self):
+        """Test that GitHub evidence under GitHub's spelling counts for the canonical skill"""
+        for skill in ('Vue', 'Vue.js', 'vuejs'):
+            result = self.validator._validate_single_skill(skill, self.github_analysis)
+            self.assertEqual(result['normalized_name'], 'Vue.js')
+            self.assertIn('Identified as framework', result['validation_factors'])
+
+        javascript = self.validator._validate_single_skill('javascript', self.github_analysis)
+        self.assertIn('GitHub skill assessment available', javascript['validation_factors'])
+
+        without_github = self.validator._validate_single_skill('Vue', None)
+        with_github = self.validator._validate_single_skill('Vue', {'frameworks': ['Vue']})
+        self.assertEqual(
+            with_github['confidence_score'] - without_github['confidence_score'], 20 * 0.4
+        )
+
+    def test_extract_prefers_longest_match(self):
+        """Test that a longer skill name wins over a skill it contains"""
+        self.assertEqual(self.validator.extract_skills('Built apps in React Native.'), ['React Native'])
+        self.assertEqual(
+            self.validator.extract_skills('React Native and React, with Node.js'),
+            ['React Native', 'React', 'Node.js']
+        )
+
+    def test_extract_word_boundaries(self):
+        """Test that skills are only extracted as whole words"""
+        self.assertEqual(self.validator.extract_skills('Reactive streams in Pythonic style'), [])
+        self.assertEqual(self.validator.extract_skills('C++ and C# services'), ['C++', 'C#'])
+        self.assertEqual(self.validator.extract_skills('golang, Java and JavaScript'), ['Go', 'Java', 'JavaScript'])
+
+    def test_extract_short_and_ambiguous_names_are_case_sensitive(self):
+        """Test that ambiguous names like Go only match in their canonical spelling"""
+        self.assertEqual(self.validator.extract_skills('Services written in Go'), ['Go'])
+        self.assertEqual(self.validator.extract_skills('Ready to go live with Python'), ['Python'])
+
+    def test_reload_bumps_version(self):
+        """Test that reloading the lexicon bumps the shared version and picks up new skills"""
+        version = get_skill_lexicon().version
+        self.assertFalse(get_skill_lexicon().is_known('Zig'))
+
+        lexicon = reload_skill_lexicon(get_skill_lexicon().known_skills + ['Zig'])
+
+        self.assertEqual(lexicon.version, version + 1)
+        self.assertEqual(cache.get(skill_validator.LEXICON_VERSION_CACHE_KEY), version + 1)
+        self.assertIs(get_skill_lexicon(), lexicon)
+        self.assertTrue(self.validator.lexicon.is_known('Zig'))
+        self.assertEqual(self.validator.extract_skills('Rewrote it in Zig'), ['Zig'])
+
+
+class AsyncGeminiClientTest(SimpleTestCase):
+    """Test cases for the shared Gemini request and token budget"""
+
+    def setUp(self):
+        """Set up an async client around a stub model"""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.model = mock.Mock()
+        self.budget = LLMRateBudget(name='test', requests_per_minute=10, tokens_per_minute=10000)
+        self.client = AsyncGeminiClient(
+            client=mock.Mock(model=self.model, generation_config={'max_output_tokens': 100}),
+            budget=self.budget
+        )
+
+    def test_failed_attempt_releases_reservation(self):
+        """Test that an attempt failing before usage is reported gives its reservation back"""
+        self.model.generate_content_async = mock.AsyncMock(side_effect=RuntimeError('connection reset'))
+
+        with self.assertRaises(GeminiAPIException):
+            asyncio.run(self.client.generate_content('Analyze this project', max_retries=1))
+
+        usage = self.budget.usage()
+        self.assertEqual(usage['requests'], 0)
+        self.assertEqual(usage['tokens'], 0)
+
+    def test_reported_usage_replaces_estimate(self):
+        """Test that a successful attempt keeps the request and settles the actual tokens"""
+        self.model.generate_content_async = mock.AsyncMock(return_value=mock.Mock(
+            text='{"ok": true}', usage_metadata=mock.Mock(total_token_count=42)
+        ))
+
+        asyncio.run(self.client.generate_content('Analyze this project', max_retries=1))
+
+        usage = self.budget.usage()
+        self.assertEqual(usage['requests'], 1)
+        self.assertEqual(usage['tokens'], 42)
+
+
+class AnalyzePendingProjectsTest(TestCase):
+    """Test cases for the batched analysis of projects still waiting for one"""
+
+    def setUp(self):
+        """Set up a stale pending project, a fresh one and an analyzed one"""
+        from projects.models import Project
+        from users.models import User
+
+        client = User.objects.create(username='client', email='client@example.com')
+        self.stale = Project.objects.create(client=client, title='Stale', description='Build a marketplace')
+        Project.objects.filter(id=self.stale.id).update(created_at=timezone.now() - timedelta(hours=1))
+        self.fresh = Project.objects.create(client=client, title='Fresh', description='Build a blog')
+        self.analyzed = Project.objects.create(
+            client=client, title='Analyzed', description='Build a shop', ai_analysis={'complexity_score': 5}
+        )
+        Project.objects.filter(id=self.analyzed.id).update(created_at=timezone.now() - timedelta(hours=1))
+
+    def test_analyzes_stale_projects_in_one_batch(self):
+        """Test that only stale unanalyzed projects are sent, through one generate_many call"""
+        from ai_services.tasks import analyze_pending_projects
+
+        gemini_client = mock.Mock()
+        gemini_client.generate_many.return_value = [RuntimeError('quota exceeded')]
+        with mock.patch('ai_services.project_analysis.GeminiClient', return_value=gemini_client):
+            result = analyze_pending_projects.apply().get()
+
+        self.assertEqual(result['analyzed'], 1)
+        gemini_client.generate_many.assert_called_once()
+        prompts = gemini_client.generate_many.call_args[0][0]
+        self.assertEqual(len(prompts), 1)
+        self.assertIn('Build a marketplace', prompts[0])
+
+        self.stale.refresh_from_db()
+        self.fresh.refresh_from_db()
+        self.assertNotEqual(self.stale.status, 'analyzing')
+        self.assertTrue(self.stale.ai_analysis)
+        self.assertEqual(self.fresh.status, 'analyzing')
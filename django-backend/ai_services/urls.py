@@ -29,6 +29,7 @@ urlpatterns = [
     # Skill validation endpoints
     path('validate-skills/', views.validate_skills, name='validate_skills'),
     path('skill-categories/', views.skill_categories, name='skill_categories'),
+    path('skill-market-dynamics/', views.skill_market_dynamics, name='skill_market_dynamics'),
     
     # Resume parsing endpoints
     path('upload-resume/', views.upload_resume, name='upload_resume'),
@@ -317,6 +317,46 @@ def skill_categories(request):
         )
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def skill_market_dynamics(request):
+    """
+    Get skill market trends with skill clusters and importance scores.
+    
+    Clusters and importance come from the latest offline skill graph
+    analytics snapshot.
+    
+    GET /api/ai-services/skill-market-dynamics/?time_window_days=90
+    """
+    from .graph_service import graph_service
+    
+    try:
+        time_window_days = int(request.query_params.get('time_window_days', 90))
+    except ValueError:
+        return Response(
+            {'error': 'time_window_days must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        dynamics = graph_service.analyze_skill_market_dynamics(time_window_days)
+        
+        if 'error' in dynamics:
+            return Response(
+                {'error': 'Skill market analysis unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        
+        return Response(dynamics)
+        
+    except Exception as e:
+        logger.error(f"Error getting skill market dynamics: {str(e)}")
+        return Response(
+            {'error': 'Internal server error'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 # Placeholder views for existing URL patterns
 # These will be implemented in other tasks
 
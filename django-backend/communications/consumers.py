@@ -0,0 +1,152 @@
+"""
+WebSocket and Server-Sent Events endpoints for real-time pushes.
+
+Both transports authenticate with a JWT access token, passed as the
+``token`` query parameter (browsers cannot set headers on WebSocket or
+EventSource requests) or, for SSE, an ``Authorization: Bearer`` header.
+Clients resume with ``last_event_id`` (or the SSE ``Last-Event-ID``
+header) and receive a ``resync`` event when they must refetch over REST.
+"""
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.http import AsyncHttpConsumer
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from .realtime import get_hub
+
+logger = logging.getLogger(__name__)
+
+
+@database_sync_to_async
+def _user_for_token(raw_token):
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+    if not raw_token:
+        return None
+    authentication = JWTAuthentication()
+    try:
+        user = authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, TokenError):
+        return None
+    return user if user.is_active else None
+
+
+def _query_params(scope):
+    return {key: values[-1] for key, values in parse_qs(scope.get('query_string', b'').decode()).items()}
+
+
+def _headers(scope):
+    return {name.decode().lower(): value.decode() for name, value in scope.get('headers', [])}
+
+
+class RealtimeConsumerMixin:
+    """Runs the hub event iterator for the connected user"""
+
+    async def authenticate(self):
+        params = _query_params(self.scope)
+        token = params.get('token')
+        if not token:
+            authorization = _headers(self.scope).get('authorization', '')
+            if authorization.lower().startswith('bearer '):
+                token = authorization[7:].strip()
+        return await _user_for_token(token)
+
+    async def pump_events(self, user, last_event_id):
+        try:
+            async for event in get_hub().events(user.pk, last_event_id):
+                await self.send_event(event)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Realtime stream for user {user.pk} failed: {str(e)}")
+
+
+class NotificationStreamConsumer(RealtimeConsumerMixin, AsyncWebsocketConsumer):
+    """WebSocket push channel: one JSON frame per event"""
+
+    async def connect(self):
+        self.pump = None
+        self.user = await self.authenticate()
+        if self.user is None:
+            await self.close(code=4401)
+            return
+        await self.accept()
+        last_event_id = _query_params(self.scope).get('last_event_id')
+        self.pump = asyncio.ensure_future(self.pump_events(self.user, last_event_id))
+
+    async def disconnect(self, code):
+        if self.pump is not None:
+            self.pump.cancel()
+
+    async def receive(self, text_data=None, bytes_data=None):
+        # Clients only listen; answer pings so they can detect dead sockets
+        if text_data == 'ping':
+            await self.send(text_data='pong')
+
+    async def send_event(self, event):
+        if event is None:
+            await self.send(text_data=json.dumps({'type': 'keepalive'}))
+        else:
+            await self.send(text_data=json.dumps(event, default=str))
+
+
+class NotificationEventSourceConsumer(RealtimeConsumerMixin, AsyncHttpConsumer):
+    """Server-Sent Events push channel"""
+
+    async def handle(self, body):
+        self.user = await self.authenticate()
+        if self.user is None:
+            await self.send_response(
+                401, b'{"detail": "Authentication credentials were not provided."}',
+                headers=[(b'Content-Type', b'application/json')]
+            )
+            return
+
+        await self.send_headers(headers=[
+            (b'Content-Type', b'text/event-stream'),
+            (b'Cache-Control', b'no-cache'),
+            (b'X-Accel-Buffering', b'no'),
+        ])
+        last_event_id = (
+            _headers(self.scope).get('last-event-id')
+            or _query_params(self.scope).get('last_event_id')
+        )
+        # The consumer does not dispatch further messages until handle()
+        # returns, so watch for http.disconnect here while streaming
+        pump = asyncio.ensure_future(self.pump_events(self.user, last_event_id))
+        disconnected = asyncio.ensure_future(self.wait_for_disconnect())
+        try:
+            await asyncio.wait([pump, disconnected], return_when=asyncio.FIRST_COMPLETED)
+            client_gone = disconnected.done()
+        finally:
+            pump.cancel()
+            disconnected.cancel()
+            await asyncio.gather(pump, disconnected, return_exceptions=True)
+        if not client_gone:
+            # The stream ended on our side; finish the response
+            await self.send_body(b'', more_body=False)
+
+    async def __call__(self, scope, receive, send):
+        self.receive_message = receive
+        await super().__call__(scope, receive, send)
+
+    async def wait_for_disconnect(self):
+        while True:
+            message = await self.receive_message()
+            if message['type'] == 'http.disconnect':
+                return
+
+    async def send_event(self, event):
+        if event is None:
+            frame = ': keepalive\n\n'
+        else:
+            frame = f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n"
+            if event.get('id'):
+                frame = f"id: {event['id']}\n" + frame
+            frame += '\n'
+        await self.send_body(frame.encode(), more_body=True)
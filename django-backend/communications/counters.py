@@ -0,0 +1,345 @@
+"""
+Materialized unread counters for conversations and notifications.
+
+Counters are adjusted with F() expressions in the same transaction as the
+write that changes them (message sent, messages read, notification created,
+read or deleted), and UnreadBadge holds per-user totals so badge endpoints
+read a single row. ``rebuild_user`` recomputes everything for a user from
+the source tables; the periodic repair task uses it to correct any drift.
+"""
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Any, Iterable, List, Optional
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import (
+    Conversation, Message, MessageReadStatus, Notification,
+    ConversationUnreadCounter, NotificationCounter, UnreadBadge
+)
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+def _decrement(field: str, amount: int):
+    return Greatest(F(field) - amount, Value(0))
+
+
+class UnreadCounterService:
+    """Maintains ConversationUnreadCounter, NotificationCounter and UnreadBadge"""
+
+    def _ensure_badges(self, user_ids: Iterable) -> None:
+        UnreadBadge.objects.bulk_create(
+            [UnreadBadge(user_id=user_id) for user_id in user_ids],
+            ignore_conflicts=True
+        )
+
+    # ------------------------------------------------------------------ messages
+
+    def message_created(self, message: Message) -> None:
+        """Count a new message as unread for every participant but the sender"""
+        with transaction.atomic():
+            Conversation.objects.filter(id=message.conversation_id).update(
+                message_count=F('message_count') + 1,
+                last_message_at=message.created_at,
+                updated_at=timezone.now()
+            )
+
+            recipients = list(
+                Conversation.participants.through.objects.filter(
+                    conversation_id=message.conversation_id
+                ).exclude(user_id=message.sender_id).values_list('user_id', flat=True)
+            )
+            if not recipients:
+                return
+
+            ConversationUnreadCounter.objects.bulk_create(
+                [ConversationUnreadCounter(user_id=user_id, conversation_id=message.conversation_id)
+                 for user_id in recipients],
+                ignore_conflicts=True
+            )
+            self._ensure_badges(recipients)
+
+            # Lock the counters (in a fixed order) to see which go from zero to unread
+            counters = ConversationUnreadCounter.objects.select_for_update().filter(
+                conversation_id=message.conversation_id, user_id__in=recipients
+            ).order_by('user_id').values_list('user_id', 'unread_count')
+            newly_unread = [user_id for user_id, unread_count in counters if unread_count == 0]
+
+            ConversationUnreadCounter.objects.filter(
+                conversation_id=message.conversation_id, user_id__in=recipients
+            ).update(unread_count=F('unread_count') + 1)
+            UnreadBadge.objects.filter(user_id__in=recipients).update(
+                unread_messages=F('unread_messages') + 1
+            )
+            if newly_unread:
+                UnreadBadge.objects.filter(user_id__in=newly_unread).update(
+                    unread_conversations=F('unread_conversations') + 1
+                )
+
+    def messages_read(self, user, conversation_id, message_ids: Optional[List] = None) -> int:
+        """
+        Mark a user's unread messages in a conversation as read (all of them,
+        or only ``message_ids``) and decrement the counters. Returns the
+        number of messages newly marked read.
+        """
+        with transaction.atomic():
+            # Lock the counter before looking for unread messages, so concurrent
+            # reads of the same conversation see each other's read statuses and
+            # never subtract the same messages twice
+            counter = ConversationUnreadCounter.objects.select_for_update().filter(
+                user=user, conversation_id=conversation_id
+            ).first()
+
+            unread = Message.objects.filter(
+                conversation_id=conversation_id,
+                conversation__participants=user
+            ).exclude(sender=user).exclude(read_statuses__user=user)
+            if message_ids is not None:
+                unread = unread.filter(id__in=message_ids)
+            unread_ids = list(unread.values_list('id', flat=True))
+            if not unread_ids:
+                return 0
+
+            MessageReadStatus.objects.bulk_create(
+                [MessageReadStatus(message_id=message_id, user=user) for message_id in unread_ids],
+                ignore_conflicts=True
+            )
+
+            if counter is None or counter.unread_count == 0:
+                return len(unread_ids)
+
+            remaining = max(counter.unread_count - len(unread_ids), 0)
+            ConversationUnreadCounter.objects.filter(pk=counter.pk).update(unread_count=remaining)
+            badge_updates = {
+                'unread_messages': _decrement('unread_messages', counter.unread_count - remaining)
+            }
+            if remaining == 0:
+                badge_updates['unread_conversations'] = _decrement('unread_conversations', 1)
+            UnreadBadge.objects.filter(user=user).update(**badge_updates)
+            return len(unread_ids)
+
+    # ------------------------------------------------------------------ notifications
+
+    def _adjust_notifications(self, user_id, deltas: Dict[str, tuple]) -> None:
+        """Apply ``{notification_type: (total_delta, unread_delta)}`` to the counters"""
+        deltas = {key: value for key, value in deltas.items() if any(value)}
+        if not deltas:
+            return
+        # Only increments need the rows to exist. Decrements stay update-only:
+        # when a user is deleted, the cascade removes their notifications
+        # (and these signals fire) while their counter rows are going away too,
+        # and inserting rows for them there would violate the user foreign key
+        if any(delta > 0 for value in deltas.values() for delta in value):
+            NotificationCounter.objects.bulk_create(
+                [NotificationCounter(user_id=user_id, notification_type=notification_type)
+                 for notification_type in deltas],
+                ignore_conflicts=True
+            )
+            self._ensure_badges([user_id])
+
+        unread_total = 0
+        for notification_type, (total_delta, unread_delta) in deltas.items():
+            updates = {}
+            if total_delta:
+                updates['total_count'] = (
+                    F('total_count') + total_delta if total_delta > 0
+                    else _decrement('total_count', -total_delta)
+                )
+            if unread_delta:
+                updates['unread_count'] = (
+                    F('unread_count') + unread_delta if unread_delta > 0
+                    else _decrement('unread_count', -unread_delta)
+                )
+                unread_total += unread_delta
+            NotificationCounter.objects.filter(
+                user_id=user_id, notification_type=notification_type
+            ).update(**updates)
+
+        if unread_total:
+            UnreadBadge.objects.filter(user_id=user_id).update(
+                unread_notifications=(
+                    F('unread_notifications') + unread_total if unread_total > 0
+                    else _decrement('unread_notifications', -unread_total)
+                )
+            )
+
+    def notification_created(self, notification: Notification) -> None:
+        self.notifications_created([notification])
+
+    def notifications_created(self, notifications: Iterable[Notification]) -> None:
+        """Count bulk-created notifications with one UPDATE per distinct delta"""
+        per_pair = defaultdict(lambda: [0, 0])
+        for notification in notifications:
+            counts = per_pair[(notification.recipient_id, notification.notification_type)]
+            counts[0] += 1
+            counts[1] += 0 if notification.is_read else 1
+        if not per_pair:
+            return
+
+        counter_groups = defaultdict(list)
+        unread_by_user = Counter()
+        for (user_id, notification_type), (total, unread) in per_pair.items():
+            counter_groups[(notification_type, total, unread)].append(user_id)
+            unread_by_user[user_id] += unread
+        badge_groups = defaultdict(list)
+        for user_id, unread in unread_by_user.items():
+            if unread:
+                badge_groups[unread].append(user_id)
+
+        with transaction.atomic():
+            NotificationCounter.objects.bulk_create(
+                [NotificationCounter(user_id=user_id, notification_type=notification_type)
+                 for user_id, notification_type in per_pair],
+                ignore_conflicts=True
+            )
+            self._ensure_badges(unread_by_user.keys())
+            for (notification_type, total, unread), user_ids in counter_groups.items():
+                NotificationCounter.objects.filter(
+                    user_id__in=user_ids, notification_type=notification_type
+                ).update(
+                    total_count=F('total_count') + total,
+                    unread_count=F('unread_count') + unread
+                )
+            for unread, user_ids in badge_groups.items():
+                UnreadBadge.objects.filter(user_id__in=user_ids).update(
+                    unread_notifications=F('unread_notifications') + unread
+                )
+
+    def notification_deleted(self, notification: Notification) -> None:
+        with transaction.atomic():
+            self._adjust_notifications(notification.recipient_id, {
+                notification.notification_type: (-1, 0 if notification.is_read else -1)
+            })
+
+    def notification_read_changed(self, notification: Notification) -> None:
+        """Call after a single notification's ``is_read`` flag flipped"""
+        with transaction.atomic():
+            self._adjust_notifications(notification.recipient_id, {
+                notification.notification_type: (0, -1 if notification.is_read else 1)
+            })
+
+    def notifications_read(self, user, notification_ids: Optional[List] = None) -> int:
+        """Mark unread notifications (all, or ``notification_ids``) as read"""
+        with transaction.atomic():
+            unread = Notification.objects.filter(recipient=user, is_read=False)
+            if notification_ids is not None:
+                unread = unread.filter(id__in=notification_ids)
+            per_type = Counter(
+                unread.select_for_update().values_list('notification_type', flat=True)
+            )
+            if not per_type:
+                return 0
+            updated = unread.update(is_read=True, read_at=timezone.now())
+            self._adjust_notifications(user.pk, {
+                notification_type: (0, -count) for notification_type, count in per_type.items()
+            })
+            return updated
+
+    # ------------------------------------------------------------------ reads
+
+    def get_badge(self, user) -> UnreadBadge:
+        """Single-row badge lookup; builds the row on first access"""
+        badge = UnreadBadge.objects.filter(user=user).first()
+        if badge is None:
+            badge = self.rebuild_user(user)['badge']
+        return badge
+
+    def get_notification_summary(self, user) -> List[Dict[str, Any]]:
+        if not UnreadBadge.objects.filter(user=user).exists():
+            self.rebuild_user(user)
+        return list(
+            NotificationCounter.objects.filter(user=user, total_count__gt=0).order_by(
+                'notification_type'
+            ).values('notification_type', 'unread_count', count=F('total_count'))
+        )
+
+    # ------------------------------------------------------------------ repair
+
+    def rebuild_user(self, user) -> Dict[str, Any]:
+        """Recompute every counter for a user from the source tables"""
+        user_id = user.pk if hasattr(user, 'pk') else user
+        with transaction.atomic():
+            unread_by_conversation = dict(
+                Message.objects.filter(conversation__participants=user_id)
+                .exclude(sender_id=user_id)
+                .exclude(read_statuses__user_id=user_id)
+                .values_list('conversation_id')
+                .annotate(unread=Count('id', distinct=True))
+                .order_by()
+            )
+            notification_counts = {
+                row['notification_type']: (row['total'], row['unread'])
+                for row in Notification.objects.filter(recipient_id=user_id)
+                .values('notification_type')
+                .annotate(total=Count('id'), unread=Count('id', filter=Q(is_read=False)))
+                .order_by()
+            }
+
+            ConversationUnreadCounter.objects.filter(user_id=user_id).exclude(
+                conversation_id__in=unread_by_conversation.keys()
+            ).update(unread_count=0)
+            ConversationUnreadCounter.objects.bulk_create(
+                [ConversationUnreadCounter(user_id=user_id, conversation_id=conversation_id, unread_count=count)
+                 for conversation_id, count in unread_by_conversation.items()],
+                update_conflicts=True,
+                unique_fields=['user', 'conversation'],
+                update_fields=['unread_count']
+            )
+
+            NotificationCounter.objects.filter(user_id=user_id).exclude(
+                notification_type__in=notification_counts.keys()
+            ).update(total_count=0, unread_count=0)
+            NotificationCounter.objects.bulk_create(
+                [NotificationCounter(user_id=user_id, notification_type=notification_type,
+                                     total_count=total, unread_count=unread)
+                 for notification_type, (total, unread) in notification_counts.items()],
+                update_conflicts=True,
+                unique_fields=['user', 'notification_type'],
+                update_fields=['total_count', 'unread_count']
+            )
+
+            expected = {
+                'unread_conversations': sum(1 for count in unread_by_conversation.values() if count),
+                'unread_messages': sum(unread_by_conversation.values()),
+                'unread_notifications': sum(unread for _, unread in notification_counts.values()),
+            }
+            badge, created = UnreadBadge.objects.get_or_create(user_id=user_id, defaults=expected)
+            drifted = not created and any(getattr(badge, field) != value for field, value in expected.items())
+            if drifted:
+                for field, value in expected.items():
+                    setattr(badge, field, value)
+                badge.save(update_fields=list(expected))
+
+        return {'badge': badge, 'drifted': drifted}
+
+    def repair(self, user_ids: Optional[Iterable] = None, batch_size: int = 500) -> Dict[str, int]:
+        """Rebuild counters for the given users (default: every active user)"""
+        if user_ids is None:
+            user_ids = User.objects.filter(is_active=True).values_list('id', flat=True).iterator(
+                chunk_size=batch_size
+            )
+
+        checked = 0
+        drifted = 0
+        for user_id in user_ids:
+            try:
+                result = self.rebuild_user(user_id)
+            except Exception as e:
+                logger.error(f"Error rebuilding unread counters for user {user_id}: {str(e)}")
+                continue
+            checked += 1
+            drifted += int(result['drifted'])
+
+        if drifted:
+            logger.warning(f"Unread counters drifted for {drifted} of {checked} users; repaired")
+        return {'users_checked': checked, 'users_repaired': drifted}
+
+
+unread_counters = UnreadCounterService()
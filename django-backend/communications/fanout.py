@@ -0,0 +1,247 @@
+"""
+Bulk notification fan-out.
+
+``notification_fanout.notify()`` takes one event and a set of recipients.
+Nothing is written inside the caller's transaction: once it commits, the
+recipients are de-duplicated (per event via ``dedupe_key``), bursts are
+collapsed into an existing unread notification (via ``collapse_key``, e.g.
+"5 new messages"), and the remaining rows are written with one
+``bulk_create``. Real-time push and email go to the batched
+``deliver_notifications`` task.
+"""
+import logging
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, Any, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import unread_counters
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+def notification_event_data(notification: Notification) -> Dict[str, Any]:
+    """Real-time payload for a notification"""
+    return {
+        'id': str(notification.id),
+        'notification_type': notification.notification_type,
+        'title': notification.title,
+        'message': notification.message,
+        'priority': notification.priority,
+        'related_message': str(notification.related_message_id) if notification.related_message_id else None,
+        'related_project': str(notification.related_project_id) if notification.related_project_id else None,
+        'related_task': str(notification.related_task_id) if notification.related_task_id else None,
+        'metadata': notification.metadata,
+        'created_at': notification.created_at.isoformat() if notification.created_at else None,
+    }
+
+
+class NotificationFanoutService:
+    """Writes one event's notifications in bulk after the triggering commit"""
+
+    BATCH_SIZE = 500
+
+    def __init__(self):
+        self.dedupe_ttl = getattr(settings, 'NOTIFICATION_DEDUPE_TTL', 24 * 60 * 60)
+        self.collapse_window = timedelta(
+            seconds=getattr(settings, 'NOTIFICATION_COLLAPSE_WINDOW', 15 * 60)
+        )
+        self.delivery_batch_size = getattr(settings, 'NOTIFICATION_DELIVERY_BATCH_SIZE', 200)
+
+    @staticmethod
+    def _recipient_ids(recipients: Iterable) -> List:
+        ids = (getattr(recipient, 'pk', recipient) for recipient in recipients)
+        return [recipient_id for recipient_id in OrderedDict.fromkeys(ids) if recipient_id is not None]
+
+    def notify(self, recipients: Iterable, notification_type: str, title: str, message: str,
+               priority: str = 'normal', related_project=None, related_task=None,
+               related_message=None, metadata: Dict[str, Any] = None,
+               recipient_metadata: Dict[Any, Dict[str, Any]] = None,
+               dedupe_key: str = None, collapse_key: str = None,
+               collapse_title: str = None, collapse_message: str = None,
+               email: bool = False) -> int:
+        """
+        Notify recipients of one event once the current transaction commits.
+
+        Args:
+            recipients: Users or user ids; duplicates are ignored
+            metadata: Metadata shared by every recipient's notification
+            recipient_metadata: Optional per-recipient metadata, keyed by user id
+            dedupe_key: Recipients who already have a notification with this
+                key are skipped, so retried events don't notify twice
+            collapse_key: An unread notification with this key created within
+                the collapse window is updated instead of adding a new row
+            collapse_title / collapse_message: ``str.format`` templates with a
+                ``{count}`` placeholder used when collapsing
+            email: Also email the recipients
+
+        Returns:
+            Number of distinct recipients scheduled
+        """
+        recipient_ids = self._recipient_ids(recipients)
+        if not recipient_ids:
+            return 0
+
+        event = {
+            'recipient_ids': recipient_ids,
+            'notification_type': notification_type,
+            'title': title,
+            'message': message,
+            'priority': priority,
+            'related_project_id': getattr(related_project, 'pk', related_project),
+            'related_task_id': getattr(related_task, 'pk', related_task),
+            'related_message_id': getattr(related_message, 'pk', related_message),
+            'metadata': dict(metadata or {}),
+            'recipient_metadata': recipient_metadata or {},
+            'dedupe_key': dedupe_key,
+            'collapse_key': collapse_key,
+            'collapse_title': collapse_title,
+            'collapse_message': collapse_message,
+            'email': email,
+        }
+        transaction.on_commit(lambda: self._write(event))
+        return len(recipient_ids)
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        try:
+            created, collapsed = self.write(event)
+        except Exception as e:
+            logger.error(f"Error fanning out {event['notification_type']} notifications: {str(e)}")
+            return
+        self._schedule_delivery(created, collapsed, event['email'])
+
+    def _dedupe_cache_key(self, dedupe_key: str, user_id) -> str:
+        return f"notification_dedupe:{dedupe_key}:{user_id}"
+
+    def _claim(self, dedupe_key: str, recipient_ids: List) -> List:
+        """
+        Atomically claim (dedupe_key, recipient) pairs; returns the recipients
+        this call won. Concurrent or retried fan-outs of the same event race
+        on ``cache.add``, so only one of them writes each notification.
+        """
+        return [
+            user_id for user_id in recipient_ids
+            if cache.add(self._dedupe_cache_key(dedupe_key, user_id), 1, self.dedupe_ttl)
+        ]
+
+    def write(self, event: Dict[str, Any]):
+        """De-duplicate, collapse and bulk-create; returns (created, collapsed) notifications"""
+        recipient_ids = list(event['recipient_ids'])
+        dedupe_key = event['dedupe_key']
+        metadata = dict(event['metadata'])
+        claimed = []
+        if dedupe_key:
+            metadata['dedupe_key'] = dedupe_key
+            claimed = recipient_ids = self._claim(dedupe_key, recipient_ids)
+        if event['collapse_key']:
+            metadata['collapse_key'] = event['collapse_key']
+
+        try:
+            with transaction.atomic():
+                if dedupe_key and recipient_ids:
+                    # Claims expire; the stored key still catches repeats after that
+                    already_notified = set(Notification.objects.filter(
+                        recipient_id__in=recipient_ids,
+                        metadata__dedupe_key=dedupe_key
+                    ).values_list('recipient_id', flat=True))
+                    recipient_ids = [user_id for user_id in recipient_ids if user_id not in already_notified]
+
+                collapsed = []
+                if event['collapse_key'] and recipient_ids:
+                    collapsed = self._collapse(event, recipient_ids)
+                    collapsed_ids = {notification.recipient_id for notification in collapsed}
+                    recipient_ids = [user_id for user_id in recipient_ids if user_id not in collapsed_ids]
+
+                notifications = [
+                    Notification(
+                        recipient_id=user_id,
+                        notification_type=event['notification_type'],
+                        title=event['title'],
+                        message=event['message'],
+                        priority=event['priority'],
+                        related_project_id=event['related_project_id'],
+                        related_task_id=event['related_task_id'],
+                        related_message_id=event['related_message_id'],
+                        metadata=dict(metadata, **event['recipient_metadata'].get(user_id, {})),
+                    )
+                    for user_id in recipient_ids
+                ]
+                if notifications:
+                    # bulk_create skips post_save, so counters are updated here
+                    Notification.objects.bulk_create(notifications, batch_size=self.BATCH_SIZE)
+                    unread_counters.notifications_created(notifications)
+        except Exception:
+            # Release the claims so a retry of this event can still notify
+            if claimed:
+                cache.delete_many([self._dedupe_cache_key(dedupe_key, user_id) for user_id in claimed])
+            raise
+
+        logger.info(
+            f"Fanned out {event['notification_type']}: {len(notifications)} created, "
+            f"{len(collapsed)} collapsed"
+        )
+        return notifications, collapsed
+
+    def _collapse(self, event: Dict[str, Any], recipient_ids: List) -> List[Notification]:
+        """Fold this event into each recipient's latest matching unread notification"""
+        candidates = Notification.objects.select_for_update().filter(
+            recipient_id__in=recipient_ids,
+            notification_type=event['notification_type'],
+            metadata__collapse_key=event['collapse_key'],
+            is_read=False,
+            is_dismissed=False,
+            created_at__gte=timezone.now() - self.collapse_window
+        ).order_by('recipient_id', '-created_at')
+
+        latest = {}
+        for notification in candidates:
+            latest.setdefault(notification.recipient_id, notification)
+        if not latest:
+            return []
+
+        now = timezone.now()
+        for notification in latest.values():
+            count = notification.metadata.get('collapsed_count', 1) + 1
+            notification.metadata = dict(
+                notification.metadata, **event['metadata'], collapsed_count=count
+            )
+            if event['collapse_title']:
+                notification.title = event['collapse_title'].format(count=count)
+            notification.message = (
+                event['collapse_message'].format(count=count)
+                if event['collapse_message'] else event['message']
+            )
+            # Point at the newest event so opening the notification shows it
+            if event['related_message_id']:
+                notification.related_message_id = event['related_message_id']
+            notification.updated_at = now
+        # Still unread, so the unread counters are unchanged
+        Notification.objects.bulk_update(
+            list(latest.values()), ['title', 'message', 'metadata', 'related_message', 'updated_at'],
+            batch_size=self.BATCH_SIZE
+        )
+        return list(latest.values())
+
+    def _schedule_delivery(self, created: List[Notification], collapsed: List[Notification],
+                           email: bool) -> None:
+        from .tasks import deliver_notifications
+
+        batches = [
+            ([str(n.id) for n in created[start:start + self.delivery_batch_size]], [], email)
+            for start in range(0, len(created), self.delivery_batch_size)
+        ]
+        if collapsed:
+            batches.append(([], [str(n.id) for n in collapsed], False))
+        for created_ids, updated_ids, send_email in batches:
+            try:
+                deliver_notifications.delay(created_ids, updated_ids, send_email)
+            except Exception as e:
+                logger.error(f"Error queueing notification delivery: {str(e)}")
+
+
+notification_fanout = NotificationFanoutService()
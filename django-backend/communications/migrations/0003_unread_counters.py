@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0002_add_task_approval_notifications'),
+        ('users', '0004_user_availability_hours_per_week_user_bio_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadBadge',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='unread_badge', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread_conversations', models.PositiveIntegerField(default=0)),
+                ('unread_messages', models.PositiveIntegerField(default=0)),
+                ('unread_notifications', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'unread_badges',
+            },
+        ),
+        migrations.CreateModel(
+            name='ConversationUnreadCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('conversation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='unread_counters', to='communications.conversation')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversation_unread_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'conversation_unread_counters',
+                'constraints': [models.UniqueConstraint(fields=('user', 'conversation'), name='unique_conversation_unread_counter')],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_type', models.CharField(max_length=30)),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'notification_counters',
+                'constraints': [models.UniqueConstraint(fields=('user', 'notification_type'), name='unique_notification_counter')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0003_unread_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('message', 'New Message'), ('project_update', 'Project Update'), ('task_assigned', 'Task Assigned'), ('task_completed', 'Task Completed'), ('task_qa_review', 'Task QA Review'), ('task_client_approval', 'Task Client Approval'), ('task_approved', 'Task Approved'), ('task_qa_rejected', 'Task QA Rejected'), ('task_client_rejected', 'Task Client Rejected'), ('milestone_completed', 'Milestone Completed'), ('payment_received', 'Payment Received'), ('payment_warning', 'Payment Warning'), ('payment_escalation', 'Payment Escalation'), ('project_paused', 'Project Paused'), ('project_resumed', 'Project Resumed'), ('team_invitation', 'Team Invitation'), ('milestone_reached', 'Milestone Reached'), ('review_request', 'Review Request'), ('system_announcement', 'System Announcement')], max_length=30),
+        ),
+    ]
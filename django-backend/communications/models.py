@@ -226,6 +226,11 @@ class Notification(models.Model):
         ('task_client_rejected', 'Task Client Rejected'),
         ('milestone_completed', 'Milestone Completed'),
         ('payment_received', 'Payment Received'),
+        ('payment_warning', 'Payment Warning'),
+        ('payment_escalation', 'Payment Escalation'),
+        ('project_paused', 'Project Paused'),
+        ('project_resumed', 'Project Resumed'),
+        ('team_invitation', 'Team Invitation'),
         ('milestone_reached', 'Milestone Reached'),
         ('review_request', 'Review Request'),
         ('system_announcement', 'System Announcement'),
@@ -314,3 +319,53 @@ class MessageReadStatus(models.Model):
         
     def __str__(self):
         return f"{self.user.username} read message {self.message.id}"
+
+
+class ConversationUnreadCounter(models.Model):
+    """Materialized unread message count per (user, conversation)"""
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='conversation_unread_counters')
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='unread_counters')
+    unread_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'conversation_unread_counters'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'conversation'], name='unique_conversation_unread_counter'),
+        ]
+        
+    def __str__(self):
+        return f"{self.user.username} - {self.conversation_id}: {self.unread_count} unread"
+
+
+class NotificationCounter(models.Model):
+    """Materialized notification counts per (user, notification type)"""
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_counters')
+    notification_type = models.CharField(max_length=30)
+    total_count = models.PositiveIntegerField(default=0)
+    unread_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'notification_counters'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'notification_type'], name='unique_notification_counter'),
+        ]
+        
+    def __str__(self):
+        return f"{self.user.username} - {self.notification_type}: {self.unread_count}/{self.total_count}"
+
+
+class UnreadBadge(models.Model):
+    """Per-user unread totals so badge endpoints are a single-row lookup"""
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='unread_badge')
+    unread_conversations = models.PositiveIntegerField(default=0)
+    unread_messages = models.PositiveIntegerField(default=0)
+    unread_notifications = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'unread_badges'
+        
+    def __str__(self):
+        return f"{self.user.username}: {self.unread_messages} messages, {self.unread_notifications} notifications"
@@ -0,0 +1,375 @@
+"""
+Real-time push of notifications, messages and payment events.
+
+Every user has an event stream. Publishing appends the event to the user's
+stream (a capped Redis stream, so a reconnecting client can resume from its
+last event id) and announces it on a single pub/sub channel in the same
+atomic step. Each ASGI process keeps one pub/sub subscription and fans
+events out to its local connections through bounded per-connection queues.
+A connection whose queue fills up stops receiving live events and catches
+up from the stream instead, so a slow client never grows server memory.
+
+``REALTIME_BROKER = 'memory'`` swaps Redis for an in-process broker with
+the same semantics, for tests and single-process development.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def parse_event_id(event_id: Optional[str]) -> Tuple[int, int]:
+    """Stream ids are '<milliseconds>-<sequence>'; compare them as tuples"""
+    if not event_id:
+        return (0, 0)
+    try:
+        milliseconds, _, sequence = str(event_id).partition('-')
+        return (int(milliseconds), int(sequence or 0))
+    except ValueError:
+        return (0, 0)
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+# Appends the event to the user's stream and announces it on the fan-out
+# channel. KEYS: stream, channel. ARGV: maxlen, ttl, user id, event json.
+_PUBLISH_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'event', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('PUBLISH', KEYS[2], ARGV[3] .. '|' .. id .. '|' .. ARGV[4])
+return id
+"""
+
+
+class RedisStreamBroker:
+    """Per-user Redis streams with a pub/sub channel for live fan-out"""
+
+    KEY_PREFIX = 'realtime:user'
+    CHANNEL = 'realtime:events'
+
+    def __init__(self, url: str = None):
+        self.url = url or _setting('REALTIME_REDIS_URL', None) or settings.REDIS_URL
+        self.maxlen = _setting('REALTIME_STREAM_MAXLEN', 500)
+        self.ttl = _setting('REALTIME_STREAM_TTL', 60 * 60 * 24 * 7)
+        self._client = None
+        self._script = None
+        # redis.asyncio clients are bound to the event loop that created them
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _key(self, user_id) -> str:
+        return f"{self.KEY_PREFIX}:{user_id}"
+
+    def _sync_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+            self._script = self._client.register_script(_PUBLISH_SCRIPT)
+        return self._client
+
+    def _async_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            import redis.asyncio as aioredis
+            client = self._async_clients[loop] = aioredis.Redis.from_url(self.url)
+        return client
+
+    def publish(self, user_ids: Iterable, event: Dict[str, Any]) -> Dict[Any, str]:
+        """Append an event to each user's stream; returns event ids by user"""
+        user_ids = list(user_ids)
+        return dict(zip(user_ids, self.publish_many([(user_id, event) for user_id in user_ids])))
+
+    def publish_many(self, entries: List[Tuple[Any, Dict[str, Any]]]) -> List[str]:
+        """Append ``(user_id, event)`` pairs in one pipeline; returns their event ids"""
+        if not entries:
+            return []
+        self._sync_client()
+        pipeline = self._client.pipeline(transaction=False)
+        for user_id, event in entries:
+            self._script(
+                keys=[self._key(user_id), self.CHANNEL],
+                args=[self.maxlen, self.ttl, user_id, json.dumps(event, default=str)],
+                client=pipeline,
+            )
+        return [_decode(event_id) for event_id in pipeline.execute()]
+
+    async def read_since(self, user_id, last_event_id: str, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Events after ``last_event_id``, oldest first. The flag is False when
+        the stream no longer holds everything the client missed.
+        """
+        client = self._async_client()
+        key = self._key(user_id)
+        pipeline = client.pipeline(transaction=False)
+        pipeline.xrange(key, min='-', max='+', count=1)
+        pipeline.xrange(key, min=f"({last_event_id}", max='+', count=limit + 1)
+        oldest, entries = await pipeline.execute()
+
+        events = [
+            dict(json.loads(_decode(fields[b'event'])), id=_decode(entry_id))
+            for entry_id, fields in entries[:limit]
+        ]
+        complete = len(entries) <= limit and (
+            not oldest or parse_event_id(_decode(oldest[0][0])) <= parse_event_id(last_event_id)
+            or not events
+        )
+        return events, complete
+
+    async def latest_id(self, user_id) -> Optional[str]:
+        entries = await self._async_client().xrevrange(self._key(user_id), count=1)
+        return _decode(entries[0][0]) if entries else None
+
+    async def listen(self, dispatch) -> None:
+        """Deliver every published event to ``dispatch(user_id, event)`` until cancelled"""
+        pubsub = self._async_client().pubsub()
+        await pubsub.subscribe(self.CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message.get('type') != 'message':
+                    continue
+                user_id, event_id, payload = _decode(message['data']).split('|', 2)
+                dispatch(user_id, dict(json.loads(payload), id=event_id))
+        finally:
+            await pubsub.aclose()
+
+
+class InMemoryBroker:
+    """Single-process broker with the same semantics as RedisStreamBroker"""
+
+    def __init__(self):
+        self.maxlen = _setting('REALTIME_STREAM_MAXLEN', 500)
+        self._lock = threading.Lock()
+        self._streams: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.maxlen))
+        self._listeners: List[tuple] = []  # (loop, queue)
+        self._last_id = (0, 0)
+
+    def _next_id(self) -> str:
+        milliseconds = int(time.time() * 1000)
+        if milliseconds <= self._last_id[0]:
+            self._last_id = (self._last_id[0], self._last_id[1] + 1)
+        else:
+            self._last_id = (milliseconds, 0)
+        return f"{self._last_id[0]}-{self._last_id[1]}"
+
+    def publish(self, user_ids: Iterable, event: Dict[str, Any]) -> Dict[Any, str]:
+        user_ids = list(user_ids)
+        return dict(zip(user_ids, self.publish_many([(user_id, event) for user_id in user_ids])))
+
+    def publish_many(self, entries: List[Tuple[Any, Dict[str, Any]]]) -> List[str]:
+        event_ids = []
+        with self._lock:
+            for user_id, event in entries:
+                # Round-trip through JSON so both brokers hand out identical payloads
+                stored = dict(json.loads(json.dumps(event, default=str)), id=self._next_id())
+                self._streams[str(user_id)].append(stored)
+                event_ids.append(stored['id'])
+                for loop, queue in self._listeners:
+                    loop.call_soon_threadsafe(queue.put_nowait, (str(user_id), stored))
+        return event_ids
+
+    async def read_since(self, user_id, last_event_id: str, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        cursor = parse_event_id(last_event_id)
+        with self._lock:
+            stream = list(self._streams.get(str(user_id), ()))
+        events = [event for event in stream if parse_event_id(event['id']) > cursor]
+        complete = len(events) <= limit and (
+            not stream or parse_event_id(stream[0]['id']) <= cursor or not events
+        )
+        return events[:limit], complete
+
+    async def latest_id(self, user_id) -> Optional[str]:
+        with self._lock:
+            stream = self._streams.get(str(user_id))
+            return stream[-1]['id'] if stream else None
+
+    async def listen(self, dispatch) -> None:
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._listeners.append(entry)
+        try:
+            while True:
+                user_id, event = await entry[1].get()
+                dispatch(user_id, event)
+        finally:
+            with self._lock:
+                self._listeners.remove(entry)
+
+
+class Subscription:
+    """One connection's bounded queue of live events"""
+
+    def __init__(self, user_id: str, max_queue: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.lagging = False
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client reads slower than events arrive; it will catch up
+            # from the stream rather than buffer without bound here.
+            self.lagging = True
+
+
+class RealtimeHub:
+    """Fans events from the broker out to this process's connections"""
+
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.max_queue = _setting('REALTIME_QUEUE_SIZE', 256)
+        self._subscriptions: Dict[str, set] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+
+    def _dispatch(self, user_id: str, event: Dict[str, Any]) -> None:
+        for subscription in tuple(self._subscriptions.get(str(user_id), ())):
+            subscription.offer(event)
+
+    async def _listen_forever(self) -> None:
+        while True:
+            try:
+                await self.broker.listen(self._dispatch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Realtime listener failed, reconnecting: {str(e)}")
+            # Anything published while disconnected is only in the streams
+            for subscriptions in self._subscriptions.values():
+                for subscription in subscriptions:
+                    subscription.lagging = True
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+    def subscribe(self, user_id) -> Subscription:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen_forever())
+        subscription = Subscription(str(user_id), self.max_queue)
+        self._subscriptions[subscription.user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    async def events(self, user_id, last_event_id: str = None, keepalive: float = None):
+        """
+        Async iterator of events for one connection.
+
+        Replays what the user missed since ``last_event_id`` (yielding a
+        ``resync`` event if the stream was trimmed past it), then live events.
+        Yields None every ``keepalive`` seconds while idle.
+        """
+        keepalive = keepalive or _setting('REALTIME_KEEPALIVE_SECONDS', 25)
+        batch = _setting('REALTIME_REPLAY_LIMIT', 200)
+        # Subscribe before replaying so nothing published meanwhile is lost
+        subscription = self.subscribe(user_id)
+        catch_up = bool(last_event_id)
+        try:
+            if not catch_up:
+                # New clients start at the head; later catch-ups resume from there
+                last_event_id = await self.broker.latest_id(user_id)
+            cursor = parse_event_id(last_event_id)
+            while True:
+                if catch_up or subscription.lagging:
+                    subscription.lagging = False
+                    catch_up = False
+                    events, complete = await self.broker.read_since(
+                        user_id, f"{cursor[0]}-{cursor[1]}", batch
+                    )
+                    if not complete:
+                        yield {'type': 'resync', 'data': {}, 'id': None}
+                    for event in events:
+                        cursor = max(cursor, parse_event_id(event['id']))
+                        yield event
+                    continue
+
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                event_cursor = parse_event_id(event['id'])
+                if event_cursor <= cursor:
+                    continue  # already delivered by a replay
+                cursor = event_cursor
+                yield event
+        finally:
+            self.unsubscribe(subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                if _setting('REALTIME_BROKER', 'redis') == 'memory':
+                    _broker = InMemoryBroker()
+                else:
+                    _broker = RedisStreamBroker()
+    return _broker
+
+
+def get_hub() -> RealtimeHub:
+    """The hub for the running event loop"""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = RealtimeHub(get_broker())
+    return hub
+
+
+def push_event(user_ids: Iterable, event_type: str, data: Dict[str, Any]) -> Dict[Any, str]:
+    """
+    Push an event to the given users' streams.
+
+    Failures are logged and swallowed: real-time delivery is best effort and
+    clients fall back to the REST endpoints on reconnect.
+    """
+    user_ids = [user_id for user_id in dict.fromkeys(user_ids) if user_id is not None]
+    if not user_ids:
+        return {}
+    event = {'type': event_type, 'data': data, 'ts': time.time()}
+    try:
+        return get_broker().publish(user_ids, event)
+    except Exception as e:
+        logger.error(f"Error pushing realtime event {event_type}: {str(e)}")
+        return {}
+
+
+def push_events(entries: Iterable[Tuple[Any, str, Dict[str, Any]]]) -> List[str]:
+    """Push many ``(user_id, event_type, data)`` events in one round trip"""
+    now = time.time()
+    entries = [
+        (user_id, {'type': event_type, 'data': data, 'ts': now})
+        for user_id, event_type, data in entries if user_id is not None
+    ]
+    if not entries:
+        return []
+    try:
+        return get_broker().publish_many(entries)
+    except Exception as e:
+        logger.error(f"Error pushing {len(entries)} realtime events: {str(e)}")
+        return []
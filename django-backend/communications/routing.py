@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import consumers
+
+websocket_urlpatterns = [
+    path('ws/notifications/', consumers.NotificationStreamConsumer.as_asgi()),
+]
+
+http_urlpatterns = [
+    path('api/communications/stream/', consumers.NotificationEventSourceConsumer.as_asgi()),
+]
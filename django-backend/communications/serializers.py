@@ -2,7 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import (
     Conversation, Message, MessageThread, FileAttachment, 
-    Notification, MessageReadStatus
+    Notification, MessageReadStatus, ConversationUnreadCounter
 )
 
 User = get_user_model()
@@ -175,13 +175,13 @@ class ConversationSerializer(serializers.ModelSerializer):
         """Get unread message count for current user"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            # Count messages not read by current user
-            read_message_ids = MessageReadStatus.objects.filter(
-                user=request.user,
-                message__conversation=obj
-            ).values_list('message_id', flat=True)
-            
-            return obj.messages.exclude(id__in=read_message_ids).count()
+            # Annotated by ConversationViewSet; fall back to the counter row
+            if hasattr(obj, 'user_unread_count'):
+                return obj.user_unread_count or 0
+            counter = ConversationUnreadCounter.objects.filter(
+                user=request.user, conversation=obj
+            ).values_list('unread_count', flat=True).first()
+            return counter or 0
         return 0
 
 
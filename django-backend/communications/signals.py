@@ -0,0 +1,133 @@
+"""
+Keep unread counters in step with new messages and notifications, notify
+conversation participants of new messages, and push new notifications,
+messages and payment/milestone changes to connected users once the
+surrounding transaction commits.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from payments.models import Milestone, Payment
+from .counters import unread_counters
+from .fanout import notification_event_data, notification_fanout
+from .models import Message, Notification
+from .realtime import push_event, push_events
+
+
+def _push_on_commit(user_ids, event_type, data):
+    transaction.on_commit(lambda: push_event(user_ids, event_type, data))
+
+
+@receiver(post_save, sender=Message, dispatch_uid='counters_message_created')
+def count_message(sender, instance, created, **kwargs):
+    if created:
+        unread_counters.message_created(instance)
+
+
+@receiver(post_save, sender=Notification, dispatch_uid='counters_notification_created')
+def count_notification(sender, instance, created, **kwargs):
+    if created:
+        unread_counters.notification_created(instance)
+
+
+@receiver(post_delete, sender=Notification, dispatch_uid='counters_notification_deleted')
+def uncount_notification(sender, instance, **kwargs):
+    unread_counters.notification_deleted(instance)
+
+
+@receiver(post_save, sender=Notification, dispatch_uid='realtime_notification_created')
+def push_notification(sender, instance, created, **kwargs):
+    if not created:
+        return
+    _push_on_commit([instance.recipient_id], 'notification.created', notification_event_data(instance))
+
+
+@receiver(post_save, sender=Message, dispatch_uid='realtime_message_created')
+def push_message(sender, instance, created, **kwargs):
+    if not created:
+        return
+    data = {
+        'id': str(instance.id),
+        'conversation': str(instance.conversation_id),
+        'sender': instance.sender_id,
+        'message_type': instance.message_type,
+        'content': instance.content,
+        'reply_to': str(instance.reply_to_id) if instance.reply_to_id else None,
+        'created_at': instance.created_at.isoformat(),
+    }
+
+    def publish():
+        recipients = instance.conversation.participants.exclude(
+            id=instance.sender_id
+        ).values_list('id', flat=True)
+        push_event(recipients, 'message.created', data)
+
+    transaction.on_commit(publish)
+
+
+@receiver(post_save, sender=Message, dispatch_uid='notify_message_created')
+def notify_message(sender, instance, created, **kwargs):
+    if not created or instance.message_type not in ('text', 'file'):
+        return
+    # A burst in one conversation folds into a single "N new messages" notification
+    notification_fanout.notify(
+        instance.conversation.participants.exclude(id=instance.sender_id).values_list('id', flat=True),
+        notification_type='message',
+        title=f'New message from {instance.sender.username}',
+        message=instance.content[:200],
+        related_message=instance,
+        metadata={'conversation_id': str(instance.conversation_id)},
+        collapse_key=f'messages:{instance.conversation_id}',
+        collapse_title='{count} new messages',
+    )
+
+
+def payment_event_data(payment, created=False):
+    return {
+        'id': str(payment.id),
+        'milestone': str(payment.milestone_id),
+        'amount': str(payment.amount),
+        'payment_type': payment.payment_type,
+        'status': payment.status,
+        'created': created,
+    }
+
+
+def push_payment_updates(payments, created=False):
+    """Push payment.updated to each payment's developer and client"""
+    payments = list(payments)
+    if not payments:
+        return
+    client_ids = dict(Milestone.objects.filter(
+        id__in={payment.milestone_id for payment in payments}
+    ).values_list('id', 'project__client_id'))
+    push_events([
+        (user_id, 'payment.updated', payment_event_data(payment, created))
+        for payment in payments
+        for user_id in dict.fromkeys([payment.developer_id, client_ids.get(payment.milestone_id)])
+    ])
+
+
+@receiver(post_save, sender=Payment, dispatch_uid='realtime_payment_updated')
+def push_payment(sender, instance, created, **kwargs):
+    transaction.on_commit(lambda: push_payment_updates([instance], created))
+
+
+@receiver(post_save, sender=Milestone, dispatch_uid='realtime_milestone_updated')
+def push_milestone(sender, instance, created, **kwargs):
+    def publish():
+        from projects.models import Project
+        user_ids = Project.objects.filter(id=instance.project_id).values_list(
+            'client_id', 'senior_developer_id'
+        ).first() or ()
+        push_event(user_ids, 'milestone.updated', {
+            'id': str(instance.id),
+            'project': str(instance.project_id),
+            'percentage': instance.percentage,
+            'amount': str(instance.amount),
+            'status': instance.status,
+            'created': created,
+        })
+
+    transaction.on_commit(publish)
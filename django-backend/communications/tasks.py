@@ -0,0 +1,85 @@
+"""
+Celery tasks for communications
+"""
+from celery import shared_task
+import logging
+
+from .counters import unread_counters
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def repair_unread_counters(user_ids=None, batch_size=500):
+    """
+    Recompute materialized unread counters from messages and notifications
+    and correct any drift
+    """
+    try:
+        result = unread_counters.repair(user_ids=user_ids, batch_size=batch_size)
+        logger.info(f"Unread counter repair: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Error repairing unread counters: {str(e)}")
+        return {'error': str(e)}
+
+
+@shared_task(bind=True, max_retries=3)
+def deliver_notifications(self, notification_ids, updated_ids=None, send_email=False):
+    """
+    Deliver a batch of fanned-out notifications: one real-time push pipeline
+    for the batch (including notifications updated by collapsing) and, when
+    requested, emails over a single SMTP connection
+    """
+    from django.conf import settings
+    from django.core.mail import EmailMessage, get_connection
+    from django.utils import timezone
+
+    from .fanout import notification_event_data
+    from .models import Notification
+    from .realtime import push_events
+
+    try:
+        notifications = list(
+            Notification.objects.filter(id__in=notification_ids).select_related('recipient')
+        )
+        updated = list(Notification.objects.filter(id__in=updated_ids or []))
+
+        # Skip rows already pushed so a retry after an email failure doesn't push twice
+        unpushed = [n for n in notifications if not n.push_sent]
+        pushed = push_events(
+            [(n.recipient_id, 'notification.created', notification_event_data(n)) for n in unpushed]
+            + [(n.recipient_id, 'notification.updated', notification_event_data(n)) for n in updated]
+        )
+        if pushed and unpushed:
+            Notification.objects.filter(id__in=[n.id for n in unpushed]).update(
+                push_sent=True, updated_at=timezone.now()
+            )
+
+        emailed = []
+        if send_email:
+            pending = [n for n in notifications if not n.email_sent and n.recipient.email]
+            messages = [
+                EmailMessage(
+                    subject=n.title,
+                    body=n.message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[n.recipient.email]
+                )
+                for n in pending
+            ]
+            if messages:
+                connection = get_connection()
+                connection.send_messages(messages)
+                emailed = [n.id for n in pending]
+                Notification.objects.filter(id__in=emailed).update(
+                    email_sent=True, updated_at=timezone.now()
+                )
+
+        return {
+            'pushed': len(pushed),
+            'emailed': len(emailed)
+        }
+    except Exception as e:
+        logger.error(f"Error delivering notifications: {str(e)}")
+        raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
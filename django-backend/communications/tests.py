@@ -1,3 +1,263 @@
-from django.test import TestCase
+"""
+Tests for real-time delivery and unread counters
+"""
+import asyncio
+import json
+from unittest import mock
 
-# Create your tests here.
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from communications import realtime
+from communications.consumers import NotificationEventSourceConsumer, NotificationStreamConsumer
+from communications.counters import unread_counters
+from communications.fanout import notification_fanout
+from communications.models import (
+    Conversation, Message, Notification, ConversationUnreadCounter, NotificationCounter, UnreadBadge
+)
+
+User = get_user_model()
+
+
+class RealtimeConsumerTest(TransactionTestCase):
+    """Test cases for the SSE and WebSocket push endpoints"""
+
+    def setUp(self):
+        """Set up a user and an in-process broker"""
+        self.user = User.objects.create(username='listener', email='listener@example.com')
+        self.token = str(AccessToken.for_user(self.user))
+        patcher = mock.patch.object(realtime, '_broker', realtime.InMemoryBroker())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def http_scope(self, token=None):
+        query_string = f'token={token}'.encode() if token else b''
+        return {
+            'type': 'http', 'method': 'GET', 'path': '/api/communications/stream/',
+            'query_string': query_string, 'headers': [],
+        }
+
+    async def wait_for_subscription(self):
+        hub = realtime.get_hub()
+        for _ in range(200):
+            if hub._subscriptions.get(str(self.user.pk)):
+                return
+            await asyncio.sleep(0.01)
+        self.fail('Stream never subscribed to the hub')
+
+    async def test_sse_delivers_published_notification(self):
+        """Test that a notification published while connected arrives as one SSE frame"""
+        communicator = ApplicationCommunicator(
+            NotificationEventSourceConsumer.as_asgi(), self.http_scope(self.token)
+        )
+        await communicator.send_input({'type': 'http.request', 'body': b'', 'more_body': False})
+
+        start = await communicator.receive_output(timeout=5)
+        self.assertEqual(start['type'], 'http.response.start')
+        self.assertEqual(start['status'], 200)
+
+        await self.wait_for_subscription()
+        realtime.push_event([self.user.pk], 'notification', {'title': 'Milestone approved'})
+
+        body = await communicator.receive_output(timeout=5)
+        self.assertEqual(body['type'], 'http.response.body')
+        self.assertTrue(body['more_body'])
+        frame = body['body'].decode()
+        data_lines = [line for line in frame.splitlines() if line.startswith('data:')]
+        self.assertEqual(len(data_lines), 1)
+        self.assertIn('event: notification', frame)
+        self.assertEqual(json.loads(data_lines[0][5:])['data'], {'title': 'Milestone approved'})
+        self.assertTrue(await communicator.receive_nothing(timeout=0.2))
+
+        await communicator.send_input({'type': 'http.disconnect'})
+        await communicator.wait(timeout=5)
+        self.assertFalse(realtime.get_hub()._subscriptions.get(str(self.user.pk)))
+
+    async def test_sse_rejects_missing_token(self):
+        """Test that the stream answers 401 without a token"""
+        communicator = ApplicationCommunicator(NotificationEventSourceConsumer.as_asgi(), self.http_scope())
+        await communicator.send_input({'type': 'http.request', 'body': b'', 'more_body': False})
+
+        start = await communicator.receive_output(timeout=5)
+        self.assertEqual(start['status'], 401)
+        await communicator.wait(timeout=5)
+
+    async def test_websocket_delivers_published_notification(self):
+        """Test that a notification published while connected arrives as one WebSocket frame"""
+        communicator = ApplicationCommunicator(NotificationStreamConsumer.as_asgi(), {
+            'type': 'websocket', 'path': '/ws/notifications/',
+            'query_string': f'token={self.token}'.encode(), 'headers': [], 'subprotocols': [],
+        })
+        await communicator.send_input({'type': 'websocket.connect'})
+        self.assertEqual((await communicator.receive_output(timeout=5))['type'], 'websocket.accept')
+
+        await self.wait_for_subscription()
+        realtime.push_event([self.user.pk], 'notification', {'title': 'New message'})
+
+        message = await communicator.receive_output(timeout=5)
+        self.assertEqual(message['type'], 'websocket.send')
+        self.assertEqual(json.loads(message['text'])['data'], {'title': 'New message'})
+
+        await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await communicator.wait(timeout=5)
+
+
+class UnreadCounterTest(TestCase):
+    """Test cases for the materialized unread counters"""
+
+    def setUp(self):
+        """Set up a direct conversation between two users"""
+        self.sender = User.objects.create(username='sender', email='sender@example.com')
+        self.reader = User.objects.create(username='reader', email='reader@example.com')
+        self.conversation = Conversation.objects.create(created_by=self.sender)
+        self.conversation.participants.add(self.sender, self.reader)
+
+    def notify(self, notification_type='message', **kwargs):
+        return Notification.objects.create(
+            recipient=self.reader, notification_type=notification_type,
+            title='Title', message='Body', **kwargs
+        )
+
+    def test_notification_counters_follow_create_read_and_delete(self):
+        """Test that notification counters and the badge track creates, reads and deletes"""
+        first = self.notify()
+        self.notify()
+        self.notify('payment_received')
+
+        counter = NotificationCounter.objects.get(user=self.reader, notification_type='message')
+        self.assertEqual((counter.total_count, counter.unread_count), (2, 2))
+        self.assertEqual(UnreadBadge.objects.get(user=self.reader).unread_notifications, 3)
+
+        self.assertEqual(unread_counters.notifications_read(self.reader, [first.id]), 1)
+        first.refresh_from_db()
+        first.delete()
+
+        counter.refresh_from_db()
+        self.assertEqual((counter.total_count, counter.unread_count), (1, 1))
+        self.assertEqual(UnreadBadge.objects.get(user=self.reader).unread_notifications, 2)
+        self.assertFalse(unread_counters.rebuild_user(self.reader)['drifted'])
+
+    def test_deleting_recipient_with_notifications(self):
+        """Test that a user with notifications can be deleted along with their counters"""
+        self.notify()
+        self.notify('payment_received', is_read=True)
+
+        self.reader.delete()
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(NotificationCounter.objects.exists())
+        self.assertFalse(UnreadBadge.objects.filter(user_id=self.reader.pk).exists())
+
+    def test_messages_read_decrements_once(self):
+        """Test that reading a conversation twice only subtracts its messages once"""
+        for content in ('one', 'two'):
+            Message.objects.create(conversation=self.conversation, sender=self.sender, content=content)
+        badge = UnreadBadge.objects.get(user=self.reader)
+        self.assertEqual((badge.unread_conversations, badge.unread_messages), (1, 2))
+
+        self.assertEqual(unread_counters.messages_read(self.reader, self.conversation.id), 2)
+        self.assertEqual(unread_counters.messages_read(self.reader, self.conversation.id), 0)
+
+        counter = ConversationUnreadCounter.objects.get(user=self.reader, conversation=self.conversation)
+        self.assertEqual(counter.unread_count, 0)
+        badge.refresh_from_db()
+        self.assertEqual((badge.unread_conversations, badge.unread_messages), (0, 0))
+
+
+class NotificationFanoutTest(TestCase):
+    """Test cases for bulk notification fan-out"""
+
+    def setUp(self):
+        """Set up recipients and stub out delivery"""
+        cache.clear()
+        self.users = [
+            User.objects.create(username=f'member{index}', email=f'member{index}@example.com')
+            for index in range(3)
+        ]
+        patcher = mock.patch('communications.tasks.deliver_notifications.delay')
+        self.deliver = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fan_out(self, recipients, dedupe_key='project_paused:1'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return notification_fanout.notify(
+                recipients, notification_type='project_paused', title='Paused', message='Project paused',
+                dedupe_key=dedupe_key
+            )
+
+    def test_dedupe_key_notifies_each_recipient_once(self):
+        """Test that repeating an event only notifies recipients who were not notified yet"""
+        self.fan_out(self.users[:2])
+        self.fan_out(self.users)
+
+        self.assertEqual(
+            sorted(Notification.objects.values_list('recipient_id', flat=True)),
+            sorted(user.pk for user in self.users)
+        )
+        self.assertEqual(UnreadBadge.objects.get(user=self.users[0]).unread_notifications, 1)
+        self.assertEqual(self.deliver.call_count, 2)
+
+    def test_recipient_claimed_by_concurrent_fanout_is_skipped(self):
+        """Test that a recipient already claimed for the event by another writer is skipped"""
+        cache.add(notification_fanout._dedupe_cache_key('project_paused:1', self.users[0].pk), 1)
+
+        self.fan_out(self.users)
+
+        self.assertFalse(Notification.objects.filter(recipient=self.users[0]).exists())
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_failed_write_releases_claims(self):
+        """Test that claims are released when the write fails so a retry can notify"""
+        with mock.patch.object(Notification.objects, 'bulk_create', side_effect=RuntimeError('db down')):
+            self.fan_out(self.users)
+        self.assertFalse(Notification.objects.exists())
+
+        self.fan_out(self.users)
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_high_priority_is_not_emailed_by_default(self):
+        """Test that only callers asking for email get it, whatever the priority"""
+        with self.captureOnCommitCallbacks(execute=True):
+            notification_fanout.notify(
+                self.users, notification_type='project_paused', title='Paused', message='Project paused',
+                priority='high'
+            )
+
+        created_ids, updated_ids, send_email = self.deliver.call_args[0]
+        self.assertEqual(len(created_ids), 3)
+        self.assertFalse(send_email)
+
+    def test_message_burst_collapses_into_one_notification(self):
+        """Test that a burst of messages leaves each recipient one "N new messages" notification"""
+        sender, *readers = self.users
+        conversation = Conversation.objects.create(created_by=sender)
+        conversation.participants.add(*self.users)
+
+        for content in ('one', 'two', 'three'):
+            with self.captureOnCommitCallbacks(execute=True):
+                latest = Message.objects.create(conversation=conversation, sender=sender, content=content)
+
+        self.assertFalse(Notification.objects.filter(recipient=sender).exists())
+        for reader in readers:
+            notification = Notification.objects.get(recipient=reader, notification_type='message')
+            self.assertEqual(notification.title, '3 new messages')
+            self.assertEqual(notification.message, 'three')
+            self.assertEqual(notification.related_message_id, latest.id)
+            self.assertEqual(notification.metadata['collapsed_count'], 3)
+            self.assertEqual(UnreadBadge.objects.get(user=reader).unread_notifications, 1)
+
+        created_ids, updated_ids, send_email = self.deliver.call_args[0]
+        self.assertEqual(created_ids, [])
+        self.assertEqual(len(updated_ids), 2)
+
+        # Once read, the next message starts a new notification
+        unread_counters.notifications_read(readers[0], list(
+            Notification.objects.filter(recipient=readers[0]).values_list('id', flat=True)
+        ))
+        with self.captureOnCommitCallbacks(execute=True):
+            Message.objects.create(conversation=conversation, sender=sender, content='four')
+        self.assertEqual(Notification.objects.filter(recipient=readers[0]).count(), 2)
+        self.assertEqual(Notification.objects.filter(recipient=readers[1]).count(), 1)
@@ -3,12 +3,13 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count
+from django.db.models import OuterRef, Subquery
 from django.utils import timezone
 
+from .counters import unread_counters
 from .models import (
     Conversation, Message, MessageThread, FileAttachment, 
-    Notification, MessageReadStatus
+    Notification, MessageReadStatus, ConversationUnreadCounter
 )
 from .serializers import (
     ConversationSerializer, ConversationDetailSerializer, ConversationCreateSerializer,
@@ -30,8 +31,13 @@ class ConversationViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Return conversations where user is a participant"""
+        unread = ConversationUnreadCounter.objects.filter(
+            user=self.request.user, conversation=OuterRef('pk')
+        ).values('unread_count')[:1]
         return Conversation.objects.filter(
             participants=self.request.user
+        ).annotate(
+            user_unread_count=Subquery(unread)
         ).prefetch_related('participants', 'messages', 'threads')
     
     def get_serializer_class(self):
@@ -100,12 +106,11 @@ class ConversationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get total unread conversations count"""
-        unread_count = self.get_queryset().filter(
-            messages__read_statuses__isnull=True,
-            messages__sender__ne=request.user
-        ).distinct().count()
-        
-        return Response({'unread_count': unread_count})
+        badge = unread_counters.get_badge(request.user)
+        return Response({
+            'unread_count': badge.unread_conversations,
+            'unread_messages': badge.unread_messages
+        })
 
 
 class MessageViewSet(viewsets.ModelViewSet):
@@ -131,23 +136,14 @@ class MessageViewSet(viewsets.ModelViewSet):
         return MessageSerializer
     
     def perform_create(self, serializer):
-        """Set sender and update conversation metadata"""
-        message = serializer.save(sender=self.request.user)
-        
-        # Update conversation metadata
-        conversation = message.conversation
-        conversation.last_message_at = timezone.now()
-        conversation.message_count = conversation.messages.count()
-        conversation.save()
+        """Set sender; conversation metadata and unread counters follow the save"""
+        serializer.save(sender=self.request.user)
     
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         """Mark message as read by current user"""
         message = self.get_object()
-        MessageReadStatus.objects.get_or_create(
-            message=message,
-            user=request.user
-        )
+        unread_counters.messages_read(request.user, message.conversation_id, [message.id])
         return Response({'status': 'marked as read'})
     
     @action(detail=True, methods=['post'])
@@ -202,16 +198,7 @@ class MessageViewSet(viewsets.ModelViewSet):
         conversation_id = request.data.get('conversation_id')
         
         if conversation_id:
-            messages = self.get_queryset().filter(
-                conversation_id=conversation_id
-            ).exclude(sender=request.user)
-            
-            for message in messages:
-                MessageReadStatus.objects.get_or_create(
-                    message=message,
-                    user=request.user
-                )
-            
+            unread_counters.messages_read(request.user, conversation_id)
             return Response({'status': 'conversation marked as read'})
         
         return Response(
@@ -337,13 +324,18 @@ class NotificationViewSet(viewsets.ModelViewSet):
             return NotificationUpdateSerializer
         return NotificationSerializer
     
+    def perform_update(self, serializer):
+        """Keep unread counters in step when is_read is toggled"""
+        was_read = serializer.instance.is_read
+        notification = serializer.save()
+        if notification.is_read != was_read:
+            unread_counters.notification_read_changed(notification)
+    
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         """Mark notification as read"""
         notification = self.get_object()
-        notification.is_read = True
-        notification.read_at = timezone.now()
-        notification.save()
+        unread_counters.notifications_read(request.user, [notification.id])
         return Response({'status': 'marked as read'})
     
     @action(detail=True, methods=['post'])
@@ -358,26 +350,20 @@ class NotificationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         """Mark all notifications as read"""
-        self.get_queryset().filter(is_read=False).update(
-            is_read=True,
-            read_at=timezone.now()
-        )
+        unread_counters.notifications_read(request.user)
         return Response({'status': 'all notifications marked as read'})
     
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get unread notifications count"""
-        unread_count = self.get_queryset().filter(is_read=False).count()
-        return Response({'unread_count': unread_count})
+        badge = unread_counters.get_badge(request.user)
+        return Response({'unread_count': badge.unread_notifications})
     
     @action(detail=False, methods=['get'])
     def summary(self, request):
         """Get notifications summary by type"""
-        summary = self.get_queryset().values('notification_type').annotate(
-            count=Count('id'),
-            unread_count=Count('id', filter=Q(is_read=False))
-        )
-        return Response({'summary': list(summary)})
+        summary = unread_counters.get_notification_summary(request.user)
+        return Response({'summary': summary})
 
 
 class MessageReadStatusViewSet(viewsets.ReadOnlyModelViewSet):
@@ -0,0 +1,157 @@
+"""
+Request-scoped batch loading for community serializers.
+
+Several serializer method fields look up something per object: the current
+user's registration for an event, their team in a hackathon, their
+participation in a session, or counts such as a team's size. Run once per
+object, a page of 50 events costs 50 extra queries per field.
+
+``CommunityLoader`` batches those lookups in the style of a DataLoader. List
+serializers built on ``BatchedListSerializer`` tell the loader which keys the
+page needs (``prime``) before rendering. The first ``load`` of a relation then
+fetches every pending key in one query and caches the results for the rest of
+the request. A key that was never primed, as in a detail view, is loaded on
+its own, so the cost is the same as a direct query.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, Set
+
+from django.db.models import Count
+from rest_framework import serializers
+
+from .models import (
+    Event, EventRegistration, HackathonTeam, Meetup, Prize, Winner,
+    VirtualMeetingSession, SessionParticipant
+)
+
+LOADER_CONTEXT_KEY = 'community_loader'
+
+
+class CommunityLoader:
+    """Batches and caches per-object lookups for one request"""
+
+    def __init__(self, user=None):
+        self.user = user
+        self._pending: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._cache: Dict[str, Dict[Hashable, Any]] = defaultdict(dict)
+
+    def prime(self, relation: str, keys: Iterable[Hashable]) -> None:
+        """Queue keys so the next load of ``relation`` fetches them together"""
+        loaded = self._cache[relation]
+        self._pending[relation].update(
+            key for key in keys if key is not None and key not in loaded
+        )
+
+    def load(self, relation: str, key: Hashable) -> Any:
+        """Value of ``relation`` for ``key``, fetching all pending keys on a miss"""
+        cache = self._cache[relation]
+        if key not in cache:
+            keys = self._pending.pop(relation, set())
+            keys.add(key)
+            cache.update(getattr(self, f'_batch_{relation}')(keys))
+        return cache[key]
+
+    # Batch functions take a set of keys and return a value for every key
+
+    def _batch_event_registration(self, event_ids):
+        """Current user's registration per event"""
+        registrations = {
+            registration.event_id: registration
+            for registration in EventRegistration.objects.filter(user=self.user, event_id__in=event_ids)
+        }
+        return {event_id: registrations.get(event_id) for event_id in event_ids}
+
+    def _batch_hackathon_team(self, hackathon_ids):
+        """Current user's team per hackathon"""
+        teams = {}
+        for team in HackathonTeam.objects.filter(
+            members=self.user, hackathon_id__in=hackathon_ids
+        ).order_by('created_at'):
+            teams.setdefault(team.hackathon_id, team)
+        return {hackathon_id: teams.get(hackathon_id) for hackathon_id in hackathon_ids}
+
+    def _batch_team_size(self, team_ids):
+        sizes = dict(
+            HackathonTeam.members.through.objects.filter(
+                hackathonteam_id__in=team_ids
+            ).values('hackathonteam_id').annotate(size=Count('id')).values_list('hackathonteam_id', 'size')
+        )
+        return {team_id: sizes.get(team_id, 0) for team_id in team_ids}
+
+    def _batch_hackathon_prizes(self, hackathon_ids):
+        prizes = defaultdict(list)
+        for prize in Prize.objects.filter(hackathon_id__in=hackathon_ids):
+            prizes[prize.hackathon_id].append(prize)
+        return {hackathon_id: prizes[hackathon_id] for hackathon_id in hackathon_ids}
+
+    def _batch_prize_winner_count(self, prize_ids):
+        counts = dict(
+            Winner.objects.filter(prize_id__in=prize_ids).values('prize_id').annotate(
+                count=Count('id')
+            ).values_list('prize_id', 'count')
+        )
+        return {prize_id: counts.get(prize_id, 0) for prize_id in prize_ids}
+
+    def _batch_meetup_attendance(self, meetup_ids):
+        """Whether the current user is a regular attendee, per meetup"""
+        attending = set(
+            Meetup.regular_attendees.through.objects.filter(
+                user_id=self.user.pk, meetup_id__in=meetup_ids
+            ).values_list('meetup_id', flat=True)
+        )
+        return {meetup_id: meetup_id in attending for meetup_id in meetup_ids}
+
+    def _batch_session_participation(self, session_ids):
+        """Current user's participation per session"""
+        participations = {
+            participant.session_id: participant
+            for participant in SessionParticipant.objects.filter(user=self.user, session_id__in=session_ids)
+        }
+        return {session_id: participations.get(session_id) for session_id in session_ids}
+
+    def _batch_session_participant_count(self, session_ids):
+        counts = dict(
+            SessionParticipant.objects.filter(session_id__in=session_ids).values('session_id').annotate(
+                count=Count('id')
+            ).values_list('session_id', 'count')
+        )
+        return {session_id: counts.get(session_id, 0) for session_id in session_ids}
+
+    def _batch_session_co_host(self, session_ids):
+        """Whether the current user co-hosts each session"""
+        co_hosted = set(
+            VirtualMeetingSession.co_hosts.through.objects.filter(
+                user_id=self.user.pk, virtualmeetingsession_id__in=session_ids
+            ).values_list('virtualmeetingsession_id', flat=True)
+        )
+        return {session_id: session_id in co_hosted for session_id in session_ids}
+
+    def _batch_event_co_organizer(self, event_ids):
+        """Whether the current user co-organizes each event"""
+        co_organized = set(
+            Event.co_organizers.through.objects.filter(
+                user_id=self.user.pk, event_id__in=event_ids
+            ).values_list('event_id', flat=True)
+        )
+        return {event_id: event_id in co_organized for event_id in event_ids}
+
+
+def community_loader(context: Dict) -> CommunityLoader:
+    """The loader shared by every serializer rendering the current request"""
+    loader = context.get(LOADER_CONTEXT_KEY)
+    if loader is None:
+        request = context.get('request')
+        loader = CommunityLoader(getattr(request, 'user', None))
+        context[LOADER_CONTEXT_KEY] = loader
+    return loader
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """List serializer that primes the loader with the whole page before rendering it"""
+
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, 'all') else data)
+        prime_loader = getattr(self.child, 'prime_loader', None)
+        if prime_loader and items:
+            prime_loader(community_loader(self.context), items)
+        return super().to_representation(items)
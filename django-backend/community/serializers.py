@@ -5,6 +5,7 @@ from .models import (
     Prize, Winner, CommunityPost, VirtualMeetingSession, SessionParticipant,
     MeetingRecording, CalendarIntegration
 )
+from .loaders import BatchedListSerializer, community_loader
 
 User = get_user_model()
 
@@ -44,6 +45,11 @@ class EventSerializer(serializers.ModelSerializer):
             'id', 'organizer', 'registration_count', 'attendance_count',
             'created_at', 'updated_at'
         ]
+        list_serializer_class = BatchedListSerializer
+    
+    @staticmethod
+    def prime_loader(loader, events):
+        loader.prime('event_registration', (event.pk for event in events))
     
     def get_registration_status(self, obj):
         """Get registration status for this event"""
@@ -62,16 +68,14 @@ class EventSerializer(serializers.ModelSerializer):
         """Get current user's registration for this event"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            try:
-                registration = EventRegistration.objects.get(user=request.user, event=obj)
+            registration = community_loader(self.context).load('event_registration', obj.pk)
+            if registration:
                 return {
                     'id': registration.id,
                     'status': registration.status,
                     'checked_in': registration.checked_in,
                     'payment_completed': registration.payment_completed,
                 }
-            except EventRegistration.DoesNotExist:
-                return None
         return None
     
     def get_spots_remaining(self, obj):
@@ -130,6 +134,11 @@ class PrizeSerializer(serializers.ModelSerializer):
             'created_at'
         ]
         read_only_fields = ['id', 'sponsor', 'created_at']
+        list_serializer_class = BatchedListSerializer
+    
+    @staticmethod
+    def prime_loader(loader, prizes):
+        loader.prime('prize_winner_count', (prize.pk for prize in prizes))
     
     def get_event_details(self, obj):
         """Get basic event information"""
@@ -153,7 +162,7 @@ class PrizeSerializer(serializers.ModelSerializer):
     
     def get_winners_count(self, obj):
         """Get count of winners for this prize"""
-        return obj.winners.count()
+        return community_loader(self.context).load('prize_winner_count', obj.pk)
 
 
 class HackathonTeamSerializer(serializers.ModelSerializer):
@@ -179,6 +188,12 @@ class HackathonTeamSerializer(serializers.ModelSerializer):
             'id', 'team_leader', 'submitted_at', 'final_score', 'ranking',
             'created_at', 'updated_at'
         ]
+        list_serializer_class = BatchedListSerializer
+    
+    @staticmethod
+    def prime_loader(loader, teams):
+        loader.prime('team_size', (team.pk for team in teams))
+        loader.prime('hackathon_team', (team.hackathon_id for team in teams))
     
     def get_hackathon_details(self, obj):
         """Get basic hackathon information"""
@@ -194,7 +209,7 @@ class HackathonTeamSerializer(serializers.ModelSerializer):
     
     def get_team_size(self, obj):
         """Get current team size"""
-        return obj.members.count()
+        return community_loader(self.context).load('team_size', obj.pk)
     
     def get_can_join(self, obj):
         """Check if current user can join this team"""
@@ -202,14 +217,11 @@ class HackathonTeamSerializer(serializers.ModelSerializer):
         if request and request.user.is_authenticated:
             # Check if team is looking for members and not full
             if obj.looking_for_members and obj.hackathon:
-                current_size = obj.members.count()
+                loader = community_loader(self.context)
+                current_size = loader.load('team_size', obj.pk)
                 if current_size < obj.hackathon.max_team_size:
                     # Check if user is not already in another team for this hackathon
-                    user_teams = HackathonTeam.objects.filter(
-                        hackathon=obj.hackathon,
-                        members=request.user
-                    )
-                    return not user_teams.exists()
+                    return loader.load('hackathon_team', obj.hackathon_id) is None
         return False
 
 
@@ -234,6 +246,13 @@ class HackathonSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'id', 'team_count', 'submission_count', 'created_at', 'updated_at'
         ]
+        list_serializer_class = BatchedListSerializer
+    
+    @staticmethod
+    def prime_loader(loader, hackathons):
+        hackathon_ids = [hackathon.pk for hackathon in hackathons]
+        loader.prime('hackathon_prizes', hackathon_ids)
+        loader.prime('hackathon_team', hackathon_ids)
     
     def get_event_details(self, obj):
         """Get basic event information"""
@@ -249,9 +268,9 @@ class HackathonSerializer(serializers.ModelSerializer):
     
     def get_prizes_summary(self, obj):
         """Get summary of prizes for this hackathon"""
-        prizes = obj.prizes.all()
+        prizes = community_loader(self.context).load('hackathon_prizes', obj.pk)
         return {
-            'total_prizes': prizes.count(),
+            'total_prizes': len(prizes),
             'total_value': sum(prize.value or 0 for prize in prizes),
             'categories': list(set(prize.category for prize in prizes if prize.category)),
         }
@@ -260,16 +279,14 @@ class HackathonSerializer(serializers.ModelSerializer):
         """Get current user's team for this hackathon"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            try:
-                team = HackathonTeam.objects.get(hackathon=obj, members=request.user)
+            team = community_loader(self.context).load('hackathon_team', obj.pk)
+            if team:
                 return {
                     'id': team.id,
                     'name': team.name,
                     'status': team.status,
-                    'is_leader': team.team_leader == request.user,
+                    'is_leader': team.team_leader_id == request.user.id,
                 }
-            except HackathonTeam.DoesNotExist:
-                return None
         return None
     
     def get_registration_status(self, obj):
@@ -299,6 +316,11 @@ class MeetupSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = BatchedListSerializer
+    
+    @staticmethod
+    def prime_loader(loader, meetups):
+        loader.prime('meetup_attendance', (meetup.pk for meetup in meetups))
     
     def get_event_details(self, obj):
         """Get basic event information"""
@@ -315,7 +337,7 @@ class MeetupSerializer(serializers.ModelSerializer):
         """Check if current user is a regular attendee"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return obj.regular_attendees.filter(id=request.user.id).exists()
+            return community_loader(self.context).load('meetup_attendance', obj.pk)
         return False
 
 
@@ -526,6 +548,14 @@ class VirtualMeetingSessionSerializer(serializers.ModelSerializer):
             'id', 'host', 'actual_start', 'actual_end', 'max_participants',
             'total_duration_minutes', 'recordings', 'created_at', 'updated_at'
         ]
+        list_serializer_class = BatchedListSerializer
+    
+    @staticmethod
+    def prime_loader(loader, sessions):
+        session_ids = [session.pk for session in sessions]
+        loader.prime('session_participant_count', session_ids)
+        loader.prime('session_participation', session_ids)
+        loader.prime('session_co_host', session_ids)
     
     def get_event_details(self, obj):
         """Get basic event information"""
@@ -541,27 +571,23 @@ class VirtualMeetingSessionSerializer(serializers.ModelSerializer):
     
     def get_participant_count(self, obj):
         """Get current participant count"""
-        return obj.participants.count()
+        return community_loader(self.context).load('session_participant_count', obj.pk)
     
     def get_user_participation(self, obj):
         """Get current user's participation in this session"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            try:
-                participant = SessionParticipant.objects.get(
-                    session=obj,
-                    user=request.user
-                )
+            loader = community_loader(self.context)
+            participant = loader.load('session_participation', obj.pk)
+            if participant:
                 return {
                     'status': participant.status,
                     'join_time': participant.join_time,
                     'leave_time': participant.leave_time,
                     'duration_minutes': participant.duration_minutes,
-                    'is_host': obj.host == request.user,
-                    'is_co_host': obj.co_hosts.filter(id=request.user.id).exists(),
+                    'is_host': obj.host_id == request.user.id,
+                    'is_co_host': loader.load('session_co_host', obj.pk),
                 }
-            except SessionParticipant.DoesNotExist:
-                return None
         return None
     
     def get_session_stats(self, obj):
@@ -598,6 +624,14 @@ class MeetingRecordingSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'id', 'provider_recording_id', 'created_at', 'updated_at'
         ]
+        list_serializer_class = BatchedListSerializer
+    
+    @staticmethod
+    def prime_loader(loader, recordings):
+        session_ids = [recording.session_id for recording in recordings]
+        loader.prime('session_co_host', session_ids)
+        loader.prime('session_participation', session_ids)
+        loader.prime('event_co_organizer', (recording.session.event_id for recording in recordings))
     
     def get_session_details(self, obj):
         """Get basic session information"""
@@ -616,13 +650,14 @@ class MeetingRecordingSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             # Check if user has access to this recording
+            loader = community_loader(self.context)
             has_access = (
                 obj.is_public or
-                obj.session.host == request.user or
-                obj.session.co_hosts.filter(id=request.user.id).exists() or
-                obj.session.participants.filter(id=request.user.id).exists() or
-                obj.session.event.organizer == request.user or
-                obj.session.event.co_organizers.filter(id=request.user.id).exists()
+                obj.session.host_id == request.user.id or
+                loader.load('session_co_host', obj.session_id) or
+                loader.load('session_participation', obj.session_id) is not None or
+                obj.session.event.organizer_id == request.user.id or
+                loader.load('event_co_organizer', obj.session.event_id)
             )
             
             return {
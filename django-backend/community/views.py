@@ -647,7 +647,7 @@ class MeetupViewSet(viewsets.ModelViewSet):
             Q(event__visibility='public') |
             Q(event__visibility='members_only') |
             Q(event__organizer=self.request.user)
-        )
+        ).prefetch_related('regular_attendees')
     
     @action(detail=True, methods=['post'])
     def join_regular_attendees(self, request, pk=None):
@@ -839,7 +839,7 @@ class VirtualMeetingSessionViewSet(viewsets.ModelViewSet):
             Q(event__organizer=self.request.user) |
             Q(event__co_organizers=self.request.user) |
             Q(event__visibility='public')
-        ).select_related('event', 'host').prefetch_related('co_hosts', 'participants').distinct()
+        ).select_related('event', 'host').prefetch_related('co_hosts').distinct()
     
     def perform_create(self, serializer):
         """Set host from request user"""
@@ -1075,7 +1075,7 @@ class MeetingRecordingViewSet(viewsets.ModelViewSet):
             Q(session__event__organizer=self.request.user) |
             Q(session__event__co_organizers=self.request.user) |
             Q(is_public=True)
-        ).select_related('session', 'session__event').distinct()
+        ).select_related('session', 'session__event', 'session__host').distinct()
     
     @action(detail=True, methods=['get'])
     def download(self, request, pk=None):
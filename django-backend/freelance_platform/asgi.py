@@ -2,6 +2,8 @@
 ASGI config for freelance_platform project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+WebSocket and Server-Sent Events push endpoints are served by Channels
+consumers; all other HTTP requests go to Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +15,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'freelance_platform.settings')
 
-application = get_asgi_application()
+# Initialise Django before importing consumers that touch models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+from django.urls import re_path  # noqa: E402
+
+from communications.routing import http_urlpatterns, websocket_urlpatterns  # noqa: E402
+
+application = ProtocolTypeRouter({
+    'http': URLRouter(http_urlpatterns + [re_path(r'', django_asgi_app)]),
+    'websocket': AllowedHostsOriginValidator(URLRouter(websocket_urlpatterns)),
+})
@@ -1,16 +1,35 @@
 """
 Caching configuration and utilities
+
+Besides plain get -> compute -> set caching, ``CacheService.get_or_compute``
+(and the ``cache_with_revalidation`` decorator) protect hot keys from
+stampedes. A value is stored together with its soft expiry and how long it
+took to compute. Past the soft expiry, or a little before it chosen at
+random (probabilistic early expiry, weighted by compute time), one caller
+takes a per-key lock and recomputes, while everyone else keeps getting the
+previous value for up to ``stale_ttl`` seconds. On a cold miss only the lock
+holder computes; the rest wait briefly for its result. Each outcome is
+counted per key prefix (hit, stale, miss, refresh, lock_wait) for
+monitoring.
 """
 import os
+import logging
+import math
+import random
+import time
+import uuid
 from django.core.cache import cache
 from django.core.cache.utils import make_template_fragment_key
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.views.decorators.vary import vary_on_headers
 from functools import wraps
+from typing import Any, Callable, Dict, Iterable
 import hashlib
 import json
 
+logger = logging.getLogger(__name__)
+
 # Cache timeouts (in seconds)
 CACHE_TIMEOUTS = {
     'short': 300,      # 5 minutes
@@ -19,6 +38,17 @@ CACHE_TIMEOUTS = {
     'very_long': 86400, # 24 hours
 }
 
+# Stampede protection defaults
+REVALIDATION_DEFAULTS = {
+    'stale_ttl': 300,      # How long past expiry a value may be served while it is refreshed
+    'lock_timeout': 30,    # Lifetime of a refresh lock, bounding a refresher that dies
+    'wait_timeout': 2.0,   # How long a cold miss waits for the lock holder before computing itself
+    'beta': 1.0,           # Early expiry aggressiveness; 0 disables early refresh
+}
+
+CACHE_EVENTS = ('hit', 'stale', 'miss', 'refresh', 'lock_wait')
+CACHE_STATS_PREFIXES_KEY = 'cache_stats:prefixes'
+
 class CacheService:
     """Service for managing application caching"""
     
@@ -44,12 +74,162 @@ class CacheService:
         return ":".join(key_parts)
     
     @staticmethod
-    def cache_developer_profile(user_id: int, timeout: int = CACHE_TIMEOUTS['medium']):
+    def get_or_compute(cache_key: str, compute: Callable[[], Any], timeout: int,
+                       prefix: str = None, **options) -> Any:
+        """
+        Cached value with single-flight refresh and stale-while-revalidate serving.
+        
+        Args:
+            cache_key: Key of the cached value
+            compute: Builds the value on a miss or refresh
+            timeout: Seconds the value is fresh
+            prefix: Name the hit/stale/miss counters are recorded under
+            **options: Overrides for REVALIDATION_DEFAULTS
+        """
+        options = {**REVALIDATION_DEFAULTS, **options}
+        prefix = prefix or cache_key.split(':', 1)[0]
+        lock_key = f"{cache_key}:refresh_lock"
+        
+        envelope = cache.get(cache_key)
+        if not CacheService._is_envelope(envelope):
+            # Missing, or written by plain caching before this key was protected
+            envelope = None
+        if envelope is not None:
+            now = time.time()
+            # XFetch: refresh early with a probability that rises towards expiry
+            # and with the cost of recomputing
+            early = options['beta'] * envelope['delta'] * -math.log(random.random() or 1e-12)
+            if now + early < envelope['expires']:
+                CacheService.record_cache_event(prefix, 'hit')
+                return envelope['value']
+            
+            lock_token = CacheService._acquire_lock(lock_key, options['lock_timeout'])
+            if lock_token is None:
+                # Someone else is refreshing; serve what we have
+                CacheService.record_cache_event(prefix, 'stale')
+                return envelope['value']
+            
+            CacheService.record_cache_event(prefix, 'refresh')
+            try:
+                return CacheService.refresh_cached(cache_key, compute, timeout, **options)
+            except Exception as e:
+                logger.error(f"Refreshing {cache_key} failed, serving the previous value: {str(e)}")
+                return envelope['value']
+            finally:
+                CacheService._release_lock(lock_key, lock_token)
+        
+        CacheService.record_cache_event(prefix, 'miss')
+        lock_token = CacheService._acquire_lock(lock_key, options['lock_timeout'])
+        if lock_token is None:
+            # Another worker is computing this key; wait briefly for its result
+            CacheService.record_cache_event(prefix, 'lock_wait')
+            deadline = time.monotonic() + options['wait_timeout']
+            delay = 0.01
+            while time.monotonic() < deadline:
+                time.sleep(delay)
+                envelope = cache.get(cache_key)
+                if CacheService._is_envelope(envelope):
+                    return envelope['value']
+                delay = min(delay * 2, 0.2)
+            return compute()
+        
+        try:
+            return CacheService.refresh_cached(cache_key, compute, timeout, **options)
+        finally:
+            CacheService._release_lock(lock_key, lock_token)
+    
+    @staticmethod
+    def cache_with_revalidation(prefix: str, timeout: int = CACHE_TIMEOUTS['short'],
+                                key_func: Callable[..., Iterable] = None, **options):
+        """
+        Stampede-protected cache decorator; see get_or_compute.
+        
+        The key is built from the call arguments, or from ``key_func(*args, **kwargs)``
+        when given (needed for methods, whose ``self`` has no stable key).
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if key_func is not None:
+                    cache_key = CacheService.get_cache_key(prefix, *key_func(*args, **kwargs))
+                else:
+                    cache_key = CacheService.get_cache_key(prefix, *args, **kwargs)
+                return CacheService.get_or_compute(
+                    cache_key, lambda: func(*args, **kwargs), timeout, prefix=prefix, **options
+                )
+            return wrapper
+        return decorator
+    
+    @staticmethod
+    def record_cache_event(prefix: str, event: str):
+        """Count a get_or_compute outcome for the prefix"""
+        counter_key = f"cache_stats:{prefix}:{event}"
+        try:
+            cache.incr(counter_key)
+        except ValueError:
+            # Counter missing or evicted; another worker may create it first
+            if not cache.add(counter_key, 1, None):
+                cache.incr(counter_key)
+            prefixes = cache.get(CACHE_STATS_PREFIXES_KEY) or set()
+            if prefix not in prefixes:
+                cache.set(CACHE_STATS_PREFIXES_KEY, prefixes | {prefix}, None)
+        except Exception as e:
+            logger.debug(f"Could not record cache event {counter_key}: {str(e)}")
+    
+    @staticmethod
+    def get_cache_stats(prefixes: Iterable[str] = None) -> Dict[str, Dict[str, int]]:
+        """Event counts per prefix (defaults to every prefix that has recorded events)"""
+        prefixes = sorted(prefixes or cache.get(CACHE_STATS_PREFIXES_KEY) or ())
+        counters = cache.get_many([
+            f"cache_stats:{prefix}:{event}" for prefix in prefixes for event in CACHE_EVENTS
+        ])
+        return {
+            prefix: {
+                event: counters.get(f"cache_stats:{prefix}:{event}", 0) for event in CACHE_EVENTS
+            }
+            for prefix in prefixes
+        }
+    
+    @staticmethod
+    def refresh_cached(cache_key: str, compute: Callable[[], Any], timeout: int, **options) -> Any:
+        """Compute a value and store it in the format get_or_compute reads"""
+        stale_ttl = options.get('stale_ttl', REVALIDATION_DEFAULTS['stale_ttl'])
+        started = time.monotonic()
+        value = compute()
+        cache.set(cache_key, {
+            'value': value,
+            'expires': time.time() + timeout,
+            'delta': time.monotonic() - started,
+        }, timeout + stale_ttl)
+        return value
+    
+    @staticmethod
+    def _is_envelope(entry) -> bool:
+        return isinstance(entry, dict) and entry.keys() >= {'value', 'expires', 'delta'}
+    
+    @staticmethod
+    def _acquire_lock(lock_key: str, lock_timeout: int):
+        token = uuid.uuid4().hex
+        return token if cache.add(lock_key, token, lock_timeout) else None
+    
+    @staticmethod
+    def _release_lock(lock_key: str, token: str):
+        # Only drop our own lock; it may have expired and been taken over
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    
+    @staticmethod
+    def cache_developer_profile(user_id: int, timeout: int = CACHE_TIMEOUTS['medium'],
+                                stampede_protection: bool = False):
         """Cache decorator for developer profile data"""
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
                 cache_key = CacheService.get_cache_key('developer_profile', user_id)
+                if stampede_protection:
+                    return CacheService.get_or_compute(
+                        cache_key, lambda: func(*args, **kwargs), timeout, prefix='developer_profile'
+                    )
                 result = cache.get(cache_key)
                 
                 if result is None:
@@ -61,12 +241,17 @@ class CacheService:
         return decorator
     
     @staticmethod
-    def cache_project_analysis(project_id: int, timeout: int = CACHE_TIMEOUTS['long']):
+    def cache_project_analysis(project_id: int, timeout: int = CACHE_TIMEOUTS['long'],
+                               stampede_protection: bool = False):
         """Cache decorator for project analysis results"""
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
                 cache_key = CacheService.get_cache_key('project_analysis', project_id)
+                if stampede_protection:
+                    return CacheService.get_or_compute(
+                        cache_key, lambda: func(*args, **kwargs), timeout, prefix='project_analysis'
+                    )
                 result = cache.get(cache_key)
                 
                 if result is None:
@@ -78,12 +263,17 @@ class CacheService:
         return decorator
     
     @staticmethod
-    def cache_matching_results(project_id: int, filters: dict = None, timeout: int = CACHE_TIMEOUTS['short']):
+    def cache_matching_results(project_id: int, filters: dict = None, timeout: int = CACHE_TIMEOUTS['short'],
+                               stampede_protection: bool = False):
         """Cache decorator for matching results"""
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
                 cache_key = CacheService.get_cache_key('matching_results', project_id, filters or {})
+                if stampede_protection:
+                    return CacheService.get_or_compute(
+                        cache_key, lambda: func(*args, **kwargs), timeout, prefix='matching_results'
+                    )
                 result = cache.get(cache_key)
                 
                 if result is None:
@@ -546,7 +736,8 @@ def monitor_cache_health():
             'status': 'healthy',
             'write_time': write_time,
             'read_time': read_time,
-            'total_time': write_time + read_time
+            'total_time': write_time + read_time,
+            'revalidation': CacheService.get_cache_stats()
         }
         
     except Exception as e:
@@ -5,6 +5,7 @@ Handles background tasks for AI services, skill analysis, and periodic updates.
 
 import os
 from celery import Celery
+from celery.signals import celeryd_init
 from django.conf import settings
 
 # Set the default Django settings module for the 'celery' program.
@@ -44,12 +45,28 @@ app.conf.beat_schedule = {
         'task': 'ai_services.tasks.cleanup_expired_cache',
         'schedule': 21600.0,  # Run every 6 hours
     },
+    'compute-skill-graph-analytics': {
+        'task': 'ai_services.tasks.compute_skill_graph_analytics',
+        'schedule': 21600.0,  # Run every 6 hours
+    },
+    'rebuild-skill-index': {
+        'task': 'ai_services.tasks.rebuild_skill_index',
+        'schedule': 86400.0,  # Run daily
+    },
+    'analyze-pending-projects': {
+        'task': 'ai_services.tasks.analyze_pending_projects',
+        'schedule': 600.0,  # Run every 10 minutes
+        'kwargs': {'batch_size': 20}
+    },
     
     # Matching Service Tasks
     'precompute-matching-results': {
         'task': 'matching.tasks.precompute_matching_results',
-        'schedule': 1800.0,  # Run every 30 minutes
-        'kwargs': {'batch_size': 10}
+        'schedule': 60.0,  # Drain dirty projects and developers every minute
+    },
+    'mark-stale-matching-results': {
+        'task': 'matching.tasks.mark_stale_matching_results',
+        'schedule': 3600.0,  # Run every hour
     },
     'cleanup-expired-matching-cache': {
         'task': 'matching.tasks.cleanup_expired_matching_cache',
@@ -89,6 +106,16 @@ app.conf.beat_schedule = {
         'task': 'payments.tasks.generate_payment_analytics_report',
         'schedule': 86400.0,  # Run daily
     },
+    'process-webhook-events': {
+        'task': 'payments.tasks.process_webhook_events',
+        'schedule': 60.0,  # Run every minute
+    },
+    
+    # Communications Tasks
+    'repair-unread-counters': {
+        'task': 'communications.tasks.repair_unread_counters',
+        'schedule': 86400.0,  # Run daily
+    },
     
     # System Monitoring Tasks
     'collect-system-health-metrics': {
@@ -123,6 +150,14 @@ app.conf.beat_schedule = {
 
 app.conf.timezone = 'UTC'
 
+
+@celeryd_init.connect
+def setup_task_telemetry(sender=None, **kwargs):
+    """Collect task counters and durations from Celery signals in workers only"""
+    from monitoring.task_telemetry import connect_task_telemetry
+    connect_task_telemetry(hostname=sender)
+
+
 @app.task(bind=True)
 def debug_task(self):
     """Debug task for testing Celery configuration."""
@@ -79,6 +79,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'users.candidates.CandidateScopeMiddleware',
+    'monitoring.performance_monitor.RequestMetricsMiddleware',
 ]
 
 ROOT_URLCONF = 'freelance_platform.urls'
@@ -99,6 +101,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'freelance_platform.wsgi.application'
+ASGI_APPLICATION = 'freelance_platform.asgi.application'
 
 
 # Database
@@ -230,6 +233,9 @@ CORS_ALLOW_CREDENTIALS = True
 
 # AI Services Configuration
 GEMINI_API_KEY = config('GEMINI_API_KEY', default='')
+GEMINI_MAX_CONCURRENCY = config('GEMINI_MAX_CONCURRENCY', default=8, cast=int)
+GEMINI_REQUESTS_PER_MINUTE = config('GEMINI_REQUESTS_PER_MINUTE', default=60, cast=int)
+GEMINI_TOKENS_PER_MINUTE = config('GEMINI_TOKENS_PER_MINUTE', default=1000000, cast=int)
 
 # Embedding and Vector Search Configuration
 EMBEDDING_MODEL = config('EMBEDDING_MODEL', default='all-MiniLM-L6-v2')
@@ -251,6 +257,10 @@ PAYPAL_CLIENT_ID = config('PAYPAL_CLIENT_ID', default='')
 PAYPAL_CLIENT_SECRET = config('PAYPAL_CLIENT_SECRET', default='')
 PAYPAL_WEBHOOK_ID = config('PAYPAL_WEBHOOK_ID', default='')
 
+# Concurrent gateway API calls during reconciliation and batch payouts
+# (rate limits come from PaymentGatewayConfig.get_gateway_limits)
+PAYMENT_GATEWAY_MAX_CONCURRENCY = config('PAYMENT_GATEWAY_MAX_CONCURRENCY', default=8, cast=int)
+
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
@@ -273,6 +283,47 @@ CACHES = {
     }
 }
 
+# In-process request metrics are merged into Redis every N seconds
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=10, cast=int)
+TASK_TELEMETRY_FLUSH_INTERVAL = config('TASK_TELEMETRY_FLUSH_INTERVAL', default=10, cast=int)
+
+# Real-time push ('redis' or 'memory' for single-process development/tests)
+REALTIME_BROKER = config('REALTIME_BROKER', default='redis')
+REALTIME_STREAM_MAXLEN = config('REALTIME_STREAM_MAXLEN', default=500, cast=int)  # events kept per user for resume
+REALTIME_QUEUE_SIZE = config('REALTIME_QUEUE_SIZE', default=256, cast=int)  # live events buffered per connection
+REALTIME_KEEPALIVE_SECONDS = config('REALTIME_KEEPALIVE_SECONDS', default=25, cast=int)
+
+# Notification fan-out: how long a (dedupe key, recipient) claim is held
+NOTIFICATION_DEDUPE_TTL = config('NOTIFICATION_DEDUPE_TTL', default=86400, cast=int)
+# Events sharing a collapse key within this many seconds update one unread notification
+NOTIFICATION_COLLAPSE_WINDOW = config('NOTIFICATION_COLLAPSE_WINDOW', default=900, cast=int)
+NOTIFICATION_DELIVERY_BATCH_SIZE = config('NOTIFICATION_DELIVERY_BATCH_SIZE', default=200, cast=int)
+
+# Per-user project console dashboard snapshots (0 disables caching)
+PROJECT_CONSOLE_DASHBOARD_CACHE_TTL = config('PROJECT_CONSOLE_DASHBOARD_CACHE_TTL', default=300, cast=int)
+
+# Match list precompute: matches kept per task, how long lists stay cached,
+# dirty entries per worker batch, and the backlog age that raises a health alert
+MATCHING_PRECOMPUTE_LIMIT = config('MATCHING_PRECOMPUTE_LIMIT', default=10, cast=int)
+MATCHING_PRECOMPUTE_CACHE_DURATION = config('MATCHING_PRECOMPUTE_CACHE_DURATION', default=86400, cast=int)
+MATCHING_PRECOMPUTE_BATCH_SIZE = config('MATCHING_PRECOMPUTE_BATCH_SIZE', default=50, cast=int)
+MATCHING_PRECOMPUTE_MAX_LAG = config('MATCHING_PRECOMPUTE_MAX_LAG', default=900, cast=int)
+
+# Seconds the team composition solver searches before returning its best team so far
+TEAM_COMPOSITION_TIME_BUDGET = config('TEAM_COMPOSITION_TIME_BUDGET', default=2.0, cast=float)
+
+# Skill graph analytics: co-occurrences needed for an edge between two skills,
+# and how many snapshot versions are kept
+SKILL_GRAPH_MIN_COOCCURRENCE = config('SKILL_GRAPH_MIN_COOCCURRENCE', default=2, cast=int)
+SKILL_GRAPH_SNAPSHOT_RETENTION = config('SKILL_GRAPH_SNAPSHOT_RETENTION', default=10, cast=int)
+
+# Restrict developer matching to developers the skill index finds for the
+# project's required skills before any embedding or graph scoring
+MATCHING_SKILL_PRUNING = config('MATCHING_SKILL_PRUNING', default=True, cast=bool)
+
+# Seconds between checks for a skill lexicon reloaded by another process
+SKILL_LEXICON_CHECK_INTERVAL = config('SKILL_LEXICON_CHECK_INTERVAL', default=30, cast=int)
+
 # Celery Configuration
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=REDIS_URL)
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default=REDIS_URL)
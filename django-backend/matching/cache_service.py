@@ -1,18 +1,24 @@
 """
 Advanced caching service for intelligent matching system with performance optimization.
+
+Every stored entry is tagged with the users, projects and skills it mentions
+("user:<id>", "project:<id>", "skill:<name>") through MatchingCacheTag rows,
+which also index the memory tier since every memory entry has a database row.
+Invalidating a user or project therefore touches only the entries indexed
+under it, not every entry in the cache.
 """
 
 import json
 import hashlib
 import logging
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterable, List, Optional, Set, Union
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.core.cache import cache
 from django.db import transaction
 from django.conf import settings
 
-from .models import MatchingCache
+from .models import MatchingCache, MatchingCacheTag
 
 logger = logging.getLogger(__name__)
 
@@ -76,7 +82,8 @@ class MatchingCacheService:
             return None
     
     def store_result(self, search_type: str, parameters: Dict[str, Any], 
-                    result: Dict[str, Any], cache_duration: Optional[int] = None) -> bool:
+                    result: Dict[str, Any], cache_duration: Optional[int] = None,
+                    tags: Optional[Iterable[str]] = None) -> bool:
         """
         Store matching result in cache with intelligent expiration and cleanup.
         
@@ -85,6 +92,7 @@ class MatchingCacheService:
             parameters: Search parameters
             result: Result to cache
             cache_duration: Custom cache duration in seconds
+            tags: Extra invalidation tags beyond those found in parameters and result
             
         Returns:
             True if successfully cached, False otherwise
@@ -106,13 +114,15 @@ class MatchingCacheService:
                         'cache_data': result,
                         'search_type': search_type,
                         'parameters_hash': parameters_hash,
-                        'expires_at': expires_at,
-                        'hit_count': 0 if created else 1
+                        'expires_at': expires_at
                     }
                 )
                 
                 if not created:
                     cache_entry.increment_hit_count()
+                
+                entry_tags = self._extract_tags(parameters, result) | set(tags or ())
+                self._index_tags(cache_entry, entry_tags)
             
             # Perform cache cleanup if needed
             self._cleanup_cache_if_needed()
@@ -138,52 +148,23 @@ class MatchingCacheService:
         Returns:
             Number of cache entries invalidated
         """
+        if user_id or project_id:
+            return self.bulk_invalidate(
+                user_ids=[user_id] if user_id else (),
+                project_ids=[project_id] if project_id else (),
+                search_type=search_type
+            )
+        
         try:
-            invalidated_count = 0
-            
-            # Build filter criteria
-            filters = {}
+            cache_entries = MatchingCache.objects.all()
             if search_type:
-                filters['search_type'] = search_type
-            
-            # Get cache entries to invalidate
-            cache_entries = MatchingCache.objects.filter(**filters)
-            
-            # Additional filtering based on user_id or project_id
-            if user_id or project_id:
-                entries_to_invalidate = []
-                for entry in cache_entries:
-                    should_invalidate = False
-                    
-                    # Check if cache data contains the user_id or project_id
-                    cache_data = entry.cache_data
-                    if isinstance(cache_data, dict):
-                        if user_id and self._contains_user_id(cache_data, user_id):
-                            should_invalidate = True
-                        if project_id and self._contains_project_id(cache_data, project_id):
-                            should_invalidate = True
-                    
-                    if should_invalidate:
-                        entries_to_invalidate.append(entry.cache_key)
-                
-                # Delete from memory cache
-                for cache_key in entries_to_invalidate:
-                    cache.delete(cache_key)
-                
-                # Delete from database
-                invalidated_count = MatchingCache.objects.filter(
-                    cache_key__in=entries_to_invalidate
-                ).delete()[0]
-            else:
-                # Delete all matching entries
-                cache_keys = list(cache_entries.values_list('cache_key', flat=True))
-                
-                # Delete from memory cache
-                for cache_key in cache_keys:
-                    cache.delete(cache_key)
-                
-                # Delete from database
-                invalidated_count = cache_entries.delete()[0]
+                cache_entries = cache_entries.filter(search_type=search_type)
+            
+            cache_keys = list(cache_entries.values_list('cache_key', flat=True))
+            cache.delete_many(cache_keys)
+            invalidated_count = MatchingCache.objects.filter(cache_key__in=cache_keys).delete()[1].get(
+                MatchingCache._meta.label, 0
+            )
             
             logger.info(f"Invalidated {invalidated_count} cache entries")
             return invalidated_count
@@ -192,6 +173,81 @@ class MatchingCacheService:
             logger.error(f"Error invalidating cache: {e}")
             return 0
     
+    def bulk_invalidate(self, user_ids: Iterable = (), project_ids: Iterable = (),
+                        skills: Iterable[str] = (), search_type: Optional[str] = None) -> int:
+        """
+        Invalidate every entry mentioning any of the given users, projects or skills.
+        
+        Args:
+            user_ids: Developer or client user IDs
+            project_ids: Project IDs
+            skills: Skill names (case-insensitive)
+            search_type: Restrict invalidation to one search type
+            
+        Returns:
+            Number of cache entries invalidated
+        """
+        tags = (
+            [self.make_tag('user', user_id) for user_id in user_ids] +
+            [self.make_tag('project', project_id) for project_id in project_ids] +
+            [self.make_tag('skill', skill) for skill in skills]
+        )
+        return self.invalidate_tags(tags, search_type)
+    
+    def invalidate_tags(self, tags: Iterable[str], search_type: Optional[str] = None) -> int:
+        """
+        Invalidate the entries indexed under any of the given tags.
+        
+        Args:
+            tags: Tags as built by make_tag
+            search_type: Restrict invalidation to one search type
+            
+        Returns:
+            Number of cache entries invalidated
+        """
+        try:
+            tags = set(tags)
+            if not tags:
+                return 0
+            
+            cache_keys = self.keys_for_tags(tags, search_type)
+            if not cache_keys:
+                return 0
+            
+            # Delete from memory cache
+            cache.delete_many(list(cache_keys))
+            
+            # Delete from database; tag rows cascade
+            invalidated_count = MatchingCache.objects.filter(
+                cache_key__in=list(cache_keys)
+            ).delete()[1].get(MatchingCache._meta.label, 0)
+            
+            logger.info(f"Invalidated {invalidated_count} cache entries for {len(tags)} tags")
+            return invalidated_count
+            
+        except Exception as e:
+            logger.error(f"Error invalidating cache: {e}")
+            return 0
+    
+    def keys_for_tags(self, tags: Iterable[str], search_type: Optional[str] = None) -> Set[str]:
+        """
+        Cache keys indexed under any of the given tags. Every memory entry has a
+        database row, and every path that deletes a row drops its memory copy,
+        so the tag table indexes both tiers.
+        """
+        db_entries = MatchingCache.objects.filter(tags__tag__in=list(tags))
+        if search_type:
+            db_entries = db_entries.filter(search_type=search_type)
+        return set(db_entries.values_list('cache_key', flat=True).distinct())
+    
+    @staticmethod
+    def make_tag(kind: str, value: Any) -> str:
+        """Invalidation tag for a user, project or skill"""
+        value = str(value).strip()
+        if kind == 'skill':
+            value = value.lower()
+        return f"{kind}:{value}"[:150]
+    
     def get_cache_statistics(self) -> Dict[str, Any]:
         """
         Get comprehensive cache performance statistics.
@@ -358,31 +414,51 @@ class MatchingCacheService:
         except Exception as e:
             logger.error(f"Error in cache cleanup: {e}")
     
-    def _contains_user_id(self, cache_data: Dict[str, Any], user_id: str) -> bool:
-        """Check if cache data contains references to specific user ID."""
-        if isinstance(cache_data, dict):
-            # Check in matches array
-            matches = cache_data.get('matches', [])
-            if isinstance(matches, list):
-                for match in matches:
-                    if isinstance(match, dict):
-                        if match.get('developer_id') == user_id:
-                            return True
-                        if match.get('client_id') == user_id:
-                            return True
-        return False
+    def _extract_tags(self, parameters: Dict[str, Any], result: Any) -> Set[str]:
+        """Tags for the users, projects and skills a cached search mentions."""
+        user_ids, project_ids, skills = set(), set(), set()
+        
+        def collect(data):
+            if not isinstance(data, dict):
+                return
+            for key in ('user_id', 'developer_id', 'client_id'):
+                if data.get(key):
+                    user_ids.add(data[key])
+            if data.get('project_id'):
+                project_ids.add(data['project_id'])
+            skills.update(data.get('required_skills') or ())
+        
+        collect(parameters)
+        project_data = parameters.get('project_data')
+        if isinstance(project_data, dict):
+            collect(project_data)
+            if project_data.get('id'):
+                project_ids.add(project_data['id'])
+        
+        if isinstance(result, dict):
+            collect(result)
+            user_ids.update(result.get('developer_ids') or ())
+            for match in result.get('matches') or ():
+                collect(match)
+                if isinstance(match, dict):
+                    # Serialized DeveloperMatch rows carry the developer and task details
+                    if match.get('developer'):
+                        user_ids.add(match['developer'])
+                    collect(match.get('task_details'))
+        
+        return (
+            {self.make_tag('user', user_id) for user_id in user_ids} |
+            {self.make_tag('project', project_id) for project_id in project_ids} |
+            {self.make_tag('skill', skill) for skill in skills if isinstance(skill, str) and skill.strip()}
+        )
     
-    def _contains_project_id(self, cache_data: Dict[str, Any], project_id: str) -> bool:
-        """Check if cache data contains references to specific project ID."""
-        if isinstance(cache_data, dict):
-            # Check in matches array
-            matches = cache_data.get('matches', [])
-            if isinstance(matches, list):
-                for match in matches:
-                    if isinstance(match, dict):
-                        if match.get('project_id') == project_id:
-                            return True
-        return False
+    def _index_tags(self, cache_entry: MatchingCache, tags: Set[str]):
+        """Index an entry under its tags; rows go with the entry when it is deleted."""
+        MatchingCacheTag.objects.filter(cache_entry=cache_entry).exclude(tag__in=tags).delete()
+        MatchingCacheTag.objects.bulk_create(
+            [MatchingCacheTag(cache_entry=cache_entry, tag=tag) for tag in tags],
+            ignore_conflicts=True
+        )
     
     def _calculate_cache_efficiency(self, hit_stats: Dict[str, Any], total_entries: int) -> float:
         """Calculate cache efficiency based on hit statistics."""
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0002_matchingcache_matchinganalytics_matchingpreferences'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchingDirtyEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('project', 'Project'), ('developer', 'Developer')], max_length=20)),
+                ('entity_id', models.CharField(max_length=64)),
+                ('reason', models.CharField(blank=True, default='', max_length=50)),
+                ('first_marked_at', models.DateTimeField()),
+                ('last_marked_at', models.DateTimeField()),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'matching_dirty_entries',
+                'ordering': ['first_marked_at'],
+                'indexes': [models.Index(fields=['claimed_at', 'first_marked_at'], name='matching_di_claimed_3bd5f6_idx')],
+                'constraints': [models.UniqueConstraint(fields=('entity_type', 'entity_id'), name='unique_matching_dirty_entry')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matching', '0003_matching_dirty_entries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchingCacheTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=150)),
+                ('cache_entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='matching.matchingcache')),
+            ],
+            options={
+                'db_table': 'matching_cache_tags',
+                'constraints': [models.UniqueConstraint(fields=('tag', 'cache_entry'), name='unique_matching_cache_tag')],
+            },
+        ),
+    ]
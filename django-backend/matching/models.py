@@ -152,3 +152,51 @@ class MatchingCache(models.Model):
         """Increment hit count and update last accessed"""
         self.hit_count += 1
         self.save(update_fields=['hit_count', 'last_accessed'])
+
+
+class MatchingDirtyEntry(models.Model):
+    """A project or developer whose precomputed match lists are out of date"""
+    
+    ENTITY_TYPES = [
+        ('project', 'Project'),
+        ('developer', 'Developer'),
+    ]
+    
+    entity_type = models.CharField(max_length=20, choices=ENTITY_TYPES)
+    entity_id = models.CharField(max_length=64)
+    reason = models.CharField(max_length=50, blank=True, default='')
+    
+    # First mark drives freshness lag; a later mark while a worker holds the
+    # entry means it changed again and must be recomputed once more
+    first_marked_at = models.DateTimeField()
+    last_marked_at = models.DateTimeField()
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'matching_dirty_entries'
+        ordering = ['first_marked_at']
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'entity_id'], name='unique_matching_dirty_entry'),
+        ]
+        indexes = [
+            models.Index(fields=['claimed_at', 'first_marked_at']),
+        ]
+        
+    def __str__(self):
+        return f"Dirty {self.entity_type} {self.entity_id} ({self.reason})"
+
+
+class MatchingCacheTag(models.Model):
+    """Reverse index from a user, project or skill to the cache entries that mention it"""
+    
+    cache_entry = models.ForeignKey(MatchingCache, on_delete=models.CASCADE, related_name='tags')
+    tag = models.CharField(max_length=150)  # e.g. "user:42", "project:<uuid>", "skill:python"
+    
+    class Meta:
+        db_table = 'matching_cache_tags'
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'cache_entry'], name='unique_matching_cache_tag'),
+        ]
+        
+    def __str__(self):
+        return f"{self.tag} -> {self.cache_entry_id}"
@@ -0,0 +1,335 @@
+"""
+Event-driven precompute of developer match lists.
+
+Rather than recomputing every active project on a timer, changes mark the
+projects and developers they affect as dirty (see ``matching.signals``): a
+profile edit or availability change, a refreshed skill embedding, or a new
+or changed project or task. Workers claim batches of dirty entries and
+expand them to the task match lists they affect. Each affected list is
+recomputed once per batch, however many entries touched it, and stored in
+``MatchingCacheService`` under the ``precomputed_match`` search type.
+
+A dirty project affects the lists of its pending tasks. A dirty developer
+affects the lists that currently include them (found through the cache's
+user tags) and those of pending tasks that require one of their skills.
+
+Every run records freshness lag (time from a change being marked to its lists
+being recomputed) and recompute throughput, so worker capacity can be sized
+against the backlog.
+"""
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Any, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from projects.models import Task
+from users.models import DeveloperProfile
+from .cache_service import MatchingCacheService, matching_cache_service
+from .models import MatchingCache, MatchingDirtyEntry
+
+logger = logging.getLogger(__name__)
+
+
+class MatchingPrecomputeEngine:
+    """Tracks dirty projects and developers and recomputes the match lists they affect"""
+
+    SEARCH_TYPE = 'precomputed_match'
+    ALGORITHM_VERSION = 'hybrid_rag_v1.0'
+    ACTIVE_PROJECT_STATUSES = ('analyzing', 'proposal_review', 'approved')
+    CLAIM_TIMEOUT = timedelta(minutes=10)
+    STATS_KEY = 'matching_precompute_stats'
+    STATS_TIMEOUT = 86400
+
+    def __init__(self, rag_service=None, cache_service: MatchingCacheService = None):
+        self._rag_service = rag_service
+        self.cache_service = cache_service or matching_cache_service
+
+    @property
+    def rag_service(self):
+        if self._rag_service is None:
+            from ai_services.hybrid_rag_service import HybridRAGService
+            self._rag_service = HybridRAGService()
+        return self._rag_service
+
+    @property
+    def match_limit(self) -> int:
+        return getattr(settings, 'MATCHING_PRECOMPUTE_LIMIT', 10)
+
+    @property
+    def cache_duration(self) -> int:
+        return getattr(settings, 'MATCHING_PRECOMPUTE_CACHE_DURATION', 86400)
+
+    @property
+    def batch_size(self) -> int:
+        return getattr(settings, 'MATCHING_PRECOMPUTE_BATCH_SIZE', 50)
+
+    # Dirty tracking
+
+    def mark_dirty(self, entity_type: str, entity_ids: Iterable, reason: str = '') -> int:
+        """Mark projects or developers as needing their match lists recomputed"""
+        entity_ids = {str(entity_id) for entity_id in entity_ids if entity_id is not None}
+        if not entity_ids:
+            return 0
+        now = timezone.now()
+        # One upsert, so a worker clearing an entry between a read and a write
+        # here can't swallow the mark; a re-mark keeps the original first_marked_at
+        MatchingDirtyEntry.objects.bulk_create([
+            MatchingDirtyEntry(
+                entity_type=entity_type,
+                entity_id=entity_id,
+                reason=reason,
+                first_marked_at=now,
+                last_marked_at=now
+            )
+            for entity_id in entity_ids
+        ], update_conflicts=True, unique_fields=['entity_type', 'entity_id'],
+            update_fields=['last_marked_at', 'reason'])
+        return len(entity_ids)
+
+    def mark_projects(self, project_ids: Iterable, reason: str = '') -> int:
+        return self.mark_dirty('project', project_ids, reason)
+
+    def mark_developers(self, developer_ids: Iterable, reason: str = '') -> int:
+        return self.mark_dirty('developer', developer_ids, reason)
+
+    def mark_stale(self) -> int:
+        """Mark projects whose pending tasks have no fresh precomputed list (safety net for missed events)"""
+        refresh_before = timezone.now() + timedelta(seconds=self.cache_duration / 2)
+        tasks = list(self._active_tasks().values_list('id', 'project_id'))
+        keys = {self.cache_key(task_id): project_id for task_id, project_id in tasks}
+        fresh = set(
+            MatchingCache.objects.filter(
+                cache_key__in=list(keys), expires_at__gt=refresh_before
+            ).values_list('cache_key', flat=True)
+        )
+        return self.mark_projects({project_id for key, project_id in keys.items() if key not in fresh}, 'stale')
+
+    def claim(self, batch_size: int) -> List[MatchingDirtyEntry]:
+        """Claim the oldest dirty entries; entries held by a stalled worker are reclaimed"""
+        now = timezone.now()
+        with transaction.atomic():
+            entries = list(
+                MatchingDirtyEntry.objects.select_for_update(skip_locked=True).filter(
+                    Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - self.CLAIM_TIMEOUT)
+                ).order_by('first_marked_at')[:batch_size]
+            )
+            MatchingDirtyEntry.objects.filter(id__in=[entry.id for entry in entries]).update(claimed_at=now)
+        for entry in entries:
+            entry.claimed_at = now
+        return entries
+
+    def backlog(self) -> Dict[str, Any]:
+        stats = MatchingDirtyEntry.objects.aggregate(oldest=Min('first_marked_at'))
+        oldest = stats['oldest']
+        return {
+            'dirty_entries': MatchingDirtyEntry.objects.count(),
+            'oldest_dirty_seconds': (timezone.now() - oldest).total_seconds() if oldest else 0,
+        }
+
+    # Recompute
+
+    def cache_parameters(self, task_id) -> Dict[str, str]:
+        return {'task_id': str(task_id)}
+
+    def cache_key(self, task_id) -> str:
+        return self.cache_service._generate_cache_key(self.SEARCH_TYPE, self.cache_parameters(task_id))
+
+    def get_precomputed_matches(self, task_id, limit: int = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        A task's precomputed matches, or None if there is no stored list or it
+        is too short to answer for ``limit`` matches
+        """
+        result = self.cache_service.get_cached_result(self.SEARCH_TYPE, self.cache_parameters(task_id))
+        if not result:
+            return None
+        matches = result['matches']
+        # A list shorter than match_limit already holds every candidate
+        if limit is not None and limit > len(matches) and len(matches) >= self.match_limit:
+            return None
+        return matches[:limit]
+
+    def _active_tasks(self):
+        return Task.objects.filter(status='pending', project__status__in=self.ACTIVE_PROJECT_STATUSES)
+
+    def affected_tasks(self, entries: List[MatchingDirtyEntry]) -> Dict[Any, List[int]]:
+        """Task id -> ids of the dirty entries that require its list to be recomputed"""
+        affected = defaultdict(list)
+        project_entries = {entry.entity_id: entry.id for entry in entries if entry.entity_type == 'project'}
+        developer_entries = {entry.entity_id: entry.id for entry in entries if entry.entity_type == 'developer'}
+
+        if project_entries:
+            for task_id, project_id in self._active_tasks().filter(
+                project_id__in=list(project_entries)
+            ).values_list('id', 'project_id'):
+                affected[str(task_id)].append(project_entries[str(project_id)])
+
+        if developer_entries:
+            # Lists a developer could now enter: pending tasks needing one of their skills
+            skill_entries = defaultdict(set)
+            for user_id, skills in DeveloperProfile.objects.filter(
+                user_id__in=list(developer_entries)
+            ).values_list('user_id', 'skills'):
+                for skill in skills or []:
+                    skill_entries[str(skill).lower()].add(developer_entries[str(user_id)])
+            if skill_entries:
+                for task_id, required_skills in self._active_tasks().values_list('id', 'required_skills'):
+                    for skill in required_skills or []:
+                        affected[str(task_id)].extend(skill_entries.get(str(skill).lower(), ()))
+
+            # Lists a developer is already on, which may now rank them differently or drop them
+            developer_tags = {
+                self.cache_service.make_tag('user', developer_id): entry_id
+                for developer_id, entry_id in developer_entries.items()
+            }
+            for tag, task_id in MatchingCache.objects.filter(
+                search_type=self.SEARCH_TYPE,
+                expires_at__gt=timezone.now(),
+                tags__tag__in=list(developer_tags)
+            ).values_list('tags__tag', 'cache_data__task_id'):
+                affected[task_id].append(developer_tags[tag])
+
+        return {task_id: list(set(entry_ids)) for task_id, entry_ids in affected.items() if entry_ids}
+
+    def task_match_data(self, task: Task) -> Dict[str, Any]:
+        """Matching input for a task, in the shape the matching API builds it"""
+        project = task.project
+        ai_analysis = project.ai_analysis or {}
+        return {
+            'id': str(project.id),
+            'title': project.title,
+            'description': project.description,
+            'complexity': ai_analysis.get('complexity', 'medium'),
+            'budget_estimate': float(project.budget_estimate) if project.budget_estimate else 0.0,
+            'timeline_estimate': project.timeline_estimate.total_seconds() if project.timeline_estimate else 0,
+            'client_id': str(project.client_id),
+            'senior_developer_required': ai_analysis.get('senior_developer_required', False),
+            'task_id': str(task.id),
+            'task_title': task.title,
+            'task_description': task.description,
+            'required_skills': task.required_skills,
+            'estimated_hours': task.estimated_hours,
+            'priority': task.priority
+        }
+
+    def recompute_task(self, task: Task) -> Dict[str, Any]:
+        """Recompute one task's match list and store it"""
+        matches = self.rag_service.find_matching_developers(
+            self.task_match_data(task), limit=self.match_limit, use_cache=False
+        )
+        result = {
+            'task_id': str(task.id),
+            'project_id': str(task.project_id),
+            'required_skills': task.required_skills,
+            'matches': matches,
+            'developer_ids': [str(match['developer_id']) for match in matches],
+            'algorithm_version': self.ALGORITHM_VERSION,
+            'computed_at': timezone.now().isoformat()
+        }
+        if not self.cache_service.store_result(
+            self.SEARCH_TYPE, self.cache_parameters(task.id), result, self.cache_duration
+        ):
+            raise RuntimeError(f"Could not store precomputed matches for task {task.id}")
+        return result
+
+    def process_batch(self, batch_size: int = None) -> Optional[Dict[str, Any]]:
+        """Claim one batch of dirty entries and recompute the lists they affect"""
+        entries = self.claim(batch_size or self.batch_size)
+        if not entries:
+            return None
+
+        affected = self.affected_tasks(entries)
+        tasks = self._active_tasks().select_related('project').filter(id__in=list(affected))
+        failed_entries = set()
+        recomputed = 0
+        errors = 0
+        for task in tasks:
+            try:
+                self.recompute_task(task)
+                recomputed += 1
+            except Exception as e:
+                logger.error(f"Error precomputing matches for task {task.id}: {str(e)}")
+                errors += 1
+                failed_entries.update(affected[str(task.id)])
+
+        finished = timezone.now()
+        entries_by_id = {entry.id: entry for entry in entries}
+        done = [entry.id for entry in entries if entry.id not in failed_entries]
+        with transaction.atomic():
+            # Entries marked again mid-run changed after their lists were read; keep them dirty
+            cleared = MatchingDirtyEntry.objects.filter(
+                id__in=done, last_marked_at__lte=entries[0].claimed_at
+            ).delete()[0]
+            MatchingDirtyEntry.objects.filter(
+                id__in=list(entries_by_id)
+            ).update(claimed_at=None)
+
+        lags = [
+            (finished - entries_by_id[entry_id].first_marked_at).total_seconds()
+            for entry_id in done
+        ]
+        return {
+            'entries': len(entries),
+            'cleared': cleared,
+            'lists_recomputed': recomputed,
+            'errors': errors,
+            'lags': lags,
+        }
+
+    def run(self, batch_size: int = None, max_batches: int = 20) -> Dict[str, Any]:
+        """Drain dirty entries in batches and record freshness and throughput"""
+        started = time.monotonic()
+        entries = cleared = recomputed = errors = batches = 0
+        lags = []
+        while batches < max_batches:
+            batch = self.process_batch(batch_size)
+            if batch is None:
+                break
+            batches += 1
+            entries += batch['entries']
+            cleared += batch['cleared']
+            recomputed += batch['lists_recomputed']
+            errors += batch['errors']
+            lags.extend(batch['lags'])
+
+        elapsed = time.monotonic() - started
+        lags.sort()
+        stats = {
+            'batches': batches,
+            'entries_processed': entries,
+            'entries_cleared': cleared,
+            'lists_recomputed': recomputed,
+            'errors': errors,
+            'elapsed_seconds': round(elapsed, 3),
+            'lists_per_second': round(recomputed / elapsed, 2) if elapsed > 0 and recomputed else 0.0,
+            'freshness_lag_seconds': {
+                'avg': round(sum(lags) / len(lags), 3) if lags else None,
+                'p95': round(lags[min(len(lags) - 1, int(len(lags) * 0.95))], 3) if lags else None,
+                'max': round(lags[-1], 3) if lags else None,
+            },
+            'backlog': self.backlog(),
+            'completed_at': timezone.now().isoformat()
+        }
+        if batches:
+            cache.set(self.STATS_KEY, stats, self.STATS_TIMEOUT)
+        logger.info(
+            f"Precomputed {recomputed} match lists for {entries} dirty entries in {elapsed:.2f}s "
+            f"({errors} errors, {stats['backlog']['dirty_entries']} still dirty)"
+        )
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Last run's lag and throughput alongside the current backlog"""
+        return {
+            'last_run': cache.get(self.STATS_KEY),
+            'backlog': self.backlog(),
+        }
+
+
+matching_precompute = MatchingPrecomputeEngine()
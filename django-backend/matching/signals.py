@@ -0,0 +1,90 @@
+"""
+Mark projects and developers dirty for the match-list precompute engine
+when the data their match lists are built from changes, and drop cached
+on-demand searches that mention a developer whose profile changed.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from ai_services.models import DeveloperEmbedding
+from projects.models import Project, Task
+from users.models import DeveloperProfile
+from .cache_service import matching_cache_service
+from .precompute import matching_precompute
+
+# Fields that feed matching; saves that touch nothing else are ignored
+PROFILE_MATCH_FIELDS = ('skills', 'experience_level', 'hourly_rate', 'availability_status', 'reputation_score')
+PROJECT_MATCH_FIELDS = (
+    'status', 'title', 'description', 'required_skills', 'ai_analysis', 'budget_estimate', 'timeline_estimate'
+)
+TASK_MATCH_FIELDS = ('status', 'title', 'description', 'required_skills', 'estimated_hours', 'priority')
+
+
+def _mark_on_commit(entity_type, entity_id, reason):
+    transaction.on_commit(lambda: matching_precompute.mark_dirty(entity_type, [entity_id], reason))
+
+
+def _remember_match_fields(instance, fields):
+    instance._previous_match_fields = (
+        type(instance).objects.filter(pk=instance.pk).values(*fields).first()
+        if instance.pk and not instance._state.adding else None
+    )
+
+
+def _changed_match_fields(instance, fields, created):
+    previous = getattr(instance, '_previous_match_fields', None)
+    if created or previous is None:
+        return set(fields)
+    return {field for field in fields if previous[field] != getattr(instance, field)}
+
+
+@receiver(pre_save, sender=DeveloperProfile, dispatch_uid='precompute_profile_previous')
+def remember_profile_fields(sender, instance, **kwargs):
+    _remember_match_fields(instance, PROFILE_MATCH_FIELDS)
+
+
+@receiver(post_save, sender=DeveloperProfile, dispatch_uid='precompute_profile_saved')
+def mark_developer_profile_dirty(sender, instance, created, **kwargs):
+    changed = _changed_match_fields(instance, PROFILE_MATCH_FIELDS, created)
+    if changed:
+        reason = 'availability_changed' if changed == {'availability_status'} else 'profile_updated'
+        _mark_on_commit('developer', instance.user_id, reason)
+        if not created:
+            user_id = instance.user_id
+            transaction.on_commit(lambda: matching_cache_service.bulk_invalidate(
+                user_ids=[user_id], search_type='developer_match'
+            ))
+
+
+@receiver(post_delete, sender=DeveloperProfile, dispatch_uid='precompute_profile_deleted')
+def mark_deleted_developer_dirty(sender, instance, **kwargs):
+    _mark_on_commit('developer', instance.user_id, 'profile_deleted')
+
+
+@receiver(post_save, sender=DeveloperEmbedding, dispatch_uid='precompute_embedding_saved')
+def mark_developer_embedding_dirty(sender, instance, **kwargs):
+    _mark_on_commit('developer', instance.developer_id, 'skills_refreshed')
+
+
+@receiver(pre_save, sender=Project, dispatch_uid='precompute_project_previous')
+def remember_project_fields(sender, instance, **kwargs):
+    _remember_match_fields(instance, PROJECT_MATCH_FIELDS)
+
+
+@receiver(post_save, sender=Project, dispatch_uid='precompute_project_saved')
+def mark_project_dirty(sender, instance, created, **kwargs):
+    if instance.status in matching_precompute.ACTIVE_PROJECT_STATUSES and \
+            _changed_match_fields(instance, PROJECT_MATCH_FIELDS, created):
+        _mark_on_commit('project', instance.pk, 'project_created' if created else 'project_updated')
+
+
+@receiver(pre_save, sender=Task, dispatch_uid='precompute_task_previous')
+def remember_task_fields(sender, instance, **kwargs):
+    _remember_match_fields(instance, TASK_MATCH_FIELDS)
+
+
+@receiver(post_save, sender=Task, dispatch_uid='precompute_task_saved')
+def mark_task_project_dirty(sender, instance, created, **kwargs):
+    if _changed_match_fields(instance, TASK_MATCH_FIELDS, created):
+        _mark_on_commit('project', instance.project_id, 'task_created' if created else 'task_updated')
@@ -14,136 +14,33 @@ from django.conf import settings
 from django.db.models import Avg, Count, Q
 
 from users.models import User, DeveloperProfile
-from projects.models import Project, Task
+from projects.models import Task
 from .models import DeveloperMatch, MatchingCache, MatchingAnalytics, MatchingPreferences
-from .cache_service import MatchingCacheService
-from ai_services.hybrid_rag_service import HybridRAGService
+from .precompute import matching_precompute
 from ai_services.models import DeveloperEmbedding
 
 logger = logging.getLogger(__name__)
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=300)
-def precompute_matching_results(self, project_id: str = None, batch_size: int = 10):
+def precompute_matching_results(self, project_id: str = None, batch_size: int = None, max_batches: int = 20):
     """
-    Pre-compute matching results for active projects to improve response times.
+    Recompute the match lists affected by projects and developers marked dirty.
     
     Args:
-        project_id: Optional specific project ID to compute matches for
-        batch_size: Number of projects to process in parallel
+        project_id: Optional project to mark dirty before draining
+        batch_size: Dirty entries claimed per batch
+        max_batches: Maximum batches to process in this run
         
     Returns:
-        Dict with pre-computation results
+        Dict with recompute throughput, freshness lag and remaining backlog
     """
     try:
-        logger.info(f"Starting matching results pre-computation")
-        
-        # Get projects that need matching pre-computation
         if project_id:
-            projects = Project.objects.filter(id=project_id, status__in=['analyzing', 'proposal_review', 'approved'])
-        else:
-            # Get projects that haven't had matches computed recently
-            cutoff_time = timezone.now() - timedelta(hours=2)
-            projects = Project.objects.filter(
-                status__in=['analyzing', 'proposal_review', 'approved'],
-                tasks__isnull=False
-            ).exclude(
-                matching_cache__computed_at__gt=cutoff_time
-            ).distinct()[:batch_size]
-        
-        total_projects = len(projects)
-        logger.info(f"Found {total_projects} projects for matching pre-computation")
-        
-        if total_projects == 0:
-            return {'success': True, 'total': 0, 'processed': 0, 'message': 'No projects need pre-computation'}
-        
-        # Initialize services
-        rag_service = HybridRAGService()
-        cache_service = MatchingCacheService()
-        
-        processed = 0
-        errors = 0
-        results = []
-        
-        for project in projects:
-            try:
-                # Get project tasks
-                project_tasks = project.tasks.filter(status='pending')
-                
-                if not project_tasks.exists():
-                    continue
-                
-                # Pre-compute matches for each task
-                task_matches = {}
-                
-                for task in project_tasks:
-                    try:
-                        # Get available developers
-                        available_developers = User.objects.filter(
-                            role='developer',
-                            developer_profile__availability_status='available',
-                            github_username__isnull=False
-                        )
-                        
-                        # Perform matching
-                        matches = rag_service.find_matching_developers(
-                            task_requirements={
-                                'skills': task.required_skills,
-                                'description': task.description,
-                                'estimated_hours': task.estimated_hours
-                            },
-                            available_developers=list(available_developers.values_list('id', flat=True)),
-                            limit=10
-                        )
-                        
-                        # Store matches in cache
-                        cache_key = f"task_matches_{task.id}"
-                        cache.set(cache_key, matches, timeout=7200)  # 2 hours
-                        
-                        # Create or update matching cache record
-                        cache_service.store_matching_results(
-                            task_id=str(task.id),
-                            matches=matches,
-                            algorithm_version='hybrid_rag_v1.0'
-                        )
-                        
-                        task_matches[str(task.id)] = {
-                            'matches_count': len(matches),
-                            'top_score': matches[0]['total_score'] if matches else 0,
-                            'cached_at': timezone.now().isoformat()
-                        }
-                        
-                    except Exception as e:
-                        logger.error(f"Error computing matches for task {task.id}: {str(e)}")
-                        task_matches[str(task.id)] = {'error': str(e)}
-                
-                results.append({
-                    'project_id': str(project.id),
-                    'project_title': project.title,
-                    'tasks_processed': len(task_matches),
-                    'task_matches': task_matches
-                })
-                
-                processed += 1
-                
-            except Exception as e:
-                logger.error(f"Error pre-computing matches for project {project.id}: {str(e)}")
-                errors += 1
-                results.append({
-                    'project_id': str(project.id),
-                    'error': str(e)
-                })
+            matching_precompute.mark_projects([project_id], 'manual')
         
-        logger.info(f"Pre-computed matches for {processed} projects with {errors} errors")
-        
-        return {
-            'success': True,
-            'total': total_projects,
-            'processed': processed,
-            'errors': errors,
-            'results': results,
-            'completed_at': timezone.now().isoformat()
-        }
+        stats = matching_precompute.run(batch_size=batch_size, max_batches=max_batches)
+        return {'success': True, **stats}
         
     except Exception as e:
         logger.error(f"Error in matching pre-computation: {str(e)}")
@@ -152,6 +49,25 @@ def precompute_matching_results(self, project_id: str = None, batch_size: int =
         return {'success': False, 'error': str(e)}
 
 
+@shared_task
+def mark_stale_matching_results():
+    """
+    Mark projects whose pending tasks lack a fresh precomputed match list,
+    catching changes that bypassed the dirty-marking signals.
+    
+    Returns:
+        Dict with the number of projects marked
+    """
+    try:
+        marked = matching_precompute.mark_stale()
+        logger.info(f"Marked {marked} projects with stale match lists")
+        return {'success': True, 'marked_projects': marked}
+        
+    except Exception as e:
+        logger.error(f"Error marking stale matching results: {str(e)}")
+        return {'success': False, 'error': str(e)}
+
+
 @shared_task
 def cleanup_expired_matching_cache():
     """
@@ -461,6 +377,22 @@ def monitor_matching_service_health():
             health_metrics['alerts'].append(f"AI service unavailable: {str(e)}")
             health_metrics['service_status'] = 'unhealthy'
         
+        # Check precompute freshness and worker throughput
+        try:
+            precompute_stats = matching_precompute.get_stats()
+            health_metrics['metrics']['precompute'] = precompute_stats
+            
+            max_lag = getattr(settings, 'MATCHING_PRECOMPUTE_MAX_LAG', 900)
+            if precompute_stats['backlog']['oldest_dirty_seconds'] > max_lag:
+                health_metrics['alerts'].append(
+                    f"Match precompute falling behind: {precompute_stats['backlog']['dirty_entries']} dirty entries, "
+                    f"oldest {precompute_stats['backlog']['oldest_dirty_seconds']:.0f}s"
+                )
+                health_metrics['service_status'] = 'degraded'
+        except Exception as e:
+            health_metrics['metrics']['precompute'] = None
+            health_metrics['alerts'].append(f"Precompute stats unavailable: {str(e)}")
+        
         # Store health metrics
         cache.set('matching_service_health', health_metrics, timeout=300)  # 5 minutes
         
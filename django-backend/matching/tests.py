@@ -1,3 +1,135 @@
+"""
+Tests for the matching cache and match list precompute
+"""
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from projects.models import Project, Task
+from users.models import User
+
+from .cache_service import MatchingCacheService
+from .models import MatchingCache, MatchingCacheTag, MatchingDirtyEntry
+from .precompute import MatchingPrecomputeEngine
+
+
+class MatchingPrecomputeTest(TestCase):
+    """Test cases for dirty tracking and precomputed match lists"""
+
+    def setUp(self):
+        """Set up a pending task on an active project and an engine with a stub ranker"""
+        cache.clear()
+        client = User.objects.create(username='client', email='client@example.com')
+        self.project = Project.objects.create(
+            client=client, title='Marketplace', description='Build a marketplace', status='approved'
+        )
+        self.task = Task.objects.create(
+            project=self.project, title='API', description='Build the API',
+            required_skills=['Python'], estimated_hours=10
+        )
+        MatchingDirtyEntry.objects.all().delete()
+        self.rag_service = mock.Mock()
+        self.rag_service.find_matching_developers.return_value = [
+            {'developer_id': developer_id, 'final_score': 0.9 - developer_id / 100} for developer_id in range(1, 4)
+        ]
+        self.engine = MatchingPrecomputeEngine(rag_service=self.rag_service)
+
+    def test_remark_keeps_first_marked_at(self):
+        """Test that marking an entry again only moves last_marked_at and the reason"""
+        self.engine.mark_projects([self.project.id], 'created')
+        first = MatchingDirtyEntry.objects.get()
+
+        self.engine.mark_projects([self.project.id], 'updated')
+
+        entry = MatchingDirtyEntry.objects.get()
+        self.assertEqual(entry.first_marked_at, first.first_marked_at)
+        self.assertGreater(entry.last_marked_at, first.last_marked_at)
+        self.assertEqual(entry.reason, 'updated')
+
+    def test_mark_during_batch_is_kept(self):
+        """Test that an entry marked again while its lists are recomputed stays dirty"""
+        self.engine.mark_projects([self.project.id], 'created')
+        recompute_task = self.engine.recompute_task
+
+        def recompute_and_remark(task):
+            result = recompute_task(task)
+            self.engine.mark_projects([self.project.id], 'updated')
+            return result
+
+        with mock.patch.object(self.engine, 'recompute_task', side_effect=recompute_and_remark):
+            batch = self.engine.process_batch()
+
+        self.assertEqual(batch['lists_recomputed'], 1)
+        self.assertEqual(batch['cleared'], 0)
+        entry = MatchingDirtyEntry.objects.get()
+        self.assertEqual(entry.reason, 'updated')
+        self.assertIsNone(entry.claimed_at)
+
+        self.assertEqual(self.engine.process_batch()['cleared'], 1)
+        self.assertFalse(MatchingDirtyEntry.objects.exists())
+
+    def test_get_precomputed_matches(self):
+        """Test that stored lists are served up to the limit they can answer for"""
+        self.assertIsNone(self.engine.get_precomputed_matches(self.task.id))
+        self.engine.recompute_task(self.task)
+
+        matches = self.engine.get_precomputed_matches(self.task.id, limit=2)
+        self.assertEqual([match['developer_id'] for match in matches], [1, 2])
+        # Three matches under a limit of ten is every candidate there is
+        self.assertEqual(len(self.engine.get_precomputed_matches(self.task.id, limit=20)), 3)
+
+        with self.settings(MATCHING_PRECOMPUTE_LIMIT=3):
+            self.assertIsNone(self.engine.get_precomputed_matches(self.task.id, limit=5))
+
+    def test_team_hiring_reads_precomputed_matches(self):
+        """Test that team hiring uses a stored list instead of ranking developers again"""
+        from projects.team_hiring_service import TeamHiringService
+
+        with mock.patch('projects.team_hiring_service.matching_precompute', self.engine), \
+                mock.patch.object(TeamHiringService, '_rank_task_matches') as rank:
+            self.engine.recompute_task(self.task)
+            TeamHiringService._find_task_matches(self.task, 3)
+
+        rank.assert_not_called()
+
+
+class MatchingCacheTagTest(TestCase):
+    """Test cases for tag-based cache invalidation"""
+
+    def setUp(self):
+        """Set up an empty cache service"""
+        cache.clear()
+        self.service = MatchingCacheService()
+
+    def store(self, project_id, developer_ids):
+        self.service.store_result(
+            'developer_match', {'project_id': project_id},
+            {'matches': [{'developer_id': developer_id} for developer_id in developer_ids]}
+        )
+        return self.service._generate_cache_key('developer_match', {'project_id': project_id})
+
+    def test_invalidates_only_tagged_entries(self):
+        """Test that invalidating a user drops the entries mentioning them from both tiers"""
+        tagged = self.store('p1', [5, 6])
+        untouched = self.store('p2', [7])
+
+        self.assertEqual(self.service.bulk_invalidate(user_ids=[5]), 1)
+
+        self.assertIsNone(cache.get(tagged))
+        self.assertFalse(MatchingCache.objects.filter(cache_key=tagged).exists())
+        self.assertIsNotNone(cache.get(untouched))
+        self.assertEqual(self.service.get_cached_result('developer_match', {'project_id': 'p2'})['matches'],
+                         [{'developer_id': 7}])
+
+    def test_restore_replaces_tags(self):
+        """Test that storing an entry again drops tags it no longer mentions"""
+        cache_key = self.store('p1', [5])
+        self.store('p1', [6])
+
+        self.assertEqual(
+            set(MatchingCacheTag.objects.filter(cache_entry__cache_key=cache_key).values_list('tag', flat=True)),
+            {'project:p1', 'user:6'}
+        )
+        self.assertEqual(self.service.bulk_invalidate(user_ids=[5]), 0)
+        self.assertEqual(self.service.bulk_invalidate(user_ids=[6]), 1)
@@ -17,6 +17,7 @@ from .serializers import (
 from .cache_service import matching_cache_service
 from ai_services.hybrid_rag_service import hybrid_rag_service
 from projects.models import Project, Task
+from users.candidates import candidate_hydrator
 from users.models import DeveloperProfile
 
 User = get_user_model()
@@ -658,15 +659,19 @@ class RealTimeMatchingViewSet(viewsets.ViewSet):
     def _store_matches(self, matches, project, task_id=None):
         """Store matches in database for caching"""
         stored_matches = []
+        developers = candidate_hydrator().load(match_data['developer_id'] for match_data in matches)
+        task = None
         
         for match_data in matches:
             try:
-                developer = User.objects.get(id=match_data['developer_id'])
+                developer = developers.get(match_data['developer_id'])
+                if developer is None:
+                    raise User.DoesNotExist(f"Developer {match_data['developer_id']} not found")
                 
-                # Get or create task
-                if task_id:
+                # Get or create task (once; every match is for the same task)
+                if task is None and task_id:
                     task = Task.objects.get(id=task_id)
-                else:
+                elif task is None:
                     # Create a temporary task for project-level matching
                     task, created = Task.objects.get_or_create(
                         project=project,
@@ -864,6 +869,8 @@ class MatchingAnalyticsViewSet(viewsets.ReadOnlyModelViewSet):
         
         if filters.get('required_skills'):
             project_data['required_skills'].extend(filters['required_skills'])
+            # Skills asked for in the search filters are hard requirements
+            project_data['mandatory_skills'] = filters['required_skills']
         
         if filters.get('excluded_skills'):
             project_data['excluded_skills'] = filters['excluded_skills']
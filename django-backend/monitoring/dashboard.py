@@ -16,6 +16,8 @@ from django.views.decorators.csrf import csrf_exempt
 
 from .performance_monitor import PerformanceMonitor
 from .health_checks import HealthCheckService
+from .timeseries import timeseries_store, choose_resolution
+from .retention import MetricRetentionEngine
 
 class MonitoringDashboard:
     """Central monitoring dashboard service"""
@@ -28,13 +30,7 @@ class MonitoringDashboard:
         try:
             # Get health status
             health_service = HealthCheckService()
-            health_checks = {
-                'database': health_service.check_database(),
-                'cache': health_service.check_cache(),
-                'ai_services': health_service.check_ai_services(),
-                'external_services': health_service.check_external_services(),
-                'celery': health_service.check_celery(),
-            }
+            health_checks = health_service.run_checks()
             
             # Calculate overall health
             healthy_services = sum(1 for check in health_checks.values() if check['status'] == 'healthy')
@@ -145,12 +141,18 @@ class MonitoringDashboard:
     
     @classmethod
     def get_performance_trends(cls, hours: int = 24) -> Dict[str, Any]:
-        """Get performance trends over time"""
+        """Get performance trends over time from the metrics time-series store"""
         try:
             end_time = timezone.now()
             start_time = end_time - timedelta(hours=hours)
+            resolution = choose_resolution(hours)
+            start_ts, end_ts = start_time.timestamp(), end_time.timestamp()
+            
+            # One read per series
+            requests = timeseries_store.query('requests', start_ts, end_ts, resolution)
+            database = timeseries_store.query('database', start_ts, end_ts, resolution)
+            ai_services = timeseries_store.query('ai_services', start_ts, end_ts, resolution)
             
-            # Collect hourly performance data
             trends = {
                 'response_times': [],
                 'error_rates': [],
@@ -159,39 +161,43 @@ class MonitoringDashboard:
                 'ai_service_performance': [],
             }
             
-            current_time = start_time
-            while current_time <= end_time:
-                hour_key = current_time.strftime('%Y%m%d%H')
-                
-                # Get cached metrics for this hour
-                response_time_data = cls._get_hourly_response_times(hour_key)
-                error_rate_data = cls._get_hourly_error_rates(hour_key)
-                throughput_data = cls._get_hourly_throughput(hour_key)
-                db_performance_data = cls._get_hourly_db_performance(hour_key)
-                ai_performance_data = cls._get_hourly_ai_performance(hour_key)
-                
+            for point in requests:
+                count = point['count']
                 trends['response_times'].append({
-                    'timestamp': current_time.isoformat(),
-                    'value': response_time_data,
+                    'timestamp': point['timestamp'],
+                    'value': (point['sum_ms'] / count / 1000.0) if count else 0.0,
+                    'max': point['max_ms'] / 1000.0,
                 })
                 trends['error_rates'].append({
-                    'timestamp': current_time.isoformat(),
-                    'value': error_rate_data,
+                    'timestamp': point['timestamp'],
+                    'value': (point['error_count'] / count) if count else 0.0,
                 })
                 trends['throughput'].append({
-                    'timestamp': current_time.isoformat(),
-                    'value': throughput_data,
+                    'timestamp': point['timestamp'],
+                    'value': int(count),
                 })
+            
+            for point in database:
+                samples = point['samples']
                 trends['database_performance'].append({
-                    'timestamp': current_time.isoformat(),
-                    'value': db_performance_data,
+                    'timestamp': point['timestamp'],
+                    'value': {
+                        'response_time': (point['sum_ms'] / samples / 1000.0) if samples else 0.0,
+                        'max_response_time': point['max_ms'] / 1000.0,
+                        'failure_rate': (point['failures'] / samples) if samples else 0.0,
+                    },
                 })
+            
+            for point in ai_services:
+                count = point['count']
                 trends['ai_service_performance'].append({
-                    'timestamp': current_time.isoformat(),
-                    'value': ai_performance_data,
+                    'timestamp': point['timestamp'],
+                    'value': {
+                        'response_time': (point['sum_ms'] / count / 1000.0) if count else 0.0,
+                        'success_rate': (point['success_count'] / count) if count else 1.0,
+                        'request_count': int(count),
+                    },
                 })
-                
-                current_time += timedelta(hours=1)
             
             return {
                 'timestamp': timezone.now().isoformat(),
@@ -199,6 +205,7 @@ class MonitoringDashboard:
                     'start': start_time.isoformat(),
                     'end': end_time.isoformat(),
                     'hours': hours,
+                    'resolution': resolution,
                 },
                 'trends': trends,
             }
@@ -209,6 +216,29 @@ class MonitoringDashboard:
                 'timestamp': timezone.now().isoformat(),
             }
     
+    @classmethod
+    def get_metric_history(cls, source: str, dimension: str, metric_name: str,
+                           days: int = 7, granularity: Optional[str] = None) -> Dict[str, Any]:
+        """Get long-range history of one metric from the hourly/daily rollups"""
+        end_time = timezone.now()
+        start_time = end_time - timedelta(days=days)
+        points = MetricRetentionEngine().get_series(
+            source, dimension, metric_name, start_time, end_time, granularity
+        )
+        
+        return {
+            'timestamp': end_time.isoformat(),
+            'period': {
+                'start': start_time.isoformat(),
+                'end': end_time.isoformat(),
+                'days': days,
+            },
+            'source': source,
+            'dimension': dimension,
+            'metric': metric_name,
+            'points': points,
+        }
+    
     @classmethod
     def get_alerts_summary(cls) -> Dict[str, Any]:
         """Get current alerts and their status"""
@@ -347,41 +377,6 @@ class MonitoringDashboard:
         except Exception:
             return 0.0
     
-    @classmethod
-    def _get_hourly_response_times(cls, hour_key: str) -> float:
-        """Get average response time for an hour"""
-        cache_key = f"{PerformanceMonitor.CACHE_PREFIX}:requests:*:{hour_key}"
-        # This is simplified - in production you'd aggregate all matching keys
-        return 0.5  # Placeholder
-    
-    @classmethod
-    def _get_hourly_error_rates(cls, hour_key: str) -> float:
-        """Get error rate for an hour"""
-        # Simplified implementation
-        return 0.02  # Placeholder
-    
-    @classmethod
-    def _get_hourly_throughput(cls, hour_key: str) -> int:
-        """Get request throughput for an hour"""
-        # Simplified implementation
-        return 1000  # Placeholder
-    
-    @classmethod
-    def _get_hourly_db_performance(cls, hour_key: str) -> Dict[str, float]:
-        """Get database performance metrics for an hour"""
-        return {
-            'query_time': 0.1,
-            'connection_count': 10,
-        }
-    
-    @classmethod
-    def _get_hourly_ai_performance(cls, hour_key: str) -> Dict[str, float]:
-        """Get AI service performance metrics for an hour"""
-        return {
-            'response_time': 2.5,
-            'success_rate': 0.98,
-        }
-    
     @classmethod
     def _get_alert_history(cls) -> List[Dict[str, Any]]:
         """Get recent alert history"""
@@ -437,6 +432,32 @@ def performance_trends(request):
             'timestamp': timezone.now().isoformat(),
         }, status=500)
 
+@csrf_exempt
+@require_http_methods(["GET"])
+def metric_history(request):
+    """API endpoint for rolled-up metric history"""
+    try:
+        source = request.GET.get('source', '')
+        dimension = request.GET.get('dimension', '')
+        metric_name = request.GET.get('metric', '')
+        granularity = request.GET.get('granularity') or None
+        
+        if source not in MetricRetentionEngine.SOURCES or not dimension or not metric_name:
+            return JsonResponse({
+                'error': f"source ({', '.join(MetricRetentionEngine.SOURCES)}), dimension and metric are required",
+            }, status=400)
+        if granularity not in (None, 'hour', 'day'):
+            return JsonResponse({'error': "granularity must be 'hour' or 'day'"}, status=400)
+        
+        days = int(request.GET.get('days', 7))
+        data = MonitoringDashboard.get_metric_history(source, dimension, metric_name, days, granularity)
+        return JsonResponse(data)
+    except Exception as e:
+        return JsonResponse({
+            'error': str(e),
+            'timestamp': timezone.now().isoformat(),
+        }, status=500)
+
 @csrf_exempt
 @require_http_methods(["GET"])
 def alerts_summary(request):
@@ -18,11 +18,48 @@ from projects.models import Project
 from users.models import User
 from payments.models import Payment
 
+from .probe_executor import probe_executor
+
 logger = logging.getLogger(__name__)
 
 class HealthCheckService:
     """Service for performing various health checks"""
     
+    # Per-check deadlines in seconds
+    CHECK_DEADLINES = {
+        'database': 1.0,
+        'cache': 0.5,
+        'ai_services': 3.0,
+        'external_services': 3.0,
+        'celery': 2.0,
+    }
+    
+    # Fixed latency budget for readiness probes
+    READINESS_BUDGET = 1.0
+    
+    def run_checks(self, names=None, budget: float = None, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Run the named checks concurrently with per-check deadlines
+        
+        Args:
+            names: Checks to run (defaults to all)
+            budget: Optional overall latency budget in seconds
+            use_cache: Reuse results younger than the executor's cache TTL
+            
+        Returns:
+            Dict of check results keyed by name; checks that miss their
+            deadline come back with status 'timeout'
+        """
+        names = names or list(self.CHECK_DEADLINES)
+        probes = {name: getattr(self, f'check_{name}') for name in names}
+        results = probe_executor.run(
+            {f'health:{name}': probe for name, probe in probes.items()},
+            deadlines={f'health:{name}': self.CHECK_DEADLINES[name] for name in names},
+            budget=budget,
+            use_cache=use_cache,
+        )
+        return {name: results[f'health:{name}'] for name in names}
+    
     @staticmethod
     def check_database() -> Dict[str, Any]:
         """Check database connectivity and basic operations"""
@@ -187,8 +224,9 @@ def health_check(request):
         health_service = HealthCheckService()
         
         # Perform basic checks
-        db_health = health_service.check_database()
-        cache_health = health_service.check_cache()
+        checks = health_service.run_checks(['database', 'cache'])
+        db_health = checks['database']
+        cache_health = checks['cache']
         
         overall_status = 'healthy'
         if db_health['status'] != 'healthy' or cache_health['status'] != 'healthy':
@@ -222,14 +260,8 @@ def detailed_health_check(request):
     try:
         health_service = HealthCheckService()
         
-        # Perform all checks
-        checks = {
-            'database': health_service.check_database(),
-            'cache': health_service.check_cache(),
-            'ai_services': health_service.check_ai_services(),
-            'external_services': health_service.check_external_services(),
-            'celery': health_service.check_celery()
-        }
+        # Perform all checks concurrently
+        checks = health_service.run_checks()
         
         # Determine overall status
         overall_status = 'healthy'
@@ -262,9 +294,12 @@ def readiness_check(request):
     try:
         health_service = HealthCheckService()
         
-        # Check critical services for readiness
-        db_health = health_service.check_database()
-        cache_health = health_service.check_cache()
+        # Check critical services for readiness within a fixed latency budget
+        checks = health_service.run_checks(
+            ['database', 'cache'], budget=HealthCheckService.READINESS_BUDGET
+        )
+        db_health = checks['database']
+        cache_health = checks['cache']
         
         if db_health['status'] == 'healthy' and cache_health['status'] == 'healthy':
             return JsonResponse({
@@ -0,0 +1,391 @@
+"""
+In-process request metrics registry with log-linear latency histograms.
+
+Request threads record into a per-thread buffer without touching Redis or
+taking locks. A background flusher swaps the buffers out every
+``METRICS_FLUSH_INTERVAL`` seconds and merges them into Redis hashes with
+atomic HINCRBY operations in one pipeline, so concurrent processes never
+overwrite each other's updates.
+"""
+import atexit
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from collections import defaultdict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger('performance')
+
+
+class LogLinearHistogram:
+    """
+    HDR-style histogram over integer microsecond values.
+
+    Values are bucketed by power of two with ``SUB_BUCKETS / 2`` linear
+    sub-buckets per power, which bounds the relative error of any reported
+    percentile to about 3% with the default 6 bits of precision while
+    keeping the bucket index computable with a couple of integer operations.
+    """
+
+    SUB_BUCKET_BITS = 6
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+    __slots__ = ('counts', 'total', 'sum')
+
+    def __init__(self):
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.total = 0
+        self.sum = 0
+
+    @classmethod
+    def bucket_index(cls, value: int) -> int:
+        """Map a non-negative integer to its bucket index"""
+        if value < cls.SUB_BUCKETS:
+            return value
+        # Keep the top SUB_BUCKET_BITS bits of the value; the exponent selects the range
+        exponent = value.bit_length() - cls.SUB_BUCKET_BITS
+        return (exponent << cls.SUB_BUCKET_BITS) + (value >> exponent)
+
+    @classmethod
+    def bucket_bounds(cls, index: int) -> Tuple[int, int]:
+        """Inclusive lower and exclusive upper bound of a bucket"""
+        if index < cls.SUB_BUCKETS:
+            return index, index + 1
+        exponent = index >> cls.SUB_BUCKET_BITS
+        low = (index & (cls.SUB_BUCKETS - 1)) << exponent
+        return low, low + (1 << exponent)
+
+    def record(self, value: int, count: int = 1) -> None:
+        self.counts[self.bucket_index(value)] += count
+        self.total += count
+        self.sum += value * count
+
+    def merge(self, other: 'LogLinearHistogram') -> None:
+        for index, count in other.counts.items():
+            self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+
+    @classmethod
+    def from_buckets(cls, buckets: Dict[int, int]) -> 'LogLinearHistogram':
+        histogram = cls()
+        for index, count in buckets.items():
+            low, high = cls.bucket_bounds(index)
+            histogram.counts[index] += count
+            histogram.total += count
+            histogram.sum += ((low + high) // 2) * count
+        return histogram
+
+    def percentile(self, q: float) -> Optional[int]:
+        """Value at quantile ``q`` (0-100), reported as the bucket midpoint"""
+        if not self.total:
+            return None
+        rank = max(1, math.ceil(self.total * q / 100.0))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self.bucket_bounds(index)
+                return (low + high - 1) // 2
+        return None
+
+    def min(self) -> Optional[int]:
+        return self.bucket_bounds(min(self.counts))[0] if self.counts else None
+
+    def max(self) -> Optional[int]:
+        return self.bucket_bounds(max(self.counts))[1] - 1 if self.counts else None
+
+
+class _SeriesStats:
+    """Counters and latency histogram for one (view, method) series"""
+
+    __slots__ = ('count', 'error_count', 'status_codes', 'histogram')
+
+    def __init__(self):
+        self.count = 0
+        self.error_count = 0
+        self.status_codes: Dict[int, int] = defaultdict(int)
+        self.histogram = LogLinearHistogram()
+
+    def merge(self, other: '_SeriesStats') -> None:
+        self.count += other.count
+        self.error_count += other.error_count
+        for status, count in other.status_codes.items():
+            self.status_codes[status] += count
+        self.histogram.merge(other.histogram)
+
+
+class MetricsRegistry:
+    """
+    Process-local registry of request counters and latency histograms.
+
+    ``record`` only touches a buffer owned by the calling thread. ``flush``
+    swaps each thread's buffer for a fresh one and merges buffers retired on
+    the *previous* flush, which guarantees no writer is still holding them
+    (a simple epoch scheme instead of a lock on the hot path).
+    """
+
+    KEY_PREFIX = 'perf_monitor:metrics'
+    KEY_TTL = 60 * 60 * 26  # keep raw minute data a bit over a day
+
+    def __init__(self, flush_interval: float = None):
+        self.flush_interval = flush_interval or getattr(settings, 'METRICS_FLUSH_INTERVAL', 10)
+        self._local = threading.local()
+        self._buffers: List[Dict] = []
+        self._retired: List[Dict] = []
+        self._registry_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.flush_listeners = []
+        if hasattr(os, 'register_at_fork'):
+            # Threads do not survive fork(); child workers start their own flusher
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._local = threading.local()
+        self._buffers = []
+        self._retired = []
+        self._registry_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------ hot path
+
+    def _buffer(self) -> Dict:
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = {'data': {}, 'thread': weakref.ref(threading.current_thread())}
+            self._local.holder = holder
+            with self._registry_lock:
+                self._buffers.append(holder)
+            self._ensure_flusher()
+        return holder['data']
+
+    def record(self, view_name: str, method: str, response_time: float, status_code: int) -> None:
+        """Record one request; ``response_time`` is in seconds"""
+        buffer = self._buffer()
+        key = (int(time.time() // 60), view_name, method)
+        stats = buffer.get(key)
+        if stats is None:
+            stats = buffer[key] = _SeriesStats()
+        stats.count += 1
+        if status_code >= 400:
+            stats.error_count += 1
+        stats.status_codes[status_code] += 1
+        stats.histogram.record(int(response_time * 1_000_000))
+
+    # ------------------------------------------------------------------ flushing
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._registry_lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._run_flusher, name='metrics-flusher', daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Metrics flush failed: {str(e)}")
+
+    def collect(self, drain: bool = False) -> Dict[Tuple[int, str, str], _SeriesStats]:
+        """
+        Swap out thread buffers and return the merged data that is safe to read.
+
+        With ``drain`` the just-swapped buffers are merged immediately too,
+        which is only safe when no other thread is recording (shutdown, tests).
+        """
+        with self._registry_lock:
+            swapped = []
+            live = []
+            for holder in self._buffers:
+                data = holder['data']
+                if data:
+                    holder['data'] = {}
+                    swapped.append(data)
+                # A finished thread never records again, so its holder can go
+                # once its last data is swapped out
+                thread = holder['thread']()
+                if thread is not None and thread.is_alive():
+                    live.append(holder)
+            self._buffers = live
+            ready, self._retired = self._retired, swapped
+            if drain:
+                ready, self._retired = ready + swapped, []
+
+        merged: Dict[Tuple[int, str, str], _SeriesStats] = {}
+        for data in ready:
+            for key, stats in data.items():
+                target = merged.get(key)
+                if target is None:
+                    merged[key] = stats
+                else:
+                    target.merge(stats)
+        return merged
+
+    def flush(self, drain: bool = False) -> int:
+        """Merge collected metrics into Redis; returns the number of series written"""
+        with self._flush_lock:
+            merged = self.collect(drain=drain)
+            if not merged:
+                return 0
+            write_series(merged, self.KEY_PREFIX, self.KEY_TTL)
+            for listener in self.flush_listeners:
+                try:
+                    listener(merged)
+                except Exception as e:
+                    logger.error(f"Metrics flush listener failed: {str(e)}")
+            return len(merged)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        try:
+            self.flush(drain=True)
+        except Exception as e:
+            logger.error(f"Final metrics flush failed: {str(e)}")
+
+    # ------------------------------------------------------------------ reading
+
+    def read_series(self, view_name: str, method: str, minutes: Iterable[int]) -> Dict[str, Any]:
+        """Read and combine stored minute series for one view"""
+        keys = [series_key(self.KEY_PREFIX, minute, view_name, method) for minute in minutes]
+        return summarize(read_hashes(keys))
+
+    def views_for_minute(self, minute: int) -> List[str]:
+        members = read_set(f"{self.KEY_PREFIX}:views:{minute}")
+        return sorted(members)
+
+
+def series_key(prefix: str, minute: int, view_name: str, method: str) -> str:
+    return f"{prefix}:{minute}:{view_name}:{method}"
+
+
+def _get_redis():
+    """Raw Redis client behind the default cache, or None for other backends"""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except Exception:
+        return None
+
+
+def _stats_fields(stats: _SeriesStats) -> Dict[str, int]:
+    fields = {
+        'count': stats.count,
+        'error_count': stats.error_count,
+        'sum_us': stats.histogram.sum,
+    }
+    for status, count in stats.status_codes.items():
+        fields[f"status:{status}"] = count
+    for index, count in stats.histogram.counts.items():
+        fields[f"b:{index}"] = count
+    return fields
+
+
+def write_series(merged: Dict[Tuple[int, str, str], _SeriesStats], prefix: str, ttl: int) -> None:
+    """Atomically add series counters into Redis hashes (one pipeline)"""
+    redis_client = _get_redis()
+    if redis_client is not None:
+        pipeline = redis_client.pipeline(transaction=False)
+        for (minute, view_name, method), stats in merged.items():
+            key = series_key(prefix, minute, view_name, method)
+            for field, value in _stats_fields(stats).items():
+                pipeline.hincrby(key, field, value)
+            pipeline.expire(key, ttl)
+            views_key = f"{prefix}:views:{minute}"
+            pipeline.sadd(views_key, f"{view_name}|{method}")
+            pipeline.expire(views_key, ttl)
+        pipeline.execute()
+        return
+
+    # Non-Redis cache backends (development/tests): per-field atomic incr
+    for (minute, view_name, method), stats in merged.items():
+        key = series_key(prefix, minute, view_name, method)
+        field_names = set(cache.get(f"{key}:fields", []))
+        for field, value in _stats_fields(stats).items():
+            field_key = f"{key}:{field}"
+            if not cache.add(field_key, value, ttl):
+                cache.incr(field_key, value)
+            field_names.add(field)
+        cache.set(f"{key}:fields", sorted(field_names), ttl)
+        views_key = f"{prefix}:views:{minute}"
+        views = set(cache.get(views_key, []))
+        views.add(f"{view_name}|{method}")
+        cache.set(views_key, sorted(views), ttl)
+
+
+def read_hashes(keys: List[str]) -> List[Dict[str, int]]:
+    redis_client = _get_redis()
+    if redis_client is not None:
+        pipeline = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.hgetall(key)
+        return [
+            {(k.decode() if isinstance(k, bytes) else k): int(v) for k, v in raw.items()}
+            for raw in pipeline.execute()
+        ]
+
+    hashes = []
+    for key in keys:
+        fields = cache.get(f"{key}:fields", [])
+        values = cache.get_many([f"{key}:{field}" for field in fields])
+        hashes.append({field: int(values.get(f"{key}:{field}", 0)) for field in fields})
+    return hashes
+
+
+def read_set(key: str) -> List[str]:
+    redis_client = _get_redis()
+    if redis_client is not None:
+        return [m.decode() if isinstance(m, bytes) else m for m in redis_client.smembers(key)]
+    return list(cache.get(key, []))
+
+
+def summarize(hashes: List[Dict[str, int]]) -> Dict[str, Any]:
+    """Combine stored hashes into counts and bucket-precision percentiles (ms)"""
+    count = error_count = 0
+    status_codes: Dict[str, int] = defaultdict(int)
+    buckets: Dict[int, int] = defaultdict(int)
+    for fields in hashes:
+        for field, value in fields.items():
+            if field == 'count':
+                count += value
+            elif field == 'error_count':
+                error_count += value
+            elif field.startswith('status:'):
+                status_codes[field[7:]] += value
+            elif field.startswith('b:'):
+                buckets[int(field[2:])] += value
+
+    histogram = LogLinearHistogram.from_buckets(buckets)
+
+    def to_ms(value):
+        return round(value / 1000.0, 3) if value is not None else None
+
+    return {
+        'count': count,
+        'error_count': error_count,
+        'error_rate': error_count / count if count else 0.0,
+        'status_codes': dict(status_codes),
+        'avg_ms': to_ms(histogram.sum / histogram.total) if histogram.total else None,
+        'min_ms': to_ms(histogram.min()),
+        'max_ms': to_ms(histogram.max()),
+        'p50_ms': to_ms(histogram.percentile(50)),
+        'p95_ms': to_ms(histogram.percentile(95)),
+        'p99_ms': to_ms(histogram.percentile(99)),
+    }
+
+
+metrics_registry = MetricsRegistry()
+atexit.register(metrics_registry.shutdown)
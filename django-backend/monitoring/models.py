@@ -44,6 +44,7 @@ class ServiceHealthMetric(models.Model):
         indexes = [
             models.Index(fields=['service_name', '-timestamp']),
             models.Index(fields=['status', '-timestamp']),
+            models.Index(fields=['timestamp']),
         ]
     
     def __str__(self):
@@ -67,6 +68,7 @@ class TaskQueueMetric(models.Model):
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['queue_name', '-timestamp']),
+            models.Index(fields=['timestamp']),
         ]
     
     def __str__(self):
@@ -103,6 +105,7 @@ class AIServiceMetric(models.Model):
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['service_type', '-timestamp']),
+            models.Index(fields=['timestamp']),
         ]
     
     def __str__(self):
@@ -116,6 +119,48 @@ class AIServiceMetric(models.Model):
         return (self.successful_requests / self.requests_count) * 100
 
 
+class MetricRollup(models.Model):
+    """Hourly and daily aggregates of raw monitoring metric rows."""
+    
+    SOURCE_CHOICES = [
+        ('service_health', 'Service Health'),
+        ('ai_service', 'AI Service'),
+        ('task_queue', 'Task Queue'),
+    ]
+    
+    GRANULARITY_CHOICES = [
+        ('hour', 'Hourly'),
+        ('day', 'Daily'),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    dimension = models.CharField(max_length=100)  # service name, service type or queue name
+    metric_name = models.CharField(max_length=50)
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    sample_count = models.IntegerField(default=0)
+    min_value = models.FloatField(null=True, blank=True)
+    avg_value = models.FloatField(null=True, blank=True)
+    max_value = models.FloatField(null=True, blank=True)
+    p95_value = models.FloatField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-bucket_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'dimension', 'metric_name', 'granularity', 'bucket_start'],
+                name='unique_metric_rollup_bucket'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['source', 'granularity', 'metric_name', 'bucket_start']),
+        ]
+    
+    def __str__(self):
+        return f"{self.source}:{self.dimension}:{self.metric_name} ({self.granularity}) at {self.bucket_start}"
+
+
 class SystemAlert(models.Model):
     """System alerts and notifications."""
     
@@ -13,6 +13,9 @@ from django.conf import settings
 from django.db import connection
 from django.utils import timezone
 
+from .metrics_registry import metrics_registry
+from .timeseries import timeseries_store, record_flushed_requests
+
 logger = logging.getLogger('performance')
 
 class PerformanceMonitor:
@@ -25,52 +28,45 @@ class PerformanceMonitor:
     
     @classmethod
     def record_request_metrics(cls, view_name: str, method: str, response_time: float, status_code: int):
-        """Record request performance metrics"""
+        """
+        Record request performance metrics
+        
+        Only updates the in-process metrics registry; counters and latency
+        histograms are merged into Redis by the registry's background flusher.
+        """
         try:
-            timestamp = timezone.now()
-            cache_key = f"{cls.CACHE_PREFIX}:requests:{view_name}:{timestamp.strftime('%Y%m%d%H%M')}"
-            
-            # Get existing metrics or initialize
-            metrics = cache.get(cache_key, {
-                'count': 0,
-                'total_time': 0.0,
-                'error_count': 0,
-                'max_time': 0.0,
-                'min_time': float('inf'),
-                'status_codes': {}
-            })
-            
-            # Update metrics
-            metrics['count'] += 1
-            metrics['total_time'] += response_time
-            metrics['max_time'] = max(metrics['max_time'], response_time)
-            metrics['min_time'] = min(metrics['min_time'], response_time)
+            metrics_registry.record(view_name, method, response_time, status_code)
             
-            if status_code >= 400:
-                metrics['error_count'] += 1
-            
-            status_key = str(status_code)
-            metrics['status_codes'][status_key] = metrics['status_codes'].get(status_key, 0) + 1
-            
-            # Cache for 1 hour
-            cache.set(cache_key, metrics, 3600)
-            
-            # Log performance data
-            logger.info(json.dumps({
-                'event': 'request_performance',
-                'view': view_name,
-                'method': method,
-                'response_time': response_time,
-                'status_code': status_code,
-                'timestamp': timestamp.isoformat()
-            }))
-            
-            # Check for alerts
-            cls._check_performance_alerts(view_name, metrics, response_time)
+            if response_time > cls.ALERT_THRESHOLD_RESPONSE_TIME:
+                cls._send_alert('high_response_time', {
+                    'view': view_name,
+                    'response_time': response_time,
+                    'threshold': cls.ALERT_THRESHOLD_RESPONSE_TIME
+                })
             
         except Exception as e:
             logger.error(f"Failed to record request metrics: {str(e)}")
     
+    @classmethod
+    def check_flushed_request_metrics(cls, merged: Dict[Any, Any]):
+        """Run error-rate alerting over a batch of flushed per-minute series"""
+        totals = {}
+        for (minute, view_name, method), stats in merged.items():
+            view_totals = totals.setdefault(view_name, {'count': 0, 'error_count': 0})
+            view_totals['count'] += stats.count
+            view_totals['error_count'] += stats.error_count
+        
+        for view_name, view_totals in totals.items():
+            cls._check_performance_alerts(view_name, view_totals, 0.0)
+    
+    @classmethod
+    def get_request_metrics(cls, view_name: str, method: str = 'GET', minutes: int = 60) -> Dict[str, Any]:
+        """Counts and p50/p95/p99 latency for a view over the last N minutes"""
+        current_minute = int(time.time() // 60)
+        return metrics_registry.read_series(
+            view_name, method, range(current_minute - minutes + 1, current_minute + 1)
+        )
+    
     @classmethod
     def record_database_metrics(cls):
         """Record database performance metrics"""
@@ -131,6 +127,13 @@ class PerformanceMonitor:
             
             cache.set(cache_key, metrics, 3600)
             
+            timeseries_store.record('ai_services', {
+                'count': 1,
+                'success_count': 1 if success else 0,
+                'sum_ms': response_time * 1000,
+                'max_ms': response_time * 1000,
+            })
+            
             logger.info(json.dumps({
                 'event': 'ai_service_performance',
                 'service': service_name,
@@ -214,16 +217,17 @@ class PerformanceMonitor:
                 'ai_services': {}
             }
             
-            # Collect request metrics
-            current_time = start_time
-            while current_time <= end_time:
-                time_key = current_time.strftime('%Y%m%d%H%M')
-                
-                # Get all request metrics for this time period
-                pattern = f"{cls.CACHE_PREFIX}:requests:*:{time_key}"
-                # Note: This is a simplified version. In production, you'd use Redis SCAN
-                
-                current_time += timedelta(minutes=1)
+            # Collect request metrics from the flushed registry series
+            end_minute = int(end_time.timestamp() // 60)
+            minutes = range(end_minute - hours * 60 + 1, end_minute + 1)
+            
+            series = set()
+            for minute in minutes:
+                series.update(metrics_registry.views_for_minute(minute))
+            
+            for member in sorted(series):
+                view_name, _, method = member.rpartition('|')
+                summary['requests'][member] = metrics_registry.read_series(view_name, method, minutes)
             
             return summary
             
@@ -264,6 +268,24 @@ def monitor_performance(view_name: Optional[str] = None):
         return wrapper
     return decorator
 
+class RequestMetricsMiddleware:
+    """Records the latency and status of every request in the metrics registry"""
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        start_time = time.time()
+        response = self.get_response(request)
+        
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match is not None else 'unresolved'
+        PerformanceMonitor.record_request_metrics(
+            view_name, request.method, time.time() - start_time, response.status_code
+        )
+        
+        return response
+
 def monitor_ai_service(service_name: str, operation: str):
     """Decorator to monitor AI service performance"""
     def decorator(func):
@@ -287,4 +309,8 @@ def monitor_ai_service(service_name: str, operation: str):
                 )
         
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
+
+
+metrics_registry.flush_listeners.append(PerformanceMonitor.check_flushed_request_metrics)
+metrics_registry.flush_listeners.append(record_flushed_requests)
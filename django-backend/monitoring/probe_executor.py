@@ -0,0 +1,123 @@
+"""
+Concurrent health-probe executor.
+
+Runs dependency checks in parallel on a shared thread pool, each with its
+own deadline, so total latency is bounded by the slowest deadline rather
+than the sum of all checks. Results are cached for a short TTL and a probe
+that is still running is never started a second time, so bursts of
+readiness/liveness requests coalesce onto one in-flight check.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class ProbeExecutor:
+    """Runs named probes concurrently with per-probe deadlines and result caching"""
+
+    DEFAULT_DEADLINE = 2.0  # seconds
+    DEFAULT_CACHE_TTL = 5.0  # seconds
+
+    def __init__(self, max_workers: int = 8, cache_ttl: float = DEFAULT_CACHE_TTL):
+        self.cache_ttl = cache_ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='health-probe')
+        # Reentrant: a future that is already done runs its callback inline
+        self._lock = threading.RLock()
+        self._in_flight: Dict[str, Future] = {}
+        self._results: Dict[str, tuple] = {}  # name -> (completed_at, result)
+
+    @staticmethod
+    def _call_probe(name: str, probe: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        try:
+            return probe()
+        except Exception as e:
+            logger.error(f"Health probe {name} raised: {str(e)}")
+            return {
+                'status': 'unhealthy',
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+        finally:
+            # Probe threads open their own DB connections; don't leak them
+            connections.close_all()
+
+    def _store_result(self, name: str, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(name) is future:
+                del self._in_flight[name]
+            if not future.cancelled() and future.exception() is None:
+                self._results[name] = (time.monotonic(), future.result())
+
+    def _cached(self, name: str, max_age: float) -> Optional[Dict[str, Any]]:
+        entry = self._results.get(name)
+        if entry and time.monotonic() - entry[0] <= max_age:
+            return entry[1]
+        return None
+
+    def _submit(self, name: str, probe: Callable) -> Future:
+        with self._lock:
+            future = self._in_flight.get(name)
+            if future is None:
+                future = self._pool.submit(self._call_probe, name, probe)
+                self._in_flight[name] = future
+                future.add_done_callback(lambda f, n=name: self._store_result(n, f))
+            return future
+
+    def run(self, probes: Dict[str, Callable[[], Dict[str, Any]]],
+            deadlines: Dict[str, float] = None, budget: float = None,
+            use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Run probes concurrently and return results keyed by probe name.
+
+        Args:
+            probes: Mapping of probe name to a zero-argument callable
+            deadlines: Optional per-probe deadline in seconds
+            budget: Optional overall latency budget; caps every deadline
+            use_cache: Serve results younger than the cache TTL without probing
+
+        Returns:
+            Dict of results. Probes that miss their deadline are reported with
+            ``status='timeout'`` and ``timed_out=True`` and keep running in the
+            background so the next call can pick up their result.
+        """
+        deadlines = deadlines or {}
+        started = time.monotonic()
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, tuple] = {}
+
+        for name, probe in probes.items():
+            cached = self._cached(name, self.cache_ttl) if use_cache else None
+            if cached is not None:
+                results[name] = dict(cached, cached=True)
+                continue
+            deadline = deadlines.get(name, self.DEFAULT_DEADLINE)
+            if budget is not None:
+                deadline = min(deadline, budget)
+            pending[name] = (self._submit(name, probe), deadline)
+
+        # Wait for each probe until its own deadline (measured from the start)
+        for name, (future, deadline) in sorted(pending.items(), key=lambda item: item[1][1]):
+            remaining = deadline - (time.monotonic() - started)
+            if remaining > 0:
+                wait([future], timeout=remaining)
+            if future.done() and future.exception() is None:
+                results[name] = future.result()
+            else:
+                results[name] = {
+                    'status': 'timeout',
+                    'timed_out': True,
+                    'deadline_ms': round(deadline * 1000),
+                    'timestamp': datetime.now().isoformat()
+                }
+
+        return {name: results[name] for name in probes}
+
+
+probe_executor = ProbeExecutor()
@@ -0,0 +1,238 @@
+"""
+Downsampling and retention for raw monitoring metric rows.
+
+Raw ServiceHealthMetric, AIServiceMetric and TaskQueueMetric rows are kept
+for a short window. Completed days are rolled up into hourly and daily
+MetricRollup rows (count/min/avg/max/p95 per metric) and raw rows past the
+window are then deleted in bulk, so long-range queries read rollups instead
+of millions of raw rows.
+"""
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+from django.conf import settings
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import (
+    ServiceHealthMetric, TaskQueueMetric, AIServiceMetric, MetricRollup
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _healthy(status: str) -> float:
+    return 1.0 if status == 'healthy' else 0.0
+
+
+class MetricRetentionEngine:
+    """Rolls raw metric rows into MetricRollup and enforces retention"""
+
+    SOURCES = {
+        'service_health': {
+            'model': ServiceHealthMetric,
+            'dimension': 'service_name',
+            'metrics': ['response_time_ms', 'error_rate', 'throughput', 'cpu_usage', 'memory_usage'],
+            # Derived metrics computed from other columns; avg of 'healthy' is uptime
+            'derived': {'healthy': ('status', _healthy)},
+        },
+        'ai_service': {
+            'model': AIServiceMetric,
+            'dimension': 'service_type',
+            'metrics': [
+                'requests_count', 'successful_requests', 'failed_requests',
+                'average_response_time', 'accuracy_score', 'confidence_score',
+            ],
+            'derived': {},
+        },
+        'task_queue': {
+            'model': TaskQueueMetric,
+            'dimension': 'queue_name',
+            'metrics': [
+                'pending_tasks', 'active_tasks', 'completed_tasks_last_hour',
+                'failed_tasks_last_hour', 'average_task_duration', 'worker_count',
+            ],
+            'derived': {},
+        },
+    }
+
+    # Days of data to keep at each tier
+    DEFAULT_RETENTION_DAYS = {
+        'raw': 3,
+        'hour': 90,
+        'day': 730,
+    }
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, retention_days: Dict[str, int] = None):
+        self.retention_days = dict(self.DEFAULT_RETENTION_DAYS)
+        self.retention_days.update(getattr(settings, 'MONITORING_RETENTION_DAYS', {}))
+        if retention_days:
+            self.retention_days.update(retention_days)
+
+    @staticmethod
+    def _day_floor(value: datetime) -> datetime:
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def _p95(sorted_values: List[float]) -> float:
+        rank = max(1, math.ceil(len(sorted_values) * 0.95))
+        return sorted_values[rank - 1]
+
+    def _build_rollup(self, source, dimension, metric_name, granularity, bucket_start, values) -> MetricRollup:
+        values.sort()
+        return MetricRollup(
+            source=source,
+            dimension=dimension,
+            metric_name=metric_name,
+            granularity=granularity,
+            bucket_start=bucket_start,
+            sample_count=len(values),
+            min_value=values[0],
+            avg_value=sum(values) / len(values),
+            max_value=values[-1],
+            p95_value=self._p95(values),
+        )
+
+    def rollup_day(self, source: str, day_start: datetime) -> int:
+        """Aggregate one UTC day of raw rows into hourly and daily rollups"""
+        config = self.SOURCES[source]
+        model = config['model']
+        metrics = config['metrics']
+        derived = config['derived']
+        derived_columns = [column for column, _ in derived.values()]
+
+        hourly = defaultdict(list)
+        daily = defaultdict(list)
+
+        rows = model.objects.filter(
+            timestamp__gte=day_start,
+            timestamp__lt=day_start + timedelta(days=1)
+        ).values_list(config['dimension'], 'timestamp', *metrics, *derived_columns)
+
+        for row in rows.iterator(chunk_size=self.BATCH_SIZE):
+            dimension, timestamp = row[0], row[1]
+            hour = timestamp.replace(minute=0, second=0, microsecond=0)
+            values = dict(zip(metrics, row[2:2 + len(metrics)]))
+            extra = dict(zip(derived_columns, row[2 + len(metrics):]))
+            for metric_name, (column, func) in derived.items():
+                values[metric_name] = func(extra[column])
+
+            for metric_name, value in values.items():
+                if value is None:
+                    continue
+                hourly[(dimension, metric_name, hour)].append(float(value))
+                daily[(dimension, metric_name)].append(float(value))
+
+        rollups = [
+            self._build_rollup(source, dimension, metric_name, 'hour', hour, values)
+            for (dimension, metric_name, hour), values in hourly.items()
+        ]
+        rollups.extend(
+            self._build_rollup(source, dimension, metric_name, 'day', day_start, values)
+            for (dimension, metric_name), values in daily.items()
+        )
+
+        if rollups:
+            # Upsert so re-running a day (e.g. after late rows) is idempotent
+            MetricRollup.objects.bulk_create(
+                rollups,
+                batch_size=self.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['source', 'dimension', 'metric_name', 'granularity', 'bucket_start'],
+                update_fields=['sample_count', 'min_value', 'avg_value', 'max_value', 'p95_value'],
+            )
+        return len(rollups)
+
+    def process_source(self, source: str, now: datetime = None) -> Dict[str, Any]:
+        """Roll up all completed, not yet rolled-up days and drop expired raw rows"""
+        now = now or timezone.now()
+        model = self.SOURCES[source]['model']
+        today = self._day_floor(now)
+
+        last_rolled = MetricRollup.objects.filter(
+            source=source, granularity='day'
+        ).aggregate(last=Max('bucket_start'))['last']
+        first_raw = model.objects.aggregate(first=Min('timestamp'))['first']
+
+        days_rolled_up = 0
+        rollup_rows = 0
+        if first_raw is not None:
+            day = self._day_floor(first_raw)
+            if last_rolled is not None:
+                day = max(day, last_rolled + timedelta(days=1))
+            while day < today:
+                rollup_rows += self.rollup_day(source, day)
+                days_rolled_up += 1
+                day += timedelta(days=1)
+
+        # Raw rows are only dropped once their day has been rolled up
+        raw_cutoff = min(now - timedelta(days=self.retention_days['raw']), today)
+        raw_deleted = model.objects.filter(timestamp__lt=raw_cutoff).delete()[0]
+
+        return {
+            'days_rolled_up': days_rolled_up,
+            'rollup_rows': rollup_rows,
+            'raw_deleted': raw_deleted,
+        }
+
+    def prune_rollups(self, now: datetime = None) -> Dict[str, int]:
+        """Delete rollups older than their tier's retention"""
+        now = now or timezone.now()
+        deleted = {}
+        for granularity in ('hour', 'day'):
+            cutoff = now - timedelta(days=self.retention_days[granularity])
+            deleted[granularity] = MetricRollup.objects.filter(
+                granularity=granularity, bucket_start__lt=cutoff
+            ).delete()[0]
+        return deleted
+
+    def run(self, now: datetime = None) -> Dict[str, Any]:
+        """Process every source and prune old rollups"""
+        now = now or timezone.now()
+        results = {}
+        for source in self.SOURCES:
+            try:
+                results[source] = self.process_source(source, now)
+                logger.info(f"Metric retention for {source}: {results[source]}")
+            except Exception as e:
+                logger.error(f"Error applying metric retention for {source}: {str(e)}")
+                results[source] = f"Error: {str(e)}"
+        results['rollups_pruned'] = self.prune_rollups(now)
+        return results
+
+    def get_series(self, source: str, dimension: str, metric_name: str,
+                   start: datetime, end: datetime, granularity: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Read aggregated points for one metric; picks daily rollups for ranges
+        longer than a week unless a granularity is given.
+        """
+        if granularity is None:
+            granularity = 'day' if end - start > timedelta(days=7) else 'hour'
+
+        rollups = MetricRollup.objects.filter(
+            source=source,
+            dimension=dimension,
+            metric_name=metric_name,
+            granularity=granularity,
+            bucket_start__gte=start,
+            bucket_start__lt=end,
+        ).order_by('bucket_start').values(
+            'bucket_start', 'sample_count', 'min_value', 'avg_value', 'max_value', 'p95_value'
+        )
+
+        return [
+            {
+                'timestamp': row['bucket_start'].isoformat(),
+                'samples': row['sample_count'],
+                'min': row['min_value'],
+                'avg': row['avg_value'],
+                'max': row['max_value'],
+                'p95': row['p95_value'],
+            }
+            for row in rollups
+        ]
@@ -0,0 +1,326 @@
+"""
+Celery task telemetry collected from task signals.
+
+Worker processes count started, succeeded, failed and retried tasks and
+record run durations per (queue, task name) in memory. The accumulated
+data is merged into per-minute Redis hashes with pipelined HINCRBY at most
+every ``TASK_TELEMETRY_FLUSH_INTERVAL`` seconds (and on worker shutdown),
+so the hot path never waits on Redis. Broker queue depth is read straight
+from the broker with one pipelined LLEN instead of inspect() broadcasts.
+
+In-flight tasks are not kept as a shared counter, which would drift
+whenever a task is revoked or its process dies between prerun and postrun.
+Each process instead writes its absolute per-queue count to its own hash,
+and readers only sum processes that flushed within ``ACTIVE_TTL``.
+"""
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Any, Iterable, List
+
+from django.conf import settings
+
+from .metrics_registry import LogLinearHistogram, _get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class _TaskStats:
+    """Counters and duration histogram for one (queue, task name) pair"""
+
+    __slots__ = ('succeeded', 'failed', 'retried', 'histogram', 'exceptions')
+
+    def __init__(self):
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.histogram = LogLinearHistogram()
+        self.exceptions: Dict[str, int] = defaultdict(int)
+
+
+class TaskTelemetry:
+    """In-process aggregation of Celery task signals with periodic Redis flush"""
+
+    KEY_PREFIX = 'celery_telemetry'
+    KEY_TTL = 60 * 60 * 26
+    WORKER_TTL = 120  # seconds a worker counts as alive after its last flush
+    ACTIVE_TTL = 60 * 60  # in-flight counts of a process that stopped flushing are dropped after this
+
+    def __init__(self, flush_interval: float = None):
+        self.flush_interval = flush_interval or getattr(settings, 'TASK_TELEMETRY_FLUSH_INTERVAL', 10)
+        self.hostname = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop buffered data (prefork children must not flush the parent's)"""
+        self._lock = threading.Lock()
+        self._stats: Dict[tuple, _TaskStats] = {}
+        self._started: Dict[str, tuple] = {}  # task_id -> (queue, monotonic start)
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def queue_for(task) -> str:
+        request = getattr(task, 'request', None)
+        delivery_info = getattr(request, 'delivery_info', None) or {}
+        return delivery_info.get('routing_key') or default_queue_name()
+
+    @property
+    def process_id(self) -> str:
+        return f"{self.hostname or 'unknown'}:{os.getpid()}"
+
+    def _get_stats(self, queue: str, task_name: str) -> _TaskStats:
+        key = (queue, task_name)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _TaskStats()
+        return stats
+
+    # ------------------------------------------------------------------ signal handlers
+
+    def on_prerun(self, task_id=None, task=None, **kwargs):
+        queue = self.queue_for(task)
+        with self._lock:
+            self._started[task_id] = (queue, time.monotonic())
+
+    def on_postrun(self, task_id=None, task=None, state=None, **kwargs):
+        with self._lock:
+            queue, started = self._started.pop(task_id, (self.queue_for(task), None))
+            stats = self._get_stats(queue, task.name)
+            if started is not None:
+                stats.histogram.record(int((time.monotonic() - started) * 1_000_000))
+            if state == 'SUCCESS':
+                stats.succeeded += 1
+        self.maybe_flush()
+
+    def on_failure(self, task_id=None, exception=None, sender=None, **kwargs):
+        with self._lock:
+            stats = self._get_stats(self.queue_for(sender), sender.name)
+            stats.failed += 1
+            stats.exceptions[type(exception).__name__] += 1
+
+    def on_retry(self, request=None, sender=None, **kwargs):
+        with self._lock:
+            stats = self._get_stats(self.queue_for(sender), sender.name)
+            stats.retried += 1
+
+    def on_revoked(self, request=None, **kwargs):
+        # postrun is not sent for a task terminated while running
+        task_id = getattr(request, 'id', None)
+        with self._lock:
+            self._started.pop(task_id, None)
+
+    # ------------------------------------------------------------------ flushing
+
+    def maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Task telemetry flush failed: {str(e)}")
+
+    def flush(self) -> int:
+        """Merge accumulated stats into Redis; returns the number of series written"""
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            active = defaultdict(int)
+            for queue, _ in self._started.values():
+                active[queue] += 1
+            self._last_flush = time.monotonic()
+
+        redis_client = _get_redis()
+        if redis_client is None:
+            return 0
+
+        minute = int(time.time() // 60)
+        pipeline = redis_client.pipeline(transaction=False)
+        members_key = f"{self.KEY_PREFIX}:tasks:{minute}"
+        for (queue, task_name), task_stats in stats.items():
+            key = f"{self.KEY_PREFIX}:{minute}:{queue}:{task_name}"
+            fields = {
+                'succeeded': task_stats.succeeded,
+                'failed': task_stats.failed,
+                'retried': task_stats.retried,
+                'runs': task_stats.histogram.total,
+                'duration_sum_us': task_stats.histogram.sum,
+            }
+            for index, count in task_stats.histogram.counts.items():
+                fields[f"b:{index}"] = count
+            for exception_name, count in task_stats.exceptions.items():
+                fields[f"exc:{exception_name}"] = count
+            for field, value in fields.items():
+                if value:
+                    pipeline.hincrby(key, field, value)
+            pipeline.expire(key, self.KEY_TTL)
+            pipeline.sadd(members_key, f"{queue}|{task_name}")
+        pipeline.expire(members_key, self.KEY_TTL)
+
+        # Absolute counts, so a lost update is corrected by the next flush
+        process_id = self.process_id
+        active_key = f"{self.KEY_PREFIX}:active:{process_id}"
+        pipeline.delete(active_key)
+        if active:
+            pipeline.hset(active_key, mapping=active)
+            pipeline.expire(active_key, self.ACTIVE_TTL)
+        pipeline.zadd(f"{self.KEY_PREFIX}:active_processes", {process_id: time.time()})
+
+        if self.hostname:
+            pipeline.zadd(f"{self.KEY_PREFIX}:workers", {self.hostname: time.time()})
+
+        pipeline.execute()
+        return len(stats)
+
+    def forget_process(self) -> None:
+        """Remove this process's in-flight counts when it shuts down cleanly"""
+        redis_client = _get_redis()
+        if redis_client is None:
+            return
+        process_id = self.process_id
+        pipeline = redis_client.pipeline(transaction=False)
+        pipeline.delete(f"{self.KEY_PREFIX}:active:{process_id}")
+        pipeline.zrem(f"{self.KEY_PREFIX}:active_processes", process_id)
+        pipeline.execute()
+
+
+def default_queue_name() -> str:
+    try:
+        from celery import current_app
+        return current_app.conf.task_default_queue or 'celery'
+    except Exception:
+        return 'celery'
+
+
+def get_queue_depths(queue_names: Iterable[str]) -> Dict[str, int]:
+    """
+    Pending message count per queue, read from the Redis broker in one pipeline.
+
+    Queue names are Celery queue names; the platform's 'default' queue maps to
+    Celery's configured default queue.
+    """
+    import redis
+
+    queue_names = list(queue_names)
+    broker = redis.Redis.from_url(settings.CELERY_BROKER_URL)
+    pipeline = broker.pipeline(transaction=False)
+    for queue_name in queue_names:
+        pipeline.llen(default_queue_name() if queue_name == 'default' else queue_name)
+    return dict(zip(queue_names, (int(depth) for depth in pipeline.execute())))
+
+
+def get_queue_task_stats(queue_names: Iterable[str], hours: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+    Completed/failed counts, average duration, active tasks and live workers
+    per queue over the last N hours, read from flushed telemetry.
+    """
+    queue_names = list(queue_names)
+    results = {
+        queue_name: {'completed': 0, 'failed': 0, 'retried': 0, 'average_duration': 0.0,
+                     'p95_duration': 0.0, 'active': 0, 'workers': 0}
+        for queue_name in queue_names
+    }
+    redis_client = _get_redis()
+    if redis_client is None:
+        return results
+
+    prefix = TaskTelemetry.KEY_PREFIX
+    current_minute = int(time.time() // 60)
+    minutes = list(range(current_minute - hours * 60 + 1, current_minute + 1))
+
+    pipeline = redis_client.pipeline(transaction=False)
+    for minute in minutes:
+        pipeline.smembers(f"{prefix}:tasks:{minute}")
+    # Processes that stopped flushing (killed, lost) no longer count as running tasks
+    pipeline.zremrangebyscore(f"{prefix}:active_processes", '-inf', time.time() - TaskTelemetry.ACTIVE_TTL)
+    pipeline.zrange(f"{prefix}:active_processes", 0, -1)
+    raw = pipeline.execute()
+    member_sets, processes = raw[:len(minutes)], raw[-1]
+
+    # Map broker-level queue names back to the requested names
+    lookup = {default_queue_name() if q == 'default' else q: q for q in queue_names}
+
+    keys: List[tuple] = []
+    for minute, members in zip(minutes, member_sets):
+        for member in members:
+            member = member.decode() if isinstance(member, bytes) else member
+            queue, _, task_name = member.partition('|')
+            if queue in lookup:
+                keys.append((lookup[queue], f"{prefix}:{minute}:{queue}:{task_name}"))
+
+    pipeline = redis_client.pipeline(transaction=False)
+    for _, key in keys:
+        pipeline.hgetall(key)
+    for process_id in processes:
+        process_id = process_id.decode() if isinstance(process_id, bytes) else process_id
+        pipeline.hgetall(f"{prefix}:active:{process_id}")
+    pipeline.zcount(f"{prefix}:workers", time.time() - TaskTelemetry.WORKER_TTL, '+inf')
+    raw = pipeline.execute()
+    task_raw, active_raw, worker_count = raw[:len(keys)], raw[len(keys):-1], raw[-1]
+
+    histograms = defaultdict(dict)
+    for (queue_name, _), fields in zip(keys, task_raw):
+        fields = {(k.decode() if isinstance(k, bytes) else k): int(v) for k, v in fields.items()}
+        results[queue_name]['completed'] += fields.get('succeeded', 0)
+        results[queue_name]['failed'] += fields.get('failed', 0)
+        results[queue_name]['retried'] += fields.get('retried', 0)
+        buckets = histograms[queue_name]
+        for field, value in fields.items():
+            if field.startswith('b:'):
+                index = int(field[2:])
+                buckets[index] = buckets.get(index, 0) + value
+
+    for queue_name, buckets in histograms.items():
+        histogram = LogLinearHistogram.from_buckets(buckets)
+        if histogram.total:
+            results[queue_name]['average_duration'] = histogram.sum / histogram.total / 1_000_000
+            results[queue_name]['p95_duration'] = histogram.percentile(95) / 1_000_000
+
+    active = defaultdict(int)
+    for process_active in active_raw:
+        for queue, count in process_active.items():
+            active[queue.decode() if isinstance(queue, bytes) else queue] += int(count)
+    for broker_queue, queue_name in lookup.items():
+        results[queue_name]['active'] = max(active.get(broker_queue, 0), 0)
+        results[queue_name]['workers'] = int(worker_count)
+
+    return results
+
+
+task_telemetry = TaskTelemetry()
+
+
+def connect_task_telemetry(hostname: str = None):
+    """
+    Attach telemetry handlers to Celery's task and worker signals.
+
+    Called from the worker's ``celeryd_init`` signal, before the pool forks,
+    so only worker processes collect telemetry.
+    """
+    from celery import signals
+
+    task_telemetry.hostname = hostname or task_telemetry.hostname
+
+    signals.task_prerun.connect(task_telemetry.on_prerun, weak=False)
+    signals.task_postrun.connect(task_telemetry.on_postrun, weak=False)
+    signals.task_failure.connect(task_telemetry.on_failure, weak=False)
+    signals.task_retry.connect(task_telemetry.on_retry, weak=False)
+    signals.task_revoked.connect(task_telemetry.on_revoked, weak=False)
+
+    def _on_process_init(**kwargs):
+        task_telemetry.reset()
+
+    def _on_heartbeat(**kwargs):
+        # Keeps idle workers registered when worker events are enabled
+        task_telemetry.maybe_flush()
+
+    def _on_shutdown(**kwargs):
+        try:
+            task_telemetry.flush()
+            task_telemetry.forget_process()
+        except Exception as e:
+            logger.error(f"Final task telemetry flush failed: {str(e)}")
+
+    signals.worker_process_init.connect(_on_process_init, weak=False)
+    signals.heartbeat_sent.connect(_on_heartbeat, weak=False)
+    signals.worker_process_shutdown.connect(_on_shutdown, weak=False)
+    signals.worker_shutdown.connect(_on_shutdown, weak=False)
@@ -25,6 +25,9 @@ from ai_services.models import DeveloperEmbedding
 
 logger = logging.getLogger(__name__)
 
+# Per-service deadline (seconds) for concurrent health metric collection
+COLLECTOR_DEADLINE = 10.0
+
 
 @shared_task
 def collect_system_health_metrics():
@@ -37,42 +40,50 @@ def collect_system_health_metrics():
     try:
         logger.info("Starting system health metrics collection")
         
-        metrics_collected = []
+        from .probe_executor import probe_executor
+        
+        collectors = {
+            'database': _collect_database_metrics,
+            'cache': _collect_cache_metrics,
+            'ai_services': _collect_ai_services_metrics,
+            'matching': _collect_matching_service_metrics,
+            'payments': _collect_payment_service_metrics,
+            'github_integration': _collect_github_integration_metrics,
+            'celery': _collect_celery_metrics,
+        }
+        
+        # Probe all services concurrently; a slow dependency only costs its own deadline
+        results = probe_executor.run(
+            {f'collect:{name}': collector for name, collector in collectors.items()},
+            deadlines={f'collect:{name}': COLLECTOR_DEADLINE for name in collectors},
+            use_cache=False,
+        )
+        
+        metrics = []
+        for name in collectors:
+            result = results[f'collect:{name}']
+            if result.get('timed_out'):
+                result = {
+                    'service_name': name,
+                    'status': 'unknown',
+                    'response_time_ms': result['deadline_ms'],
+                    'error_rate': 0.0,
+                    'alerts': [f"Health probe timed out after {result['deadline_ms']}ms"]
+                }
+            elif 'service_name' not in result:
+                # Collector raised; the executor returned a generic failure
+                result = {
+                    'service_name': name,
+                    'status': 'unhealthy',
+                    'error_rate': 100.0,
+                    'alerts': [result.get('error', 'Health probe failed')]
+                }
+            metrics.append(ServiceHealthMetric(**result))
         
-        # Database health check
-        db_metrics = _collect_database_metrics()
-        ServiceHealthMetric.objects.create(**db_metrics)
-        metrics_collected.append('database')
-        
-        # Cache health check
-        cache_metrics = _collect_cache_metrics()
-        ServiceHealthMetric.objects.create(**cache_metrics)
-        metrics_collected.append('cache')
-        
-        # AI Services health check
-        ai_metrics = _collect_ai_services_metrics()
-        ServiceHealthMetric.objects.create(**ai_metrics)
-        metrics_collected.append('ai_services')
-        
-        # Matching service health check
-        matching_metrics = _collect_matching_service_metrics()
-        ServiceHealthMetric.objects.create(**matching_metrics)
-        metrics_collected.append('matching')
-        
-        # Payment service health check
-        payment_metrics = _collect_payment_service_metrics()
-        ServiceHealthMetric.objects.create(**payment_metrics)
-        metrics_collected.append('payments')
-        
-        # GitHub integration health check
-        github_metrics = _collect_github_integration_metrics()
-        ServiceHealthMetric.objects.create(**github_metrics)
-        metrics_collected.append('github_integration')
-        
-        # Celery task queue health check
-        celery_metrics = _collect_celery_metrics()
-        ServiceHealthMetric.objects.create(**celery_metrics)
-        metrics_collected.append('celery')
+        ServiceHealthMetric.objects.bulk_create(metrics)
+        metrics_collected = [metric.service_name for metric in metrics]
+        
+        _record_database_trend(metrics)
         
         logger.info(f"Collected health metrics for {len(metrics_collected)} services")
         
@@ -146,59 +157,33 @@ def collect_task_queue_metrics():
     try:
         logger.info("Starting task queue metrics collection")
         
-        # Get Celery app instance
-        from celery import current_app
+        from .task_telemetry import get_queue_depths, get_queue_task_stats
         
         # Collect metrics for each queue
-        queues = ['default', 'ai_services', 'matching', 'communications']
-        metrics_collected = []
-        
-        for queue_name in queues:
-            try:
-                # Get queue statistics
-                inspect = current_app.control.inspect()
-                
-                # Get active tasks
-                active_tasks = inspect.active()
-                queue_active = 0
-                if active_tasks:
-                    for worker, tasks in active_tasks.items():
-                        queue_active += len([t for t in tasks if t.get('delivery_info', {}).get('routing_key') == queue_name])
-                
-                # Get reserved tasks (pending)
-                reserved_tasks = inspect.reserved()
-                queue_pending = 0
-                if reserved_tasks:
-                    for worker, tasks in reserved_tasks.items():
-                        queue_pending += len([t for t in tasks if t.get('delivery_info', {}).get('routing_key') == queue_name])
-                
-                # Get worker count
-                stats = inspect.stats()
-                worker_count = len(stats) if stats else 0
-                
-                # Calculate completed/failed tasks from recent history
-                # This would typically come from a task result backend
-                completed_last_hour = _get_completed_tasks_count(queue_name, hours=1)
-                failed_last_hour = _get_failed_tasks_count(queue_name, hours=1)
-                
-                # Calculate average task duration
-                avg_duration = _get_average_task_duration(queue_name, hours=1)
-                
-                queue_metrics = TaskQueueMetric(
-                    queue_name=queue_name,
-                    pending_tasks=queue_pending,
-                    active_tasks=queue_active,
-                    completed_tasks_last_hour=completed_last_hour,
-                    failed_tasks_last_hour=failed_last_hour,
-                    average_task_duration=avg_duration,
-                    worker_count=worker_count
-                )
-                queue_metrics.save()
-                
-                metrics_collected.append(queue_name)
-                
-            except Exception as e:
-                logger.error(f"Error collecting metrics for queue {queue_name}: {str(e)}")
+        queues = ['default', 'ai_services', 'matching', 'communications', 'monitoring', 'payments']
+        
+        # One pipelined LLEN against the broker and one telemetry read for all queues
+        try:
+            queue_depths = get_queue_depths(queues)
+        except Exception as e:
+            logger.error(f"Error reading broker queue depths: {str(e)}")
+            queue_depths = {}
+        task_stats = get_queue_task_stats(queues, hours=1)
+        
+        metrics = [
+            TaskQueueMetric(
+                queue_name=queue_name,
+                pending_tasks=queue_depths.get(queue_name, 0),
+                active_tasks=task_stats[queue_name]['active'],
+                completed_tasks_last_hour=task_stats[queue_name]['completed'],
+                failed_tasks_last_hour=task_stats[queue_name]['failed'],
+                average_task_duration=task_stats[queue_name]['average_duration'],
+                worker_count=task_stats[queue_name]['workers']
+            )
+            for queue_name in queues
+        ]
+        TaskQueueMetric.objects.bulk_create(metrics)
+        metrics_collected = [metric.queue_name for metric in metrics]
         
         # Check for task queue alerts
         _check_task_queue_alerts()
@@ -298,7 +283,8 @@ def check_performance_thresholds():
 @shared_task
 def cleanup_old_metrics():
     """
-    Clean up old monitoring metrics to prevent database bloat.
+    Roll raw monitoring metrics up into hourly/daily aggregates and apply
+    retention to prevent database bloat.
     
     Returns:
         Dict with cleanup results
@@ -306,45 +292,22 @@ def cleanup_old_metrics():
     try:
         logger.info("Starting monitoring metrics cleanup")
         
-        # Define retention periods
-        retention_periods = {
-            'ServiceHealthMetric': 7,  # days
-            'TaskQueueMetric': 7,
-            'AIServiceMetric': 14,
-            'SystemAlert': 30,  # Keep alerts longer for analysis
-        }
+        from .retention import MetricRetentionEngine
         
-        cleanup_results = {}
+        cleanup_results = MetricRetentionEngine().run()
         
-        for model_name, days in retention_periods.items():
-            try:
-                cutoff_date = timezone.now() - timedelta(days=days)
-                
-                if model_name == 'ServiceHealthMetric':
-                    deleted_count = ServiceHealthMetric.objects.filter(
-                        timestamp__lt=cutoff_date
-                    ).delete()[0]
-                elif model_name == 'TaskQueueMetric':
-                    deleted_count = TaskQueueMetric.objects.filter(
-                        timestamp__lt=cutoff_date
-                    ).delete()[0]
-                elif model_name == 'AIServiceMetric':
-                    deleted_count = AIServiceMetric.objects.filter(
-                        timestamp__lt=cutoff_date
-                    ).delete()[0]
-                elif model_name == 'SystemAlert':
-                    # Only delete resolved alerts
-                    deleted_count = SystemAlert.objects.filter(
-                        created_at__lt=cutoff_date,
-                        status='resolved'
-                    ).delete()[0]
-                
-                cleanup_results[model_name] = deleted_count
-                logger.info(f"Cleaned up {deleted_count} {model_name} records")
-                
-            except Exception as e:
-                logger.error(f"Error cleaning up {model_name}: {str(e)}")
-                cleanup_results[model_name] = f"Error: {str(e)}"
+        # Alerts are kept raw for analysis; only resolved ones expire
+        try:
+            cutoff_date = timezone.now() - timedelta(days=30)
+            deleted_count = SystemAlert.objects.filter(
+                created_at__lt=cutoff_date,
+                status='resolved'
+            ).delete()[0]
+            cleanup_results['SystemAlert'] = deleted_count
+            logger.info(f"Cleaned up {deleted_count} SystemAlert records")
+        except Exception as e:
+            logger.error(f"Error cleaning up SystemAlert: {str(e)}")
+            cleanup_results['SystemAlert'] = f"Error: {str(e)}"
         
         return {
             'success': True,
@@ -564,6 +527,24 @@ def _collect_database_metrics():
         }
 
 
+def _record_database_trend(metrics):
+    """Add the database probe to the performance trends time series"""
+    from .timeseries import timeseries_store
+    
+    try:
+        for metric in metrics:
+            if metric.service_name == 'database':
+                response_time_ms = float(metric.response_time_ms or 0)
+                timeseries_store.record('database', {
+                    'samples': 1,
+                    'failures': 0 if metric.status in ('healthy', 'degraded') else 1,
+                    'sum_ms': response_time_ms,
+                    'max_ms': response_time_ms,
+                })
+    except Exception as e:
+        logger.error(f"Error recording database trend: {str(e)}")
+
+
 def _collect_cache_metrics():
     """Collect cache service health metrics."""
     start_time = time.time()
@@ -823,20 +804,20 @@ def _check_task_queue_alerts():
 
 def _get_completed_tasks_count(queue_name, hours=1):
     """Get completed tasks count for a queue in the last N hours."""
-    # This would typically query the Celery result backend
-    return 0
+    from .task_telemetry import get_queue_task_stats
+    return get_queue_task_stats([queue_name], hours=hours)[queue_name]['completed']
 
 
 def _get_failed_tasks_count(queue_name, hours=1):
     """Get failed tasks count for a queue in the last N hours."""
-    # This would typically query the Celery result backend
-    return 0
+    from .task_telemetry import get_queue_task_stats
+    return get_queue_task_stats([queue_name], hours=hours)[queue_name]['failed']
 
 
 def _get_average_task_duration(queue_name, hours=1):
     """Get average task duration for a queue in the last N hours."""
-    # This would typically query the Celery result backend
-    return 0.0
+    from .task_telemetry import get_queue_task_stats
+    return get_queue_task_stats([queue_name], hours=hours)[queue_name]['average_duration']
 
 
 def _extract_metric_value(metric, metric_name):
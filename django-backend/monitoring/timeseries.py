@@ -0,0 +1,213 @@
+"""
+Embedded time-series store for request, database and AI service metrics.
+
+Each series is written at minute, hour and day resolution in the same call,
+so downsampling happens at write time. Every (series, resolution) pair is a
+fixed-size ring buffer kept in a single Redis hash: the slot for a bucket is
+``bucket % capacity`` and a ``<slot>:ts`` field records which bucket currently
+owns the slot, so old data is overwritten in place and retention is bounded
+by construction. A range query is one HMGET per series.
+"""
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, List, Any
+
+from django.core.cache import cache
+
+logger = logging.getLogger('performance')
+
+
+# Retention per resolution: bucket width in seconds and ring capacity
+RESOLUTIONS = {
+    'minute': {'seconds': 60, 'capacity': 24 * 60},       # 24 hours
+    'hour': {'seconds': 3600, 'capacity': 31 * 24},       # 31 days
+    'day': {'seconds': 86400, 'capacity': 400},           # ~13 months
+}
+
+# Field aggregation per series: 'sum' fields add up, 'max' fields keep the maximum
+SERIES_SCHEMAS = {
+    'requests': {'count': 'sum', 'error_count': 'sum', 'sum_ms': 'sum', 'max_ms': 'max'},
+    'database': {'samples': 'sum', 'failures': 'sum', 'sum_ms': 'sum', 'max_ms': 'max'},
+    'ai_services': {'count': 'sum', 'success_count': 'sum', 'sum_ms': 'sum', 'max_ms': 'max'},
+}
+
+# Resets the slot when it belongs to an older bucket, then applies the update.
+# ARGV: slot, bucket, ttl, then (op, field, value) triples.
+_UPDATE_SCRIPT = """
+local slot = ARGV[1]
+local ts_field = slot .. ':ts'
+if redis.call('HGET', KEYS[1], ts_field) ~= ARGV[2] then
+    for i = 4, #ARGV, 3 do
+        redis.call('HDEL', KEYS[1], slot .. ':' .. ARGV[i + 1])
+    end
+    redis.call('HSET', KEYS[1], ts_field, ARGV[2])
+end
+for i = 4, #ARGV, 3 do
+    local field = slot .. ':' .. ARGV[i + 1]
+    if ARGV[i] == 'max' then
+        local current = tonumber(redis.call('HGET', KEYS[1], field))
+        if current == nil or tonumber(ARGV[i + 2]) > current then
+            redis.call('HSET', KEYS[1], field, ARGV[i + 2])
+        end
+    else
+        redis.call('HINCRBYFLOAT', KEYS[1], field, ARGV[i + 2])
+    end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+class TimeSeriesStore:
+    """Ring-buffer time-series store on top of Redis hashes"""
+
+    KEY_PREFIX = 'perf_monitor:ts'
+
+    def __init__(self):
+        self._script = None
+
+    def _redis(self):
+        from .metrics_registry import _get_redis
+        return _get_redis()
+
+    def _key(self, series: str, resolution: str) -> str:
+        return f"{self.KEY_PREFIX}:{series}:{resolution}"
+
+    @staticmethod
+    def _ttl(resolution: str) -> int:
+        config = RESOLUTIONS[resolution]
+        return config['seconds'] * config['capacity'] + 3600
+
+    @staticmethod
+    def bucket_for(timestamp: float, resolution: str) -> int:
+        return int(timestamp // RESOLUTIONS[resolution]['seconds'])
+
+    # ------------------------------------------------------------------ writes
+
+    def record(self, series: str, values: Dict[str, float], timestamp: float = None) -> None:
+        """Add one observation (or pre-aggregated values) to all resolutions"""
+        self.record_many(series, [(timestamp or time.time(), values)])
+
+    def record_many(self, series: str, points: List) -> None:
+        """Write many ``(timestamp, values)`` points in one pipeline"""
+        schema = SERIES_SCHEMAS[series]
+        redis_client = self._redis()
+
+        if redis_client is None:
+            for timestamp, values in points:
+                for resolution in RESOLUTIONS:
+                    self._record_fallback(series, resolution, schema, timestamp, values)
+            return
+
+        if self._script is None:
+            self._script = redis_client.register_script(_UPDATE_SCRIPT)
+
+        pipeline = redis_client.pipeline(transaction=False)
+        for timestamp, values in points:
+            args_tail = []
+            for field, op in schema.items():
+                args_tail.extend([op, field, float(values.get(field, 0))])
+            for resolution, config in RESOLUTIONS.items():
+                bucket = self.bucket_for(timestamp, resolution)
+                slot = bucket % config['capacity']
+                self._script(
+                    keys=[self._key(series, resolution)],
+                    args=[slot, bucket, self._ttl(resolution)] + args_tail,
+                    client=pipeline,
+                )
+        pipeline.execute()
+
+    def _record_fallback(self, series, resolution, schema, timestamp, values) -> None:
+        # Non-Redis cache backends (development/tests); not atomic across processes
+        key = self._key(series, resolution)
+        data = cache.get(key, {})
+        bucket = self.bucket_for(timestamp, resolution)
+        slot = bucket % RESOLUTIONS[resolution]['capacity']
+        if data.get(f"{slot}:ts") != bucket:
+            for field in schema:
+                data.pop(f"{slot}:{field}", None)
+            data[f"{slot}:ts"] = bucket
+        for field, op in schema.items():
+            field_key = f"{slot}:{field}"
+            value = float(values.get(field, 0))
+            if op == 'max':
+                data[field_key] = max(data.get(field_key, value), value)
+            else:
+                data[field_key] = data.get(field_key, 0.0) + value
+        cache.set(key, data, self._ttl(resolution))
+
+    # ------------------------------------------------------------------ reads
+
+    def query(self, series: str, start: float, end: float, resolution: str = 'hour') -> List[Dict[str, Any]]:
+        """
+        Return one point per bucket between ``start`` and ``end`` (epoch seconds).
+
+        Buckets with no data are returned with zeroed fields so charts get a
+        continuous axis.
+        """
+        schema = SERIES_SCHEMAS[series]
+        config = RESOLUTIONS[resolution]
+        first = self.bucket_for(start, resolution)
+        last = self.bucket_for(end, resolution)
+        # Never read further back than the ring holds
+        first = max(first, last - config['capacity'] + 1)
+        buckets = list(range(first, last + 1))
+
+        fields = []
+        for bucket in buckets:
+            slot = bucket % config['capacity']
+            fields.append(f"{slot}:ts")
+            fields.extend(f"{slot}:{field}" for field in schema)
+
+        redis_client = self._redis()
+        key = self._key(series, resolution)
+        if redis_client is not None:
+            raw = redis_client.hmget(key, fields) if fields else []
+            values = dict(zip(fields, raw))
+        else:
+            data = cache.get(key, {})
+            values = {field: data.get(field) for field in fields}
+
+        points = []
+        for bucket in buckets:
+            slot = bucket % config['capacity']
+            owner = values.get(f"{slot}:ts")
+            owned = owner is not None and int(float(owner)) == bucket
+            point = {
+                'timestamp': datetime.fromtimestamp(bucket * config['seconds'], tz=dt_timezone.utc).isoformat(),
+            }
+            for field in schema:
+                raw_value = values.get(f"{slot}:{field}") if owned else None
+                point[field] = float(raw_value) if raw_value is not None else 0.0
+            points.append(point)
+        return points
+
+
+def choose_resolution(hours: int) -> str:
+    """Pick the coarsest resolution that still gives a useful number of points"""
+    if hours <= 6:
+        return 'minute'
+    if hours <= 24 * 7:
+        return 'hour'
+    return 'day'
+
+
+def record_flushed_requests(merged: Dict[Any, Any]) -> None:
+    """Metrics registry flush listener: roll flushed series into the store"""
+    per_minute: Dict[int, Dict[str, float]] = {}
+    for (minute, view_name, method), stats in merged.items():
+        values = per_minute.setdefault(minute, {'count': 0, 'error_count': 0, 'sum_ms': 0.0, 'max_ms': 0.0})
+        values['count'] += stats.count
+        values['error_count'] += stats.error_count
+        values['sum_ms'] += stats.histogram.sum / 1000.0
+        max_us = stats.histogram.max()
+        if max_us is not None:
+            values['max_ms'] = max(values['max_ms'], max_us / 1000.0)
+
+    timeseries_store.record_many('requests', [
+        (minute * 60, values) for minute, values in per_minute.items()
+    ])
+
+
+timeseries_store = TimeSeriesStore()
@@ -15,5 +15,6 @@ urlpatterns = [
     path('dashboard/overview/', dashboard.system_overview, name='system_overview'),
     path('dashboard/metrics/', dashboard.application_metrics, name='application_metrics'),
     path('dashboard/trends/', dashboard.performance_trends, name='performance_trends'),
+    path('dashboard/history/', dashboard.metric_history, name='metric_history'),
     path('dashboard/alerts/', dashboard.alerts_summary, name='alerts_summary'),
 ]
\ No newline at end of file
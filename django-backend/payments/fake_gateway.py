@@ -0,0 +1,92 @@
+"""
+In-process stand-in for a payment gateway API.
+
+Used to benchmark and exercise bulk gateway operations locally: each call
+sleeps for a configurable latency and returns a deterministic status per
+transaction ID, and calls are counted so request volume can be compared.
+Payouts honour idempotency keys and can fail transiently to exercise retries.
+"""
+import itertools
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+
+from .services import PaymentGatewayService
+
+
+class FakeGatewayService(PaymentGatewayService):
+    """Gateway client that never leaves the process"""
+
+    DEFAULT_STATUSES = ('succeeded', 'succeeded', 'succeeded', 'processing', 'canceled')
+
+    def __init__(self, gateway=None, latency: float = 0.05, statuses=DEFAULT_STATUSES,
+                 supports_list: bool = False, page_size: int = 100, transient_failures: int = 0):
+        self.latency = latency
+        self.statuses = statuses
+        self.supports_list = supports_list
+        self.page_size = page_size
+        self.transactions: Dict[str, str] = {}
+        # Fail the first N requests for each idempotency key with a retryable error
+        self.transient_failures = transient_failures
+        self.payouts: Dict[str, Dict] = {}
+        self._attempts = Counter()
+        self._lock = threading.Lock()
+        self._calls = itertools.count()
+        self.call_count = 0
+        super().__init__(gateway)
+
+    def setup_gateway(self):
+        pass
+
+    def _request(self):
+        self.call_count = next(self._calls) + 1
+        time.sleep(self.latency)
+
+    def status_for(self, transaction_id: str) -> str:
+        if transaction_id not in self.transactions:
+            index = zlib.crc32(transaction_id.encode()) % len(self.statuses)
+            self.transactions[transaction_id] = self.statuses[index]
+        return self.transactions[transaction_id]
+
+    def get_payment_status(self, transaction_id: str) -> Dict:
+        self._request()
+        return {'success': True, 'status': self.status_for(transaction_id)}
+
+    def list_payment_statuses(self, created_after: datetime) -> Optional[Dict[str, Dict]]:
+        if not self.supports_list:
+            return None
+        # One request per page of known transactions
+        for _ in range(max(1, -(-len(self.transactions) // self.page_size))):
+            self._request()
+        return {
+            transaction_id: {'success': True, 'status': status}
+            for transaction_id, status in self.transactions.items()
+        }
+
+    def submit_payment(self, payment, idempotency_key: Optional[str] = None) -> Dict:
+        self._request()
+        key = idempotency_key or f"payment_{payment.id}"
+        with self._lock:
+            if key in self.payouts:
+                return dict(self.payouts[key])
+            self._attempts[key] += 1
+            if self._attempts[key] <= self.transient_failures:
+                return {
+                    'success': False,
+                    'error': 'Simulated gateway timeout',
+                    'retryable': True,
+                    'message': 'Fake gateway error: simulated timeout'
+                }
+            transaction_id = f"fake_{len(self.payouts) + 1}"
+            self.transactions[transaction_id] = 'processing'
+            self.payouts[key] = {
+                'success': True,
+                'transaction_id': transaction_id,
+                'status': 'processing',
+                'gateway_response': {'id': transaction_id, 'idempotency_key': key},
+                'message': f"Fake payout created: {transaction_id}"
+            }
+            return dict(self.payouts[key])
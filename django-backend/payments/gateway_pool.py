@@ -0,0 +1,81 @@
+"""
+Concurrent, rate-limited calls to payment gateway APIs.
+
+Gateway calls are network-bound, so bulk operations (reconciliation,
+batch payouts) run them on a thread pool. A token bucket per gateway keeps
+the combined request rate inside the gateway's documented limits
+(``PaymentGatewayConfig.get_gateway_limits``).
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Hashable, Iterable
+
+from django.conf import settings
+
+from .gateway_config import PaymentGatewayConfig
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Thread-safe token bucket: ``rate`` calls per second, bursts up to ``burst``"""
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def gateway_rate_limiter(gateway_type: str) -> RateLimiter:
+    """Rate limiter sized from the gateway's configured API limits"""
+    limits = PaymentGatewayConfig.get_gateway_limits(gateway_type).get('rate_limit', {})
+    rate = limits.get('requests_per_second', 10)
+    # Stay well under the burst allowance; other workers share the same account
+    return RateLimiter(rate, burst=min(limits.get('burst_limit', rate), rate))
+
+
+def call_concurrently(func: Callable[[Any], Dict[str, Any]], items: Iterable[Hashable],
+                      limiter: RateLimiter = None, max_workers: int = None) -> Dict[Any, Dict[str, Any]]:
+    """
+    Call ``func(item)`` for each distinct item on a thread pool.
+
+    Returns results keyed by item. A call that raises yields
+    ``{'success': False, 'error': ...}`` like the gateway services do.
+    """
+    items = list(dict.fromkeys(items))
+    if not items:
+        return {}
+    max_workers = max_workers or getattr(settings, 'PAYMENT_GATEWAY_MAX_CONCURRENCY', 8)
+
+    def call(item):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return func(item)
+        except Exception as e:
+            logger.error(f"Gateway call failed for {item}: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
+    if max_workers <= 1 or len(items) == 1:
+        return {item: call(item) for item in items}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items)),
+                            thread_name_prefix='payment-gateway') as pool:
+        return dict(zip(items, pool.map(call, items)))
@@ -0,0 +1,121 @@
+"""
+Management command to benchmark gateway reconciliation against a fake gateway
+"""
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from datetime import timedelta
+
+from payments.fake_gateway import FakeGatewayService
+from payments.models import Milestone, Payment, PaymentGateway
+from payments.services import PaymentReconciliationService
+from projects.models import Project
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Benchmark payment reconciliation with an in-process fake gateway (no data is kept)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--payments',
+            type=int,
+            default=500,
+            help='Number of payments to reconcile (default: 500)',
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0.05,
+            help='Simulated gateway latency per request in seconds (default: 0.05)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Concurrent gateway calls (default: 8)',
+        )
+
+    def handle(self, *args, **options):
+        # Everything runs in one transaction that is rolled back at the end
+        with transaction.atomic():
+            payment_ids = self._create_payments(options['payments'])
+            reconciliation_service = PaymentReconciliationService()
+
+            runs = [
+                ('serial', {'max_workers': 1, 'use_list_api': False}, False),
+                ('concurrent', {'max_workers': options['workers'], 'use_list_api': False}, False),
+                ('list api', {'max_workers': options['workers'], 'use_list_api': True}, True),
+            ]
+            for label, kwargs, supports_list in runs:
+                Payment.objects.filter(id__in=payment_ids).update(
+                    status='processing', last_reconciled_at=None
+                )
+                fake_gateway = FakeGatewayService(
+                    latency=options['latency'], supports_list=supports_list
+                )
+                if supports_list:
+                    for transaction_id in Payment.objects.filter(
+                        id__in=payment_ids
+                    ).values_list('transaction_id', flat=True):
+                        fake_gateway.status_for(transaction_id)
+
+                started = time.perf_counter()
+                result = reconciliation_service.reconcile_gateway_transactions(
+                    'stripe', gateway_service=fake_gateway, **kwargs
+                )
+                elapsed = time.perf_counter() - started
+
+                if not result['success']:
+                    self.stdout.write(self.style.ERROR(f'{label}: {result["error"]}'))
+                    continue
+                self.stdout.write(
+                    f'{label:>10}: {elapsed:7.2f}s, {fake_gateway.call_count} gateway requests, '
+                    f'{result["updated_payments"]} updated'
+                )
+
+            # A second pass skips payments already reconciled in a terminal state
+            started = time.perf_counter()
+            result = reconciliation_service.reconcile_gateway_transactions(
+                'stripe', gateway_service=FakeGatewayService(latency=options['latency']),
+                max_workers=options['workers'], use_list_api=False
+            )
+            self.stdout.write(
+                f'{"re-run":>10}: {time.perf_counter() - started:7.2f}s, '
+                f'{result["skipped_payments"]} skipped as already reconciled'
+            )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark completed; test data rolled back'))
+
+    def _create_payments(self, count):
+        PaymentGateway.objects.filter(gateway_type='stripe').update(status='inactive')
+        gateway = PaymentGateway.objects.create(
+            name='Benchmark gateway',
+            gateway_type='stripe',
+            api_endpoint='https://gateway.invalid',
+            api_key_encrypted=''
+        )
+        client = User.objects.create(username='benchmark-client', email='client@benchmark.invalid')
+        developer = User.objects.create(username='benchmark-developer', email='dev@benchmark.invalid')
+        project = Project.objects.create(client=client, title='Reconciliation benchmark', description='')
+        milestone = Milestone.objects.create(
+            project=project, percentage=100, amount=Decimal(count), due_date=timezone.now() + timedelta(days=7)
+        )
+        payments = Payment.objects.bulk_create([
+            Payment(
+                milestone=milestone,
+                developer=developer,
+                amount=Decimal('1.00'),
+                net_amount=Decimal('1.00'),
+                status='processing',
+                payment_gateway=gateway,
+                transaction_id=f'pi_benchmark_{index}'
+            )
+            for index in range(count)
+        ])
+        return [payment.id for payment in payments]
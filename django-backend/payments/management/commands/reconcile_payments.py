@@ -55,6 +55,7 @@ class Command(BaseCommand):
                         )
                     )
                     self.stdout.write(f'  - Total payments checked: {result["total_payments_checked"]}')
+                    self.stdout.write(f'  - Skipped (already reconciled): {result["skipped_payments"]}')
                     self.stdout.write(f'  - Mismatches found: {result["mismatches"]}')
                     
                     if result['mismatches'] > 0:
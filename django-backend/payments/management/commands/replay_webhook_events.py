@@ -0,0 +1,90 @@
+"""
+Management command to replay stored payment gateway webhook events
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from payments.services import WebhookService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Replay stored payment gateway webhook events (failed events by default)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--provider',
+            type=str,
+            choices=['stripe', 'paypal'],
+            help='Only replay events from this provider',
+        )
+        parser.add_argument(
+            '--event-id',
+            action='append',
+            dest='event_ids',
+            help='Provider event ID to replay (can be repeated)',
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='Only replay events received on or after this date (YYYY-MM-DD format)',
+        )
+        parser.add_argument(
+            '--include-processed',
+            action='store_true',
+            help='Also replay events that were processed successfully',
+        )
+        parser.add_argument(
+            '--process-now',
+            action='store_true',
+            help='Process the replayed events in this process instead of queueing them',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Starting webhook replay at {timezone.now()}'
+            )
+        )
+
+        try:
+            webhook_service = WebhookService()
+
+            since = None
+            if options['since']:
+                from datetime import datetime
+
+                since = timezone.make_aware(datetime.fromisoformat(options['since']))
+
+            replayed = webhook_service.replay_events(
+                provider=options['provider'],
+                event_ids=options['event_ids'],
+                since=since,
+                include_processed=options['include_processed']
+            )
+            self.stdout.write(f'Events reset for replay: {replayed}')
+
+            if options['process_now'] and replayed:
+                totals = {'processed': 0, 'failed': 0}
+                while True:
+                    results = webhook_service.process_pending_events()
+                    if not results['claimed']:
+                        break
+                    totals['processed'] += results['processed']
+                    totals['failed'] += results['failed']
+
+                self.stdout.write(f'  - Processed: {totals["processed"]}')
+                if totals['failed']:
+                    self.stdout.write(
+                        self.style.WARNING(f'  - Failed: {totals["failed"]}')
+                    )
+
+            self.stdout.write(self.style.SUCCESS('Webhook replay completed'))
+
+        except Exception as e:
+            logger.error(f"Error replaying webhook events: {str(e)}")
+            self.stdout.write(
+                self.style.ERROR(f'Error replaying webhook events: {str(e)}')
+            )
+            raise
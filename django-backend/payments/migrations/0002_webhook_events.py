@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:03
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('provider', models.CharField(choices=[('stripe', 'Stripe'), ('paypal', 'PayPal')], max_length=20)),
+                ('event_id', models.CharField(max_length=255)),
+                ('event_type', models.CharField(max_length=100)),
+                ('payload', models.JSONField(default=dict)),
+                ('ordering_key', models.CharField(blank=True, default='', max_length=255)),
+                ('event_created_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('received', 'Received'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed')], default='received', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('processing_started_at', models.DateTimeField(blank=True, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'webhook_events',
+                'ordering': ['received_at'],
+                'indexes': [models.Index(fields=['status', 'received_at'], name='webhook_eve_status_f769dd_idx'), models.Index(fields=['ordering_key', 'event_created_at'], name='webhook_eve_orderin_daaa1f_idx')],
+                'constraints': [models.UniqueConstraint(fields=('provider', 'event_id'), name='unique_webhook_event')],
+            },
+        ),
+    ]
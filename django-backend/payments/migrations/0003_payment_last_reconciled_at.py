@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_webhook_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='last_reconciled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
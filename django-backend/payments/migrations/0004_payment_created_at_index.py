@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0003_payment_last_reconciled_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['created_at', 'status'], name='payments_created_dc0c82_idx'),
+        ),
+    ]
@@ -92,6 +92,7 @@ class Payment(models.Model):
     # Timing
     processed_at = models.DateTimeField(null=True, blank=True)
     expected_date = models.DateTimeField(null=True, blank=True)
+    last_reconciled_at = models.DateTimeField(null=True, blank=True)
     
     # Fees and deductions
     platform_fee = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
@@ -108,6 +109,9 @@ class Payment(models.Model):
     class Meta:
         db_table = 'payments'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'status']),
+        ]
         
     def __str__(self):
         return f"Payment to {self.developer.username} - ${self.amount}"
@@ -368,3 +372,54 @@ class PaymentMethod(models.Model):
         
     def __str__(self):
         return f"{self.user.username} - {self.display_name}"
+
+
+class WebhookEvent(models.Model):
+    """Raw payment gateway webhook event, stored before processing"""
+    
+    PROVIDERS = [
+        ('stripe', 'Stripe'),
+        ('paypal', 'PayPal'),
+    ]
+    
+    EVENT_STATUS = [
+        ('received', 'Received'),
+        ('processing', 'Processing'),
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    provider = models.CharField(max_length=20, choices=PROVIDERS)
+    event_id = models.CharField(max_length=255)  # Provider's event ID
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    
+    # Gateway object the event is about (payment intent, charge, payout item);
+    # events sharing a key are processed in provider order
+    ordering_key = models.CharField(max_length=255, blank=True, default='')
+    event_created_at = models.DateTimeField(null=True, blank=True)
+    
+    # Processing state
+    status = models.CharField(max_length=20, choices=EVENT_STATUS, default='received')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    result = models.JSONField(default=dict, blank=True)
+    processing_started_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    received_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'webhook_events'
+        ordering = ['received_at']
+        constraints = [
+            models.UniqueConstraint(fields=['provider', 'event_id'], name='unique_webhook_event'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'received_at']),
+            models.Index(fields=['ordering_key', 'event_created_at']),
+        ]
+        
+    def __str__(self):
+        return f"{self.provider} {self.event_type} ({self.event_id}) - {self.status}"
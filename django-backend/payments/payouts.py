@@ -0,0 +1,273 @@
+"""
+Payout execution for milestone and batch payments.
+
+Gateway calls never run inside a database transaction. Pending payments are
+claimed in one short transaction, sent to their gateways concurrently (rate
+limited, each with an idempotency key so a retried request cannot pay
+twice), and the outcomes are written back in bulk in a second short
+transaction. Transient gateway errors are retried per payout; one payout
+failing does not affect the others.
+
+A payout whose outcome is unknown (the gateway timed out or kept failing
+transiently) may still have been paid, so it stays ``processing`` without a
+transaction ID instead of failing. ``resolve_unconfirmed`` later resends it
+with the same idempotency key, which returns the original outcome if the
+gateway did execute it.
+"""
+import logging
+import time
+from collections import defaultdict
+from decimal import Decimal
+from typing import Callable, Dict, Any, Iterable, List
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .gateway_pool import call_concurrently, gateway_rate_limiter
+from .models import Payment, PaymentMethod, TransactionLog
+from .services import PaymentGatewayService
+
+logger = logging.getLogger(__name__)
+
+# Gateway that pays out to each payment method type
+GATEWAY_FOR_METHOD = {
+    'stripe_account': 'stripe',
+    'paypal': 'paypal',
+}
+
+
+class PayoutExecutor:
+    """Dispatches pending payments to their gateways concurrently"""
+
+    MAX_ATTEMPTS = 3
+    RETRY_BACKOFF = 1.0  # seconds, doubled after each attempt
+    BATCH_SIZE = 500
+    # Unconfirmed payouts younger than this may still be in flight
+    UNCONFIRMED_GRACE = timedelta(minutes=15)
+
+    def __init__(self, gateway_service_factory: Callable[[str], PaymentGatewayService],
+                 max_workers: int = None):
+        self.get_gateway_service = gateway_service_factory
+        self.max_workers = max_workers
+
+    @staticmethod
+    def default_payment_methods(developer_ids: Iterable) -> Dict[Any, PaymentMethod]:
+        """Each developer's default verified payment method, keyed by developer id"""
+        return {
+            method.user_id: method
+            for method in PaymentMethod.objects.filter(
+                user_id__in=set(developer_ids),
+                is_default=True,
+                status='verified'
+            ).order_by('created_at')
+        }
+
+    def execute(self, payment_ids: Iterable, payment_methods: Dict[Any, PaymentMethod] = None) -> Dict[str, Dict]:
+        """
+        Pay out the given payments that are still pending.
+
+        Args:
+            payment_ids: Payments to dispatch; any not pending are ignored
+            payment_methods: Developer id -> payment method, loaded if not given
+
+        Returns:
+            Per-payment results keyed by payment ID
+        """
+        return self._dispatch(self._claim(payment_ids), payment_methods)
+
+    def resolve_unconfirmed(self, older_than: timedelta = None) -> Dict[str, Dict]:
+        """
+        Resend payouts left ``processing`` without a transaction ID (outcome
+        unknown, or the run died mid-dispatch) with their original idempotency
+        key. A success records the gateway's transaction, a definite rejection
+        fails the payment, and anything still unknown is left for the next run.
+        """
+        cutoff = timezone.now() - (self.UNCONFIRMED_GRACE if older_than is None else older_than)
+        return self._dispatch(self._claim_unconfirmed(cutoff), None, unsent_status='processing')
+
+    def _dispatch(self, payments: List[Payment], payment_methods: Dict[Any, PaymentMethod] = None,
+                  unsent_status: str = 'pending') -> Dict[str, Dict]:
+        if not payments:
+            return {}
+        if payment_methods is None:
+            payment_methods = self.default_payment_methods(payment.developer_id for payment in payments)
+
+        results = {}
+        by_gateway = defaultdict(list)
+        for payment in payments:
+            payment_method = payment_methods.get(payment.developer_id)
+            if not payment_method:
+                results[payment.id] = {'success': False, 'error': 'No verified payment method found', 'unsent': True}
+            elif payment_method.method_type not in GATEWAY_FOR_METHOD:
+                results[payment.id] = {
+                    'success': False,
+                    'error': f"Unsupported payment method: {payment_method.method_type}",
+                    'unsent': True
+                }
+            else:
+                by_gateway[GATEWAY_FOR_METHOD[payment_method.method_type]].append(payment)
+
+        gateways = {}
+        for gateway_type, gateway_payments in by_gateway.items():
+            try:
+                gateway_service = self.get_gateway_service(gateway_type)
+            except Exception as e:
+                for payment in gateway_payments:
+                    results[payment.id] = {'success': False, 'error': str(e), 'unsent': True}
+                continue
+            gateways[gateway_type] = gateway_service.gateway
+
+            limiter = gateway_rate_limiter(gateway_type)
+            outcomes = call_concurrently(
+                lambda payment: self._submit(gateway_service, payment, limiter),
+                gateway_payments,
+                max_workers=self.max_workers
+            )
+            for payment, outcome in outcomes.items():
+                outcome['gateway_type'] = gateway_type
+                results[payment.id] = outcome
+
+        self._record(payments, results, payment_methods, gateways, unsent_status)
+
+        return {
+            str(payment.id): {
+                'payment_id': str(payment.id),
+                'developer': payment.developer.username,
+                'amount': payment.amount,
+                'net_amount': payment.net_amount,
+                'success': results[payment.id]['success'],
+                'status': payment.status,
+                'transaction_id': results[payment.id].get('transaction_id'),
+                'attempts': results[payment.id].get('attempts', 0),
+                'error': results[payment.id].get('error'),
+            }
+            for payment in payments
+        }
+
+    def _claim(self, payment_ids: Iterable) -> List[Payment]:
+        """Move pending payments to processing so no other run dispatches them"""
+        now = timezone.now()
+        with transaction.atomic():
+            payments = list(
+                Payment.objects.select_for_update(of=('self',)).select_related(
+                    'milestone__project', 'developer'
+                ).filter(id__in=list(payment_ids), status='pending')
+            )
+            for payment in payments:
+                # Each dispatch gets a fresh idempotency key; retries within it reuse the key
+                payment.metadata = dict(payment.metadata, payout_attempt=payment.metadata.get('payout_attempt', 0) + 1)
+                payment.status = 'processing'
+                payment.updated_at = now
+            Payment.objects.bulk_update(payments, ['metadata', 'status', 'updated_at'], batch_size=self.BATCH_SIZE)
+        return payments
+
+    def _claim_unconfirmed(self, cutoff) -> List[Payment]:
+        """Lock unconfirmed payouts last touched before ``cutoff``, keeping their payout attempt"""
+        now = timezone.now()
+        with transaction.atomic():
+            payments = list(
+                Payment.objects.select_for_update(of=('self',), skip_locked=True).select_related(
+                    'milestone__project', 'developer'
+                ).filter(
+                    status='processing',
+                    transaction_id__isnull=True,
+                    metadata__has_key='payout_attempt',
+                    updated_at__lt=cutoff
+                )[:self.BATCH_SIZE]
+            )
+            # Touch them so a concurrent resolver run doesn't pick them up too
+            Payment.objects.filter(id__in=[payment.id for payment in payments]).update(updated_at=now)
+        return payments
+
+    def _submit(self, gateway_service: PaymentGatewayService, payment: Payment, limiter) -> Dict:
+        """Send one payout, retrying transient errors with the same idempotency key"""
+        idempotency_key = f"payout_{payment.id}_{payment.metadata['payout_attempt']}"
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            limiter.acquire()
+            try:
+                result = gateway_service.submit_payment(payment, idempotency_key=idempotency_key)
+            except Exception as e:
+                result = {'success': False, 'error': str(e), 'retryable': True, 'message': f"Gateway error: {str(e)}"}
+
+            if result['success'] or not result.get('retryable') or attempt == self.MAX_ATTEMPTS:
+                break
+            logger.warning(f"Payout {payment.id} attempt {attempt} failed, retrying: {result.get('error')}")
+            time.sleep(self.RETRY_BACKOFF * 2 ** (attempt - 1))
+
+        result['attempts'] = attempt
+        return result
+
+    def _record(self, payments: List[Payment], results: Dict, payment_methods: Dict[Any, PaymentMethod],
+                gateways: Dict, unsent_status: str = 'pending') -> None:
+        """Write every outcome back in one short transaction"""
+        now = timezone.now()
+        logs = []
+        method_totals = defaultdict(Decimal)
+        for payment in payments:
+            result = results[payment.id]
+            payment.updated_at = now
+            if result['success']:
+                payment.transaction_id = result['transaction_id']
+                payment.gateway_response = result.get('gateway_response') or {}
+                payment.payment_gateway = gateways[result['gateway_type']]
+                payment.status = 'processing'
+                payment.processed_at = now
+                method_totals[payment_methods[payment.developer_id].pk] += payment.net_amount
+                logs.append(TransactionLog(
+                    payment=payment,
+                    log_type='payment_initiated',
+                    log_level='info',
+                    message=result.get('message', 'Payout sent'),
+                    gateway_response=payment.gateway_response
+                ))
+            elif result.get('unsent'):
+                # Nothing reached a gateway this time; leave the payment to be paid later
+                payment.status = unsent_status
+            elif result.get('retryable'):
+                # The gateway may have executed it; never fail (and so re-pay) an unknown outcome
+                payment.payment_gateway = gateways[result['gateway_type']]
+                payment.status = 'processing'
+                logs.append(TransactionLog(
+                    payment=payment,
+                    log_type='payment_processing',
+                    log_level='warning',
+                    message=f"Payout outcome unknown, left for reconciliation: {result['error']}",
+                    error_message=result['error']
+                ))
+            else:
+                payment.status = 'failed'
+                logs.append(TransactionLog(
+                    payment=payment,
+                    log_type='payment_failed',
+                    log_level='error',
+                    message=result.get('message') or result['error'],
+                    error_message=result['error']
+                ))
+
+        with transaction.atomic():
+            Payment.objects.bulk_update(
+                payments,
+                ['transaction_id', 'gateway_response', 'payment_gateway', 'status', 'processed_at', 'updated_at'],
+                batch_size=self.BATCH_SIZE
+            )
+            TransactionLog.objects.bulk_create(logs, batch_size=self.BATCH_SIZE)
+            for method_id, total in method_totals.items():
+                PaymentMethod.objects.filter(pk=method_id).update(
+                    total_payments_received=F('total_payments_received') + total,
+                    last_used_date=now
+                )
+
+            # bulk_update skips post_save, so push the realtime updates here
+            from communications.signals import push_payment_updates
+            transaction.on_commit(lambda: push_payment_updates(payments))
+
+        sent = sum(1 for payment in payments if payment.transaction_id)
+        unconfirmed = sum(1 for payment in payments if payment.status == 'processing' and not payment.transaction_id)
+        failed = sum(1 for payment in payments if payment.status == 'failed')
+        logger.info(
+            f"Payouts dispatched: {sent} sent, {unconfirmed} unconfirmed, {failed} failed, "
+            f"{len(payments) - sent - unconfirmed - failed} not sent"
+        )
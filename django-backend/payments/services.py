@@ -7,14 +7,17 @@ import logging
 import json
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from .gateway_pool import call_concurrently, gateway_rate_limiter
 from .models import (
     Payment, PaymentGateway, TransactionLog, PaymentDispute, 
-    PaymentMethod, Milestone
+    PaymentMethod, Milestone, WebhookEvent
 )
 from projects.models import Project
 from users.models import User
@@ -34,8 +37,32 @@ class PaymentGatewayService:
         raise NotImplementedError("Subclasses must implement setup_gateway")
     
     def process_payment(self, payment: Payment) -> Dict:
-        """Process a payment through the gateway"""
-        raise NotImplementedError("Subclasses must implement process_payment")
+        """Process a payment through the gateway and record the outcome"""
+        result = self.submit_payment(payment)
+        
+        if result['success']:
+            payment.transaction_id = result['transaction_id']
+            payment.gateway_response = result['gateway_response']
+            payment.status = 'processing'
+            payment.save()
+            self._log_transaction(payment, 'payment_initiated', result['message'])
+        else:
+            self._log_transaction(payment, 'payment_failed', result['message'], log_level='error')
+            payment.status = 'failed'
+            payment.save()
+        
+        return {key: value for key, value in result.items() if key not in ('gateway_response', 'message', 'retryable')}
+    
+    def submit_payment(self, payment: Payment, idempotency_key: Optional[str] = None) -> Dict:
+        """
+        Send a payment to the gateway without touching the database.
+        
+        ``payment.milestone.project`` and ``payment.developer`` must already be
+        loaded. Requests repeated with the same idempotency key are not
+        executed twice by the gateway. Failures carry ``retryable`` for
+        transient errors (timeouts, rate limiting, gateway 5xx).
+        """
+        raise NotImplementedError("Subclasses must implement submit_payment")
     
     def refund_payment(self, payment: Payment, amount: Optional[Decimal] = None) -> Dict:
         """Refund a payment"""
@@ -44,6 +71,23 @@ class PaymentGatewayService:
     def get_payment_status(self, transaction_id: str) -> Dict:
         """Get payment status from gateway"""
         raise NotImplementedError("Subclasses must implement get_payment_status")
+    
+    def list_payment_statuses(self, created_after: datetime) -> Optional[Dict[str, Dict]]:
+        """
+        Statuses of all transactions created after a date, keyed by transaction ID,
+        from the gateway's list API. Returns None if the gateway has no such API.
+        """
+        return None
+    
+    def _log_transaction(self, payment: Payment, log_type: str, message: str, log_level: str = 'info'):
+        """Log transaction details"""
+        TransactionLog.objects.create(
+            payment=payment,
+            log_type=log_type,
+            log_level=log_level,
+            message=message,
+            gateway_response=payment.gateway_response
+        )
 
 
 class StripePaymentService(PaymentGatewayService):
@@ -55,8 +99,8 @@ class StripePaymentService(PaymentGatewayService):
         self.publishable_key = settings.STRIPE_PUBLISHABLE_KEY
         self.webhook_secret = settings.STRIPE_WEBHOOK_SECRET
     
-    def process_payment(self, payment: Payment) -> Dict:
-        """Process payment through Stripe"""
+    def submit_payment(self, payment: Payment, idempotency_key: Optional[str] = None) -> Dict:
+        """Create a Stripe payment intent"""
         try:
             # Create payment intent for direct payment
             intent = stripe.PaymentIntent.create(
@@ -65,45 +109,30 @@ class StripePaymentService(PaymentGatewayService):
                 automatic_payment_methods={'enabled': True},
                 metadata={
                     'payment_id': str(payment.id),
-                    'project_id': str(payment.milestone.project.id),
-                    'developer_id': str(payment.developer.id),
-                }
-            )
-            
-            # Update payment with transaction details
-            payment.transaction_id = intent.id
-            payment.gateway_response = intent
-            payment.status = 'processing'
-            payment.save()
-            
-            # Log transaction
-            self._log_transaction(
-                payment, 
-                'payment_initiated', 
-                f"Stripe payment intent created: {intent.id}"
+                    'project_id': str(payment.milestone.project_id),
+                    'developer_id': str(payment.developer_id),
+                },
+                **({'idempotency_key': idempotency_key} if idempotency_key else {})
             )
             
             return {
                 'success': True,
                 'transaction_id': intent.id,
                 'client_secret': intent.client_secret,
-                'status': intent.status
+                'status': intent.status,
+                'gateway_response': intent,
+                'message': f"Stripe payment intent created: {intent.id}"
             }
             
         except stripe.error.StripeError as e:
-            self._log_transaction(
-                payment, 
-                'payment_failed', 
-                f"Stripe error: {str(e)}",
-                log_level='error'
-            )
-            payment.status = 'failed'
-            payment.save()
-            
             return {
                 'success': False,
                 'error': str(e),
-                'error_code': e.code if hasattr(e, 'code') else 'stripe_error'
+                'error_code': e.code if hasattr(e, 'code') else 'stripe_error',
+                'retryable': isinstance(e, (
+                    stripe.error.APIConnectionError, stripe.error.RateLimitError, stripe.error.APIError
+                )),
+                'message': f"Stripe error: {str(e)}"
             }
     
     def refund_payment(self, payment: Payment, amount: Optional[Decimal] = None) -> Dict:
@@ -164,15 +193,26 @@ class StripePaymentService(PaymentGatewayService):
                 'error': str(e)
             }
     
-    def _log_transaction(self, payment: Payment, log_type: str, message: str, log_level: str = 'info'):
-        """Log transaction details"""
-        TransactionLog.objects.create(
-            payment=payment,
-            log_type=log_type,
-            log_level=log_level,
-            message=message,
-            gateway_response=payment.gateway_response
-        )
+    def list_payment_statuses(self, created_after: datetime) -> Optional[Dict[str, Dict]]:
+        """List payment intents page by page (100 per request) instead of one retrieve each"""
+        try:
+            statuses = {}
+            intents = stripe.PaymentIntent.list(
+                created={'gte': int(created_after.timestamp())},
+                limit=100
+            )
+            for intent in intents.auto_paging_iter():
+                statuses[intent.id] = {
+                    'success': True,
+                    'status': intent.status,
+                    'amount': Decimal(intent.amount) / 100,
+                    'currency': intent.currency,
+                    'created': datetime.fromtimestamp(intent.created)
+                }
+            return statuses
+        except stripe.error.StripeError as e:
+            logger.error(f"Error listing Stripe payment intents: {str(e)}")
+            return None
 
 
 class PayPalPaymentService(PaymentGatewayService):
@@ -186,12 +226,15 @@ class PayPalPaymentService(PaymentGatewayService):
             "client_secret": settings.PAYPAL_CLIENT_SECRET
         })
     
-    def process_payment(self, payment: Payment) -> Dict:
-        """Process payment through PayPal"""
+    # PayPal error names worth retrying with the same sender_batch_id
+    RETRYABLE_ERRORS = ('INTERNAL_SERVICE_ERROR', 'RATE_LIMIT_REACHED', 'SERVICE_UNAVAILABLE')
+    
+    def submit_payment(self, payment: Payment, idempotency_key: Optional[str] = None) -> Dict:
+        """Create a PayPal payout; the sender_batch_id makes retries idempotent"""
         try:
             payout = paypalrestsdk.Payout({
                 "sender_batch_header": {
-                    "sender_batch_id": f"payment_{payment.id}",
+                    "sender_batch_id": idempotency_key or f"payment_{payment.id}",
                     "email_subject": "Payment from Freelance Platform"
                 },
                 "items": [{
@@ -207,50 +250,29 @@ class PayPalPaymentService(PaymentGatewayService):
             })
             
             if payout.create():
-                payment.transaction_id = payout.batch_header.payout_batch_id
-                payment.gateway_response = payout.to_dict()
-                payment.status = 'processing'
-                payment.save()
-                
-                self._log_transaction(
-                    payment,
-                    'payment_initiated',
-                    f"PayPal payout created: {payout.batch_header.payout_batch_id}"
-                )
-                
                 return {
                     'success': True,
                     'transaction_id': payout.batch_header.payout_batch_id,
-                    'status': payout.batch_header.batch_status
+                    'status': payout.batch_header.batch_status,
+                    'gateway_response': payout.to_dict(),
+                    'message': f"PayPal payout created: {payout.batch_header.payout_batch_id}"
                 }
             else:
-                self._log_transaction(
-                    payment,
-                    'payment_failed',
-                    f"PayPal payout failed: {payout.error}",
-                    log_level='error'
-                )
-                payment.status = 'failed'
-                payment.save()
-                
+                error_name = payout.error.get('name') if isinstance(payout.error, dict) else None
                 return {
                     'success': False,
-                    'error': str(payout.error)
+                    'error': str(payout.error),
+                    'retryable': error_name in self.RETRYABLE_ERRORS,
+                    'message': f"PayPal payout failed: {payout.error}"
                 }
                 
         except Exception as e:
-            self._log_transaction(
-                payment,
-                'payment_failed',
-                f"PayPal error: {str(e)}",
-                log_level='error'
-            )
-            payment.status = 'failed'
-            payment.save()
-            
+            # Connection errors and timeouts
             return {
                 'success': False,
-                'error': str(e)
+                'error': str(e),
+                'retryable': True,
+                'message': f"PayPal error: {str(e)}"
             }
     
     def refund_payment(self, payment: Payment, amount: Optional[Decimal] = None) -> Dict:
@@ -275,16 +297,6 @@ class PayPalPaymentService(PaymentGatewayService):
                 'success': False,
                 'error': str(e)
             }
-    
-    def _log_transaction(self, payment: Payment, log_type: str, message: str, log_level: str = 'info'):
-        """Log transaction details"""
-        TransactionLog.objects.create(
-            payment=payment,
-            log_type=log_type,
-            log_level=log_level,
-            message=message,
-            gateway_response=payment.gateway_response
-        )
 
 
 class PaymentProcessingService:
@@ -311,9 +323,16 @@ class PaymentProcessingService:
         
         return self.gateway_services[gateway_type](gateway)
     
-    @transaction.atomic
     def process_milestone_payment(self, milestone: Milestone) -> Dict:
-        """Process payment for a completed milestone"""
+        """
+        Process payment for a completed milestone
+        
+        Payment rows are created in one short transaction and paid out after
+        it commits (see PayoutExecutor), so no transaction stays open across
+        gateway calls.
+        """
+        from .payouts import PayoutExecutor
+        
         try:
             # Validate milestone is ready for payment
             if not self._validate_milestone_for_payment(milestone):
@@ -324,14 +343,87 @@ class PaymentProcessingService:
             
             # Get team members and calculate payments
             team_payments = self._calculate_team_payments(milestone)
+            payment_methods = PayoutExecutor.default_payment_methods(developer.id for developer in team_payments)
+            
+            payment_results = {}
+            with transaction.atomic():
+                # Lock the milestone so concurrent runs don't create duplicate payments
+                milestone = Milestone.objects.select_for_update().get(pk=milestone.pk)
+                if not self._validate_milestone_for_payment(milestone):
+                    return {
+                        'success': False,
+                        'error': 'Milestone not ready for payment'
+                    }
+                
+                # Reuse payments left by an earlier run instead of paying twice
+                existing = {
+                    payment.developer_id: payment
+                    for payment in Payment.objects.filter(
+                        milestone=milestone,
+                        payment_type='milestone'
+                    ).exclude(status__in=['failed', 'cancelled'])
+                }
+                
+                new_payments = []
+                for developer, amount in team_payments.items():
+                    if developer.id in existing:
+                        continue
+                    payment_method = payment_methods.get(developer.id)
+                    if not payment_method:
+                        payment_results[developer.id] = {
+                            'success': False,
+                            'developer': developer.username,
+                            'error': 'No verified payment method found'
+                        }
+                        continue
+                    
+                    # Calculate fees based on gateway type
+                    platform_fee = amount * Decimal('0.05')  # 5% platform fee
+                    gateway_fee = self._calculate_gateway_fee(amount, payment_method.method_type)
+                    new_payments.append(Payment(
+                        milestone=milestone,
+                        developer=developer,
+                        amount=amount,
+                        platform_fee=platform_fee,
+                        gateway_fee=gateway_fee,
+                        net_amount=amount - platform_fee - gateway_fee,
+                        payment_type='milestone',
+                        status='pending'
+                    ))
+                Payment.objects.bulk_create(new_payments)
+            
+            # Pay out after commit; each payout succeeds or fails on its own
+            pending = [payment for payment in existing.values() if payment.status == 'pending'] + new_payments
+            outcomes = PayoutExecutor(self.get_gateway_service).execute(
+                [payment.id for payment in pending], payment_methods
+            )
             
-            # Process payments for each team member
-            payment_results = []
-            for developer, amount in team_payments.items():
-                payment_result = self._process_individual_payment(
-                    milestone, developer, amount
-                )
-                payment_results.append(payment_result)
+            for payment in pending:
+                outcome = outcomes.get(str(payment.id))
+                payment_results[payment.developer_id] = {
+                    'success': bool(outcome and outcome['success']),
+                    'status': outcome['status'] if outcome else 'processing',
+                    'developer': payment.developer.username,
+                    'amount': payment.amount,
+                    'net_amount': payment.net_amount,
+                    'payment_id': str(payment.id),
+                    'transaction_id': outcome and outcome['transaction_id'],
+                    'error': outcome['error'] if outcome else 'Payment is already being processed'
+                }
+            for payment in existing.values():
+                if payment.status != 'pending':
+                    # Dispatched by an earlier run; only paid out once the gateway accepted it
+                    payment_results[payment.developer_id] = {
+                        'success': bool(payment.transaction_id),
+                        'status': payment.status,
+                        'developer': payment.developer.username,
+                        'amount': payment.amount,
+                        'net_amount': payment.net_amount,
+                        'payment_id': str(payment.id),
+                        'transaction_id': payment.transaction_id,
+                        'error': None if payment.transaction_id else 'Payout not yet confirmed by the gateway'
+                    }
+            payment_results = list(payment_results.values())
             
             # Update milestone status
             if all(result['success'] for result in payment_results):
@@ -395,71 +487,6 @@ class PaymentProcessingService:
         
         return team_payments
     
-    def _process_individual_payment(self, milestone: Milestone, developer: User, amount: Decimal) -> Dict:
-        """Process payment for individual developer"""
-        try:
-            # Get developer's preferred payment method
-            payment_method = developer.payment_methods.filter(
-                is_default=True,
-                status='verified'
-            ).first()
-            
-            if not payment_method:
-                return {
-                    'success': False,
-                    'developer': developer.username,
-                    'error': 'No verified payment method found'
-                }
-            
-            # Calculate fees based on gateway type
-            platform_fee = amount * Decimal('0.05')  # 5% platform fee
-            gateway_fee = self._calculate_gateway_fee(amount, payment_method.method_type)
-            net_amount = amount - platform_fee - gateway_fee
-            
-            # Create payment record
-            payment = Payment.objects.create(
-                milestone=milestone,
-                developer=developer,
-                amount=amount,
-                platform_fee=platform_fee,
-                gateway_fee=gateway_fee,
-                net_amount=net_amount,
-                payment_type='milestone',
-                status='pending'
-            )
-            
-            # Process through gateway
-            gateway_service = self.get_gateway_service(payment_method.method_type)
-            result = gateway_service.process_payment(payment)
-            
-            if result['success']:
-                payment.status = 'processing'
-                payment.processed_at = timezone.now()
-                payment.save()
-                
-                # Update payment method usage
-                payment_method.total_payments_received += net_amount
-                payment_method.last_used_date = timezone.now()
-                payment_method.save()
-            
-            return {
-                'success': result['success'],
-                'developer': developer.username,
-                'amount': amount,
-                'net_amount': net_amount,
-                'payment_id': str(payment.id),
-                'transaction_id': result.get('transaction_id'),
-                'error': result.get('error')
-            }
-            
-        except Exception as e:
-            logger.error(f"Error processing individual payment: {str(e)}")
-            return {
-                'success': False,
-                'developer': developer.username,
-                'error': str(e)
-            }
-    
     def _calculate_gateway_fee(self, amount: Decimal, gateway_type: str) -> Decimal:
         """Calculate gateway-specific fees"""
         if gateway_type == 'stripe' or gateway_type == 'stripe_account':
@@ -469,50 +496,29 @@ class PaymentProcessingService:
         else:
             return Decimal('0.00')
     
-    @transaction.atomic
     def process_batch_payments(self, payment_ids: List[str]) -> Dict:
-        """Process multiple payments in batch"""
+        """Process multiple payments in batch, dispatching gateway calls concurrently"""
+        from .payouts import PayoutExecutor
+        
         try:
-            payments = Payment.objects.filter(
-                id__in=payment_ids,
-                status='pending'
-            )
-            
-            if not payments.exists():
+            if not Payment.objects.filter(id__in=payment_ids, status='pending').exists():
                 return {
                     'success': False,
                     'error': 'No valid pending payments found'
                 }
             
-            # Group payments by gateway type for batch processing
-            payments_by_gateway = {}
-            for payment in payments:
-                payment_method = payment.developer.payment_methods.filter(
-                    is_default=True,
-                    status='verified'
-                ).first()
-                
-                if payment_method:
-                    gateway_type = payment_method.method_type
-                    if gateway_type not in payments_by_gateway:
-                        payments_by_gateway[gateway_type] = []
-                    payments_by_gateway[gateway_type].append(payment)
-            
-            # Process each gateway batch
-            batch_results = []
-            for gateway_type, gateway_payments in payments_by_gateway.items():
-                gateway_service = self.get_gateway_service(gateway_type)
-                
-                for payment in gateway_payments:
-                    result = gateway_service.process_payment(payment)
-                    batch_results.append({
-                        'payment_id': str(payment.id),
-                        'developer': payment.developer.username,
-                        'amount': payment.amount,
-                        'success': result['success'],
-                        'transaction_id': result.get('transaction_id'),
-                        'error': result.get('error')
-                    })
+            outcomes = PayoutExecutor(self.get_gateway_service).execute(payment_ids)
+            batch_results = [
+                {
+                    'payment_id': outcome['payment_id'],
+                    'developer': outcome['developer'],
+                    'amount': outcome['amount'],
+                    'success': outcome['success'],
+                    'transaction_id': outcome['transaction_id'],
+                    'error': outcome['error']
+                }
+                for outcome in outcomes.values()
+            ]
             
             successful_payments = len([r for r in batch_results if r['success']])
             
@@ -743,27 +749,28 @@ class PaymentDelayService:
     def _notify_team_of_payment_delay(self, project: Project, milestone: Milestone):
         """Notify team members about payment delay"""
         try:
-            from communications.models import Notification
+            from communications.fanout import notification_fanout
             
             # Get all team members
-            team_members = User.objects.filter(
+            team_member_ids = User.objects.filter(
                 assigned_tasks__project=project
-            ).distinct()
-            
-            for member in team_members:
-                Notification.objects.create(
-                    recipient=member,
-                    title=f"Project Paused: {project.title}",
-                    message=f"Project has been paused due to overdue payment. "
-                           f"Milestone {milestone.percentage}% payment is overdue. "
-                           f"Work will resume once payment is processed.",
-                    notification_type='project_paused',
-                    metadata={
-                        'project_id': str(project.id),
-                        'milestone_id': str(milestone.id),
-                        'reason': 'payment_delay'
-                    }
-                )
+            ).values_list('id', flat=True).distinct()
+            
+            notification_fanout.notify(
+                team_member_ids,
+                title=f"Project Paused: {project.title}",
+                message=f"Project has been paused due to overdue payment. "
+                       f"Milestone {milestone.percentage}% payment is overdue. "
+                       f"Work will resume once payment is processed.",
+                notification_type='project_paused',
+                related_project=project,
+                metadata={
+                    'project_id': str(project.id),
+                    'milestone_id': str(milestone.id),
+                    'reason': 'payment_delay'
+                },
+                dedupe_key=f"project_paused:{project.id}:{milestone.id}"
+            )
             
             logger.info(f"Team notified of payment delay for project {project.id}")
             
@@ -773,27 +780,28 @@ class PaymentDelayService:
     def _notify_admins_of_escalation(self, milestone: Milestone):
         """Notify administrators of payment escalation"""
         try:
-            from communications.models import Notification
+            from communications.fanout import notification_fanout
             
             # Get admin users
-            admin_users = User.objects.filter(role='admin', is_active=True)
-            
-            for admin in admin_users:
-                Notification.objects.create(
-                    recipient=admin,
-                    title=f"Payment Escalation: {milestone.project.title}",
-                    message=f"Payment for milestone {milestone.percentage}% has been overdue for more than "
-                           f"{self.delay_thresholds['escalate']} days. Amount: ${milestone.amount}. "
-                           f"Manual intervention required.",
-                    notification_type='payment_escalation',
-                    priority='high',
-                    metadata={
-                        'milestone_id': str(milestone.id),
-                        'project_id': str(milestone.project.id),
-                        'amount': float(milestone.amount),
-                        'days_overdue': (timezone.now() - milestone.due_date).days
-                    }
-                )
+            admin_ids = User.objects.filter(role='admin', is_active=True).values_list('id', flat=True)
+            
+            notification_fanout.notify(
+                admin_ids,
+                title=f"Payment Escalation: {milestone.project.title}",
+                message=f"Payment for milestone {milestone.percentage}% has been overdue for more than "
+                       f"{self.delay_thresholds['escalate']} days. Amount: ${milestone.amount}. "
+                       f"Manual intervention required.",
+                notification_type='payment_escalation',
+                priority='high',
+                related_project=milestone.project_id,
+                metadata={
+                    'milestone_id': str(milestone.id),
+                    'project_id': str(milestone.project_id),
+                    'amount': float(milestone.amount),
+                    'days_overdue': (timezone.now() - milestone.due_date).days
+                },
+                dedupe_key=f"payment_escalation:{milestone.id}"
+            )
             
             logger.info(f"Admins notified of payment escalation for milestone {milestone.id}")
             
@@ -841,23 +849,23 @@ class PaymentDelayService:
     def _notify_team_of_project_resume(self, project: Project):
         """Notify team members that project has resumed"""
         try:
-            from communications.models import Notification
+            from communications.fanout import notification_fanout
             
             # Get all team members
-            team_members = User.objects.filter(
+            team_member_ids = User.objects.filter(
                 assigned_tasks__project=project
-            ).distinct()
-            
-            for member in team_members:
-                Notification.objects.create(
-                    recipient=member,
-                    title=f"Project Resumed: {project.title}",
-                    message=f"Project has been resumed. Payment has been received and work can continue.",
-                    notification_type='project_resumed',
-                    metadata={
-                        'project_id': str(project.id)
-                    }
-                )
+            ).values_list('id', flat=True).distinct()
+            
+            notification_fanout.notify(
+                team_member_ids,
+                title=f"Project Resumed: {project.title}",
+                message=f"Project has been resumed. Payment has been received and work can continue.",
+                notification_type='project_resumed',
+                related_project=project,
+                metadata={
+                    'project_id': str(project.id)
+                }
+            )
             
             logger.info(f"Team notified of project resume for project {project.id}")
             
@@ -866,7 +874,17 @@ class PaymentDelayService:
 
 
 class PaymentReconciliationService:
-    """Service for reconciling payments with external gateways"""
+    """
+    Service for reconciling payments with external gateways.
+    
+    Payments in a terminal state are only re-checked after they change.
+    Statuses come from the gateway's list API where it has one; the rest
+    are fetched concurrently under the gateway's rate limit, and changes
+    are written with bulk_update/bulk_create per batch.
+    """
+    
+    TERMINAL_STATUSES = ('completed', 'failed', 'refunded', 'cancelled')
+    BATCH_SIZE = 500
     
     def __init__(self):
         self.gateway_services = {
@@ -874,8 +892,17 @@ class PaymentReconciliationService:
             'paypal': PayPalPaymentService,
         }
     
-    def reconcile_gateway_transactions(self, gateway_type: str) -> Dict:
-        """Reconcile transactions with payment gateway"""
+    def reconcile_gateway_transactions(self, gateway_type: str, gateway_service: PaymentGatewayService = None,
+                                       max_workers: int = None, use_list_api: bool = True) -> Dict:
+        """
+        Reconcile transactions with payment gateway
+        
+        Args:
+            gateway_type: Gateway to reconcile ('stripe' or 'paypal')
+            gateway_service: Gateway client to use instead of the real one (e.g. a fake for benchmarks)
+            max_workers: Concurrent status calls (default PAYMENT_GATEWAY_MAX_CONCURRENCY)
+            use_list_api: Fetch statuses through the gateway's list API when available
+        """
         try:
             gateway = PaymentGateway.objects.filter(
                 gateway_type=gateway_type,
@@ -895,62 +922,46 @@ class PaymentReconciliationService:
                 created_at__gte=thirty_days_ago,
                 transaction_id__isnull=False
             )
+            # Terminal payments only need checking once after each change
+            due = payments.filter(
+                ~Q(status__in=self.TERMINAL_STATUSES) |
+                Q(last_reconciled_at__isnull=True) |
+                Q(last_reconciled_at__lt=F('updated_at'))
+            ).only(
+                'id', 'status', 'transaction_id', 'amount', 'milestone_id',
+                'developer_id', 'payment_type', 'updated_at', 'last_reconciled_at'
+            ).order_by('created_at')
             
             reconciliation_results = {
                 'gateway_type': gateway_type,
-                'total_payments_checked': payments.count(),
+                'total_payments_checked': 0,
+                'skipped_payments': 0,
                 'mismatches': 0,
                 'updated_payments': 0,
                 'errors': [],
                 'details': []
             }
             
-            gateway_service = self.gateway_services[gateway_type](gateway)
-            
-            for payment in payments:
-                try:
-                    # Get status from gateway
-                    gateway_status = gateway_service.get_payment_status(payment.transaction_id)
-                    
-                    if gateway_status['success']:
-                        gateway_payment_status = gateway_status.get('status')
-                        
-                        # Map gateway status to our status
-                        mapped_status = self._map_gateway_status(gateway_payment_status, gateway_type)
-                        
-                        if mapped_status != payment.status:
-                            # Status mismatch found
-                            reconciliation_results['mismatches'] += 1
-                            
-                            # Update payment status
-                            old_status = payment.status
-                            payment.status = mapped_status
-                            payment.save()
-                            
-                            reconciliation_results['updated_payments'] += 1
-                            reconciliation_results['details'].append({
-                                'payment_id': str(payment.id),
-                                'old_status': old_status,
-                                'new_status': mapped_status,
-                                'gateway_status': gateway_payment_status,
-                                'amount': float(payment.amount)
-                            })
-                            
-                            # Log the reconciliation
-                            TransactionLog.objects.create(
-                                payment=payment,
-                                log_type='payment_reconciled',
-                                log_level='info',
-                                message=f'Payment status updated from {old_status} to {mapped_status} during reconciliation',
-                                gateway_response=gateway_status
-                            )
-                    
-                except Exception as e:
-                    reconciliation_results['errors'].append({
-                        'payment_id': str(payment.id),
-                        'error': str(e)
-                    })
-                    logger.error(f"Error reconciling payment {payment.id}: {str(e)}")
+            if gateway_service is None:
+                gateway_service = self.gateway_services[gateway_type](gateway)
+            listed_statuses = gateway_service.list_payment_statuses(thirty_days_ago) if use_list_api else None
+            limiter = gateway_rate_limiter(gateway_type)
+            
+            due_count = 0
+            batch = []
+            for payment in due.iterator(chunk_size=self.BATCH_SIZE):
+                batch.append(payment)
+                if len(batch) >= self.BATCH_SIZE:
+                    due_count += len(batch)
+                    self._reconcile_batch(batch, gateway_type, gateway_service, listed_statuses,
+                                          limiter, max_workers, reconciliation_results)
+                    batch = []
+            if batch:
+                due_count += len(batch)
+                self._reconcile_batch(batch, gateway_type, gateway_service, listed_statuses,
+                                      limiter, max_workers, reconciliation_results)
+            
+            reconciliation_results['skipped_payments'] = payments.count() - due_count
             
             logger.info(f"Reconciliation completed for {gateway_type}: {reconciliation_results['mismatches']} mismatches found")
             
@@ -966,6 +977,126 @@ class PaymentReconciliationService:
                 'error': str(e)
             }
     
+    def _reconcile_batch(self, payments: List[Payment], gateway_type: str,
+                         gateway_service: PaymentGatewayService, listed_statuses: Optional[Dict[str, Dict]],
+                         limiter, max_workers: Optional[int], results: Dict) -> None:
+        """Fetch statuses for one batch and write every change in bulk"""
+        statuses = {}
+        if listed_statuses:
+            statuses = {
+                payment.transaction_id: listed_statuses[payment.transaction_id]
+                for payment in payments if payment.transaction_id in listed_statuses
+            }
+        missing = [payment.transaction_id for payment in payments if payment.transaction_id not in statuses]
+        statuses.update(call_concurrently(gateway_service.get_payment_status, missing, limiter, max_workers))
+        
+        now = timezone.now()
+        changed = {}
+        unchanged_ids = []
+        logs = []
+        for payment in payments:
+            gateway_status = statuses.get(payment.transaction_id) or {'success': False, 'error': 'No status returned'}
+            if not gateway_status['success']:
+                results['errors'].append({
+                    'payment_id': str(payment.id),
+                    'error': gateway_status.get('error')
+                })
+                logger.error(f"Error reconciling payment {payment.id}: {gateway_status.get('error')}")
+                continue
+            
+            results['total_payments_checked'] += 1
+            gateway_payment_status = gateway_status.get('status')
+            
+            # Map gateway status to our status
+            mapped_status = self._map_gateway_status(gateway_payment_status, gateway_type)
+            
+            if mapped_status == payment.status:
+                unchanged_ids.append(payment.id)
+                continue
+            
+            # Status mismatch found
+            results['mismatches'] += 1
+            old_status = payment.status
+            changed[payment.id] = (payment, payment.updated_at)
+            payment.status = mapped_status
+            payment.updated_at = now
+            payment.last_reconciled_at = now
+            results['details'].append({
+                'payment_id': str(payment.id),
+                'old_status': old_status,
+                'new_status': mapped_status,
+                'gateway_status': gateway_payment_status,
+                'amount': float(payment.amount)
+            })
+            logs.append(TransactionLog(
+                payment=payment,
+                log_type='payment_reconciled',
+                log_level='info',
+                message=f'Payment status updated from {old_status} to {mapped_status} during reconciliation',
+                gateway_response=gateway_status
+            ))
+        
+        with transaction.atomic():
+            Payment.objects.filter(id__in=unchanged_ids).update(last_reconciled_at=now)
+            if changed:
+                self._apply_status_changes(changed, logs, results)
+    
+    def _apply_status_changes(self, changed: Dict, logs: List[TransactionLog], results: Dict) -> None:
+        """
+        Write reconciled statuses in bulk. Payments modified since they were
+        read (e.g. by a webhook) are left for the next run rather than overwritten.
+        """
+        current = dict(
+            Payment.objects.select_for_update().filter(id__in=changed.keys()).values_list('id', 'updated_at')
+        )
+        stale = {
+            payment_id for payment_id, (_, read_updated_at) in changed.items()
+            if current.get(payment_id) != read_updated_at
+        }
+        updated = [payment for payment_id, (payment, _) in changed.items() if payment_id not in stale]
+        
+        Payment.objects.bulk_update(
+            updated, ['status', 'updated_at', 'last_reconciled_at'], batch_size=self.BATCH_SIZE
+        )
+        TransactionLog.objects.bulk_create(
+            [log for log in logs if log.payment_id not in stale], batch_size=self.BATCH_SIZE
+        )
+        results['updated_payments'] += len(updated)
+        if stale:
+            stale_ids = {str(payment_id) for payment_id in stale}
+            results['details'] = [
+                detail for detail in results['details'] if detail['payment_id'] not in stale_ids
+            ]
+            logger.info(f"Skipped {len(stale)} payments modified during reconciliation")
+        
+        # bulk_update skips post_save, so push the realtime updates here
+        from communications.signals import push_payment_updates
+        transaction.on_commit(lambda: push_payment_updates(updated))
+    
+    def resolve_unconfirmed_payouts(self) -> Dict:
+        """Resend payouts whose outcome is unknown with their original idempotency keys"""
+        from .payouts import PayoutExecutor
+        
+        try:
+            outcomes = PayoutExecutor(PaymentProcessingService().get_gateway_service).resolve_unconfirmed()
+            statuses = [outcome['status'] for outcome in outcomes.values()]
+            return {
+                'success': True,
+                'checked': len(outcomes),
+                'confirmed': sum(1 for outcome in outcomes.values() if outcome['transaction_id']),
+                'failed': statuses.count('failed'),
+                'unresolved': sum(
+                    1 for outcome in outcomes.values()
+                    if outcome['status'] == 'processing' and not outcome['transaction_id']
+                )
+            }
+        except Exception as e:
+            logger.error(f"Error resolving unconfirmed payouts: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     def _map_gateway_status(self, gateway_status: str, gateway_type: str) -> str:
         """Map gateway-specific status to our payment status"""
         if gateway_type == 'stripe':
@@ -993,48 +1124,71 @@ class PaymentReconciliationService:
         return status_mapping.get(gateway_status, 'pending')
     
     def generate_payment_report(self, start_date: datetime, end_date: datetime) -> Dict:
-        """Generate comprehensive payment report"""
+        """
+        Generate comprehensive payment report
+        
+        All figures come from one query grouped by status, gateway and month,
+        so the work done in Python depends on the number of groups rather
+        than the number of payments in the range.
+        """
         try:
-            payments = Payment.objects.filter(
+            groups = Payment.objects.filter(
                 created_at__gte=start_date,
                 created_at__lte=end_date
-            )
-            
-            # Calculate summary statistics
-            total_payments = payments.count()
-            total_amount = sum(p.amount for p in payments if p.status == 'completed')
-            total_platform_fees = sum(p.platform_fee for p in payments if p.status == 'completed')
-            total_gateway_fees = sum(p.gateway_fee for p in payments if p.status == 'completed')
-            net_amount_paid = sum(p.net_amount for p in payments if p.status == 'completed')
-            
-            # Status breakdown
-            status_breakdown = {}
-            for status in ['pending', 'processing', 'completed', 'failed', 'cancelled']:
-                status_breakdown[status] = payments.filter(status=status).count()
-            
-            # Gateway breakdown
-            gateway_breakdown = {}
-            for gateway_type in ['stripe', 'paypal']:
-                gateway_payments = payments.filter(payment_gateway__gateway_type=gateway_type)
-                gateway_breakdown[gateway_type] = {
-                    'count': gateway_payments.count(),
-                    'amount': sum(p.amount for p in gateway_payments if p.status == 'completed'),
-                    'fees': sum(p.gateway_fee for p in gateway_payments if p.status == 'completed')
-                }
-            
-            # Monthly breakdown
+            ).values(
+                'status',
+                gateway_type=F('payment_gateway__gateway_type'),
+                month=TruncMonth('created_at', tzinfo=dt_timezone.utc)
+            ).annotate(
+                count=Count('id'),
+                amount=Sum('amount'),
+                platform_fees=Sum('platform_fee'),
+                gateway_fees=Sum('gateway_fee'),
+                net_amount=Sum('net_amount')
+            ).order_by()
+            
+            total_payments = 0
+            total_amount = Decimal('0')
+            total_platform_fees = Decimal('0')
+            total_gateway_fees = Decimal('0')
+            net_amount_paid = Decimal('0')
+            status_breakdown = {status: 0 for status in ['pending', 'processing', 'completed', 'failed', 'cancelled']}
+            gateway_breakdown = {
+                gateway_type: {'count': 0, 'amount': Decimal('0'), 'fees': Decimal('0')}
+                for gateway_type in ['stripe', 'paypal']
+            }
             monthly_breakdown = {}
-            for payment in payments.filter(status='completed'):
-                month_key = payment.created_at.strftime('%Y-%m')
-                if month_key not in monthly_breakdown:
-                    monthly_breakdown[month_key] = {
-                        'count': 0,
-                        'amount': 0,
-                        'fees': 0
-                    }
-                monthly_breakdown[month_key]['count'] += 1
-                monthly_breakdown[month_key]['amount'] += float(payment.amount)
-                monthly_breakdown[month_key]['fees'] += float(payment.platform_fee + payment.gateway_fee)
+            
+            for group in groups.iterator():
+                total_payments += group['count']
+                status_breakdown[group['status']] = status_breakdown.get(group['status'], 0) + group['count']
+                
+                gateway = None
+                if group['gateway_type']:
+                    gateway = gateway_breakdown.setdefault(
+                        group['gateway_type'], {'count': 0, 'amount': Decimal('0'), 'fees': Decimal('0')}
+                    )
+                    gateway['count'] += group['count']
+                
+                # Amounts only count completed payments
+                if group['status'] != 'completed':
+                    continue
+                
+                total_amount += group['amount']
+                total_platform_fees += group['platform_fees']
+                total_gateway_fees += group['gateway_fees']
+                net_amount_paid += group['net_amount']
+                
+                if gateway is not None:
+                    gateway['amount'] += group['amount']
+                    gateway['fees'] += group['gateway_fees']
+                
+                month = monthly_breakdown.setdefault(
+                    group['month'].strftime('%Y-%m'), {'count': 0, 'amount': 0, 'fees': 0}
+                )
+                month['count'] += group['count']
+                month['amount'] += float(group['amount'])
+                month['fees'] += float(group['platform_fees'] + group['gateway_fees'])
             
             report = {
                 'period': {
@@ -1050,7 +1204,7 @@ class PaymentReconciliationService:
                 },
                 'status_breakdown': status_breakdown,
                 'gateway_breakdown': gateway_breakdown,
-                'monthly_breakdown': monthly_breakdown,
+                'monthly_breakdown': dict(sorted(monthly_breakdown.items())),
                 'generated_at': timezone.now().isoformat()
             }
             
@@ -1067,7 +1221,21 @@ class PaymentReconciliationService:
 
 
 class WebhookService:
-    """Service for handling payment gateway webhooks"""
+    """
+    Service for handling payment gateway webhooks.
+    
+    The HTTP handlers only verify the signature and store the raw event
+    (unique per provider event ID, so provider retries are no-ops).
+    Background workers claim stored events in batches and process them
+    idempotently, in provider order per gateway object (payment intent,
+    charge or payout item). Stored events can be replayed for recovery.
+    """
+    
+    MAX_ATTEMPTS = 5
+    RETRY_DELAY = timedelta(minutes=5)
+    # A claimed event not finished within this window is assumed abandoned
+    PROCESSING_TIMEOUT = timedelta(minutes=10)
+    BATCH_SIZE = 100
     
     def __init__(self):
         self.webhook_handlers = {
@@ -1075,15 +1243,13 @@ class WebhookService:
             'paypal': self._handle_paypal_event
         }
     
-    def handle_stripe_webhook(self, payload: Dict, signature: str) -> Dict:
-        """Handle Stripe webhook events"""
+    def handle_stripe_webhook(self, payload: bytes, signature: str) -> Dict:
+        """Verify a Stripe webhook and store it for background processing"""
         try:
-            import stripe
-            
-            # Verify webhook signature
+            # Verify webhook signature against the raw request body
             try:
-                event = stripe.Webhook.construct_event(
-                    json.dumps(payload),
+                stripe.Webhook.construct_event(
+                    payload,
                     signature,
                     settings.STRIPE_WEBHOOK_SECRET
                 )
@@ -1094,31 +1260,238 @@ class WebhookService:
                 logger.error("Invalid Stripe webhook signature")
                 return {'success': False, 'error': 'Invalid signature'}
             
-            # Handle the event
-            result = self._handle_stripe_event(event)
-            
-            logger.info(f"Stripe webhook processed: {event['type']}")
-            return result
+            event = json.loads(payload)
+            event_object = event.get('data', {}).get('object', {})
+            if event_object.get('object') == 'payment_intent':
+                ordering_key = event_object.get('id')
+            else:
+                ordering_key = event_object.get('payment_intent') or event_object.get('charge') or event_object.get('id')
+            created = event.get('created')
+            
+            return self._store_event(
+                provider='stripe',
+                event_id=event.get('id'),
+                event_type=event.get('type', ''),
+                payload=event,
+                ordering_key=ordering_key,
+                event_created_at=datetime.fromtimestamp(created, tz=dt_timezone.utc) if created else None
+            )
             
         except Exception as e:
             logger.error(f"Error handling Stripe webhook: {str(e)}")
             return {'success': False, 'error': str(e)}
     
-    def handle_paypal_webhook(self, payload: Dict, headers: Dict) -> Dict:
-        """Handle PayPal webhook events"""
+    def handle_paypal_webhook(self, payload: bytes, headers: Dict) -> Dict:
+        """Verify a PayPal webhook and store it for background processing"""
         try:
-            # In a real implementation, you would verify the PayPal webhook signature
-            # For now, we'll process the event directly
-            
-            result = self._handle_paypal_event(payload)
+            if not self._verify_paypal_signature(payload, headers):
+                logger.error("Invalid PayPal webhook signature")
+                return {'success': False, 'error': 'Invalid signature'}
             
-            logger.info(f"PayPal webhook processed: {payload.get('event_type', 'unknown')}")
-            return result
+            event = json.loads(payload)
+            resource = event.get('resource', {})
+            created = event.get('create_time')
+            
+            return self._store_event(
+                provider='paypal',
+                event_id=event.get('id'),
+                event_type=event.get('event_type', ''),
+                payload=event,
+                ordering_key=resource.get('payout_item_id') or resource.get('id'),
+                event_created_at=datetime.fromisoformat(created.replace('Z', '+00:00')) if created else None
+            )
             
         except Exception as e:
             logger.error(f"Error handling PayPal webhook: {str(e)}")
             return {'success': False, 'error': str(e)}
     
+    def _verify_paypal_signature(self, payload: bytes, headers: Dict) -> bool:
+        """Verify PayPal transmission headers against the configured webhook ID"""
+        webhook_id = settings.PAYPAL_WEBHOOK_ID
+        if not webhook_id:
+            if settings.DEBUG:
+                logger.warning("PAYPAL_WEBHOOK_ID not set; accepting unverified PayPal webhook in DEBUG")
+                return True
+            return False
+        
+        try:
+            return paypalrestsdk.WebhookEvent.verify(
+                headers.get('HTTP_PAYPAL_TRANSMISSION_ID'),
+                headers.get('HTTP_PAYPAL_TRANSMISSION_TIME'),
+                webhook_id,
+                payload.decode('utf-8') if isinstance(payload, bytes) else payload,
+                headers.get('HTTP_PAYPAL_CERT_URL'),
+                headers.get('HTTP_PAYPAL_TRANSMISSION_SIG'),
+                'sha256'
+            )
+        except Exception as e:
+            logger.error(f"Error verifying PayPal webhook signature: {str(e)}")
+            return False
+    
+    def _store_event(self, provider: str, event_id: str, event_type: str, payload: Dict,
+                     ordering_key: Optional[str], event_created_at: Optional[datetime]) -> Dict:
+        """Persist a verified event once; duplicates from provider retries are acknowledged"""
+        if not event_id:
+            return {'success': False, 'error': 'Missing event ID'}
+        
+        webhook_event, created = WebhookEvent.objects.get_or_create(
+            provider=provider,
+            event_id=event_id,
+            defaults={
+                'event_type': event_type,
+                'payload': payload,
+                'ordering_key': ordering_key or '',
+                'event_created_at': event_created_at or timezone.now(),
+            }
+        )
+        
+        if created:
+            transaction.on_commit(self.queue_processing)
+            logger.info(f"{provider.title()} webhook stored: {event_type} ({event_id})")
+        else:
+            logger.info(f"Duplicate {provider} webhook ignored: {event_id}")
+        
+        return {'success': True, 'event_id': event_id, 'duplicate': not created}
+    
+    @staticmethod
+    def queue_processing():
+        """Ask a worker to drain stored events; the periodic task is the fallback"""
+        try:
+            from .tasks import process_webhook_events
+            process_webhook_events.delay()
+        except Exception as e:
+            logger.error(f"Error queueing webhook processing: {str(e)}")
+    
+    def _unfinished_events(self):
+        """Events still owed processing; a retryable failure blocks later events for its key"""
+        return WebhookEvent.objects.filter(
+            Q(status__in=['received', 'processing']) |
+            Q(status='failed', attempts__lt=self.MAX_ATTEMPTS)
+        )
+    
+    def claim_events(self, batch_size: int = None) -> List[WebhookEvent]:
+        """
+        Claim up to batch_size due events, oldest first.
+        
+        An event is only claimed if no earlier unfinished event exists for
+        its ordering key outside this claim, so each gateway object's events
+        are applied in order even with several workers.
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        now = timezone.now()
+        
+        with transaction.atomic():
+            candidates = list(
+                WebhookEvent.objects.select_for_update(skip_locked=True).filter(
+                    Q(status='received') |
+                    Q(status='failed', attempts__lt=self.MAX_ATTEMPTS,
+                      processing_started_at__lt=now - self.RETRY_DELAY) |
+                    Q(status='processing', processing_started_at__lt=now - self.PROCESSING_TIMEOUT)
+                ).order_by('event_created_at', 'received_at')[:batch_size]
+            )
+            if not candidates:
+                return []
+            
+            claimed_ids = {event.id for event in candidates}
+            keys = {event.ordering_key for event in candidates if event.ordering_key}
+            earliest_elsewhere = {}
+            for key, created_at in self._unfinished_events().filter(
+                ordering_key__in=keys
+            ).exclude(id__in=claimed_ids).values_list('ordering_key', 'event_created_at'):
+                if key not in earliest_elsewhere or created_at < earliest_elsewhere[key]:
+                    earliest_elsewhere[key] = created_at
+            
+            events = [
+                event for event in candidates
+                if event.ordering_key not in earliest_elsewhere
+                or event.event_created_at < earliest_elsewhere[event.ordering_key]
+            ]
+            WebhookEvent.objects.filter(id__in=[event.id for event in events]).update(
+                status='processing', processing_started_at=now
+            )
+        
+        return events
+    
+    def process_pending_events(self, batch_size: int = None) -> Dict:
+        """Claim a batch of stored events and process them in order"""
+        events = self.claim_events(batch_size)
+        results = {'claimed': len(events), 'processed': 0, 'failed': 0, 'deferred': 0}
+        blocked_keys = set()
+        
+        for event in events:
+            if event.ordering_key and event.ordering_key in blocked_keys:
+                # An earlier event for this object failed; keep order by waiting for it
+                WebhookEvent.objects.filter(pk=event.pk).update(status='received')
+                results['deferred'] += 1
+                continue
+            
+            if self.process_event(event):
+                results['processed'] += 1
+            else:
+                results['failed'] += 1
+                if event.ordering_key:
+                    blocked_keys.add(event.ordering_key)
+        
+        return results
+    
+    def process_event(self, event: WebhookEvent) -> bool:
+        """Apply one stored event; handler effects and the status update commit together"""
+        handler = self.webhook_handlers[event.provider]
+        
+        try:
+            with transaction.atomic():
+                result = handler(event.payload)
+                if not result.get('success'):
+                    raise ValueError(result.get('error', 'Webhook handler failed'))
+                WebhookEvent.objects.filter(pk=event.pk).update(
+                    status='processed',
+                    attempts=F('attempts') + 1,
+                    last_error=None,
+                    result=result,
+                    processed_at=timezone.now()
+                )
+            logger.info(f"{event.provider.title()} webhook processed: {event.event_type} ({event.event_id})")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error processing {event.provider} webhook {event.event_id}: {str(e)}")
+            WebhookEvent.objects.filter(pk=event.pk).update(
+                status='failed',
+                attempts=F('attempts') + 1,
+                last_error=str(e)
+            )
+            return False
+    
+    def replay_events(self, provider: str = None, event_ids: List[str] = None,
+                      since: datetime = None, include_processed: bool = False) -> int:
+        """
+        Reset stored events so workers process them again.
+        
+        By default only failed events are replayed; handlers are idempotent,
+        so replaying processed events is safe as well.
+        """
+        events = WebhookEvent.objects.all()
+        if provider:
+            events = events.filter(provider=provider)
+        if event_ids:
+            events = events.filter(event_id__in=event_ids)
+        if since:
+            events = events.filter(received_at__gte=since)
+        if not include_processed:
+            events = events.filter(status='failed')
+        
+        replayed = events.update(
+            status='received',
+            attempts=0,
+            last_error=None,
+            processing_started_at=None
+        )
+        
+        if replayed:
+            transaction.on_commit(self.queue_processing)
+        logger.info(f"Replaying {replayed} webhook events")
+        return replayed
+    
     def _handle_stripe_event(self, event: Dict) -> Dict:
         """Handle specific Stripe events"""
         event_type = event['type']
@@ -1161,9 +1534,12 @@ class WebhookService:
         try:
             # Find payment by transaction ID
             transaction_id = payment_data.get('id')
-            payment = Payment.objects.filter(transaction_id=transaction_id).first()
+            payment = Payment.objects.select_for_update().filter(transaction_id=transaction_id).first()
             
-            if payment:
+            if payment and payment.status == 'completed':
+                # Redelivered or replayed event
+                return {'success': True, 'payment_id': str(payment.id), 'already_processed': True}
+            elif payment:
                 payment.status = 'completed'
                 payment.processed_at = timezone.now()
                 payment.gateway_response = payment_data
@@ -1201,9 +1577,12 @@ class WebhookService:
         try:
             # Find payment by transaction ID
             transaction_id = payment_data.get('id')
-            payment = Payment.objects.filter(transaction_id=transaction_id).first()
+            payment = Payment.objects.select_for_update().filter(transaction_id=transaction_id).first()
             
-            if payment:
+            if payment and payment.status in ('failed', 'completed'):
+                # Redelivered or replayed event; never downgrade a completed payment
+                return {'success': True, 'payment_id': str(payment.id), 'already_processed': True}
+            elif payment:
                 payment.status = 'failed'
                 payment.gateway_response = payment_data
                 payment.save()
@@ -1238,11 +1617,14 @@ class WebhookService:
             payout_item_id = payout_item.get('payout_item_id')
             
             # Find payment by metadata or transaction ID
-            payment = Payment.objects.filter(
+            payment = Payment.objects.select_for_update().filter(
                 transaction_id__contains=payout_item_id
             ).first()
             
-            if payment:
+            if payment and payment.status == 'completed':
+                # Redelivered or replayed event
+                return {'success': True, 'payment_id': str(payment.id), 'already_processed': True}
+            elif payment:
                 payment.status = 'completed'
                 payment.processed_at = timezone.now()
                 payment.gateway_response = event_data
@@ -1276,11 +1658,14 @@ class WebhookService:
             payout_item_id = payout_item.get('payout_item_id')
             
             # Find payment by metadata or transaction ID
-            payment = Payment.objects.filter(
+            payment = Payment.objects.select_for_update().filter(
                 transaction_id__contains=payout_item_id
             ).first()
             
-            if payment:
+            if payment and payment.status in ('failed', 'completed'):
+                # Redelivered or replayed event; never downgrade a completed payout
+                return {'success': True, 'payment_id': str(payment.id), 'already_processed': True}
+            elif payment:
                 payment.status = 'failed'
                 payment.gateway_response = event_data
                 payment.save()
@@ -1312,11 +1697,14 @@ class WebhookService:
         try:
             # Find payment by charge ID
             charge_id = dispute_data.get('charge')
-            payment = Payment.objects.filter(
+            payment = Payment.objects.select_for_update().filter(
                 gateway_response__id=charge_id
             ).first()
             
-            if payment:
+            if payment and payment.disputes.filter(dispute_type='unauthorized_charge').exists():
+                # Redelivered or replayed event
+                return {'success': True, 'payment_id': str(payment.id), 'already_processed': True}
+            elif payment:
                 # Create dispute record
                 PaymentDispute.objects.create(
                     payment=payment,
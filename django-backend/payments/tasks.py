@@ -7,7 +7,7 @@ from datetime import timedelta
 import logging
 from .services import (
     PaymentProcessingService, PaymentDelayService, 
-    PaymentReconciliationService
+    PaymentReconciliationService, WebhookService
 )
 from .models import Payment, Milestone
 
@@ -90,6 +90,9 @@ def reconcile_gateway_payments_periodic(gateway_type='all'):
         gateways = ['stripe', 'paypal'] if gateway_type == 'all' else [gateway_type]
         results = {}
         
+        # Settle payouts with unknown outcomes first so they get transaction IDs to reconcile
+        results['unconfirmed_payouts'] = reconciliation_service.resolve_unconfirmed_payouts()
+        
         for gateway in gateways:
             try:
                 result = reconciliation_service.reconcile_gateway_transactions(gateway)
@@ -302,4 +305,36 @@ def generate_payment_analytics_report():
         
     except Exception as e:
         logger.error(f"Error generating payment analytics report: {str(e)}")
-        return {'success': False, 'error': str(e)}
\ No newline at end of file
+        return {'success': False, 'error': str(e)}
+
+
+@shared_task
+def process_webhook_events(batch_size=None, max_batches=20):
+    """
+    Drain stored gateway webhook events in batches.
+    
+    Queued after each stored event and run periodically so events are
+    picked up even if the queueing call was lost.
+    """
+    try:
+        webhook_service = WebhookService()
+        totals = {'claimed': 0, 'processed': 0, 'failed': 0, 'deferred': 0}
+        
+        for _ in range(max_batches):
+            results = webhook_service.process_pending_events(batch_size)
+            for key, value in results.items():
+                totals[key] += value
+            if not results['claimed']:
+                break
+        
+        if totals['claimed']:
+            logger.info(
+                f"Webhook events: {totals['processed']} processed, "
+                f"{totals['failed']} failed, {totals['deferred']} deferred"
+            )
+        
+        return {'success': True, **totals}
+        
+    except Exception as e:
+        logger.error(f"Error processing webhook events: {str(e)}")
+        return {'success': False, 'error': str(e)}
@@ -1,3 +1,123 @@
+"""
+Tests for payout execution
+"""
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from projects.models import Project
+from users.models import User
+
+from .fake_gateway import FakeGatewayService
+from .models import Milestone, Payment, PaymentGateway, PaymentMethod, TransactionLog
+from .payouts import PayoutExecutor
+from .services import PaymentProcessingService
+
+
+class PayoutExecutorTest(TestCase):
+    """Test cases for dispatching payouts and settling unknown outcomes"""
+
+    def setUp(self):
+        """Set up a payable milestone, a developer with a payment method and a fake gateway"""
+        self.client_user = User.objects.create(username='client', email='client@example.com')
+        self.developer = User.objects.create(username='developer', email='developer@example.com')
+        self.project = Project.objects.create(
+            client=self.client_user, title='Marketplace', description='Build a marketplace'
+        )
+        self.milestone = Milestone.objects.create(
+            project=self.project, percentage=25, amount=Decimal('1000.00'),
+            due_date=timezone.now() + timedelta(days=7), status='completed',
+            client_approved=True, senior_developer_approved=True
+        )
+        PaymentMethod.objects.create(
+            user=self.developer, method_type='stripe_account', status='verified',
+            is_default=True, display_name='Stripe'
+        )
+        self.gateway = PaymentGateway.objects.create(
+            name='Stripe', gateway_type='stripe', api_endpoint='https://api.stripe.com',
+            api_key_encrypted='key'
+        )
+        self.fake = FakeGatewayService(self.gateway, latency=0)
+        self.executor = PayoutExecutor(lambda gateway_type: self.fake)
+        patcher = mock.patch.object(PayoutExecutor, 'RETRY_BACKOFF', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_payment(self):
+        return Payment.objects.create(
+            milestone=self.milestone, developer=self.developer, amount=Decimal('1000.00'),
+            net_amount=Decimal('950.00'), payment_type='milestone'
+        )
+
+    def test_successful_payout(self):
+        """Test that an accepted payout records the gateway transaction"""
+        payment = self.create_payment()
+
+        outcome = self.executor.execute([payment.id])[str(payment.id)]
+
+        payment.refresh_from_db()
+        self.assertTrue(outcome['success'])
+        self.assertEqual(payment.status, 'processing')
+        self.assertEqual(payment.transaction_id, outcome['transaction_id'])
+        self.assertEqual(payment.payment_gateway, self.gateway)
+
+    def test_unknown_outcome_stays_processing(self):
+        """Test that exhausting retries on transient errors does not fail the payment"""
+        self.fake.transient_failures = PayoutExecutor.MAX_ATTEMPTS
+        payment = self.create_payment()
+
+        outcome = self.executor.execute([payment.id])[str(payment.id)]
+
+        payment.refresh_from_db()
+        self.assertFalse(outcome['success'])
+        self.assertEqual(outcome['status'], 'processing')
+        self.assertEqual(payment.status, 'processing')
+        self.assertIsNone(payment.transaction_id)
+        self.assertTrue(TransactionLog.objects.filter(payment=payment, log_type='payment_processing').exists())
+
+    def test_definite_rejection_fails_payment(self):
+        """Test that a non-retryable gateway error fails the payment"""
+        payment = self.create_payment()
+        declined = {'success': False, 'error': 'Card declined', 'retryable': False, 'message': 'Declined'}
+
+        with mock.patch.object(self.fake, 'submit_payment', return_value=declined):
+            self.executor.execute([payment.id])
+
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, 'failed')
+
+    def test_rerun_does_not_pay_unconfirmed_payout_again(self):
+        """Test that processing the milestone again neither creates a payment nor reports success"""
+        self.fake.transient_failures = PayoutExecutor.MAX_ATTEMPTS
+        service = PaymentProcessingService()
+        with mock.patch.object(service, 'get_gateway_service', return_value=self.fake), \
+                mock.patch.object(service, '_calculate_team_payments',
+                                  return_value={self.developer: Decimal('1000.00')}):
+            first = service.process_milestone_payment(self.milestone)
+            second = service.process_milestone_payment(self.milestone)
+
+        self.assertFalse(first['success'])
+        self.assertFalse(second['success'])
+        self.assertEqual(second['payments'][0]['status'], 'processing')
+        self.assertEqual(Payment.objects.filter(milestone=self.milestone).count(), 1)
+        self.assertEqual(len(self.fake.payouts), 0)
+        self.milestone.refresh_from_db()
+        self.assertEqual(self.milestone.status, 'completed')
+
+    def test_resolve_unconfirmed_reuses_idempotency_key(self):
+        """Test that settling an unknown outcome resends the original idempotency key"""
+        self.fake.transient_failures = PayoutExecutor.MAX_ATTEMPTS
+        payment = self.create_payment()
+        self.executor.execute([payment.id])
+
+        self.assertEqual(self.executor.resolve_unconfirmed(), {})
+        outcomes = self.executor.resolve_unconfirmed(older_than=timedelta(0))
 
-# Create your tests here.
+        payment.refresh_from_db()
+        self.assertTrue(outcomes[str(payment.id)]['success'])
+        self.assertEqual(payment.status, 'processing')
+        self.assertEqual(list(self.fake.payouts), [f'payout_{payment.id}_1'])
+        self.assertEqual(payment.transaction_id, self.fake.payouts[f'payout_{payment.id}_1']['transaction_id'])
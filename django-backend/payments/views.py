@@ -1,7 +1,6 @@
 """
 Payment processing views and API endpoints
 """
-import json
 import logging
 from decimal import Decimal
 from datetime import datetime, timedelta
@@ -418,7 +417,7 @@ def check_overdue_payments(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def stripe_webhook(request):
-    """Handle Stripe webhook events"""
+    """Verify and store Stripe webhook events; processing happens in the background"""
     payload = request.body
     sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
     
@@ -427,10 +426,7 @@ def stripe_webhook(request):
     
     try:
         webhook_service = WebhookService()
-        result = webhook_service.handle_stripe_webhook(
-            json.loads(payload.decode('utf-8')), 
-            sig_header
-        )
+        result = webhook_service.handle_stripe_webhook(payload, sig_header)
         
         if result['success']:
             return HttpResponse(status=200)
@@ -446,16 +442,13 @@ def stripe_webhook(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def paypal_webhook(request):
-    """Handle PayPal webhook events"""
+    """Verify and store PayPal webhook events; processing happens in the background"""
     payload = request.body
     headers = dict(request.META)
     
     try:
         webhook_service = WebhookService()
-        result = webhook_service.handle_paypal_webhook(
-            json.loads(payload.decode('utf-8')), 
-            headers
-        )
+        result = webhook_service.handle_paypal_webhook(payload, headers)
         
         if result['success']:
             return HttpResponse(status=200)
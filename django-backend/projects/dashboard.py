@@ -0,0 +1,181 @@
+"""
+Project console dashboard.
+
+The dashboard is built from one annotated project queryset (task counts,
+team size and the user's access come from conditional aggregates and
+EXISTS subqueries, budget and timeline from a joined resource allocation),
+so its cost does not grow with the number of projects. Snapshots are
+cached per user and invalidated by the signal receivers in
+``projects.signals`` whenever a project, task, resource allocation,
+invitation or assignment that feeds them changes.
+"""
+import logging
+from typing import Dict, Any, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+
+from freelance_platform.cache_config import CacheService
+from .models import Project, Task, TaskAssignment, TeamInvitation
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectDashboardService:
+    """Builds and caches the per-user project console dashboard"""
+
+    CACHE_PREFIX = 'project_console_dashboard'
+
+    @property
+    def cache_timeout(self) -> int:
+        return getattr(settings, 'PROJECT_CONSOLE_DASHBOARD_CACHE_TTL', 300)
+
+    def cache_key(self, user_id) -> str:
+        return CacheService.get_cache_key(self.CACHE_PREFIX, user_id)
+
+    def get_dashboard(self, user, use_cache: bool = True) -> Dict[str, Any]:
+        """Cached dashboard snapshot for a user; rebuilt when missing or invalidated"""
+        if not use_cache or self.cache_timeout <= 0:
+            return self.build_dashboard(user)
+
+        # Expired snapshots keep being served while one request rebuilds them;
+        # invalidation deletes the key, so changes are never masked
+        return CacheService.get_or_compute(
+            self.cache_key(user.pk), lambda: self.build_dashboard(user),
+            self.cache_timeout, prefix=self.CACHE_PREFIX
+        )
+
+    def invalidate_users(self, user_ids: Iterable) -> None:
+        keys = [self.cache_key(user_id) for user_id in set(user_ids) if user_id is not None]
+        if not keys:
+            return
+        try:
+            cache.delete_many(keys)
+        except Exception as e:
+            logger.error(f"Error invalidating project dashboards: {str(e)}")
+
+    def invalidate_projects(self, project_ids: Iterable, extra_user_ids: Iterable = ()) -> None:
+        """Drop the snapshots of everyone who can see the given projects"""
+        project_ids = [project_id for project_id in set(project_ids) if project_id is not None]
+        user_ids = set(extra_user_ids)
+        if project_ids:
+            for client_id, senior_developer_id in Project.objects.filter(
+                id__in=project_ids
+            ).values_list('client_id', 'senior_developer_id'):
+                user_ids.update((client_id, senior_developer_id))
+            user_ids.update(Task.objects.filter(
+                project_id__in=project_ids, assigned_developer__isnull=False
+            ).values_list('assigned_developer_id', flat=True).distinct())
+        self.invalidate_users(user_ids)
+
+    def dashboard_projects(self, user):
+        """Projects visible to the user, annotated with everything the dashboard shows"""
+        assigned_to_user = Task.objects.filter(project=OuterRef('pk'), assigned_developer=user)
+        senior_developer_assigned = Task.objects.filter(
+            project=OuterRef('pk'), assigned_developer=OuterRef('senior_developer')
+        )
+        return Project.objects.annotate(
+            user_is_assigned=Exists(assigned_to_user),
+        ).filter(
+            Q(client=user) | Q(senior_developer=user) | Q(user_is_assigned=True)
+        ).select_related(
+            'senior_developer', 'resource_allocation'
+        ).annotate(
+            total_tasks=Count('tasks'),
+            completed_tasks=Count('tasks', filter=Q(tasks__status='completed')),
+            in_progress_tasks=Count('tasks', filter=Q(tasks__status='in_progress')),
+            assigned_developers=Count('tasks__assigned_developer', distinct=True),
+            senior_developer_assigned=Exists(senior_developer_assigned),
+        )
+
+    def _project_role(self, project: Project, user) -> str:
+        if user.is_staff:
+            return 'admin'
+        elif project.client_id == user.pk:
+            return 'client'
+        elif project.senior_developer_id == user.pk:
+            return 'senior_developer'
+        elif project.user_is_assigned:
+            return 'developer'
+        return None
+
+    def build_dashboard(self, user) -> Dict[str, Any]:
+        dashboard_data = {
+            'user_role': user.role,
+            'projects': [],
+            'summary': {
+                'total_projects': 0,
+                'active_projects': 0,
+                'completed_projects': 0,
+                'total_tasks': 0,
+                'completed_tasks': 0,
+                'pending_invitations': 0,
+                'active_assignments': 0
+            }
+        }
+        summary = dashboard_data['summary']
+
+        for project in self.dashboard_projects(user):
+            # Assigned developers plus the senior developer if they hold no task
+            team_size = project.assigned_developers + (
+                1 if project.senior_developer_id and not project.senior_developer_assigned else 0
+            )
+            resource_allocation = getattr(project, 'resource_allocation', None)
+
+            total_tasks = project.total_tasks
+            completed_tasks = project.completed_tasks
+            dashboard_data['projects'].append({
+                'id': str(project.id),
+                'title': project.title,
+                'status': project.status,
+                'user_role': self._project_role(project, user),
+                'progress': {
+                    'total_tasks': total_tasks,
+                    'completed_tasks': completed_tasks,
+                    'in_progress_tasks': project.in_progress_tasks,
+                    'completion_percentage': (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+                },
+                'team': {
+                    'total_members': team_size,
+                    'senior_developer': {
+                        'id': project.senior_developer.id,
+                        'username': project.senior_developer.username,
+                        'name': f"{project.senior_developer.first_name} {project.senior_developer.last_name}".strip()
+                    } if project.senior_developer else None
+                },
+                'budget': {
+                    'total_budget': float(resource_allocation.total_budget) if resource_allocation else 0,
+                    'allocated_budget': float(resource_allocation.allocated_budget) if resource_allocation else 0,
+                    'remaining_budget': float(resource_allocation.remaining_budget) if resource_allocation else 0,
+                    'budget_risk_level': resource_allocation.budget_risk_level if resource_allocation else 'low'
+                },
+                'timeline': {
+                    'planned_start_date': resource_allocation.planned_start_date if resource_allocation else None,
+                    'planned_end_date': resource_allocation.planned_end_date if resource_allocation else None,
+                    'current_projected_end_date': resource_allocation.current_projected_end_date if resource_allocation else None,
+                    'timeline_risk_level': resource_allocation.timeline_risk_level if resource_allocation else 'low'
+                },
+                'created_at': project.created_at,
+                'updated_at': project.updated_at
+            })
+
+            summary['total_projects'] += 1
+            summary['active_projects'] += int(project.status == 'in_progress')
+            summary['completed_projects'] += int(project.status == 'completed')
+            summary['total_tasks'] += total_tasks
+            summary['completed_tasks'] += completed_tasks
+
+        # Get user-specific statistics
+        if user.role == 'developer':
+            summary['pending_invitations'] = TeamInvitation.objects.filter(
+                developer=user, status='pending'
+            ).count()
+            summary['active_assignments'] = TaskAssignment.objects.filter(
+                developer=user, status='active'
+            ).count()
+
+        return dashboard_data
+
+
+project_dashboards = ProjectDashboardService()
@@ -0,0 +1,144 @@
+"""
+Management command to benchmark senior developer candidate scoring
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from projects.models import Project, ProjectReview, SeniorDeveloperAssignment
+from projects.senior_developer_service import SeniorDeveloperService
+from users.models import DeveloperProfile, User
+from users.skill_index import skill_index
+
+SKILLS = [
+    'Python', 'Django', 'React', 'TypeScript', 'PostgreSQL', 'AWS', 'Docker',
+    'Kubernetes', 'Go', 'Rust', 'GraphQL', 'Redis', 'Machine Learning', 'Node.js',
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark batch senior developer scoring against the per-developer loop (no data is kept)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--developers',
+            type=int,
+            default=2000,
+            help='Number of senior/lead developers in the pool (default: 2000)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=5,
+            help='Number of candidates to return (default: 5)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=7,
+            help='Random seed for the generated pool (default: 7)',
+        )
+
+    def handle(self, *args, **options):
+        # Everything runs in one transaction that is rolled back at the end
+        with transaction.atomic():
+            project = self._create_pool(options['developers'], random.Random(options['seed']))
+
+            runs = [
+                ('per-row loop', lambda: self._legacy_identify(project, options['limit'])),
+                ('batch', lambda: SeniorDeveloperService.identify_senior_developers(project, options['limit'])),
+            ]
+            rankings = {}
+            for label, run in runs:
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    candidates = run()
+                    elapsed = time.perf_counter() - started
+                rankings[label] = [
+                    (candidate['developer'].pk, round(candidate['scores']['total_score'], 9))
+                    for candidate in candidates
+                ]
+                self.stdout.write(f'{label:>12}: {elapsed:7.3f}s, {len(queries)} queries')
+
+            if rankings['per-row loop'] == rankings['batch']:
+                self.stdout.write(self.style.SUCCESS('Rankings match'))
+            else:
+                self.stdout.write(self.style.ERROR(
+                    f'Rankings differ: {rankings["per-row loop"]} != {rankings["batch"]}'
+                ))
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark completed; test data rolled back'))
+
+    @staticmethod
+    def _legacy_identify(project, limit):
+        """The scoring loop identify_senior_developers used before batch scoring"""
+        service = SeniorDeveloperService
+        candidates = []
+        for developer in User.objects.filter(
+            role='developer',
+            developer_profile__experience_level__in=['senior', 'lead'],
+            developer_profile__availability_status='available'
+        ).select_related('developer_profile'):
+            scores = service._calculate_developer_scores(developer, project)
+            if (scores['total_score'] >= service.MIN_TOTAL_SCORE and
+                    scores['experience_score'] >= service.MIN_EXPERIENCE_SCORE and
+                    scores['reputation_score'] >= service.MIN_REPUTATION_SCORE):
+                candidates.append({'developer': developer, 'scores': scores})
+        candidates.sort(key=lambda x: x['scores']['total_score'], reverse=True)
+        return candidates[:limit]
+
+    def _create_pool(self, count, rng):
+        client = User.objects.create(username='benchmark-client', email='client@benchmark.invalid', role='client')
+        developers = User.objects.bulk_create([
+            User(username=f'benchmark-senior-{index}', email=f'senior{index}@benchmark.invalid', role='developer')
+            for index in range(count)
+        ])
+        DeveloperProfile.objects.bulk_create([
+            DeveloperProfile(
+                user=developer,
+                skills=rng.sample(SKILLS, rng.randint(2, 8)),
+                experience_level=rng.choice(['senior', 'lead']),
+                hourly_rate=100,
+                availability_status=rng.choice(['available', 'available', 'available', 'busy']),
+                # A quarter have no reputation score yet and are rated from reviews
+                reputation_score=0.0 if rng.random() < 0.25 else round(rng.uniform(2.0, 5.0), 2),
+                projects_completed=rng.randint(0, 30),
+            )
+            for developer in developers
+        ])
+        # bulk_create skips the signals that keep the skill index current
+        skill_index.index_developers(developer.pk for developer in developers)
+
+        # Past projects give some developers senior assignments and reviews
+        past_projects = Project.objects.bulk_create([
+            Project(client=client, title=f'Benchmark past project {index}', description='', status='completed')
+            for index in range(count // 2)
+        ])
+        reviewed = rng.sample(developers, len(past_projects))
+        SeniorDeveloperAssignment.objects.bulk_create([
+            SeniorDeveloperAssignment(
+                project=past_project, senior_developer=developer, status=rng.choice(['completed', 'active', 'declined']),
+                experience_score=0, reputation_score=0, skill_match_score=0, leadership_score=0, total_score=0
+            )
+            for past_project, developer in zip(past_projects, reviewed)
+        ])
+        ProjectReview.objects.bulk_create([
+            ProjectReview(
+                project=past_project, reviewer=client, reviewee=developer,
+                overall_rating=rng.randint(2, 5), communication_rating=rng.randint(2, 5),
+                quality_rating=rng.randint(2, 5), timeliness_rating=rng.randint(2, 5), review_text=''
+            )
+            for past_project, developer in zip(past_projects, reviewed)
+        ])
+
+        return Project.objects.create(
+            client=client,
+            title='Senior scoring benchmark',
+            description='',
+            required_skills=rng.sample(SKILLS, 4),
+        )
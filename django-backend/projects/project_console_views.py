@@ -18,6 +18,7 @@ from .models import (
     TeamInvitation, ProjectProposal, DynamicPricing
 )
 from payments.models import Milestone, Payment
+from .dashboard import project_dashboards
 from .serializers import (
     ProjectSerializer, TaskSerializer, TaskAssignmentSerializer,
     ResourceAllocationSerializer, TeamInvitationSerializer
@@ -51,98 +52,12 @@ class ProjectConsoleViewSet(viewsets.ViewSet):
         """
         Get role-based project dashboard with real-time updates
         Requirements: 6.1 - Role-appropriate project information
-        """
-        user = request.user
-        
-        # Get projects user has access to
-        user_projects = Project.objects.filter(
-            Q(client=user) | 
-            Q(senior_developer=user) | 
-            Q(tasks__assigned_developer=user)
-        ).distinct()
-        
-        dashboard_data = {
-            'user_role': user.role,
-            'projects': [],
-            'summary': {
-                'total_projects': user_projects.count(),
-                'active_projects': user_projects.filter(status='in_progress').count(),
-                'completed_projects': user_projects.filter(status='completed').count(),
-                'total_tasks': 0,
-                'completed_tasks': 0,
-                'pending_invitations': 0,
-                'active_assignments': 0
-            }
-        }
         
-        for project in user_projects:
-            user_role = self.get_project_access(project, user)
-            
-            # Get project statistics
-            total_tasks = project.tasks.count()
-            completed_tasks = project.tasks.filter(status='completed').count()
-            in_progress_tasks = project.tasks.filter(status='in_progress').count()
-            
-            # Get team information
-            team_members = User.objects.filter(
-                Q(assigned_tasks__project=project) |
-                Q(id=project.senior_developer_id) if project.senior_developer else Q()
-            ).distinct()
-            
-            # Get budget information
-            resource_allocation = getattr(project, 'resource_allocation', None)
-            
-            project_data = {
-                'id': str(project.id),
-                'title': project.title,
-                'status': project.status,
-                'user_role': user_role,
-                'progress': {
-                    'total_tasks': total_tasks,
-                    'completed_tasks': completed_tasks,
-                    'in_progress_tasks': in_progress_tasks,
-                    'completion_percentage': (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-                },
-                'team': {
-                    'total_members': team_members.count(),
-                    'senior_developer': {
-                        'id': project.senior_developer.id,
-                        'username': project.senior_developer.username,
-                        'name': f"{project.senior_developer.first_name} {project.senior_developer.last_name}".strip()
-                    } if project.senior_developer else None
-                },
-                'budget': {
-                    'total_budget': float(resource_allocation.total_budget) if resource_allocation else 0,
-                    'allocated_budget': float(resource_allocation.allocated_budget) if resource_allocation else 0,
-                    'remaining_budget': float(resource_allocation.remaining_budget) if resource_allocation else 0,
-                    'budget_risk_level': resource_allocation.budget_risk_level if resource_allocation else 'low'
-                },
-                'timeline': {
-                    'planned_start_date': resource_allocation.planned_start_date if resource_allocation else None,
-                    'planned_end_date': resource_allocation.planned_end_date if resource_allocation else None,
-                    'current_projected_end_date': resource_allocation.current_projected_end_date if resource_allocation else None,
-                    'timeline_risk_level': resource_allocation.timeline_risk_level if resource_allocation else 'low'
-                },
-                'created_at': project.created_at,
-                'updated_at': project.updated_at
-            }
-            
-            dashboard_data['projects'].append(project_data)
-            
-            # Update summary
-            dashboard_data['summary']['total_tasks'] += total_tasks
-            dashboard_data['summary']['completed_tasks'] += completed_tasks
-        
-        # Get user-specific statistics
-        if user.role == 'developer':
-            dashboard_data['summary']['pending_invitations'] = TeamInvitation.objects.filter(
-                developer=user, status='pending'
-            ).count()
-            dashboard_data['summary']['active_assignments'] = TaskAssignment.objects.filter(
-                developer=user, status='active'
-            ).count()
-        
-        return Response(dashboard_data)
+        Served from a per-user snapshot that is invalidated when the user's
+        projects or tasks change; pass ?refresh=true to rebuild it.
+        """
+        refresh = request.query_params.get('refresh', '').lower() in ('1', 'true')
+        return Response(project_dashboards.get_dashboard(request.user, use_cache=not refresh))
     
     @action(detail=True, methods=['get'], url_path='details')
     def get_project_details(self, request, pk=None):
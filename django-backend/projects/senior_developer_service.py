@@ -3,16 +3,27 @@ Senior Developer Assignment Service
 
 This service handles the identification and assignment of senior developers
 to projects based on experience, reputation, and skill matching.
+
+Candidates are ranked in bulk: the profile fields, review averages, senior
+assignment counts and skill index coverage for the whole pool are read in
+four queries, the four scores are computed as arrays, and only the top
+``limit`` candidates are loaded as model instances.
+``_calculate_developer_scores`` scores a single developer with the same
+formulas.
 """
 
 from django.contrib.auth import get_user_model
 from django.db.models import Q, Avg, Count
 from django.utils import timezone
 from typing import List, Dict, Optional, Tuple
+import heapq
 import logging
 
-from .models import Project, SeniorDeveloperAssignment, ProjectProposal
+import numpy as np
+
+from .models import Project, SeniorDeveloperAssignment, ProjectProposal, ProjectReview
 from users.models import DeveloperProfile
+from users.skill_index import skill_index
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -32,6 +43,11 @@ class SeniorDeveloperService:
     MIN_REPUTATION_SCORE = 0.6
     MIN_TOTAL_SCORE = 0.65
     
+    EXPERIENCE_LEVEL_SCORES = {'junior': 0.2, 'mid': 0.5, 'senior': 0.8, 'lead': 1.0}
+    LEADERSHIP_LEVEL_SCORES = {'junior': 0.1, 'mid': 0.3, 'senior': 0.7, 'lead': 0.9}
+    LEADERSHIP_STATUSES = ['completed', 'active']
+    SCORE_NAMES = ('experience_score', 'reputation_score', 'skill_match_score', 'leadership_score', 'total_score')
+    
     @classmethod
     def identify_senior_developers(cls, project: Project, limit: int = 5) -> List[Dict]:
         """
@@ -51,34 +67,144 @@ class SeniorDeveloperService:
             role='developer',
             developer_profile__experience_level__in=['senior', 'lead'],
             developer_profile__availability_status='available'
-        ).select_related('developer_profile')
+        )
+        
+        # A set reputation score below the minimum can never qualify. The bound is
+        # slightly loose for float rounding; the exact check runs after scoring.
+        # Unset (zero) scores fall back to reviews, so they are kept.
+        senior_developers = senior_developers.filter(
+            Q(developer_profile__reputation_score__lte=0) |
+            Q(developer_profile__reputation_score__gte=cls.MIN_REPUTATION_SCORE * 5.0 - 1e-9)
+        )
+        
+        try:
+            developer_ids, scores = cls._calculate_batch_scores(senior_developers, project)
+        except Exception as e:
+            logger.error(f"Error scoring senior developers for project {project.id}: {str(e)}")
+            return []
+        
+        # Only consider developers who meet minimum criteria
+        qualified = np.flatnonzero(
+            (scores['total_score'] >= cls.MIN_TOTAL_SCORE) &
+            (scores['experience_score'] >= cls.MIN_EXPERIENCE_SCORE) &
+            (scores['reputation_score'] >= cls.MIN_REPUTATION_SCORE)
+        )
+        
+        # Highest total scores first; ties keep query order like a stable sort
+        top = heapq.nlargest(limit, qualified.tolist(), key=scores['total_score'].__getitem__)
+        developers = User.objects.select_related('developer_profile').in_bulk(
+            [developer_ids[index] for index in top]
+        )
         
         candidates = []
+        for index in top:
+            developer = developers[developer_ids[index]]
+            candidates.append({
+                'developer': developer,
+                'scores': {name: float(values[index]) for name, values in scores.items()},
+                'profile': developer.developer_profile
+            })
+        
+        logger.info(f"Found {len(qualified)} qualified senior developers")
+        return candidates
+    
+    @classmethod
+    def _calculate_batch_scores(cls, developers, project: Project) -> Tuple[List, Dict[str, np.ndarray]]:
+        """
+        Score every developer in a queryset against a project.
+        
+        Returns the developer IDs and one array per score, aligned by position.
+        The formulas match _calculate_developer_scores.
+        """
+        rows = list(developers.values_list(
+            'pk',
+            'developer_profile__experience_level',
+            'developer_profile__projects_completed',
+            'developer_profile__reputation_score',
+        ))
+        if not rows:
+            return [], {name: np.empty(0) for name in cls.SCORE_NAMES}
+        developer_ids, levels, projects_completed, reputations = zip(*rows)
+        
+        # Review averages for developers without a reputation score
+        review_averages = {
+            row['reviewee_id']: row
+            for row in ProjectReview.objects.filter(
+                reviewee__in=developers.filter(developer_profile__reputation_score__lte=0).values('pk')
+            ).values('reviewee_id').annotate(
+                avg_overall=Avg('overall_rating'),
+                avg_quality=Avg('quality_rating'),
+                avg_communication=Avg('communication_rating')
+            )
+        }
+        senior_assignments = dict(
+            SeniorDeveloperAssignment.objects.filter(
+                senior_developer__in=developers.values('pk'),
+                status__in=cls.LEADERSHIP_STATUSES
+            ).values('senior_developer_id').annotate(
+                count=Count('id')
+            ).values_list('senior_developer_id', 'count')
+        )
+        
+        projects_completed = np.array(projects_completed, dtype=float)
+        
+        # Experience Score (based on level and projects completed)
+        experience_base = np.array([cls.EXPERIENCE_LEVEL_SCORES.get(level, 0.5) for level in levels])
+        experience_score = np.minimum(
+            experience_base + np.minimum(projects_completed * 0.02, 0.2), 1.0
+        )
         
-        for developer in senior_developers:
-            try:
-                scores = cls._calculate_developer_scores(developer, project)
-                
-                # Only consider developers who meet minimum criteria
-                if (scores['total_score'] >= cls.MIN_TOTAL_SCORE and 
-                    scores['experience_score'] >= cls.MIN_EXPERIENCE_SCORE and
-                    scores['reputation_score'] >= cls.MIN_REPUTATION_SCORE):
-                    
-                    candidates.append({
-                        'developer': developer,
-                        'scores': scores,
-                        'profile': developer.developer_profile
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error scoring developer {developer.username}: {str(e)}")
-                continue
-        
-        # Sort by total score (descending)
-        candidates.sort(key=lambda x: x['scores']['total_score'], reverse=True)
-        
-        logger.info(f"Found {len(candidates)} qualified senior developers")
-        return candidates[:limit]
+        # Reputation Score (own score, else reviews, else the new developer default)
+        reputation_score = np.full(len(rows), 0.5)
+        reputations = np.array(reputations, dtype=float)
+        has_reputation = reputations > 0
+        reputation_score[has_reputation] = np.minimum(reputations[has_reputation] / 5.0, 1.0)
+        for index, developer_id in enumerate(developer_ids):
+            averages = review_averages.get(developer_id)
+            if averages is not None and not has_reputation[index]:
+                weighted_avg = (
+                    averages['avg_overall'] * 0.5 +
+                    averages['avg_quality'] * 0.3 +
+                    averages['avg_communication'] * 0.2
+                )
+                reputation_score[index] = min(weighted_avg / 5.0, 1.0)
+        
+        # Skill Match Score (based on required skills alignment)
+        required_skills = skill_index.normalize_all(project.required_skills or [])
+        if required_skills:
+            # Matched and total skill counts come from the skill index, not the profiles' JSON
+            coverage = skill_index.coverage(required_skills, developers.values('pk'))
+            matched = np.array([coverage.get(developer_id, (0, 0))[0] for developer_id in developer_ids], dtype=float)
+            skill_counts = np.array([coverage.get(developer_id, (0, 0))[1] for developer_id in developer_ids], dtype=float)
+            skill_match_score = np.minimum(
+                matched / len(required_skills) + np.minimum(skill_counts * 0.01, 0.2), 1.0
+            )
+        else:
+            skill_match_score = np.full(len(rows), 0.8)
+        
+        # Leadership Score (based on past senior roles and team management)
+        leadership_base = np.array([cls.LEADERSHIP_LEVEL_SCORES.get(level, 0.3) for level in levels])
+        assignment_counts = np.array(
+            [senior_assignments.get(developer_id, 0) for developer_id in developer_ids], dtype=float
+        )
+        leadership_score = np.minimum(
+            leadership_base + np.minimum(assignment_counts * 0.1, 0.3), 1.0
+        )
+        
+        total_score = (
+            experience_score * cls.EXPERIENCE_WEIGHT +
+            reputation_score * cls.REPUTATION_WEIGHT +
+            skill_match_score * cls.SKILL_MATCH_WEIGHT +
+            leadership_score * cls.LEADERSHIP_WEIGHT
+        )
+        
+        return list(developer_ids), {
+            'experience_score': experience_score,
+            'reputation_score': reputation_score,
+            'skill_match_score': skill_match_score,
+            'leadership_score': leadership_score,
+            'total_score': total_score
+        }
     
     @classmethod
     def _calculate_developer_scores(cls, developer: User, project: Project) -> Dict[str, float]:
@@ -119,13 +245,7 @@ class SeniorDeveloperService:
         """Calculate experience score based on level and completed projects"""
         
         # Base score from experience level
-        level_scores = {
-            'junior': 0.2,
-            'mid': 0.5,
-            'senior': 0.8,
-            'lead': 1.0
-        }
-        base_score = level_scores.get(profile.experience_level, 0.5)
+        base_score = cls.EXPERIENCE_LEVEL_SCORES.get(profile.experience_level, 0.5)
         
         # Bonus from completed projects (up to 0.2 additional points)
         project_bonus = min(profile.projects_completed * 0.02, 0.2)
@@ -167,8 +287,9 @@ class SeniorDeveloperService:
         if not project.required_skills:
             return 0.8  # Default score if no specific skills required
         
-        developer_skills = set(skill.lower() for skill in profile.skills)
-        required_skills = set(skill.lower() for skill in project.required_skills)
+        # Normalised the way the skill index stores them, as the batch scores use it
+        developer_skills = set(skill_index.normalize_all(profile.skills))
+        required_skills = set(skill_index.normalize_all(project.required_skills))
         
         if not required_skills:
             return 0.8
@@ -188,17 +309,11 @@ class SeniorDeveloperService:
         
         # Count successful senior assignments
         senior_assignments = profile.user.senior_assignments.filter(
-            status__in=['completed', 'active']
+            status__in=cls.LEADERSHIP_STATUSES
         ).count()
         
         # Base score from experience level
-        level_scores = {
-            'junior': 0.1,
-            'mid': 0.3,
-            'senior': 0.7,
-            'lead': 0.9
-        }
-        base_score = level_scores.get(profile.experience_level, 0.3)
+        base_score = cls.LEADERSHIP_LEVEL_SCORES.get(profile.experience_level, 0.3)
         
         # Bonus from successful senior assignments
         assignment_bonus = min(senior_assignments * 0.1, 0.3)
@@ -0,0 +1,53 @@
+"""
+Invalidate cached project console dashboards when the projects, tasks,
+allocations, invitations or assignments they are built from change.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .dashboard import project_dashboards
+from .models import Project, ResourceAllocation, Task, TaskAssignment, TeamInvitation
+
+
+def _invalidate_on_commit(project_ids=(), user_ids=()):
+    project_ids, user_ids = list(project_ids), list(user_ids)
+    transaction.on_commit(lambda: project_dashboards.invalidate_projects(project_ids, user_ids))
+
+
+@receiver(pre_save, sender=Task, dispatch_uid='dashboard_task_previous_assignee')
+def remember_previous_assignee(sender, instance, **kwargs):
+    # A reassigned task drops out of the previous developer's dashboard
+    instance._previous_assigned_developer_id = (
+        Task.objects.filter(pk=instance.pk).values_list('assigned_developer_id', flat=True).first()
+        if instance.pk and not instance._state.adding else None
+    )
+
+
+@receiver(post_save, sender=Project, dispatch_uid='dashboard_project_saved')
+@receiver(post_delete, sender=Project, dispatch_uid='dashboard_project_deleted')
+def invalidate_project_dashboards(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.pk], [instance.client_id, instance.senior_developer_id])
+
+
+@receiver(post_save, sender=Task, dispatch_uid='dashboard_task_saved')
+@receiver(post_delete, sender=Task, dispatch_uid='dashboard_task_deleted')
+def invalidate_task_dashboards(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.project_id], [
+        instance.assigned_developer_id,
+        getattr(instance, '_previous_assigned_developer_id', None)
+    ])
+
+
+@receiver(post_save, sender=ResourceAllocation, dispatch_uid='dashboard_allocation_saved')
+@receiver(post_delete, sender=ResourceAllocation, dispatch_uid='dashboard_allocation_deleted')
+def invalidate_allocation_dashboards(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.project_id])
+
+
+@receiver(post_save, sender=TeamInvitation, dispatch_uid='dashboard_invitation_saved')
+@receiver(post_delete, sender=TeamInvitation, dispatch_uid='dashboard_invitation_deleted')
+@receiver(post_save, sender=TaskAssignment, dispatch_uid='dashboard_assignment_saved')
+@receiver(post_delete, sender=TaskAssignment, dispatch_uid='dashboard_assignment_deleted')
+def invalidate_developer_dashboard(sender, instance, **kwargs):
+    _invalidate_on_commit(user_ids=[instance.developer_id])
@@ -17,6 +17,7 @@ import logging
 
 from .models import Task, Project, TaskAssignment
 from communications.models import Notification
+from communications.fanout import notification_fanout
 from payments.models import Milestone
 
 User = get_user_model()
@@ -423,9 +424,9 @@ class TaskApprovalService:
                     })
                     milestone_triggered = True
                     
-                    # Create notification for client about milestone completion
-                    Notification.objects.create(
-                        recipient=project.client,
+                    # Notify client about milestone completion once the progress update commits
+                    notification_fanout.notify(
+                        [project.client_id],
                         notification_type='milestone_completed',
                         title=f'Milestone Completed: {milestone.percentage}%',
                         message=f'Milestone {milestone.percentage}% has been completed for project "{project.title}". Payment of ${milestone.amount} is now due.',
@@ -436,7 +437,8 @@ class TaskApprovalService:
                             'milestone_percentage': milestone.percentage,
                             'milestone_amount': float(milestone.amount),
                             'completed_at': timezone.now().isoformat()
-                        }
+                        },
+                        dedupe_key=f'milestone_completed:{milestone.id}'
                     )
                     
                     logger.info(f"Milestone {milestone.percentage}% completed for project {project.id}")
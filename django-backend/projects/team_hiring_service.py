@@ -22,8 +22,12 @@ from .models import (
     DynamicPricing, ResourceAllocation
 )
 from matching.models import DeveloperMatch
+from matching.precompute import matching_precompute
+from users.candidates import candidate_hydrator, candidate_scope
 from users.models import DeveloperProfile
 from ai_services.hybrid_rag_service import hybrid_rag_service
+from communications.fanout import notification_fanout
+from .dashboard import project_dashboards
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -96,7 +100,8 @@ class TeamHiringService:
             'errors': []
         }
         
-        with transaction.atomic():
+        # Tasks often match the same developers; load each candidate once per run
+        with candidate_scope(), transaction.atomic():
             for task in tasks:
                 try:
                     task_result = cls._process_task_hiring(
@@ -217,6 +222,30 @@ class TeamHiringService:
     def _find_task_matches(cls, task: Task, limit: int) -> List[Dict]:
         """Find matching developers for a task using AI matching"""
         
+        # Lists kept fresh by the precompute workers spare ranking on the hiring path
+        matches = matching_precompute.get_precomputed_matches(task.id, limit)
+        if matches is None:
+            matches = cls._rank_task_matches(task, limit)
+        
+        # Filter out unavailable developers
+        hydrator = candidate_hydrator()
+        developers = hydrator.load(match['developer_id'] for match in matches)
+        available_matches = []
+        for match in matches:
+            developer = developers.get(match['developer_id'])
+            profile = hydrator.profile(developer)
+            
+            if profile and profile.availability_status == 'available':
+                match['developer'] = developer
+                match['profile'] = profile
+                available_matches.append(match)
+        
+        return available_matches
+    
+    @classmethod
+    def _rank_task_matches(cls, task: Task, limit: int) -> List[Dict]:
+        """Rank developers for a task with the hybrid RAG service"""
+        
         # Prepare task data for matching
         task_data = {
             'id': str(task.id),
@@ -231,26 +260,9 @@ class TeamHiringService:
         }
         
         # Use hybrid RAG service for intelligent matching
-        matches = hybrid_rag_service.find_matching_developers(
+        return hybrid_rag_service.find_matching_developers(
             task_data, limit, include_analysis=True
         )
-        
-        # Filter out unavailable developers
-        available_matches = []
-        for match in matches:
-            try:
-                developer = User.objects.get(id=match['developer_id'])
-                profile = getattr(developer, 'developer_profile', None)
-                
-                if profile and profile.availability_status == 'available':
-                    match['developer'] = developer
-                    match['profile'] = profile
-                    available_matches.append(match)
-                    
-            except User.DoesNotExist:
-                continue
-        
-        return available_matches
     
     @classmethod
     def _send_task_invitations(cls, task: Task, matches: List[Dict], 
@@ -273,7 +285,7 @@ class TeamHiringService:
                 task, match['profile']
             )
             
-            invitation = TeamInvitation.objects.create(
+            invitations.append(TeamInvitation(
                 task=task,
                 developer=developer,
                 match_score=match.get('final_score', 0.8),
@@ -283,13 +295,52 @@ class TeamHiringService:
                 expires_at=expires_at,
                 invitation_rank=rank,
                 is_fallback=rank > 1
-            )
-            
-            invitations.append(invitation)
-            logger.info(f"Invitation sent to {developer.username} for task {task.title}")
+            ))
+        
+        TeamInvitation.objects.bulk_create(invitations)
+        cls._notify_invited_developers(task, invitations)
+        # bulk_create skips post_save, so refresh the invitees' dashboards here
+        transaction.on_commit(lambda: project_dashboards.invalidate_users(
+            [invitation.developer_id for invitation in invitations]
+        ))
+        
+        logger.info(f"{len(invitations)} invitations sent for task {task.title}")
         
         return invitations
     
+    @classmethod
+    def _notify_invited_developers(cls, task: Task, invitations: List[TeamInvitation]):
+        """Notify invited developers in one fan-out once the hiring transaction commits"""
+        if not invitations:
+            return
+        
+        notification_fanout.notify(
+            [invitation.developer_id for invitation in invitations],
+            notification_type='team_invitation',
+            title=f'Team Invitation: {task.title}',
+            message=f'You have been invited to work on "{task.title}" in project "{task.project.title}". '
+                    f'Please respond before the invitation expires.',
+            priority='high',
+            related_project=task.project_id,
+            related_task=task,
+            metadata={
+                'task_id': str(task.id),
+                'project_id': str(task.project_id),
+            },
+            recipient_metadata={
+                invitation.developer_id: {
+                    'invitation_id': str(invitation.id),
+                    'offered_rate': float(invitation.offered_rate),
+                    'estimated_hours': float(invitation.estimated_hours or 0),
+                    'expires_at': invitation.expires_at.isoformat(),
+                    'is_fallback': invitation.is_fallback,
+                }
+                for invitation in invitations
+            },
+            # A developer is invited to a task at most once
+            dedupe_key=f'team_invitation:{task.id}'
+        )
+    
     @classmethod
     def respond_to_invitation(cls, invitation: TeamInvitation, action: str,
                             counter_offer_rate: Decimal = None,
@@ -454,6 +505,8 @@ class TeamHiringService:
             is_fallback=True
         )
         
+        cls._notify_invited_developers(task, [invitation])
+        
         logger.info(f"Fallback invitation sent to {next_match['developer'].username}")
         
         return {
@@ -469,13 +522,17 @@ class TeamHiringService:
         other_invitations = task.team_invitations.filter(
             status='pending'
         ).exclude(id=accepted_invitation_id)
+        developer_ids = list(other_invitations.values_list('developer_id', flat=True))
         
-        other_invitations.update(
+        cancelled = other_invitations.update(
             status='cancelled',
             responded_at=timezone.now()
         )
         
-        logger.info(f"Cancelled {other_invitations.count()} other invitations for task {task.id}")
+        # update() skips the post_save signals that invalidate developer dashboards
+        transaction.on_commit(lambda: project_dashboards.invalidate_users(developer_ids))
+        
+        logger.info(f"Cancelled {cancelled} other invitations for task {task.id}")
     
     @classmethod
     def _initialize_resource_allocation(cls, project: Project) -> ResourceAllocation:
@@ -1,3 +1,53 @@
+"""
+Tests for team hiring
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+
+from users.models import User
+
+from .dashboard import project_dashboards
+from .models import Project, Task, TeamInvitation
+from .team_hiring_service import TeamHiringService
+
+
+class CancelOtherInvitationsTest(TestCase):
+    """Test cases for cancelling the remaining invitations once one is accepted"""
+
+    def setUp(self):
+        """Set up a task with three pending invitations"""
+        cache.clear()
+        client = User.objects.create(username='client', email='client@example.com')
+        project = Project.objects.create(client=client, title='Marketplace', description='Build a marketplace')
+        self.task = Task.objects.create(project=project, title='API', description='Build the API', estimated_hours=10)
+        self.invitations = [
+            TeamInvitation.objects.create(
+                task=self.task,
+                developer=User.objects.create(username=f'developer{rank}', email=f'developer{rank}@example.com'),
+                match_score=0.9, offered_rate=Decimal('50.00'), estimated_hours=10,
+                estimated_completion_date=timezone.now() + timedelta(days=7),
+                expires_at=timezone.now() + timedelta(days=1), invitation_rank=rank
+            )
+            for rank in range(1, 4)
+        ]
+
+    def test_cancels_pending_invitations_and_invalidates_dashboards(self):
+        """Test that the other invitations are cancelled and their developers' dashboards dropped"""
+        accepted, *others = self.invitations
+        for invitation in self.invitations:
+            cache.set(project_dashboards.cache_key(invitation.developer_id), {'projects': []})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TeamHiringService._cancel_other_invitations(self.task, accepted.id)
 
-# Create your tests here.
+        self.assertEqual(
+            set(TeamInvitation.objects.filter(status='cancelled').values_list('id', flat=True)),
+            {invitation.id for invitation in others}
+        )
+        for invitation in others:
+            self.assertIsNone(cache.get(project_dashboards.cache_key(invitation.developer_id)))
+        self.assertIsNotNone(cache.get(project_dashboards.cache_key(accepted.developer_id)))
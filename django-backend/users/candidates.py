@@ -0,0 +1,93 @@
+"""
+Bulk hydration of developer candidates.
+
+Matching produces lists of candidate developer IDs. The stages that consume
+them need each candidate's user and developer profile: availability scoring
+in HybridRAGService, invitations in TeamHiringService, and stored matches in
+the matching API. ``CandidateHydrator`` loads a whole candidate list in one
+query, with profiles joined, and keeps the rows in an identity map.
+
+Inside ``candidate_scope()`` one hydrator is shared by every stage, so a
+candidate loaded by one stage is not fetched again by the next. Each request
+runs in a scope (``CandidateScopeMiddleware``), and so does each team hiring
+run. Outside a scope every call gets a fresh hydrator.
+"""
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional
+
+from .models import User, DeveloperProfile
+
+_current_hydrator = contextvars.ContextVar('candidate_hydrator', default=None)
+
+
+class CandidateHydrator:
+    """Identity map of candidate users with their developer profiles"""
+
+    def __init__(self):
+        self._users: Dict[str, Optional[User]] = {}
+
+    def load(self, user_ids: Iterable[Any]) -> Dict[Any, User]:
+        """Users for the given IDs keyed as passed in; unknown IDs are left out"""
+        user_ids = [user_id for user_id in user_ids if user_id is not None]
+        missing = {str(user_id) for user_id in user_ids} - self._users.keys()
+        if missing:
+            found = {
+                str(user.pk): user
+                for user in User.objects.select_related('developer_profile').filter(pk__in=missing)
+            }
+            for key in missing:
+                self._users[key] = found.get(key)
+        return {
+            user_id: self._users[str(user_id)]
+            for user_id in user_ids
+            if self._users[str(user_id)] is not None
+        }
+
+    def get(self, user_id: Any) -> Optional[User]:
+        return self.load([user_id]).get(user_id)
+
+    @staticmethod
+    def profile(user: Optional[User]) -> Optional[DeveloperProfile]:
+        """The user's developer profile without a query (it was joined on load)"""
+        if user is None:
+            return None
+        try:
+            return user.developer_profile
+        except DeveloperProfile.DoesNotExist:
+            return None
+
+    def forget(self, user_ids: Iterable[Any]) -> None:
+        """Drop users whose rows changed so the next load reads them again"""
+        for user_id in user_ids:
+            self._users.pop(str(user_id), None)
+
+
+def candidate_hydrator() -> CandidateHydrator:
+    """The hydrator of the current scope, or a fresh one outside any scope"""
+    return _current_hydrator.get() or CandidateHydrator()
+
+
+@contextmanager
+def candidate_scope():
+    """Share one identity map for the duration of the block; nested scopes reuse the outer one"""
+    if _current_hydrator.get() is not None:
+        yield _current_hydrator.get()
+        return
+    hydrator = CandidateHydrator()
+    token = _current_hydrator.set(hydrator)
+    try:
+        yield hydrator
+    finally:
+        _current_hydrator.reset(token)
+
+
+class CandidateScopeMiddleware:
+    """Runs each request inside its own candidate scope"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with candidate_scope():
+            return self.get_response(request)
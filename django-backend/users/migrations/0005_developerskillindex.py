@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_skill_index(apps, schema_editor):
+    """Index existing profiles; rebuild_skill_index later adds proficiency records"""
+    DeveloperProfile = apps.get_model('users', 'DeveloperProfile')
+    DeveloperSkillIndex = apps.get_model('users', 'DeveloperSkillIndex')
+
+    entries = []
+    for user_id, skills, github_analysis in DeveloperProfile.objects.values_list(
+        'user_id', 'skills', 'github_analysis'
+    ).iterator(chunk_size=1000):
+        assessment = {
+            ' '.join(str(skill).split()).lower(): value
+            for skill, value in ((github_analysis or {}).get('skill_assessment') or {}).items()
+        }
+        seen = set()
+        for skill in skills if isinstance(skills, list) else []:
+            normalized = ' '.join(str(skill).split()).lower()[:100]
+            if not normalized or normalized in seen:
+                continue
+            seen.add(normalized)
+            try:
+                proficiency = min(max(float(assessment[normalized]['proficiency']) / 100.0, 0.0), 1.0)
+            except (KeyError, TypeError, ValueError):
+                proficiency = 0.5
+            entries.append(DeveloperSkillIndex(developer_id=user_id, skill=normalized, proficiency=proficiency))
+        if len(entries) >= 5000:
+            DeveloperSkillIndex.objects.bulk_create(entries, ignore_conflicts=True)
+            entries = []
+    DeveloperSkillIndex.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_availability_hours_per_week_user_bio_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeveloperSkillIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=100)),
+                ('proficiency', models.FloatField(default=0.5)),
+                ('developer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_index_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'developer_skill_index',
+                'indexes': [models.Index(fields=['skill', 'proficiency'], name='developer_s_skill_ce11d1_idx')],
+                'unique_together': {('developer', 'skill')},
+            },
+        ),
+        migrations.RunPython(backfill_skill_index, migrations.RunPython.noop),
+    ]
@@ -126,6 +126,24 @@ class DeveloperProfile(models.Model):
         return f"{self.user.username} - {self.experience_level} Developer"
 
 
+class DeveloperSkillIndex(models.Model):
+    """Inverted index entry: one normalised skill of a developer profile with its proficiency"""
+
+    developer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='skill_index_entries')
+    skill = models.CharField(max_length=100)  # Lowercased, whitespace-collapsed skill name
+    proficiency = models.FloatField(default=0.5)  # 0.0 to 1.0
+
+    class Meta:
+        db_table = 'developer_skill_index'
+        unique_together = ['developer', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'proficiency']),
+        ]
+
+    def __str__(self):
+        return f"{self.skill} -> {self.developer_id} ({self.proficiency:.2f})"
+
+
 class Skill(models.Model):
     """Skills that users can have"""
     
@@ -0,0 +1,26 @@
+"""
+Keep the skill index in line with developer profiles.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import DeveloperProfile
+from .skill_index import skill_index
+
+# Profile fields the index is built from; saves that touch nothing else are ignored
+SKILL_INDEX_FIELDS = {'skills', 'github_analysis'}
+
+
+@receiver(post_save, sender=DeveloperProfile, dispatch_uid='skill_index_profile_saved')
+def index_developer_profile(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SKILL_INDEX_FIELDS & set(update_fields):
+        return
+    user_id = instance.user_id
+    transaction.on_commit(lambda: skill_index.index_developers([user_id]))
+
+
+@receiver(post_delete, sender=DeveloperProfile, dispatch_uid='skill_index_profile_deleted')
+def remove_developer_profile(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: skill_index.remove_developers([user_id]))
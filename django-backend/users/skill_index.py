@@ -0,0 +1,250 @@
+"""
+Inverted index from skills to developers.
+
+``DeveloperProfile.skills`` is a JSON list, so "developers who know X and Y"
+cannot use a database index and ends up scanning profiles. ``SkillIndex``
+keeps one ``DeveloperSkillIndex`` row per developer and normalised skill
+(lowercased, whitespace collapsed) with a 0-1 proficiency, indexed by skill.
+
+Proficiency is taken from the developer's ``DeveloperSkillProficiency``
+record for the skill when there is one, else from the GitHub skill
+assessment on the profile, else ``DEFAULT_PROFICIENCY``.
+
+The index is updated after a profile save that may change skills (see
+``users.signals``) and by the skill proficiency task. Writes that bypass
+signals (queryset updates, raw SQL) are picked up by the periodic
+``rebuild_skill_index`` task.
+
+Lookups return querysets of developer IDs, so they can be combined and used
+as subqueries without loading the IDs:
+
+- ``developers_with_all``: developers with every skill (AND)
+- ``developers_with_any``: developers with at least one skill (OR)
+- ``candidates``: AND, OR and NOT combined
+- ``weighted_scores``: developers ranked by weighted proficiency over skills
+- ``coverage``: matched and total skill counts per developer
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Q, QuerySet, Sum, Value, When
+
+from .models import DeveloperProfile, DeveloperSkillIndex
+
+
+class SkillIndex:
+    """Maintains and queries the skill -> developer inverted index"""
+
+    DEFAULT_PROFICIENCY = 0.5
+    LEVEL_PROFICIENCY = {'beginner': 0.25, 'intermediate': 0.5, 'advanced': 0.75, 'expert': 1.0}
+    MAX_SKILL_LENGTH = 100
+
+    @classmethod
+    def normalize(cls, skill: Any) -> str:
+        return ' '.join(str(skill).split()).lower()[:cls.MAX_SKILL_LENGTH]
+
+    @classmethod
+    def normalize_all(cls, skills: Iterable[Any]) -> List[str]:
+        """Distinct non-empty normalised skills, in first-seen order"""
+        return list(dict.fromkeys(
+            normalized for normalized in (cls.normalize(skill) for skill in skills or []) if normalized
+        ))
+
+    # Maintenance
+
+    def index_developers(self, user_ids: Iterable[Any]) -> Dict[str, int]:
+        """Bring the entries of the given developers in line with their profiles"""
+        user_ids = list({user_id for user_id in user_ids if user_id is not None})
+        if not user_ids:
+            return {'created': 0, 'updated': 0, 'deleted': 0}
+
+        profiles = {
+            user_id: (skills, github_analysis)
+            for user_id, skills, github_analysis in DeveloperProfile.objects.filter(
+                user_id__in=user_ids
+            ).values_list('user_id', 'skills', 'github_analysis')
+        }
+        assessed = self._assessed_proficiencies(list(profiles))
+
+        wanted = {}
+        for user_id, (skills, github_analysis) in profiles.items():
+            github_assessment = {
+                self.normalize(skill): assessment
+                for skill, assessment in ((github_analysis or {}).get('skill_assessment') or {}).items()
+            }
+            for skill in self.normalize_all(skills if isinstance(skills, list) else []):
+                proficiency = assessed.get((user_id, skill))
+                if proficiency is None:
+                    proficiency = self._github_proficiency(github_assessment.get(skill))
+                wanted[(user_id, skill)] = proficiency
+
+        existing = {
+            (entry.developer_id, entry.skill): entry
+            for entry in DeveloperSkillIndex.objects.filter(developer_id__in=user_ids)
+        }
+        to_create = [
+            DeveloperSkillIndex(developer_id=user_id, skill=skill, proficiency=proficiency)
+            for (user_id, skill), proficiency in wanted.items()
+            if (user_id, skill) not in existing
+        ]
+        to_update = []
+        for key, entry in existing.items():
+            if key in wanted and abs(entry.proficiency - wanted[key]) > 1e-9:
+                entry.proficiency = wanted[key]
+                to_update.append(entry)
+        to_delete = [entry.pk for key, entry in existing.items() if key not in wanted]
+
+        with transaction.atomic():
+            if to_delete:
+                DeveloperSkillIndex.objects.filter(pk__in=to_delete).delete()
+            if to_update:
+                DeveloperSkillIndex.objects.bulk_update(to_update, ['proficiency'])
+            if to_create:
+                # A concurrent reindex of the same developer may have inserted the row already
+                DeveloperSkillIndex.objects.bulk_create(to_create, ignore_conflicts=True)
+
+        return {'created': len(to_create), 'updated': len(to_update), 'deleted': len(to_delete)}
+
+    def remove_developers(self, user_ids: Iterable[Any]) -> int:
+        deleted, _ = DeveloperSkillIndex.objects.filter(developer_id__in=list(user_ids)).delete()
+        return deleted
+
+    def rebuild(self, batch_size: int = 500) -> Dict[str, int]:
+        """Reindex every developer profile and drop entries of developers without one"""
+        totals = {'developers': 0, 'created': 0, 'updated': 0, 'deleted': 0}
+        user_ids = DeveloperProfile.objects.order_by('user_id').values_list('user_id', flat=True)
+        batch = []
+        for user_id in user_ids.iterator(chunk_size=batch_size):
+            batch.append(user_id)
+            if len(batch) >= batch_size:
+                self._add_totals(totals, self.index_developers(batch), len(batch))
+                batch = []
+        if batch:
+            self._add_totals(totals, self.index_developers(batch), len(batch))
+
+        orphaned, _ = DeveloperSkillIndex.objects.exclude(
+            developer_id__in=DeveloperProfile.objects.values('user_id')
+        ).delete()
+        totals['deleted'] += orphaned
+        return totals
+
+    @staticmethod
+    def _add_totals(totals: Dict[str, int], result: Dict[str, int], developers: int):
+        totals['developers'] += developers
+        for key, value in result.items():
+            totals[key] += value
+
+    def _assessed_proficiencies(self, user_ids: List[Any]) -> Dict[Tuple[Any, str], float]:
+        """Proficiency per (developer, normalised skill) from skill proficiency records"""
+        if not user_ids:
+            return {}
+        from ai_services.models import DeveloperSkillProficiency
+
+        assessed = {}
+        for developer_id, skill_name, level in DeveloperSkillProficiency.objects.filter(
+            developer_id__in=user_ids
+        ).values_list('developer_id', 'skill__name', 'proficiency_level'):
+            key = (developer_id, self.normalize(skill_name))
+            proficiency = self.LEVEL_PROFICIENCY.get(level, self.DEFAULT_PROFICIENCY)
+            assessed[key] = max(assessed.get(key, 0.0), proficiency)
+        return assessed
+
+    def _github_proficiency(self, assessment: Optional[Dict[str, Any]]) -> float:
+        try:
+            return min(max(float(assessment['proficiency']) / 100.0, 0.0), 1.0)
+        except (KeyError, TypeError, ValueError):
+            return self.DEFAULT_PROFICIENCY
+
+    # Lookups
+
+    def entries(self, skills: Iterable[Any], min_proficiency: float = 0.0) -> QuerySet:
+        entries = DeveloperSkillIndex.objects.filter(skill__in=self.normalize_all(skills))
+        if min_proficiency > 0:
+            entries = entries.filter(proficiency__gte=min_proficiency)
+        return entries
+
+    def developers_with_all(self, skills: Iterable[Any], min_proficiency: float = 0.0) -> QuerySet:
+        """IDs of developers with every skill"""
+        normalized = self.normalize_all(skills)
+        if not normalized:
+            return DeveloperSkillIndex.objects.none().values_list('developer_id', flat=True)
+        return self.entries(normalized, min_proficiency).values('developer_id').annotate(
+            matched=Count('id')
+        ).filter(matched=len(normalized)).values_list('developer_id', flat=True)
+
+    def developers_with_any(self, skills: Iterable[Any], min_proficiency: float = 0.0) -> QuerySet:
+        """IDs of developers with at least one of the skills"""
+        return self.entries(skills, min_proficiency).values_list('developer_id', flat=True).distinct()
+
+    def candidates(self, any_of: Iterable[Any] = None, all_of: Iterable[Any] = None,
+                   none_of: Iterable[Any] = None, min_proficiency: float = 0.0) -> Optional[QuerySet]:
+        """
+        IDs of developers with every ``all_of`` skill, at least one ``any_of`` skill
+        and no ``none_of`` skill.
+
+        Returns None when no skill constraint is given, meaning every developer qualifies.
+        """
+        any_of, all_of, none_of = (self.normalize_all(skills) for skills in (any_of, all_of, none_of))
+        if not (any_of or all_of or none_of):
+            return None
+
+        candidates = DeveloperProfile.objects.all()
+        if all_of:
+            candidates = candidates.filter(user_id__in=self.developers_with_all(all_of, min_proficiency))
+        if any_of:
+            candidates = candidates.filter(user_id__in=self.developers_with_any(any_of, min_proficiency))
+        if none_of:
+            candidates = candidates.exclude(user_id__in=self.developers_with_any(none_of))
+        return candidates.values_list('user_id', flat=True)
+
+    def weighted_scores(self, skills: Union[Dict[Any, float], Iterable[Any]],
+                        limit: Optional[int] = None, min_score: float = 0.0,
+                        developer_ids: Iterable[Any] = None) -> List[Tuple[Any, float]]:
+        """
+        Developers ranked by the weighted mean proficiency over the given skills.
+
+        Skills a developer lacks count as zero. A plain list weights every skill equally.
+        """
+        if not isinstance(skills, dict):
+            skills = {skill: 1.0 for skill in skills or []}
+        weights = {}
+        for skill, weight in skills.items():
+            normalized = self.normalize(skill)
+            if normalized and weight > 0:
+                weights[normalized] = weights.get(normalized, 0.0) + float(weight)
+        total_weight = sum(weights.values())
+        if not total_weight:
+            return []
+
+        entries = self.entries(weights)
+        if developer_ids is not None:
+            entries = entries.filter(developer_id__in=developer_ids)
+        weight = Case(
+            *(When(skill=skill, then=Value(value)) for skill, value in weights.items()),
+            default=Value(0.0), output_field=FloatField()
+        )
+        scores = entries.values('developer_id').annotate(
+            score=Sum(F('proficiency') * weight, output_field=FloatField()) / Value(total_weight)
+        )
+        if min_score > 0:
+            scores = scores.filter(score__gte=min_score)
+        scores = scores.order_by('-score', 'developer_id')
+        if limit is not None:
+            scores = scores[:limit]
+        return [(row['developer_id'], row['score']) for row in scores]
+
+    def coverage(self, skills: Iterable[Any], developer_ids: Iterable[Any]) -> Dict[Any, Tuple[int, int]]:
+        """(matched skills, total skills) per developer; developers without entries are left out"""
+        normalized = self.normalize_all(skills)
+        return {
+            row['developer_id']: (row['matched'], row['total'])
+            for row in DeveloperSkillIndex.objects.filter(developer_id__in=developer_ids).values(
+                'developer_id'
+            ).annotate(
+                matched=Count('id', filter=Q(skill__in=normalized)),
+                total=Count('id')
+            )
+        }
+
+
+skill_index = SkillIndex()